@@ -3,14 +3,17 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group
 from django.utils.translation import gettext_lazy as _
+from main.exports import export_action
 from .models import User
 
 class UserAdmin(BaseUserAdmin):
     # فرم نمایش در ادمین
-    list_display = ['phone_number', 'is_active', 'is_staff', 'date_joined']
+    list_display = ['phone_number', 'is_active', 'is_staff', 'premium_until', 'date_joined']
     list_filter = ['is_active', 'is_staff', 'is_superuser']
     search_fields = ['phone_number']
     ordering = ['-date_joined']
+    date_hierarchy = 'date_joined'
+    actions = [export_action('users'), export_action('users', 'jsonl')]
     
     # فیلدهایی که در صفحه جزئیات نمایش داده می‌شوند
     fieldsets = (
@@ -19,6 +22,7 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions'),
         }),
         (_('Important dates'), {'fields': ('last_login', 'date_joined')}),
+        ('اشتراک ویژه', {'fields': ('premium_until',)}),
         (_('OTP Information'), {
             'fields': ('otp_code', 'otp_created_at'),
             'classes': ('collapse',),  # قابل باز و بسته شدن
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='premium_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='پایان اشتراک ویژه'),
+        ),
+    ]
@@ -45,6 +45,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     otp_code = models.CharField(max_length=6, blank=True, null=True, verbose_name="کد تایید")
     otp_created_at = models.DateTimeField(null=True, blank=True, verbose_name="زمان ایجاد کد")
 
+    # اشتراک ویژه — کپی غیرنرمال از آخرین Subscription موفق برای بررسی دسترسی بدون کوئری
+    premium_until = models.DateTimeField(null=True, blank=True, verbose_name="پایان اشتراک ویژه")
+
     objects = UserManager()
 
     USERNAME_FIELD = 'phone_number'
@@ -58,6 +61,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.phone_number
 
+    @property
+    def has_active_premium(self) -> bool:
+        """اشتراک ویژه فعال است؟ — فقط از فیلد premium_until روی همین سطر، بدون کوئری"""
+        return bool(self.premium_until and self.premium_until > timezone.now())
+
     def is_otp_valid(self, otp_code, expiry_minutes=5):
         """بررسی اعتبار کد OTP"""
         if not self.otp_code or not self.otp_created_at:
@@ -76,4 +84,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         """تنظیم کد OTP جدید"""
         self.otp_code = otp_code
         self.otp_created_at = timezone.now()
-        self.save(update_fields=['otp_code', 'otp_created_at'])
\ No newline at end of file
+        self.save(update_fields=['otp_code', 'otp_created_at'])
+
+    async def aset_otp(self, otp_code):
+        """set_otp برای viewهای async"""
+        self.otp_code = otp_code
+        self.otp_created_at = timezone.now()
+        await self.asave(update_fields=['otp_code', 'otp_created_at'])
\ No newline at end of file
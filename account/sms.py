@@ -2,7 +2,10 @@ import random
 import logging
 from django.conf import settings
 from sms_ir import SmsIr
-import requests
+
+from main import metrics
+from main.httpclient import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,16 +33,18 @@ def send_otp_sms(phone_number, otp_code) -> bool:
        
 
         sms_ir = SmsIr(api_key)
-        sms_ir.send_verify_code(
-            number=phone_number,
-            template_id=template_id,
-            parameters=[
-                {
-                    "name": "CODE",
-                    "value": str(otp_code),
-                },
-            ],
-        )
+        with metrics.observe(metrics.SMS_LATENCY, provider='smsir') as call:
+            sms_ir.send_verify_code(
+                number=phone_number,
+                template_id=template_id,
+                parameters=[
+                    {
+                        "name": "CODE",
+                        "value": str(otp_code),
+                    },
+                ],
+            )
+            call['outcome'] = 'ok'
         logger.info(f"OTP sent to {phone_number}")
         return True
 
@@ -53,4 +58,28 @@ def send_otp_sms(phone_number, otp_code) -> bool:
 
     except Exception as e:
         logger.error(f"SMS sending failed for {phone_number}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+async def asend_otp_sms(phone_number, otp_code) -> bool:
+    """
+    نسخه async ارسال OTP برای viewهای async — همان endpoint و payload کتابخانه sms_ir
+    (v1/send/verify) با main/httpclient.py، بدون اشغال thread در زمان انتظار
+    """
+    payload = {
+        'Mobile':     phone_number,
+        'TemplateId': settings.SMSIR_TEMPLATE_ID,
+        'Parameters': [{'name': 'CODE', 'value': str(otp_code)}],
+    }
+    headers = {'X-API-KEY': settings.SMSIR_API_KEY, 'ACCEPT': 'application/json'}
+    try:
+        with metrics.observe(metrics.SMS_LATENCY, provider='smsir') as call:
+            async with http_client() as http:
+                resp = await http.post(f'{SmsIr.ENDPOINT}/v1/send/verify/', json=payload, headers=headers)
+            resp.raise_for_status()
+            call['outcome'] = 'ok'
+        logger.info(f"OTP sent to {phone_number}")
+        return True
+    except Exception as e:
+        logger.error(f"SMS sending failed for {phone_number}: {e}")
+        return False
@@ -1,4 +1,5 @@
 import re
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
@@ -6,8 +7,10 @@ from django.http import HttpResponse
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 
+from main import metrics
+
 from .models import User
-from .sms import generate_otp, send_otp_sms
+from .sms import asend_otp_sms, generate_otp
 
 
 def is_htmx(request):
@@ -30,11 +33,15 @@ def login_view(request):
 
 
 @require_http_methods(["POST"])
-def send_code(request):
-    """HTMX endpoint: دریافت شماره → ارسال OTP"""
+async def send_code(request):
+    """
+    HTMX endpoint: دریافت شماره → ارسال OTP
+    async: در زمان انتظار برای sms.ir فقط event loop منتظر است، نه یک thread
+    """
     phone_raw = request.POST.get('phone', '').strip()
 
     if not validate_phone(phone_raw):
+        metrics.OTP_SENT.labels('send', 'invalid_phone').inc()
         if is_htmx(request):
             return HttpResponse(
                 '<div class="input-error">شماره موبایل معتبر نیست</div>',
@@ -45,22 +52,22 @@ def send_code(request):
     phone = '0' + phone_raw  # ذخیره با صفر پیشرو
 
     # گرفتن یا ساخت کاربر
-    user, created = User.objects.get_or_create(phone_number=phone)
+    user, created = await User.objects.aget_or_create(phone_number=phone)
 
     # تولید و ذخیره OTP
     otp = generate_otp()
-    user.set_otp(otp)
+    await user.aset_otp(otp)
 
     # ارسال SMS
-    sms_sent = send_otp_sms(phone, otp)
+    sms_sent = await asend_otp_sms(phone, otp)
+    metrics.OTP_SENT.labels('send', 'sent' if sms_sent else 'failed').inc()
 
     # ذخیره شماره در session برای مرحله verify
-    request.session['pending_phone'] = phone
-    request.session.modified = True
+    await request.session.aset('pending_phone', phone)
 
     if is_htmx(request):
-        # جایگزین کردن محتوای فرم با فرم verify
-        response = render(request, 'account/partials/verify_form.html', {
+        # جایگزین کردن محتوای فرم با فرم verify (context processorها کوئری sync دارند)
+        response = await sync_to_async(render)(request, 'account/partials/verify_form.html', {
             'phone': phone,
             'phone_display': _format_phone(phone),
             'sms_sent': sms_sent,
@@ -78,7 +85,7 @@ def send_code(request):
 def verify_view(request):
     phone = request.session.get('pending_phone')
     if not phone:
-        return redirect('login')
+        return redirect('account:login')
     return render(request, 'account/verify.html', {
         'phone': phone,
         'phone_display': _format_phone(phone),
@@ -92,6 +99,7 @@ def verify_code(request):
     code = request.POST.get('code', '').strip()
 
     if not phone:
+        metrics.OTP_VERIFY.labels('no_session').inc()
         if is_htmx(request):
             return HttpResponse(
                 '<div class="input-error">جلسه منقضی شده. دوباره وارد شوید</div>',
@@ -102,6 +110,7 @@ def verify_code(request):
     try:
         user = User.objects.get(phone_number=phone)
     except User.DoesNotExist:
+        metrics.OTP_VERIFY.labels('unknown_user').inc()
         if is_htmx(request):
             return HttpResponse(
                 '<div class="input-error">کاربر یافت نشد</div>',
@@ -110,6 +119,7 @@ def verify_code(request):
         return redirect('account:login')
 
     if not user.is_otp_valid(code):
+        metrics.OTP_VERIFY.labels('invalid').inc()
         if is_htmx(request):
             return HttpResponse(
                 '<div class="otp-error" id="otp-error">کد وارد شده صحیح یا منقضی شده است</div>',
@@ -123,6 +133,7 @@ def verify_code(request):
         })
 
     # کد صحیح: ورود
+    metrics.OTP_VERIFY.labels('success').inc()
     user.clear_otp()
     del request.session['pending_phone']
     login(request, user, backend='django.contrib.auth.backends.ModelBackend')
@@ -136,20 +147,21 @@ def verify_code(request):
 
 
 @require_http_methods(["POST"])
-def resend_code(request):
-    """HTMX endpoint: ارسال مجدد کد"""
-    phone = request.session.get('pending_phone')
+async def resend_code(request):
+    """HTMX endpoint: ارسال مجدد کد (async، مثل send_code)"""
+    phone = await request.session.aget('pending_phone')
     if not phone:
         return HttpResponse('<span class="resend-error">جلسه منقضی شده</span>', status=422)
 
     try:
-        user = User.objects.get(phone_number=phone)
+        user = await User.objects.aget(phone_number=phone)
     except User.DoesNotExist:
         return HttpResponse('<span class="resend-error">کاربر یافت نشد</span>', status=422)
 
     otp = generate_otp()
-    user.set_otp(otp)
-    send_otp_sms(phone, otp)
+    await user.aset_otp(otp)
+    sms_sent = await asend_otp_sms(phone, otp)
+    metrics.OTP_SENT.labels('resend', 'sent' if sms_sent else 'failed').inc()
 
     return HttpResponse(
         '<span class="resend-success">کد جدید ارسال شد ✓</span>',
@@ -162,7 +174,11 @@ def resend_code(request):
 
 @login_required
 def profile_view(request):
-    return render(request, 'account/profile.html', {'user': request.user})
+    from book.progress import continue_reading
+    return render(request, 'account/profile.html', {
+        'user':             request.user,
+        'continue_reading': continue_reading(request.user),
+    })
 
 
 @login_required
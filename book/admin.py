@@ -1,7 +1,18 @@
 # books/admin.py
-from django.contrib import admin
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils.html import format_html, mark_safe, mark_safe
 from django.db.models import Count
+from main.images import thumbnail_url
+from main.adminfilters import AutocompleteFilterMixin, AutocompleteListFilter, EstimatedCountPaginator
+from main.querybudget import QueryBudgetMixin
+from .ingest import SUPPORTED_EXTENSIONS, IngestError, import_book_content, parse_book
 from .models import BookCategory, Book, BookChapter, BookPage
 
 
@@ -64,7 +75,7 @@ class BookChapterInline(admin.TabularInline):
 # ══════════════════════════════════════════════════════════════════════════
 
 @admin.register(Book)
-class BookAdmin(admin.ModelAdmin):
+class BookAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = (
         'cover_thumbnail', 'title', 'author', 'category',
         'access_badge', 'price_display', 'rating',
@@ -72,6 +83,7 @@ class BookAdmin(admin.ModelAdmin):
     )
     list_display_links = ('cover_thumbnail', 'title')
     list_filter  = ('is_active', 'is_featured', 'access_type', 'category', 'language')
+    list_select_related = ('category',)
     list_editable = ('is_featured', 'is_active')
     search_fields = ('title', 'author', 'translator', 'publisher', 'isbn')
     prepopulated_fields = {'slug': ('title',)}
@@ -115,7 +127,7 @@ class BookAdmin(admin.ModelAdmin):
         if obj.cover_image:
             return format_html(
                 '<img src="{}" style="height:48px;width:36px;object-fit:cover;border-radius:4px;">',
-                obj.cover_image.url
+                thumbnail_url(obj.cover_image, 160)
             )
         return mark_safe(
             '<div style="height:48px;width:36px;background:#eee;border-radius:4px;'
@@ -127,7 +139,7 @@ class BookAdmin(admin.ModelAdmin):
         if obj.cover_image:
             return format_html(
                 '<img src="{}" style="max-height:200px;border-radius:8px;">',
-                obj.cover_image.url
+                thumbnail_url(obj.cover_image, 320)
             )
         return '—'
     cover_preview.short_description = 'پیش‌نمایش جلد'
@@ -151,34 +163,96 @@ class BookAdmin(admin.ModelAdmin):
             return mark_safe('<span style="color:#2e7d32;">رایگان</span>')
         if obj.discount_percent:
             return format_html(
-                '<span style="text-decoration:line-through;color:#999;font-size:11px;">{:,}</span>'
-                ' <strong style="color:#d32f2f;">{:,}</strong> <small>ت</small>',
-                obj.price, obj.final_price
+                '<span style="text-decoration:line-through;color:#999;font-size:11px;">{}</span>'
+                ' <strong style="color:#d32f2f;">{}</strong> <small>ت</small>',
+                f'{obj.price:,}', f'{obj.final_price:,}'
             )
-        return format_html('{:,} <small>ت</small>', obj.price)
+        return format_html('{} <small>ت</small>', f'{obj.price:,}')
     price_display.short_description = 'قیمت'
 
     def final_price_display(self, obj):
         return f'{obj.final_price:,} تومان'
     final_price_display.short_description = 'قیمت نهایی (با تخفیف)'
 
+    # ── وارد کردن متن کامل از فایل ────────────────────────────────────────
+
+    def get_urls(self):
+        return [
+            path(
+                '<path:object_id>/import-content/',
+                self.admin_site.admin_view(self.import_content_view),
+                name='book_book_import_content',
+            ),
+        ] + super().get_urls()
+
+    def import_content_view(self, request, object_id):
+        book = self.get_object(request, unquote(object_id))
+        if book is None:
+            return self._get_obj_does_not_exist_redirect(request, self.opts, object_id)
+        if not self.has_change_permission(request, book):
+            raise PermissionDenied
+
+        form = BookContentImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                chapters = parse_book(upload.name, upload.read())
+            except IngestError as e:
+                form.add_error('file', str(e))
+            else:
+                stats = import_book_content(book, chapters, page_chars=form.cleaned_data['page_chars'])
+                self.message_user(
+                    request,
+                    f'{stats["chapters"]} فصل و {stats["pages"]} صفحه وارد شد'
+                    f' ({stats["removed_pages"]} صفحه اضافه قبلی حذف شد).',
+                    messages.SUCCESS,
+                )
+                return redirect('admin:book_book_change', book.pk)
+
+        return TemplateResponse(request, 'admin/book/book/import_content.html', {
+            **self.admin_site.each_context(request),
+            'title':    f'وارد کردن متن «{book}»',
+            'opts':     self.opts,
+            'original': book,
+            'form':     form,
+            'pages':    book.pages.count(),
+        })
+
+
+class BookContentImportForm(forms.Form):
+    file       = forms.FileField(
+        label='فایل کتاب',
+        help_text=f'فرمت‌های {"، ".join(SUPPORTED_EXTENSIONS)} — هر فایل حجیم‌تر با manage.py import_book_content',
+    )
+    page_chars = forms.IntegerField(
+        label='نویسه در هر صفحه', initial=getattr(settings, 'BOOK_IMPORT_PAGE_CHARS', 2000), min_value=300, max_value=20000,
+        help_text='صفحه‌ها در مرز پاراگراف شکسته می‌شوند',
+    )
+
 
 # ══════════════════════════════════════════════════════════════════════════
 #  BookChapter
 # ══════════════════════════════════════════════════════════════════════════
 
 @admin.register(BookChapter)
-class BookChapterAdmin(admin.ModelAdmin):
+class BookChapterAdmin(QueryBudgetMixin, AutocompleteFilterMixin, admin.ModelAdmin):
     list_display  = ('title', 'book', 'order', 'is_preview', 'pages_count')
-    list_filter   = ('is_preview', 'book')
+    list_filter   = ('is_preview', ('book', AutocompleteListFilter))
     search_fields = ('title', 'book__title')
     list_editable = ('order', 'is_preview')
     ordering      = ('book', 'order')
     autocomplete_fields = ('book',)
 
+    def get_queryset(self, request):
+        # select_related برای autocomplete هم لازم است (str(chapter) عنوان کتاب را می‌خواند)
+        return super().get_queryset(request).select_related('book').annotate(
+            _pages_count=Count('pages')
+        )
+
     def pages_count(self, obj):
-        return obj.pages.count()
+        return obj._pages_count
     pages_count.short_description = 'تعداد صفحات'
+    pages_count.admin_order_field = '_pages_count'
 
 
 # ══════════════════════════════════════════════════════════════════════════
@@ -186,14 +260,18 @@ class BookChapterAdmin(admin.ModelAdmin):
 # ══════════════════════════════════════════════════════════════════════════
 
 @admin.register(BookPage)
-class BookPageAdmin(admin.ModelAdmin):
+class BookPageAdmin(QueryBudgetMixin, AutocompleteFilterMixin, admin.ModelAdmin):
     list_display  = ('book', 'chapter', 'order', 'page_number', 'heading_short', 'content_preview')
-    list_filter   = ('book', 'chapter')
+    # str(chapter) عنوان کتاب را هم می‌خواند
+    list_select_related = ('book', 'chapter__book')
+    list_filter   = (('book', AutocompleteListFilter), ('chapter', AutocompleteListFilter))
     search_fields = ('book__title', 'heading', 'content', 'page_number')
     list_editable = ('order', 'page_number')
     ordering      = ('book', 'order')
     autocomplete_fields = ('book', 'chapter')
     readonly_fields = ('page_image_preview',)
+    paginator     = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('موقعیت', {
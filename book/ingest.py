@@ -0,0 +1,425 @@
+"""
+book/ingest.py
+وارد کردن متن کامل کتاب از فایل EPUB / DOCX / TXT به BookChapter و BookPage
+
+  parse_book(name, data)          → [(عنوان فصل، [بلوک HTML پاک‌سازی‌شده، ...]), ...]
+  import_book_content(book, ...)  → نوشتن فصل‌ها و صفحه‌ها با bulk_create در تراکنش‌های دسته‌ای
+
+فقط کتابخانه استاندارد پایتون (zipfile، ElementTree، HTMLParser) استفاده می‌شود.
+HTML ورودی با فهرست سفید تگ‌ها پاک‌سازی می‌شود چون قالب خواننده محتوا را با |safe نمایش می‌دهد.
+
+    python manage.py import_book_content <slug> book.epub
+    (یا دکمه «وارد کردن متن» در صفحه ویرایش کتاب در admin)
+"""
+import io
+import posixpath
+import re
+import zipfile
+from html import escape
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import unquote
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+SUPPORTED_EXTENSIONS = ('.epub', '.docx', '.txt')
+
+# نشانگر شکست صفحه اجباری داخل فهرست بلوک‌ها (\f در TXT، page break در DOCX)
+PAGE_BREAK = None
+
+
+class IngestError(Exception):
+    pass
+
+
+# ── پاک‌سازی HTML ─────────────────────────────────────────────────────────
+
+BLOCK_TAGS  = {'p', 'blockquote', 'ul', 'ol', 'li', 'h4', 'pre'}
+INLINE_TAGS = {'strong', 'em', 'u', 'sup', 'sub', 'a'}
+RENAME_TAGS = {
+    'b': 'strong', 'i': 'em',
+    'h1': 'h4', 'h2': 'h4', 'h3': 'h4', 'h5': 'h4', 'h6': 'h4',
+}
+# محتوای این تگ‌ها کامل حذف می‌شود
+DROP_TAGS   = {'script', 'style', 'head', 'title', 'noscript', 'iframe', 'object', 'svg', 'math', 'template'}
+# مرز بلوک بدون اینکه خودشان در خروجی بمانند
+BREAK_TAGS  = {'div', 'section', 'article', 'body', 'header', 'footer', 'aside', 'nav', 'table', 'tr', 'td', 'th', 'figure', 'hr'}
+
+_TAG_RE   = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+class _Sanitizer(HTMLParser):
+    """HTML دلخواه → فهرست بلوک‌های سطح بالا با تگ‌های مجاز و بدون attribute (به‌جز href امن)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks   = []
+        self.stack    = []      # تگ‌های باز بلوک جاری
+        self.buf      = []
+        self.implicit = False   # بلوک جاری <p> ساختگی برای متن بیرون از بلوک است
+        self.skip     = 0
+
+    def _open_implicit(self):
+        self.stack, self.buf, self.implicit = ['p'], ['<p>'], True
+
+    def _flush(self):
+        while self.stack:
+            self.buf.append(f'</{self.stack.pop()}>')
+        html = ''.join(self.buf)
+        if _TAG_RE.sub('', html).strip():
+            self.blocks.append(html)
+        self.buf, self.implicit = [], False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_TAGS:
+            self.skip += 1
+            return
+        if self.skip:
+            return
+        tag = RENAME_TAGS.get(tag, tag)
+
+        if tag in BREAK_TAGS:
+            if self.implicit:
+                self._flush()
+        elif tag in BLOCK_TAGS:
+            if self.implicit:
+                self._flush()
+            elif tag in ('p', 'li', 'h4') and tag in self.stack:
+                # <p>...<p> بدون تگ بسته
+                self.handle_endtag(tag)
+            self.stack.append(tag)
+            self.buf.append(f'<{tag}>')
+        elif tag in INLINE_TAGS:
+            if not self.stack:
+                self._open_implicit()
+            if tag == 'a':
+                href = dict(attrs).get('href') or ''
+                if not href.startswith(('http://', 'https://')):
+                    return
+                self.buf.append(f'<a href="{escape(href)}" rel="nofollow noopener">')
+            else:
+                self.buf.append(f'<{tag}>')
+            self.stack.append(tag)
+        elif tag == 'br' and self.stack:
+            self.buf.append('<br>')
+
+    def handle_endtag(self, tag):
+        if tag in DROP_TAGS:
+            self.skip = max(self.skip - 1, 0)
+            return
+        if self.skip:
+            return
+        tag = RENAME_TAGS.get(tag, tag)
+
+        if tag in BREAK_TAGS:
+            if self.implicit:
+                self._flush()
+        elif tag in self.stack:
+            while self.stack:
+                open_tag = self.stack.pop()
+                self.buf.append(f'</{open_tag}>')
+                if open_tag == tag:
+                    break
+            if not self.stack:
+                self._flush()
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        if 'pre' not in self.stack:
+            data = _SPACE_RE.sub(' ', data)
+        if not self.stack:
+            if not data.strip():
+                return
+            self._open_implicit()
+        self.buf.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def sanitize_blocks(html: str) -> list:
+    parser = _Sanitizer()
+    parser.feed(html)
+    parser.close()
+    return parser.blocks
+
+
+def sanitize_html(html: str) -> str:
+    return ''.join(sanitize_blocks(html))
+
+
+def text_of(html: str) -> str:
+    return _SPACE_RE.sub(' ', _TAG_RE.sub('', html)).strip()
+
+
+# ── TXT ───────────────────────────────────────────────────────────────────
+#  «# عنوان» شروع فصل، «## عنوان» عنوان میانی، خط خالی پایان پاراگراف، \f شکست صفحه
+
+def _decode_text(data: bytes) -> str:
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        # فایل‌های متنی قدیمی ویندوز فارسی
+        return data.decode('cp1256', errors='replace')
+
+
+def parse_txt(data: bytes) -> list:
+    text     = _decode_text(data).replace('\r\n', '\n').replace('\r', '\n')
+    chapters = [['', []]]
+    lines    = []
+
+    def end_paragraph():
+        if lines:
+            chapters[-1][1].append(f'<p>{escape(" ".join(lines), quote=False)}</p>')
+            lines.clear()
+
+    for raw in text.split('\n'):
+        for i, part in enumerate(raw.split('\f')):
+            if i:
+                end_paragraph()
+                chapters[-1][1].append(PAGE_BREAK)
+            line = part.strip()
+            if not line:
+                end_paragraph()
+            elif line.startswith('## '):
+                end_paragraph()
+                chapters[-1][1].append(f'<h4>{escape(line[3:].strip(), quote=False)}</h4>')
+            elif line.startswith('# '):
+                end_paragraph()
+                chapters.append([line[2:].strip(), []])
+            else:
+                lines.append(line)
+    end_paragraph()
+    return [(title, blocks) for title, blocks in chapters if title or any(blocks)]
+
+
+# ── DOCX ──────────────────────────────────────────────────────────────────
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _docx_flag(rpr, name: str) -> bool:
+    el = rpr.find(W + name) if rpr is not None else None
+    return el is not None and el.get(W + 'val', 'true') not in ('0', 'false', 'none')
+
+
+def _docx_level(p):
+    """0 برای عنوان فصل، 1 برای عنوان میانی، None برای پاراگراف عادی"""
+    ppr = p.find(W + 'pPr')
+    if ppr is None:
+        return None
+    outline = ppr.find(W + 'outlineLvl')
+    if outline is not None and outline.get(W + 'val', '9').isdigit() and int(outline.get(W + 'val')) < 9:
+        return min(int(outline.get(W + 'val')), 1)
+    style = ppr.find(W + 'pStyle')
+    name  = (style.get(W + 'val', '') if style is not None else '').lower().replace(' ', '')
+    if name in ('title', 'heading1'):
+        return 0
+    if name.startswith('heading'):
+        return 1
+    return None
+
+
+def parse_docx(data: bytes) -> list:
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read('word/document.xml'))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise IngestError(f'فایل DOCX نامعتبر است: {e}')
+
+    chapters = [['', []]]
+    for p in root.iter(W + 'p'):
+        ppr = p.find(W + 'pPr')
+        if ppr is not None and _docx_flag(ppr, 'pageBreakBefore'):
+            chapters[-1][1].append(PAGE_BREAK)
+
+        parts, plain, page_break = [], [], False
+        for run in p.iter(W + 'r'):
+            rpr = run.find(W + 'rPr')
+            for el in run:
+                if el.tag == W + 't' and el.text:
+                    piece = escape(el.text, quote=False)
+                    if _docx_flag(rpr, 'b'):
+                        piece = f'<strong>{piece}</strong>'
+                    if _docx_flag(rpr, 'i'):
+                        piece = f'<em>{piece}</em>'
+                    parts.append(piece)
+                    plain.append(el.text)
+                elif el.tag == W + 'tab':
+                    parts.append(' ')
+                    plain.append(' ')
+                elif el.tag == W + 'br':
+                    if el.get(W + 'type') == 'page':
+                        page_break = True
+                    else:
+                        parts.append('<br>')
+
+        text  = ''.join(plain).strip()
+        level = _docx_level(p)
+        if text and level == 0:
+            chapters.append([text, []])
+        elif text and level == 1:
+            chapters[-1][1].append(f'<h4>{escape(text, quote=False)}</h4>')
+        elif text:
+            chapters[-1][1].append(f'<p>{"".join(parts).strip()}</p>')
+        if page_break:
+            chapters[-1][1].append(PAGE_BREAK)
+    return [(title, blocks) for title, blocks in chapters if title or any(blocks)]
+
+
+# ── EPUB ──────────────────────────────────────────────────────────────────
+
+OPF       = '{http://www.idpf.org/2007/opf}'
+CONTAINER = '{urn:oasis:names:tc:opendocument:xmlns:container}'
+HTML_TYPES = ('application/xhtml+xml', 'text/html')
+
+
+def parse_epub(data: bytes) -> list:
+    """هر سند spine یک فصل؛ عنوان فصل اولین عنوان سند (از محتوا حذف می‌شود)"""
+    try:
+        archive   = zipfile.ZipFile(io.BytesIO(data))
+        container = ElementTree.fromstring(archive.read('META-INF/container.xml'))
+        opf_path  = container.find(f'.//{CONTAINER}rootfile').get('full-path')
+        package   = ElementTree.fromstring(archive.read(opf_path))
+    except (zipfile.BadZipFile, KeyError, AttributeError, ElementTree.ParseError) as e:
+        raise IngestError(f'فایل EPUB نامعتبر است: {e}')
+
+    base     = posixpath.dirname(opf_path)
+    manifest = {
+        item.get('id'): item
+        for item in package.iterfind(f'{OPF}manifest/{OPF}item')
+    }
+    chapters = []
+    with archive:
+        for ref in package.iterfind(f'{OPF}spine/{OPF}itemref'):
+            item = manifest.get(ref.get('idref'))
+            if item is None or ref.get('linear') == 'no':
+                continue
+            if item.get('media-type') not in HTML_TYPES or 'nav' in (item.get('properties') or '').split():
+                continue
+            try:
+                html = archive.read(posixpath.normpath(posixpath.join(base, unquote(item.get('href')))))
+            except KeyError:
+                continue
+            blocks = sanitize_blocks(html.decode('utf-8', errors='replace'))
+            title  = ''
+            if blocks and blocks[0].startswith('<h4>'):
+                title = text_of(blocks.pop(0))
+            if blocks:
+                chapters.append((title, blocks))
+    return chapters
+
+
+PARSERS = {'.epub': parse_epub, '.docx': parse_docx, '.txt': parse_txt}
+
+
+def parse_book(name: str, data: bytes) -> list:
+    """
+    name: نام فایل (فرمت از پسوند تشخیص داده می‌شود)
+    Returns: [(عنوان فصل، [بلوک HTML یا PAGE_BREAK، ...]), ...]
+    Raises: IngestError
+    """
+    ext = Path(name).suffix.lower()
+    if ext not in PARSERS:
+        raise IngestError(f'فرمت {ext or name} پشتیبانی نمی‌شود ({", ".join(SUPPORTED_EXTENSIONS)})')
+    chapters = PARSERS[ext](data)
+    if not chapters:
+        raise IngestError('متنی در فایل پیدا نشد')
+    return chapters
+
+
+# ── صفحه‌بندی ─────────────────────────────────────────────────────────────
+
+def paginate(blocks: list, page_chars: int) -> list:
+    """بلوک‌ها پشت سر هم تا حدود page_chars نویسه در یک صفحه؛ پاراگراف وسط صفحه شکسته نمی‌شود"""
+    pages, current, size = [], [], 0
+    for block in blocks:
+        if block is PAGE_BREAK:
+            if current:
+                pages.append(current)
+            current, size = [], 0
+            continue
+        length = len(text_of(block))
+        if current and size + length > page_chars:
+            pages.append(current)
+            current, size = [], 0
+        current.append(block)
+        size += length
+    if current:
+        pages.append(current)
+    return [''.join(page) for page in pages]
+
+
+# ── نوشتن در دیتابیس ──────────────────────────────────────────────────────
+
+def import_book_content(book, chapters: list, page_chars: int = None, batch_size: int = 500, progress=None) -> dict:
+    """
+    chapters: خروجی parse_book
+    progress: تابع اختیاری (صفحات نوشته‌شده، کل صفحات) بعد از هر دسته
+
+    فصل‌ها و صفحه‌ها با کلید (book, order) upsert می‌شوند و ردیف‌های اضافه قبلی حذف؛
+    وارد کردن دوباره همان فایل نتیجه یکسان دارد و شناسه صفحه‌ها ثابت می‌ماند.
+    is_preview فصل‌ها و تصویر / یادداشت ویراستار صفحه‌ها دست نمی‌خورد.
+    """
+    from .models import Book, BookChapter, BookPage
+
+    page_chars = page_chars or getattr(settings, 'BOOK_IMPORT_PAGE_CHARS', 2000)
+    plan = [
+        (title, pages)
+        for title, pages in ((title, paginate(blocks, page_chars)) for title, blocks in chapters)
+        if pages
+    ]
+    total = sum(len(pages) for _, pages in plan)
+
+    with transaction.atomic():
+        BookChapter.objects.bulk_create(
+            [
+                BookChapter(book=book, order=order, title=(title or f'بخش {order}')[:255])
+                for order, (title, _) in enumerate(plan, start=1)
+            ],
+            update_conflicts=True, unique_fields=['book', 'order'], update_fields=['title'],
+        )
+        removed_chapters, _ = BookChapter.objects.filter(book=book, order__gt=len(plan)).delete()
+    chapter_ids = dict(BookChapter.objects.filter(book=book).values_list('order', 'pk'))
+
+    batch, order = [], 0
+
+    def flush():
+        with transaction.atomic():
+            BookPage.objects.bulk_create(
+                batch, batch_size=batch_size,
+                update_conflicts=True, unique_fields=['book', 'order'],
+                update_fields=['chapter', 'page_number', 'content', 'heading'],
+            )
+        batch.clear()
+        if progress:
+            progress(order, total)
+
+    for chapter_order, (title, pages) in enumerate(plan, start=1):
+        for i, content in enumerate(pages):
+            order += 1
+            batch.append(BookPage(
+                book=book, chapter_id=chapter_ids[chapter_order],
+                order=order, page_number=str(order), content=content,
+                heading=title[:255] if i == 0 else '',
+            ))
+            if len(batch) >= batch_size:
+                flush()
+    if batch:
+        flush()
+
+    removed_pages, _ = BookPage.objects.filter(book=book, order__gt=order).delete()
+    # کلید کش کارت‌های کتاب (card_tags) به updated_at وابسته است
+    Book.objects.filter(pk=book.pk).update(updated_at=timezone.now())
+    return {
+        'chapters':         len(plan),
+        'pages':            total,
+        'removed_chapters': removed_chapters,
+        'removed_pages':    removed_pages,
+    }
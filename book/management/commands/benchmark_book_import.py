@@ -0,0 +1,174 @@
+"""
+book/management/commands/benchmark_book_import.py
+سنجش سرعت وارد کردن متن کتاب (صفحه در دقیقه) برای هر فرمت
+
+برای هر فرمت یک کتاب مصنوعی با --chapters فصل ساخته، در یک کتاب موقت وارد و دوباره
+وارد می‌شود (بررسی idempotent بودن: همان تعداد صفحه، شناسه‌های ثابت، بدون حذف) و در پایان
+کتاب موقت پاک می‌شود. فایل‌های book/fixtures/ingest/ با همین مولدها ساخته شده‌اند:
+
+    python manage.py benchmark_book_import
+    python manage.py benchmark_book_import --chapters 400 --paragraphs 120 --formats txt epub
+    python manage.py benchmark_book_import --chapters 3 --paragraphs 6 --save book/fixtures/ingest
+"""
+import io
+import time
+import zipfile
+from html import escape
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from book.ingest import import_book_content, parse_book
+from book.models import Book, BookPage
+
+SENTENCES = (
+    'خواندن کتاب خوب، گفت‌وگو با فرهیخته‌ترین انسان‌های قرون گذشته است.',
+    'هر فصل این کتاب با پرسشی آغاز می‌شود و با پاسخی کوتاه پایان می‌یابد.',
+    'نویسنده در این بخش به تاریخچه موضوع و دیدگاه‌های گوناگون می‌پردازد.',
+    'The quick brown fox jumps over the lazy dog, again and again.',
+    'تمرین‌های پایان فصل برای مرور مطالب و سنجش یادگیری طراحی شده‌اند.',
+)
+
+
+def sample_book(chapters: int, paragraphs: int) -> list:
+    """[(عنوان فصل، [پاراگراف، ...]), ...]"""
+    return [
+        (
+            f'فصل {c}: موضوع شماره {c}',
+            [' '.join(SENTENCES[(c + p + i) % len(SENTENCES)] for i in range(4)) for p in range(paragraphs)],
+        )
+        for c in range(1, chapters + 1)
+    ]
+
+
+def build_txt(book: list) -> bytes:
+    out = []
+    for title, paragraphs in book:
+        out.append(f'# {title}\n')
+        for i, paragraph in enumerate(paragraphs):
+            if i and i % 10 == 0:
+                out.append(f'## بخش {i // 10}\n')
+            out.append(f'{paragraph}\n')
+    return '\n'.join(out).encode()
+
+
+def build_docx(book: list) -> bytes:
+    def para(text, style=None, bold=False):
+        ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+        rpr = '<w:rPr><w:b/></w:rPr>' if bold else ''
+        return f'<w:p>{ppr}<w:r>{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+    body = []
+    for title, paragraphs in book:
+        body.append(para(title, 'Heading1'))
+        for i, paragraph in enumerate(paragraphs):
+            body.append(para(paragraph, bold=(i % 7 == 0)))
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ))
+        z.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="word/document.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+            '</Relationships>'
+        ))
+        z.writestr('word/document.xml', document)
+    return buf.getvalue()
+
+
+def build_epub(book: list) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+        z.writestr('META-INF/container.xml', (
+            '<?xml version="1.0"?>'
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>'
+            '</container>'
+        ))
+        items, spine = [], []
+        for i, (title, paragraphs) in enumerate(book, start=1):
+            body = ''.join(f'<p>{escape(p)}</p>' for p in paragraphs)
+            z.writestr(f'OEBPS/text/ch{i}.xhtml', (
+                '<?xml version="1.0" encoding="utf-8"?>'
+                '<html xmlns="http://www.w3.org/1999/xhtml" dir="rtl"><head><title>'
+                f'{escape(title)}</title><style>p {{ margin: 0 }}</style></head>'
+                f'<body><section><h1>{escape(title)}</h1>{body}</section></body></html>'
+            ))
+            items.append(f'<item id="ch{i}" href="text/ch{i}.xhtml" media-type="application/xhtml+xml"/>')
+            spine.append(f'<itemref idref="ch{i}"/>')
+        z.writestr('OEBPS/content.opf', (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="id">'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>نمونه</dc:title>'
+            '<dc:identifier id="id">sample</dc:identifier><dc:language>fa</dc:language></metadata>'
+            f'<manifest>{"".join(items)}</manifest><spine>{"".join(spine)}</spine></package>'
+        ))
+    return buf.getvalue()
+
+
+BUILDERS = {'txt': build_txt, 'docx': build_docx, 'epub': build_epub}
+
+
+class Command(BaseCommand):
+    help = 'بنچمارک سرعت وارد کردن متن کتاب (EPUB / DOCX / TXT)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chapters', type=int, default=200)
+        parser.add_argument('--paragraphs', type=int, default=60, help='پاراگراف در هر فصل')
+        parser.add_argument('--formats', nargs='*', default=list(BUILDERS), choices=list(BUILDERS))
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--save', help='فقط فایل‌های نمونه را در این پوشه بنویس')
+
+    def handle(self, *args, **options):
+        book = sample_book(options['chapters'], options['paragraphs'])
+
+        if options['save']:
+            folder = Path(options['save'])
+            folder.mkdir(parents=True, exist_ok=True)
+            for fmt in options['formats']:
+                (folder / f'sample.{fmt}').write_bytes(BUILDERS[fmt](book))
+                self.stdout.write(f'wrote {folder / f"sample.{fmt}"}')
+            return
+
+        self.stdout.write(
+            f'{"format":<6} {"size":>8} {"pages":>7} {"parse":>8} {"write":>8} {"pages/min":>11} {"re-import":>10}'
+        )
+        for fmt in options['formats']:
+            data   = BUILDERS[fmt](book)
+            target = Book.objects.create(title=f'benchmark {fmt}', slug=f'benchmark-import-{fmt}-{time.time_ns()}', author='-')
+            try:
+                start    = time.perf_counter()
+                chapters = parse_book(f'book.{fmt}', data)
+                parsed   = time.perf_counter() - start
+                stats    = import_book_content(target, chapters, batch_size=options['batch_size'])
+                total    = time.perf_counter() - start
+                ids      = list(BookPage.objects.filter(book=target).order_by('order').values_list('pk', flat=True))
+
+                again  = time.perf_counter()
+                second = import_book_content(target, parse_book(f'book.{fmt}', data), batch_size=options['batch_size'])
+                again  = time.perf_counter() - again
+                same   = list(BookPage.objects.filter(book=target).order_by('order').values_list('pk', flat=True)) == ids
+                if not same or second['removed_pages'] or second['pages'] != stats['pages']:
+                    raise CommandError(f'{fmt}: re-import changed the page set')
+
+                self.stdout.write(
+                    f'{fmt:<6} {len(data) / 1024:>6.0f}KB {stats["pages"]:>7} {parsed:>7.2f}s '
+                    f'{total - parsed:>7.2f}s {stats["pages"] / total * 60:>11,.0f} {again:>9.2f}s'
+                )
+            finally:
+                target.delete()
@@ -0,0 +1,71 @@
+"""
+book/management/commands/import_book_content.py
+وارد کردن متن کامل یک کتاب از EPUB / DOCX / TXT (فصل‌ها و صفحه‌ها)
+
+کتاب باید از قبل در admin ساخته شده باشد. اجرای دوباره با همان فایل یا نسخه اصلاح‌شده
+محتوای قبلی را بازنویسی می‌کند (book/ingest.py).
+
+    python manage.py import_book_content <slug یا id> book.epub
+    python manage.py import_book_content 12 book.txt --page-chars 1500 --dry-run
+"""
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from book.ingest import IngestError, import_book_content, paginate, parse_book
+from book.models import Book
+
+
+class Command(BaseCommand):
+    help = 'وارد کردن متن کامل کتاب از فایل EPUB / DOCX / TXT'
+
+    def add_arguments(self, parser):
+        parser.add_argument('book', help='slug یا شناسه کتاب')
+        parser.add_argument('path', help='مسیر فایل .epub / .docx / .txt')
+        parser.add_argument('--page-chars', type=int, default=None, help='حدود نویسه هر صفحه (پیش‌فرض: BOOK_IMPORT_PAGE_CHARS)')
+        parser.add_argument('--batch-size', type=int, default=500, help='تعداد صفحه در هر تراکنش')
+        parser.add_argument('--dry-run', action='store_true', help='فقط تجزیه و گزارش، بدون نوشتن')
+
+    def handle(self, *args, **options):
+        lookup = {'pk': options['book']} if options['book'].isdigit() else {'slug': options['book']}
+        try:
+            book = Book.objects.get(**lookup)
+        except Book.DoesNotExist:
+            raise CommandError(f'کتاب {options["book"]} پیدا نشد')
+
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'فایل {path} وجود ندارد')
+
+        start = time.perf_counter()
+        try:
+            chapters = parse_book(path.name, path.read_bytes())
+        except IngestError as e:
+            raise CommandError(str(e))
+        parsed = time.perf_counter() - start
+        self.stdout.write(f'{book}: {len(chapters)} chapters parsed in {parsed:.2f}s')
+
+        if options['dry_run']:
+            page_chars = options['page_chars'] or getattr(settings, 'BOOK_IMPORT_PAGE_CHARS', 2000)
+            for title, blocks in chapters:
+                self.stdout.write(f'  {len(paginate(blocks, page_chars)):>5} pages  {title or "—"}')
+            return
+
+        def progress(done, total):
+            rate = done / (time.perf_counter() - start) * 60
+            self.stdout.write(f'\r  {done}/{total} pages ({done / max(total, 1):.0%})  {rate:,.0f} pages/min', ending='')
+            self.stdout.flush()
+
+        stats   = import_book_content(
+            book, chapters,
+            page_chars=options['page_chars'], batch_size=options['batch_size'], progress=progress,
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'chapters={stats["chapters"]} pages={stats["pages"]} '
+            f'removed_chapters={stats["removed_chapters"]} removed_pages={stats["removed_pages"]} '
+            f'in {elapsed:.2f}s ({stats["pages"] / elapsed * 60:,.0f} pages/min)'
+        ))
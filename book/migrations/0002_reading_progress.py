@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_order', models.PositiveIntegerField(default=1, verbose_name='آخرین صفحه (ترتیب)')),
+                ('percent', models.PositiveSmallIntegerField(default=0, verbose_name='درصد پیشرفت')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='آخرین مطالعه')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reading_progress', to='book.book', verbose_name='کتاب')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reading_progress', to=settings.AUTH_USER_MODEL, verbose_name='کاربر')),
+            ],
+            options={
+                'verbose_name': 'پیشرفت مطالعه',
+                'verbose_name_plural': 'پیشرفت\u200cهای مطالعه',
+                'indexes': [models.Index(fields=['user', '-updated_at'], name='reading_progress_recent')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'book'), name='unique_reading_progress')],
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 # ══════════════════════════════════════════════════════════════════════════
@@ -214,4 +216,42 @@ class BookPage(models.Model):
     def prev_page(self):
         return BookPage.objects.filter(
             book=self.book, order=self.order - 1
-        ).first()
\ No newline at end of file
+        ).first()
+
+
+# ══════════════════════════════════════════════════════════════════════════
+#  پیشرفت مطالعه  (آخرین صفحه هر کاربر در هر کتاب — بین دستگاه‌ها)
+# ══════════════════════════════════════════════════════════════════════════
+
+class ReadingProgress(models.Model):
+    """
+    با book/progress.py نوشته می‌شود: beacon خواننده در بافر پردازه جمع و دسته‌ای upsert می‌شود
+    updated_at زمان خواندن است نه زمان flush، پس auto_now ندارد
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='reading_progress',
+        verbose_name="کاربر"
+    )
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE,
+        related_name='reading_progress',
+        verbose_name="کتاب"
+    )
+    last_order = models.PositiveIntegerField(default=1, verbose_name="آخرین صفحه (ترتیب)")
+    percent    = models.PositiveSmallIntegerField(default=0, verbose_name="درصد پیشرفت")
+    updated_at = models.DateTimeField(default=timezone.now, verbose_name="آخرین مطالعه")
+
+    class Meta:
+        verbose_name        = "پیشرفت مطالعه"
+        verbose_name_plural = "پیشرفت‌های مطالعه"
+        constraints         = [
+            models.UniqueConstraint(fields=['user', 'book'], name='unique_reading_progress'),
+        ]
+        indexes             = [
+            # قفسه «ادامه مطالعه» پروفایل
+            models.Index(fields=['user', '-updated_at'], name='reading_progress_recent'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} — {self.book} ({self.percent}٪)"
@@ -0,0 +1,156 @@
+"""
+book/progress.py
+پیشرفت مطالعه با نوشتن دسته‌ای (ReadingProgress)
+
+خواننده (static/js/book-reader.js) آخرین صفحه را با beacon و debounce می‌فرستد و view فقط آن را در
+بافر همین پردازه می‌گذارد؛ ورق زدن‌های پشت‌سرهم یک کاربر در یک کتاب یک ردیف می‌شوند و بافر با یک
+INSERT ... ON CONFLICT DO UPDATE (bulk_create با update_conflicts) روی (user, book) نوشته می‌شود.
+
+    record(user_id, book_id, order, percent)   # view beacon؛ flush خودکار با اندازه یا سن بافر
+    flush()                                    # worker_exit گونیکورن، پیش از قفسه پروفایل
+    buffer.start()                             # post_worker_init گونیکورن: flush دوره‌ای در thread
+
+  - READING_PROGRESS_FLUSH_SIZE     حداکثر ردیف در بافر (پیش‌فرض 200)
+  - READING_PROGRESS_FLUSH_SECONDS  حداکثر سن قدیمی‌ترین ردیف بافر (پیش‌فرض 10)
+
+thread پس‌زمینه هر ثانیه سن بافر را بررسی می‌کند، پس ادامه مطالعه روی دستگاه دیگر (که به worker
+دیگری می‌رسد) حداکثر حدود FLUSH_SECONDS ثانیه عقب است. بدون آن (runserver) بافر فقط با beacon بعدی،
+خواندن قفسه یا خروج پردازه نوشته می‌شود. اگر نوشتن با خطای دیتابیس شکست بخورد، ردیف‌ها به بافر
+برمی‌گردند و beacon همچنان 204 می‌گیرد.
+
+هزینه: با از کار افتادن ناگهانی پردازه حداکثر چند ثانیه پیشرفت از دست می‌رود، و اگر beaconهای
+یک کاربر به دو worker برسند، flush دیرتر برنده است حتی اگر قدیمی‌تر باشد.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import Book, ReadingProgress
+
+logger = logging.getLogger(__name__)
+
+UPDATE_FIELDS = ['last_order', 'percent', 'updated_at']
+
+
+class ProgressBuffer:
+
+    def __init__(self):
+        self._lock  = threading.Lock()
+        self._rows  = {}      # (user_id, book_id) → (order, percent, زمان خواندن)
+        self._since = None    # time.monotonic() اولین ردیف بافر
+        self._stop  = threading.Event()
+
+    def add(self, user_id: int, book_id: int, order: int, percent: int, at=None):
+        size = getattr(settings, 'READING_PROGRESS_FLUSH_SIZE', 200)
+        with self._lock:
+            self._rows[(user_id, book_id)] = (order, percent, at or timezone.now())
+            if self._since is None:
+                self._since = time.monotonic()
+            due = len(self._rows) >= size or self._expired()
+        if due:
+            self._safe_flush()
+
+    def _expired(self) -> bool:
+        seconds = getattr(settings, 'READING_PROGRESS_FLUSH_SECONDS', 10)
+        return self._since is not None and time.monotonic() - self._since >= seconds
+
+    def _safe_flush(self):
+        try:
+            self.flush()
+        except DatabaseError:
+            # ردیف‌ها به بافر برگشته‌اند و flush بعدی دوباره تلاش می‌کند
+            logger.warning('reading progress flush failed', exc_info=True)
+
+    def start(self, interval: float = 1.0):
+        """thread پس‌زمینه flush بر اساس سن بافر — یک بار در هر worker (بعد از fork)"""
+        self._stop.clear()
+        threading.Thread(target=self._run, args=(interval,), name='reading-progress-flush', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            with self._lock:
+                due = self._expired()
+            if due:
+                self._safe_flush()
+                connection.close()     # اتصال همین thread
+
+    def pending(self, user_id: int) -> dict:
+        """book_id → (order, percent, زمان) برای ردیف‌های نوشته‌نشده همین کاربر"""
+        with self._lock:
+            return {book_id: row for (uid, book_id), row in self._rows.items() if uid == user_id}
+
+    def _take(self) -> dict:
+        with self._lock:
+            rows, self._rows, self._since = self._rows, {}, None
+        return rows
+
+    def _restore(self, rows: dict):
+        """برگرداندن ردیف‌های نوشته‌نشده؛ ردیفی که در این فاصله تازه‌تر رسیده برنده است"""
+        with self._lock:
+            for key, row in rows.items():
+                self._rows.setdefault(key, row)
+            if self._rows and self._since is None:
+                self._since = time.monotonic()
+
+    def flush(self) -> int:
+        rows = self._take()
+        if not rows:
+            return 0
+        # ترتیب ثابت کلیدها تا flush همزمان دو worker روی PostgreSQL بن‌بست نسازد
+        objs = [
+            ReadingProgress(user_id=user_id, book_id=book_id, last_order=order, percent=percent, updated_at=at)
+            for (user_id, book_id), (order, percent, at) in sorted(rows.items())
+        ]
+        try:
+            try:
+                _upsert(objs)
+            except IntegrityError:
+                # کاربر یا کتابی در این فاصله حذف شده؛ بقیه ردیف‌ها نوشته شوند
+                from account.models import User
+                users = set(User.objects.filter(pk__in={o.user_id for o in objs}).values_list('pk', flat=True))
+                books = set(Book.objects.filter(pk__in={o.book_id for o in objs}).values_list('pk', flat=True))
+                objs  = [o for o in objs if o.user_id in users and o.book_id in books]
+                _upsert(objs)
+        except DatabaseError:
+            self._restore(rows)
+            raise
+        return len(objs)
+
+
+def _upsert(objs: list):
+    with transaction.atomic():
+        ReadingProgress.objects.bulk_create(
+            objs, update_conflicts=True, unique_fields=['user', 'book'], update_fields=UPDATE_FIELDS,
+        )
+
+
+buffer = ProgressBuffer()
+record = buffer.add
+flush  = buffer.flush
+
+
+def last_order(user, book) -> int | None:
+    """صفحه ادامه مطالعه؛ اول بافر همین پردازه، بعد دیتابیس"""
+    row = buffer.pending(user.pk).get(book.pk)
+    if row:
+        return row[0]
+    return ReadingProgress.objects.filter(user=user, book=book).values_list('last_order', flat=True).first()
+
+
+def continue_reading(user, limit: int = 6) -> list:
+    """قفسه «ادامه مطالعه» پروفایل — یک کوئری؛ ردیف‌های بافر این کاربر پیش از آن نوشته می‌شوند"""
+    if buffer.pending(user.pk):
+        flush()
+    return list(
+        ReadingProgress.objects.filter(user=user, book__is_active=True)
+        .select_related('book')
+        .only('last_order', 'percent', 'updated_at', 'book__title', 'book__slug', 'book__author', 'book__cover_image')
+        .order_by('-updated_at')[:limit]
+    )
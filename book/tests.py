@@ -1,3 +1,149 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from account.models import User
+
+from . import progress
+from .models import Book, BookPage, ReadingProgress
+
+
+class ReadingProgressTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user  = User.objects.create(phone_number='09120000001')
+        cls.other = User.objects.create(phone_number='09120000002')
+        cls.books = [
+            Book.objects.create(title=f'کتاب {i}', slug=f'book-{i}', author='نویسنده') for i in range(3)
+        ]
+        for order in range(1, 11):
+            BookPage.objects.create(book=cls.books[0], page_number=str(order), order=order, content='متن')
+
+    def setUp(self):
+        progress.buffer._take()
+        self.addCleanup(progress.buffer._take)
+
+    def test_flips_coalesce_into_one_upsert(self):
+        for order in range(1, 8):
+            progress.record(self.user.pk, self.books[0].pk, order, order * 10)
+        progress.record(self.other.pk, self.books[0].pk, 2, 20)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(progress.flush(), 2)
+        self.assertEqual(len([q for q in queries if 'SAVEPOINT' not in q['sql']]), 1)
+        row = ReadingProgress.objects.get(user=self.user, book=self.books[0])
+        self.assertEqual((row.last_order, row.percent), (7, 70))
+
+        progress.record(self.user.pk, self.books[0].pk, 3, 30)
+        progress.flush()
+        row.refresh_from_db()
+        self.assertEqual(row.last_order, 3)
+        self.assertEqual(ReadingProgress.objects.count(), 2)
+
+    @override_settings(READING_PROGRESS_FLUSH_SIZE=2)
+    def test_flushes_when_buffer_is_full(self):
+        progress.record(self.user.pk, self.books[0].pk, 1, 10)
+        self.assertFalse(ReadingProgress.objects.exists())
+        progress.record(self.user.pk, self.books[1].pk, 1, 10)
+        self.assertEqual(ReadingProgress.objects.count(), 2)
+        self.assertEqual(progress.buffer.pending(self.user.pk), {})
+
+    def test_beacon_only_buffers(self):
+        self.client.force_login(self.user)
+        url = reverse('books:book_progress', args=[self.books[0].slug])
+        response = self.client.post(url, {'order': 4, 'total': 10})
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(ReadingProgress.objects.exists())
+        self.assertEqual(progress.buffer.pending(self.user.pk)[self.books[0].pk][:2], (4, 40))
+
+        self.assertEqual(self.client.post(url, {'order': 'x'}).status_code, 400)
+        self.assertEqual(self.client.post(url, {'order': 0}).status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.client.post(url, {'order': 4}).status_code, 403)
+
+    def test_reader_resumes_from_saved_page(self):
+        ReadingProgress.objects.create(user=self.user, book=self.books[0], last_order=6, percent=60)
+        self.client.force_login(self.user)
+        url = reverse('books:book_reader', args=[self.books[0].slug])
+        self.assertEqual(self.client.get(url).context['page_order'], 6)
+        self.assertEqual(self.client.get(url + '?page=2').context['page_order'], 2)
+
+        progress.record(self.user.pk, self.books[0].pk, 8, 80)     # هنوز در بافر
+        self.assertEqual(self.client.get(url).context['page_order'], 8)
+
+    def test_continue_reading_is_one_query(self):
+        for i, book in enumerate(self.books):
+            progress.record(self.user.pk, book.pk, i + 1, (i + 1) * 10)
+        progress.flush()
+        progress.record(self.user.pk, self.books[0].pk, 9, 90)
+
+        shelf = progress.continue_reading(self.user)     # بافر این کاربر اول نوشته می‌شود
+        self.assertEqual(shelf[0].book, self.books[0])
+        self.assertEqual(shelf[0].last_order, 9)
+        with self.assertNumQueries(1):
+            shelf = progress.continue_reading(self.user)
+            self.assertEqual([item.book.title for item in shelf], [b.title for b in (self.books[0], self.books[2], self.books[1])])
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('account:profile'))
+        self.assertContains(response, 'ادامه مطالعه')
+        self.assertContains(response, '?page=9')
+
+    @override_settings(READING_PROGRESS_FLUSH_SIZE=1)
+    def test_failed_write_keeps_rows_buffered(self):
+        self.client.force_login(self.user)
+        url = reverse('books:book_progress', args=[self.books[0].slug])
+        with mock.patch('book.progress._upsert', side_effect=OperationalError('database is locked')), \
+                self.assertLogs('book.progress', 'WARNING'):
+            self.assertEqual(self.client.post(url, {'order': 5, 'total': 10}).status_code, 204)
+        self.assertEqual(progress.buffer.pending(self.user.pk)[self.books[0].pk][:2], (5, 50))
+
+        progress.flush()
+        self.assertEqual(ReadingProgress.objects.get().last_order, 5)
+
+    def test_restore_does_not_override_newer_rows(self):
+        progress.record(self.user.pk, self.books[0].pk, 2, 20)
+        progress.record(self.user.pk, self.books[1].pk, 2, 20)
+        taken = progress.buffer._take()
+        progress.record(self.user.pk, self.books[0].pk, 3, 30)     # beacon تازه‌تر در حین نوشتن
+        progress.buffer._restore(taken)
+        pending = progress.buffer.pending(self.user.pk)
+        self.assertEqual((pending[self.books[0].pk][0], pending[self.books[1].pk][0]), (3, 2))
+
+
+class ReadingProgressFlushTests(TransactionTestCase):
+    """کلید خارجی‌ها deferred هستند؛ خطا فقط با commit واقعی دیده می‌شود"""
+
+    def setUp(self):
+        progress.buffer._take()
+        self.addCleanup(progress.buffer._take)
+
+    def test_rows_of_deleted_books_are_dropped(self):
+        user = User.objects.create(phone_number='09120000003')
+        kept, gone = (Book.objects.create(title=slug, slug=slug, author='-') for slug in ('kept', 'gone'))
+        progress.record(user.pk, kept.pk, 4, 40)
+        progress.record(user.pk, gone.pk, 1, 10)
+        gone.delete()
+        self.assertEqual(progress.flush(), 1)
+        self.assertEqual(ReadingProgress.objects.get().book, kept)
+
+    @override_settings(READING_PROGRESS_FLUSH_SECONDS=60)
+    def test_background_thread_flushes_old_rows(self):
+        user = User.objects.create(phone_number='09120000004')
+        book = Book.objects.create(title='b', slug='b', author='-')
+        progress.record(user.pk, book.pk, 7, 70)
+        self.assertFalse(ReadingProgress.objects.exists())
+
+        progress.buffer._since -= 61            # قدیمی‌ترین ردیف از FLUSH_SECONDS گذشته؛ beacon دیگری نمی‌رسد
+        progress.buffer.start(interval=0.01)
+        self.addCleanup(progress.buffer.stop)
+        deadline = time.monotonic() + 5
+        while not ReadingProgress.objects.filter(user=user).exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        progress.buffer.stop()
+        self.assertEqual(ReadingProgress.objects.get(user=user).last_order, 7)
@@ -8,5 +8,6 @@ urlpatterns = [
     re_path(r'^category/(?P<slug>[^/]+)/$',               views.books_by_category, name='books_by_category'),
     re_path(r'^(?P<slug>[^/]+)/read/$',                   views.book_reader,       name='book_reader'),
     re_path(r'^(?P<slug>[^/]+)/page-api/$',               views.book_page_api,     name='book_page_api'),
+    re_path(r'^(?P<slug>[^/]+)/progress/$',               views.book_progress,     name='book_progress'),
     re_path(r'^(?P<slug>[^/]+)/$',                        views.book_detail,       name='book_detail'),
 ]
\ No newline at end of file
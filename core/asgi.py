@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+    DJANGO_ENV=production GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker gunicorn core.asgi
+
+viewهای async (OTP، پرداخت، صوت) در event loop worker منتظر شبکه می‌مانند؛ بقیه viewها sync
+هستند و Django هر کدام را در thread جدا اجرا می‌کند.
 """
 
 import os
@@ -12,5 +17,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('DJANGO_ASGI', '1')
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.TEMPLATE_WARMUP:
+    from main.warmup import warm_up  # noqa: E402
+    warm_up()
@@ -0,0 +1,24 @@
+"""
+core/settings
+تنظیمات لایه‌ای: base.py (مشترک) + یکی از پروفایل‌ها بر اساس DJANGO_ENV
+
+    DJANGO_ENV=development (پیش‌فرض) → dev.py   SQLite، DEBUG
+    DJANGO_ENV=production             → prod.py  PostgreSQL، cached loader، استاتیک hash‌دار
+
+DJANGO_SETTINGS_MODULE همان core.settings می‌ماند؛ core.settings.prod و core.settings.dev
+هم مستقیم قابل استفاده‌اند.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+
+DJANGO_ENV = os.getenv('DJANGO_ENV', 'development')
+
+if DJANGO_ENV == 'production':
+    from .prod import *  # noqa: F401,F403
+elif DJANGO_ENV == 'development':
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(f"DJANGO_ENV باید development یا production باشد، نه {DJANGO_ENV!r}")
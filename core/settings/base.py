@@ -0,0 +1,284 @@
+"""
+Django settings for core project — تنظیمات مشترک همه پروفایل‌ها (core/settings/__init__.py)
+
+Generated by 'django-admin startproject' using Django 5.2.7.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.2/ref/settings/
+"""
+
+from pathlib import Path
+import os
+from dotenv import load_dotenv
+import sys
+
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+env_file = BASE_DIR / '.env'
+load_dotenv(env_file)
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+
+def env_bool(name, default=False):
+    return os.getenv(name, str(default)).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# SECURITY WARNING: don't run with debug turned on in production!
+# (dev.py روشن می‌کند)
+DEBUG = False
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'django-insecure-q@ph-9a@t=9-%+ube&7rosrum@49oi_=assz2)b95x7h@!nd5-')
+
+ALLOWED_HOSTS = [h.strip() for h in os.getenv('DJANGO_ALLOWED_HOSTS', '').split(',') if h.strip()]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
+    'main.apps.MainConfig',
+    'account.apps.AccountConfig',
+    'purchase.apps.PurchaseConfig',
+    'book.apps.BookConfig',
+    'podcast.apps.PodcastConfig',
+    'blog.apps.BlogConfig',
+    'course.apps.CourseConfig',
+]
+
+MIDDLEWARE = [
+    'main.metrics.MetricsMiddleware',
+    'main.instrumentation.InstrumentationMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'main.staticfiles.AsyncWhiteNoiseMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'core.urls'
+
+# قالب‌ها در هر درخواست از دیسک خوانده می‌شوند (ویرایش و رفرش)؛ prod.py آن‌ها را در
+# cached loader می‌پیچد تا هر قالب یک بار در هر پردازه کامپایل شود (main/warmup.py)
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'main.context_processors.site_settings',
+            ],
+            'loaders': TEMPLATE_LOADERS,
+        },
+    },
+]
+
+# کامپایل همه قالب‌ها هنگام بالا آمدن پردازه (core/wsgi.py)؛ با preload_app گونیکورن
+# یک بار در master انجام می‌شود و workerها بعد از fork قالب‌های آماده را به ارث می‌برند
+TEMPLATE_WARMUP = env_bool('DJANGO_TEMPLATE_WARMUP', False)
+
+WSGI_APPLICATION = 'core.wsgi.application'
+
+
+# Database: dev.py (SQLite) و prod.py (PostgreSQL)
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.2/topics/i18n/
+
+LANGUAGE_CODE = 'fa-ir'
+
+TIME_ZONE = 'Asia/Tehran'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
+
+# Static files (CSS, JavaScript, Images)
+STATIC_URL = '/static/'
+STATICFILES_DIRS = [
+    os.path.join(BASE_DIR, 'static'),  # Additional static files directories
+]
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # For production
+
+# prod.py: نام‌های hash‌دار + نسخه‌های .br/.gz (کش یک‌ساله WhiteNoise) — نیازمند collectstatic
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# باندل‌های هر صفحه ({% bundle 'reader' 'css' %}) — main/staticfiles.py
+STATIC_BUNDLES = {
+    'base':           {'css': ['vendor/fontawesome/css/icons.css', 'css/style.css'], 'js': ['js/main.js']},
+    'account':        {'css': ['vendor/fontawesome/css/icons.css', 'css/style.css', 'css/login.css']},
+    'profile':        {'css': ['css/profile.css']},
+    'books':          {'css': ['css/books.css'], 'js': ['js/books.js']},
+    'book-detail':    {'css': ['css/book-detail.css'], 'js': ['js/book-detail.js']},
+    'reader':         {'css': ['css/book-reader.css'], 'js': ['js/book-reader.js']},
+    'podcasts':       {'css': ['css/podcasts.css']},
+    'podcast-detail': {'css': ['css/podcasts.css', 'css/podcast-detail.css']},
+    'courses':        {'css': ['css/courses.css']},
+    'course-detail':  {'css': ['css/courses.css', 'css/course-detail.css']},
+    'lesson':         {'css': ['css/lesson.css']},
+    'support':        {'css': ['css/support.css']},
+}
+
+# CSS بحرانی هر صفحه (main/critical.py — manage.py build_critical_css)
+# نام → باندل‌های CSS صفحه و قالب‌هایی که واژگان selectorها از آن‌ها خوانده می‌شود
+CRITICAL_CSS_ENABLED = False   # prod.py روشن می‌کند
+CRITICAL_CSS = {
+    'base':           {'bundles': ['base'], 'templates': ['base.html']},
+    'home':           {'bundles': ['base'], 'templates': ['base.html', 'main/index.html']},
+    'support':        {'bundles': ['base', 'support'], 'templates': ['base.html', 'main/support.html']},
+    'profile':        {'bundles': ['base', 'profile'], 'templates': ['base.html', 'account/profile.html']},
+    'account':        {'bundles': ['account'], 'templates': ['account/base.html', 'account/login.html', 'account/verify.html']},
+    'books':          {'bundles': ['base', 'books'], 'templates': ['base.html', 'books/books.html', 'books/books_category.html']},
+    'book-detail':    {'bundles': ['base', 'book-detail'], 'templates': ['base.html', 'books/book_detail.html']},
+    'reader':         {'bundles': ['base', 'reader'], 'templates': ['base.html', 'books/book_reader.html']},
+    'podcasts':       {'bundles': ['base', 'podcasts'], 'templates': ['base.html', 'podcasts/podcasts.html']},
+    'podcast-detail': {'bundles': ['base', 'podcast-detail'], 'templates': ['base.html', 'podcasts/podcast_detail.html']},
+    'courses':        {'bundles': ['base', 'courses'], 'templates': ['base.html', 'courses/courses.html']},
+    'course-detail':  {'bundles': ['base', 'course-detail'], 'templates': ['base.html', 'courses/course_detail.html']},
+    'lesson':         {'bundles': ['base', 'lesson'], 'templates': ['base.html', 'courses/lesson_view.html']},
+}
+
+# Media files (User uploaded content)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# اگر تنظیم شود (مثلاً '/protected-media/')، فایل‌های محافظت‌شده با X-Accel-Redirect
+# به nginx سپرده می‌شوند؛ location متناظر باید internal و به MEDIA_ROOT اشاره کند
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+
+# لینک‌های امضاشده رسانه پولی (main/signing.py)
+# MEDIA_SIGNING_MODE: 'hmac' (بررسی در Django، با کاربر نشست) یا 'nginx' (ماژول secure_link)
+MEDIA_SIGNING_MODE    = os.getenv('MEDIA_SIGNING_MODE', 'hmac')
+MEDIA_SIGNING_KEY     = os.getenv('MEDIA_SIGNING_KEY', '')   # خالی = SECRET_KEY
+MEDIA_SIGNED_URL_TTL  = int(os.getenv('MEDIA_SIGNED_URL_TTL', 3600))
+
+# پردازش آفلاین رسانه (main/ffmpeg.py)
+FFMPEG_BINARY  = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+FFPROBE_BINARY = os.getenv('FFPROBE_BINARY', 'ffprobe')
+FFMPEG_THREADS = int(os.getenv('FFMPEG_THREADS', 0))   # 0 = همه هسته‌ها
+
+# نسخه سبک صوت پادکست‌ها (manage.py ingest_media)
+AUDIO_MOBILE_BITRATE = int(os.getenv('AUDIO_MOBILE_BITRATE', 64_000))
+AUDIO_LOUDNESS_LUFS  = float(os.getenv('AUDIO_LOUDNESS_LUFS', -16))
+
+# نسخه‌های کوچک‌شده تصاویر (main/images.py — manage.py build_image_derivatives)
+IMAGE_DERIVATIVE_WIDTHS  = (160, 320, 480, 768, 1200)
+IMAGE_DERIVATIVE_FORMATS = ('avif', 'webp')
+
+# کش HTML کارت‌های کاتالوگ (main/templatetags/card_tags.py)
+# کلید با updated_at ردیف عوض می‌شود؛ timeout فقط سقف تازگی داده‌های بیرون از ردیف است
+# (نسخه‌های تازه‌ساخته تصویر، شمارنده پخش)
+CARD_CACHE_ENABLED = True
+CARD_CACHE_TIMEOUT = 15 * 60
+
+# وارد کردن متن کامل کتاب (book/ingest.py — manage.py import_book_content)
+# حدود نویسه هر صفحه؛ صفحه‌ها در مرز پاراگراف شکسته می‌شوند
+BOOK_IMPORT_PAGE_CHARS = 2000
+
+# پیشرفت مطالعه (book/progress.py): beaconها در بافر هر پردازه جمع و دسته‌ای upsert می‌شوند
+READING_PROGRESS_FLUSH_SIZE    = 200   # ردیف
+READING_PROGRESS_FLUSH_SECONDS = 10    # سن قدیمی‌ترین ردیف بافر
+
+# sitemap.xml و فید RSS پادکست (main/conditional.py)
+# کلید کش با نسخه محتوا عوض می‌شود؛ timeout فقط نسخه‌های قدیمی را پاک می‌کند.
+# max-age مدتی است که CDN / کلاینت بدون پرسیدن دوباره از نسخه خود استفاده می‌کند
+XML_CACHE_TIMEOUT = 24 * 3600
+XML_CACHE_MAX_AGE = 15 * 60
+PODCAST_ITUNES_CATEGORY = 'Religion & Spirituality'   # از فهرست دسته‌های Apple Podcasts
+
+# اندازه‌گیری هزینه هر درخواست (main/instrumentation.py)
+INSTRUMENTATION_SAMPLE_RATE   = float(os.getenv('INSTRUMENTATION_SAMPLE_RATE', 1.0))
+INSTRUMENTATION_SLOW_MS       = int(os.getenv('INSTRUMENTATION_SLOW_MS', 500))
+INSTRUMENTATION_SERVER_TIMING = 'staff'   # True = برای همه (dev.py)
+
+# متریک‌های Prometheus در /metrics (main/metrics.py)؛ بدون توکن فقط staff می‌بیند
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# اجرا زیر ASGI (uvicorn) — core/asgi.py متغیر DJANGO_ASGI=1 را پیش از بارگذاری تنظیمات می‌گذارد.
+# viewهای I/O محور (OTP، شروع و callback پرداخت، صوت) async هستند و تماس بیرونی‌شان با
+# main/httpclient.py است؛ زیر ASGI کلاینت و اتصال‌های keep-alive بین درخواست‌ها مشترک می‌مانند
+ASGI = env_bool('DJANGO_ASGI', False)
+HTTP_CLIENT_TIMEOUT         = 10     # ثانیه
+HTTP_CLIENT_MAX_CONNECTIONS = 200    # سقف تماس بیرونی همزمان در هر worker
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# USER AUTH MODEL
+AUTH_USER_MODEL = 'account.User'
+
+# SMS.ir Configuration
+SMSIR_API_KEY = '8Ca4PBnyrDH6t9mQapjjB8eFsU8z6iBxEg0ExI33uaJl6hnlfyvePAKzSwd7XDkt'
+SMSIR_TEMPLATE_ID = 830439  # شناسه قالب OTP در sms.ir
+
+
+ZARINPAL_MERCHANT_ID = 'XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX'  # از پنل زرین‌پال
+ZARINPAL_SANDBOX     = True   # در production به False تغییر دهید
+
+
+
+# OTP Settings
+OTP_EXPIRY_MINUTES = 2
+OTP_LENGTH = 5
+
+LOGIN_URL = '/login/'
+LOGIN_REDIRECT_URL = '/profile/'
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+core/settings/dev.py
+پروفایل توسعه: DEBUG، SQLite، قالب‌ها و استاتیک بدون کش
+"""
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR
+
+DEBUG = True
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+        }
+    }
+}
+
+INSTRUMENTATION_SERVER_TIMING = True
@@ -0,0 +1,85 @@
+"""
+core/settings/prod.py
+پروفایل production: PostgreSQL با اتصال ماندگار، cached loader، استاتیک hash‌دار و CSS بحرانی
+
+متغیرهای محیطی لازم: DJANGO_SECRET_KEY, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST
+اتصال دیتابیس (همه اختیاری):
+    DB_CONN_MAX_AGE=60            عمر اتصال ماندگار (ثانیه)؛ 0 = اتصال تازه در هر درخواست
+                                  زیر ASGI پیش‌فرض 0 است (هر درخواست thread خودش را دارد و اتصال
+                                  ماندگار نشت می‌کند)؛ pool را به PgBouncer بسپارید
+    DB_CONN_HEALTH_CHECKS=1       بررسی سلامت اتصال ماندگار در شروع هر درخواست
+    DB_STATEMENT_TIMEOUT_MS=30000 سقف زمان هر کوئری؛ 0 = بدون سقف
+    DB_CONNECT_TIMEOUT=5
+    DB_SSLMODE=disable
+    DB_PGBOUNCER=0                PgBouncer در حالت transaction pooling (پایین را ببینید)
+"""
+import importlib.util
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import ASGI, STORAGES, TEMPLATE_LOADERS, TEMPLATES, env_bool
+
+DEBUG = False
+
+required_env_vars = ['DJANGO_SECRET_KEY', 'DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST']
+missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+if missing_vars:
+    raise Exception(f"Requirement env vars: {', '.join(missing_vars)}")
+
+
+# ── دیتابیس ──────────────────────────────────────────────────────────────
+# PgBouncer (pool_mode = transaction): هر تراکنش ممکن است روی اتصال سرور دیگری برود، پس
+#   - server-side cursor (که بین تراکنش‌ها باز می‌ماند) خاموش می‌شود
+#   - statement_timeout به‌صورت پارامتر startup فرستاده نمی‌شود (PgBouncer آن را رد می‌کند)؛
+#     باید روی نقش دیتابیس تنظیم شود: ALTER ROLE <user> SET statement_timeout = '30s'
+#   - prepared statementهای psycopg 3 خاموش می‌شوند
+DB_PGBOUNCER            = env_bool('DB_PGBOUNCER', False)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30_000))
+
+_db_options = {
+    'sslmode':         os.getenv('DB_SSLMODE', 'disable'),
+    'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+}
+if DB_STATEMENT_TIMEOUT_MS and not DB_PGBOUNCER:
+    _db_options['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+if DB_PGBOUNCER and importlib.util.find_spec('psycopg'):
+    _db_options['prepare_threshold'] = None
+
+DATABASES = {
+    'default': {
+        'ENGINE':             'django.db.backends.postgresql',
+        'NAME':               os.getenv('DB_NAME'),
+        'USER':               os.getenv('DB_USER'),
+        'PASSWORD':           os.getenv('DB_PASSWORD'),
+        'HOST':               os.getenv('DB_HOST'),
+        'PORT':               os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE':       int(os.getenv('DB_CONN_MAX_AGE', 0 if ASGI else 60)),
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+        # .iterator() روی querysetهای بزرگ (خروجی‌ها) با server-side cursor کار می‌کند مگر پشت PgBouncer
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER or env_bool('DB_DISABLE_SERVER_SIDE_CURSORS', False),
+        'OPTIONS':            _db_options,
+    }
+}
+
+
+# ── قالب‌ها، استاتیک، warm-up ───────────────────────────────────────────
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'OPTIONS': {**TEMPLATES[0]['OPTIONS'], 'loaders': [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]},
+}]
+
+TEMPLATE_WARMUP = env_bool('DJANGO_TEMPLATE_WARMUP', True)
+
+STORAGES = {
+    **STORAGES,
+    'staticfiles': {
+        'BACKEND': 'main.staticfiles.BundledManifestStaticFilesStorage',
+    },
+}
+
+CRITICAL_CSS_ENABLED = True
+
+
+# ── اندازه‌گیری درخواست‌ها (main/instrumentation.py) ─────────────────────
+# کوئری / کش / قالب فقط در ۵٪ درخواست‌ها شمرده می‌شود؛ هیستوگرام زمان همچنان همه را دارد
+INSTRUMENTATION_SAMPLE_RATE = float(os.getenv('INSTRUMENTATION_SAMPLE_RATE', 0.05))
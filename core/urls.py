@@ -18,6 +18,10 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from main.views import signed_media
+from main.sitemaps import sitemap_index, sitemap_section
+from main.instrumentation import instrumentation_stats
+from main.metrics import metrics_view
 
 admin.site.site_header = "پنل مدیریت سامانه جامع محبوب"
 admin.site.site_title  = "محبوب — مدیریت"
@@ -33,6 +37,17 @@ urlpatterns = [
     path('podcasts/', include('podcast.urls')),
     path('courses/',  include('course.urls')),
     path('purchase/', include('purchase.urls')),
+
+    # ── رسانه پولی با لینک امضاشده ────────────────────────────────────
+    path('media-signed/<path:path>', signed_media, name='signed_media'),
+
+    # ── sitemap (index + بخش‌ها، صفحه‌بندی با ?p=) ─────────────────────
+    path('sitemap.xml',           sitemap_index,   name='sitemap_index'),
+    path('sitemap-<section>.xml', sitemap_section, name='sitemap_section'),
+
+    # ── پایش: هیستوگرام‌های پردازه (staff) و Prometheus (توکن یا staff) ──
+    path('_instrumentation/', instrumentation_stats, name='instrumentation_stats'),
+    path('metrics',           metrics_view,          name='metrics'),
 ]
 
 if settings.DEBUG:
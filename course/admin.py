@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.db.models import Count, Sum
+from main.images import thumbnail_url
+from main.adminfilters import AutocompleteFilterMixin, AutocompleteListFilter
+from main.querybudget import QueryBudgetMixin
 from .models import CourseCategory, Course, CourseSection, CourseLesson
 
 
@@ -72,7 +75,7 @@ class LevelFilter(admin.SimpleListFilter):
 
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = (
         'cover_thumbnail', 'title', 'instructor', 'category',
         'level_badge', 'access_badge', 'price_display',
@@ -82,6 +85,7 @@ class CourseAdmin(admin.ModelAdmin):
     list_display_links = ('cover_thumbnail', 'title')
     list_editable      = ('is_featured', 'is_active')
     list_filter        = (AccessTypeFilter, LevelFilter, 'category', 'has_certificate', 'is_active', 'is_featured')
+    list_select_related = ('category',)
     search_fields      = ('title', 'instructor', 'short_desc')
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields    = ('views', 'enrollments', 'created_at', 'updated_at', 'cover_preview')
@@ -117,14 +121,14 @@ class CourseAdmin(admin.ModelAdmin):
         if obj.cover_image:
             return format_html(
                 '<img src="{}" style="width:70px;height:45px;object-fit:cover;border-radius:6px;"/>',
-                obj.cover_image.url
+                thumbnail_url(obj.cover_image, 160)
             )
         return format_html('<div style="width:70px;height:45px;background:#e9ecef;border-radius:6px;display:flex;align-items:center;justify-content:center;">🎬</div>')
     cover_thumbnail.short_description = 'کاور'
 
     def cover_preview(self, obj):
         if obj.cover_image:
-            return format_html('<img src="{}" style="max-height:200px;border-radius:8px;"/>', obj.cover_image.url)
+            return format_html('<img src="{}" style="max-height:200px;border-radius:8px;"/>', thumbnail_url(obj.cover_image, 480))
         return '—'
     cover_preview.short_description = 'پیش‌نمایش'
 
@@ -154,7 +158,7 @@ class CourseAdmin(admin.ModelAdmin):
     def price_display(self, obj):
         if obj.access_type == 'free':
             return format_html('<span style="color:#198754;font-weight:bold;">رایگان</span>')
-        return format_html('{:,} تومان', obj.final_price)
+        return format_html('{} تومان', f'{obj.final_price:,}')
     price_display.short_description = 'قیمت'
 
     def duration_display(self, obj):
@@ -181,16 +185,21 @@ class CourseSectionAdmin(admin.ModelAdmin):
     lessons_count.short_description = 'تعداد درس'
     lessons_count.admin_order_field = '_lessons'
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        Course.refresh_total_duration([form.instance.course_id])
+
 
 # ── درس ──────────────────────────────────────────────────────────────────
 
 @admin.register(CourseLesson)
-class CourseLessonAdmin(admin.ModelAdmin):
-    list_display  = ('title', 'section', 'lesson_type_badge', 'duration_display', 'is_preview', 'order')
+class CourseLessonAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
+    list_display  = ('title', 'section', 'lesson_type_badge', 'duration_display', 'hls_status', 'is_preview', 'order')
     list_editable = ('order', 'is_preview')
-    list_filter   = ('lesson_type', 'is_preview', 'section__course')
+    list_filter   = ('lesson_type', 'hls_status', 'is_preview', ('section__course', AutocompleteListFilter))
     search_fields = ('title', 'section__title', 'section__course__title')
     ordering      = ('section', 'order')
+    list_select_related = ('section__course',)
 
     fieldsets = (
         ('اطلاعات درس', {
@@ -199,7 +208,26 @@ class CourseLessonAdmin(admin.ModelAdmin):
         ('محتوا', {
             'fields': ('video_url', 'video_file', 'duration'),
         }),
+        ('پخش تطبیقی (HLS)', {
+            'fields': ('hls_status', 'hls_manifest', 'thumbnail', 'hls_error'),
+            'classes': ('collapse',),
+        }),
     )
+    readonly_fields = ('hls_status', 'hls_manifest', 'thumbnail', 'hls_error')
+    actions = ['requeue_hls']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if 'duration' in form.changed_data or 'section' in form.changed_data:
+            course_ids = {obj.section.course_id}
+            if change and 'section' in form.changed_data:
+                course_ids.add(CourseSection.objects.get(pk=form.initial['section']).course_id)
+            Course.refresh_total_duration(course_ids)
+
+    @admin.action(description='ساخت مجدد HLS برای درس‌های انتخاب‌شده')
+    def requeue_hls(self, request, queryset):
+        n = queryset.exclude(video_file='').update(hls_status=CourseLesson.ProcessingStatus.PENDING)
+        self.message_user(request, f'{n} درس در صف پردازش قرار گرفت.')
 
     def lesson_type_badge(self, obj):
         icons = {
@@ -0,0 +1,87 @@
+"""
+course/management/commands/transcode_lessons.py
+worker آفلاین تبدیل ویدیوی درس‌ها به HLS
+
+درس‌هایی که فایل ویدیوی جدید دارند (hls_status=pending) یکی‌یکی برداشته می‌شوند.
+چند نمونه از این worker می‌تواند همزمان اجرا شود (قفل با skip_locked).
+
+    python manage.py transcode_lessons           # حلقه دائمی (systemd service)
+    python manage.py transcode_lessons --once    # پردازش صف فعلی و خروج
+"""
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from course.models import Course, CourseLesson
+from course.transcoding import package_lesson
+
+logger = logging.getLogger(__name__)
+
+Status = CourseLesson.ProcessingStatus
+
+
+def claim_next():
+    """برداشتن یک درس از صف و علامت‌گذاری PROCESSING"""
+    with transaction.atomic():
+        lesson = (
+            CourseLesson.objects.select_for_update(skip_locked=True)
+            .filter(hls_status=Status.PENDING)
+            .order_by('pk')
+            .first()
+        )
+        if lesson:
+            lesson.hls_status = Status.PROCESSING
+            lesson.save(update_fields=['hls_status'])
+        return lesson
+
+
+def process(lesson) -> bool:
+    try:
+        result = package_lesson(lesson)
+    except Exception as e:
+        logger.exception('HLS packaging failed for lesson %s', lesson.pk)
+        CourseLesson.objects.filter(pk=lesson.pk).update(hls_status=Status.FAILED, hls_error=str(e)[:2000])
+        return False
+
+    updates = {
+        'hls_status':   Status.READY,
+        'hls_manifest': result['manifest'],
+        'thumbnail':    result['thumbnail'],
+        'hls_error':    '',
+    }
+    if not lesson.duration:
+        updates['duration'] = result['duration']
+    CourseLesson.objects.filter(pk=lesson.pk).update(**updates)
+    if 'duration' in updates:
+        Course.refresh_total_duration([lesson.section.course_id])
+    return True
+
+
+class Command(BaseCommand):
+    help = 'تبدیل ویدیوی درس‌ها به HLS چندکیفیتی (worker آفلاین)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='پردازش صف فعلی و خروج')
+        parser.add_argument('--sleep', type=int, default=30, help='فاصله بررسی صف وقتی خالی است (ثانیه)')
+        parser.add_argument('--requeue-failed', action='store_true', help='درس‌های خطادار را دوباره در صف بگذار')
+
+    def handle(self, *args, **options):
+        if options['requeue_failed']:
+            n = CourseLesson.objects.filter(hls_status=Status.FAILED).update(hls_status=Status.PENDING)
+            self.stdout.write(f'requeued={n}')
+
+        while True:
+            lesson = claim_next()
+            if lesson is None:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            started = time.monotonic()
+            ok = process(lesson)
+            self.stdout.write(
+                f"lesson={lesson.pk} {'ready' if ok else 'failed'} elapsed={time.monotonic() - started:.1f}s"
+            )
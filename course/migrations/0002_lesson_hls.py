@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courselesson',
+            name='hls_error',
+            field=models.TextField(blank=True, verbose_name='خطای پردازش'),
+        ),
+        migrations.AddField(
+            model_name='courselesson',
+            name='hls_manifest',
+            field=models.CharField(blank=True, max_length=255, verbose_name='فایل master.m3u8'),
+        ),
+        migrations.AddField(
+            model_name='courselesson',
+            name='hls_status',
+            field=models.CharField(choices=[('none', 'بدون پردازش'), ('pending', 'در صف پردازش'), ('processing', 'در حال پردازش'), ('ready', 'آماده'), ('failed', 'خطا')], default='none', max_length=12, verbose_name='وضعیت HLS'),
+        ),
+        migrations.AddField(
+            model_name='courselesson',
+            name='thumbnail',
+            field=models.ImageField(blank=True, upload_to='courses/thumbs/', verbose_name='تصویر بندانگشتی'),
+        ),
+        migrations.AddIndex(
+            model_name='courselesson',
+            index=models.Index(fields=['hls_status'], name='course_cour_hls_sta_2cf225_idx'),
+        ),
+    ]
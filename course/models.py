@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class CourseCategory(models.Model):
@@ -89,6 +90,22 @@ class Course(models.Model):
         h, m = divmod(self.total_duration, 60)
         return f"{h} ساعت {m} دقیقه" if h else f"{m} دقیقه"
 
+    @classmethod
+    def refresh_total_duration(cls, course_ids):
+        """total_duration (دقیقه، رو به بالا) = مجموع مدت درس‌ها — یک کوئری تجمیعی"""
+        course_ids = set(course_ids)
+        totals = dict(
+            CourseLesson.objects.filter(section__course_id__in=course_ids)
+            .values('section__course_id').annotate(total=models.Sum('duration'))
+            .values_list('section__course_id', 'total')
+        )
+        for course_id in course_ids:
+            minutes = ((totals.get(course_id) or 0) + 59) // 60
+            # updated_at هم عوض می‌شود تا کارت کش‌شده دوره (card_tags) نامعتبر شود
+            cls.objects.filter(pk=course_id).exclude(total_duration=minutes).update(
+                total_duration=minutes, updated_at=timezone.now(),
+            )
+
 
 class CourseSection(models.Model):
     """فصل / بخش داخل یک دوره"""
@@ -113,6 +130,13 @@ class CourseLesson(models.Model):
         TEXT     = 'text',     'متن'
         QUIZ     = 'quiz',     'آزمون'
 
+    class ProcessingStatus(models.TextChoices):
+        NONE       = 'none',       'بدون پردازش'
+        PENDING    = 'pending',    'در صف پردازش'
+        PROCESSING = 'processing', 'در حال پردازش'
+        READY      = 'ready',      'آماده'
+        FAILED     = 'failed',     'خطا'
+
     section     = models.ForeignKey(CourseSection, on_delete=models.CASCADE, related_name='lessons', verbose_name="بخش")
     title       = models.CharField(max_length=255, verbose_name="عنوان درس")
     lesson_type = models.CharField(max_length=10, choices=LessonType.choices, default=LessonType.VIDEO, verbose_name="نوع محتوا")
@@ -122,10 +146,41 @@ class CourseLesson(models.Model):
     is_preview  = models.BooleanField(default=False, verbose_name="پیش‌نمایش رایگان")
     order       = models.PositiveSmallIntegerField(default=0, verbose_name="ترتیب")
 
+    # ── پخش تطبیقی (HLS) — توسط manage.py transcode_lessons پر می‌شود ─────
+    hls_status   = models.CharField(max_length=12, choices=ProcessingStatus.choices, default=ProcessingStatus.NONE, verbose_name="وضعیت HLS")
+    hls_manifest = models.CharField(max_length=255, blank=True, verbose_name="فایل master.m3u8")
+    hls_error    = models.TextField(blank=True, verbose_name="خطای پردازش")
+    thumbnail    = models.ImageField(upload_to='courses/thumbs/', blank=True, verbose_name="تصویر بندانگشتی")
+
     class Meta:
         verbose_name = "درس"
         verbose_name_plural = "درس‌ها"
         ordering = ['order']
+        indexes  = [
+            models.Index(fields=['hls_status']),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_video_name = instance.__dict__.get('video_file')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # فایل ویدیوی جدید → در صف تبدیل به HLS
+        loaded = getattr(self, '_loaded_video_name', None)
+        if self.video_file and self.video_file.name != loaded and self.lesson_type == self.LessonType.VIDEO:
+            self.hls_status   = self.ProcessingStatus.PENDING
+            self.hls_manifest = ''
+            self.hls_error    = ''
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'hls_status', 'hls_manifest', 'hls_error'}
+        super().save(*args, **kwargs)
+        self._loaded_video_name = self.video_file.name if self.video_file else None
+
+    @property
+    def has_hls(self):
+        return self.hls_status == self.ProcessingStatus.READY and bool(self.hls_manifest)
\ No newline at end of file
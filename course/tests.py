@@ -1,3 +1,209 @@
-from django.test import TestCase
+import json
+import subprocess
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from main.ffmpeg import FFmpegError
+
+from .models import Course, CourseLesson, CourseSection
+from .transcoding import DEFAULT_RENDITIONS, _renditions, package_lesson
+
+Status = CourseLesson.ProcessingStatus
+
+
+class FakeFFmpeg:
+    """جایگزین subprocess.run: ffprobe خروجی json ثابت می‌دهد، فرمان‌های ffmpeg فقط ثبت می‌شوند"""
+
+    def __init__(self, width=1280, height=720, duration=95.6, audio=True, fail_on=None):
+        streams = [{'codec_type': 'video', 'width': width, 'height': height}]
+        if audio:
+            streams.append({'codec_type': 'audio'})
+        self.probe   = {'streams': streams, 'format': {'duration': str(duration), 'bit_rate': '2000000'}}
+        self.fail_on = fail_on
+        self.calls   = []
+
+    def __call__(self, cmd, **kwargs):
+        if cmd[0] == 'ffprobe':
+            return subprocess.CompletedProcess(cmd, 0, json.dumps(self.probe), '')
+        self.calls.append(cmd)
+        if self.fail_on and self.fail_on in cmd:
+            return subprocess.CompletedProcess(cmd, 1, '', 'Conversion failed!')
+        return subprocess.CompletedProcess(cmd, 0, '', '')
+
+    def option(self, cmd, name):
+        return cmd[cmd.index(name) + 1]
+
+
+class RenditionTests(SimpleTestCase):
+
+    def test_no_upscaling(self):
+        self.assertEqual([r[0] for r in _renditions(1080)], [240, 360, 480, 720])
+        self.assertEqual([r[0] for r in _renditions(480)], [240, 360, 480])
+        self.assertEqual([r[0] for r in _renditions(400)], [240, 360])
+
+    def test_tiny_source_gets_lowest_rendition(self):
+        self.assertEqual(_renditions(144), [DEFAULT_RENDITIONS[0]])
+
+    @override_settings(HLS_RENDITIONS=((540, 1_000_000, 96_000), (1080, 4_000_000, 128_000)))
+    def test_renditions_from_settings(self):
+        self.assertEqual([r[0] for r in _renditions(720)], [540])
+
+
+@override_settings(FFMPEG_BINARY='ffmpeg', FFPROBE_BINARY='ffprobe', FFMPEG_THREADS=2)
+class PackageLessonTests(SimpleTestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media  = Path(media.name)
+        settings    = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.lesson = mock.Mock(pk=7, video_file=mock.Mock(path='/videos/lesson.mp4'))
+
+    def package(self, fake):
+        with mock.patch('main.ffmpeg.subprocess.run', side_effect=fake):
+            return package_lesson(self.lesson)
+
+    def test_ladder_and_master_playlist(self):
+        fake   = FakeFFmpeg(width=1280, height=720, duration=95.6)
+        result = self.package(fake)
+
+        self.assertEqual(result, {
+            'manifest':  'courses/hls/7/master.m3u8',
+            'thumbnail': 'courses/hls/7/thumb.jpg',
+            'duration':  96,
+        })
+        *variants, thumb = fake.calls
+        self.assertEqual([fake.option(cmd, '-vf') for cmd in variants],
+                         ['scale=426:240', 'scale=640:360', 'scale=854:480', 'scale=1280:720'])
+
+        cmd = variants[1]
+        self.assertEqual(cmd[:5], ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y'])
+        self.assertEqual(fake.option(cmd, '-threads'), '2')
+        self.assertEqual(fake.option(cmd, '-b:v'), '800000')
+        self.assertEqual(fake.option(cmd, '-maxrate'), '856000')
+        self.assertEqual(fake.option(cmd, '-bufsize'), '1600000')
+        self.assertEqual(fake.option(cmd, '-force_key_frames'), 'expr:gte(t,n_forced*6)')
+        self.assertEqual(fake.option(cmd, '-b:a'), '96000')
+        self.assertTrue(cmd[-1].endswith('360p/index.m3u8'))
+        self.assertTrue(fake.option(cmd, '-hls_segment_filename').endswith('360p/seg_%04d.ts'))
+
+        self.assertEqual(fake.option(thumb, '-ss'), '5')
+        self.assertTrue(thumb[-1].endswith('thumb.jpg'))
+
+        master = (self.media / 'courses/hls/7/master.m3u8').read_text().splitlines()
+        self.assertEqual(master[:4], [
+            '#EXTM3U', '#EXT-X-VERSION:3',
+            '#EXT-X-STREAM-INF:BANDWIDTH=464000,RESOLUTION=426x240', '240p/index.m3u8',
+        ])
+        self.assertEqual(master[-2], '#EXT-X-STREAM-INF:BANDWIDTH=2928000,RESOLUTION=1280x720')
+
+    def test_silent_short_portrait_video(self):
+        fake = FakeFFmpeg(width=720, height=1280, duration=4, audio=False)
+        self.package(fake)
+        *variants, thumb = fake.calls
+        self.assertEqual(fake.option(variants[0], '-vf'), 'scale=136:240')
+        self.assertTrue(all('-an' in cmd and '-c:a' not in cmd for cmd in variants))
+        self.assertEqual(fake.option(thumb, '-ss'), '2.0')
+
+    def test_failure_keeps_previous_output(self):
+        previous = self.media / 'courses/hls/7/master.m3u8'
+        previous.parent.mkdir(parents=True)
+        previous.write_text('old')
+
+        with self.assertRaisesMessage(FFmpegError, 'Conversion failed!'):
+            self.package(FakeFFmpeg(fail_on='scale=854:480'))
+        self.assertEqual(previous.read_text(), 'old')
+        self.assertEqual([p.name for p in (self.media / 'courses/hls').iterdir()], ['7'])
+
+    def test_audio_only_file_is_rejected(self):
+        fake = FakeFFmpeg()
+        fake.probe['streams'] = [{'codec_type': 'audio'}]
+        with self.assertRaises(FFmpegError):
+            self.package(fake)
+        self.assertEqual(fake.calls, [])
+
+
+class LessonRequeueTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        course      = Course.objects.create(title='دوره', slug='course', instructor='مدرس')
+        cls.section = CourseSection.objects.create(course=course, title='فصل ۱')
+
+    def test_new_video_is_queued(self):
+        lesson = CourseLesson.objects.create(section=self.section, title='درس', video_file='courses/videos/a.mp4')
+        self.assertEqual(lesson.hls_status, Status.PENDING)
+
+    def test_unchanged_video_is_not_requeued(self):
+        lesson = CourseLesson.objects.create(section=self.section, title='درس', video_file='courses/videos/a.mp4')
+        CourseLesson.objects.filter(pk=lesson.pk).update(hls_status=Status.READY, hls_manifest='courses/hls/1/master.m3u8')
+
+        lesson = CourseLesson.objects.get(pk=lesson.pk)
+        lesson.title = 'درس ۱'
+        lesson.save()
+        lesson.refresh_from_db()
+        self.assertEqual((lesson.hls_status, lesson.hls_manifest), (Status.READY, 'courses/hls/1/master.m3u8'))
+
+    def test_replaced_video_is_requeued_with_update_fields(self):
+        lesson = CourseLesson.objects.create(section=self.section, title='درس', video_file='courses/videos/a.mp4')
+        CourseLesson.objects.filter(pk=lesson.pk).update(
+            hls_status=Status.READY, hls_manifest='courses/hls/1/master.m3u8', hls_error='قدیمی',
+        )
+
+        lesson = CourseLesson.objects.get(pk=lesson.pk)
+        lesson.video_file = 'courses/videos/b.mp4'
+        lesson.save(update_fields=['video_file'])
+        lesson.refresh_from_db()
+        self.assertEqual((lesson.hls_status, lesson.hls_manifest, lesson.hls_error), (Status.PENDING, '', ''))
+
+        # وضعیت PROCESSING در worker با update_fields ذخیره می‌شود و نباید دوباره صف شود
+        lesson.hls_status = Status.PROCESSING
+        lesson.save(update_fields=['hls_status'])
+        lesson.refresh_from_db()
+        self.assertEqual(lesson.hls_status, Status.PROCESSING)
+
+    def test_non_video_lessons_are_not_queued(self):
+        lesson = CourseLesson.objects.create(
+            section=self.section, title='صوت', lesson_type=CourseLesson.LessonType.AUDIO, video_file='courses/videos/a.mp3',
+        )
+        self.assertEqual(lesson.hls_status, Status.NONE)
+
+
+class TotalDurationTests(TestCase):
+
+    def test_minutes_round_up_per_course(self):
+        courses = [Course.objects.create(title=f'دوره {i}', slug=f'c-{i}', instructor='مدرس') for i in range(4)]
+        for course, durations in zip(courses, ([61, 59], [120], [1], [])):
+            section = CourseSection.objects.create(course=course, title='فصل')
+            for seconds in durations:
+                CourseLesson.objects.create(section=section, title='درس', lesson_type='text', duration=seconds)
+
+        Course.refresh_total_duration(c.pk for c in courses)
+        self.assertEqual(
+            list(Course.objects.order_by('slug').values_list('total_duration', flat=True)), [2, 2, 1, 0],
+        )
+
+    def test_unchanged_total_keeps_updated_at(self):
+        course  = Course.objects.create(title='دوره', slug='c', instructor='مدرس', total_duration=3)
+        section = CourseSection.objects.create(course=course, title='فصل')
+        CourseLesson.objects.create(section=section, title='درس', lesson_type='text', duration=150)
+        stamp = timezone.now() - timedelta(days=1)
+        Course.objects.filter(pk=course.pk).update(updated_at=stamp)
+
+        with self.assertNumQueries(2):
+            Course.refresh_total_duration([course.pk])
+        course.refresh_from_db()
+        self.assertEqual((course.total_duration, course.updated_at), (3, stamp))
+
+        CourseLesson.objects.filter(section=section).update(duration=181)
+        Course.refresh_total_duration([course.pk])
+        course.refresh_from_db()
+        self.assertEqual(course.total_duration, 4)
+        self.assertGreater(course.updated_at, stamp)
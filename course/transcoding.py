@@ -0,0 +1,114 @@
+"""
+course/transcoding.py
+بسته‌بندی ویدیوی درس‌ها به HLS با چند کیفیت + تصویر بندانگشتی (ffmpeg، فقط CPU)
+
+خروجی کنار درس در MEDIA_ROOT/courses/hls/<lesson_id>/ :
+    master.m3u8
+    240p/index.m3u8, 240p/seg_0000.ts, ...
+    360p/...
+    thumb.jpg
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+from main.ffmpeg import run, probe, FFmpegError
+
+# (ارتفاع، بیت‌ریت ویدیو، بیت‌ریت صوت)
+DEFAULT_RENDITIONS = (
+    (240, 400_000,   64_000),
+    (360, 800_000,   96_000),
+    (480, 1_400_000, 128_000),
+    (720, 2_800_000, 128_000),
+)
+
+SEGMENT_SECONDS = 6
+
+
+def _renditions(source_height: int):
+    renditions = getattr(settings, 'HLS_RENDITIONS', DEFAULT_RENDITIONS)
+    # کیفیت بالاتر از منبع فقط حجم اضافه تولید می‌کند
+    usable = [r for r in renditions if r[0] <= source_height]
+    return usable or [min(renditions)]
+
+
+def _even(value: float) -> int:
+    return max(2, int(round(value / 2)) * 2)
+
+
+def package_lesson(lesson) -> dict:
+    """
+    تبدیل video_file درس به HLS.
+    Returns: {'manifest': 'courses/hls/<id>/master.m3u8', 'thumbnail': '...', 'duration': int}
+    Raises: FFmpegError
+    """
+    source = lesson.video_file.path
+    info   = probe(source)
+    if not info['has_video']:
+        raise FFmpegError('فایل ویدیو جریان تصویری ندارد')
+
+    rel_dir   = f'courses/hls/{lesson.pk}'
+    final_dir = Path(settings.MEDIA_ROOT) / rel_dir
+    final_dir.parent.mkdir(parents=True, exist_ok=True)
+    work_dir  = Path(tempfile.mkdtemp(prefix=f'hls-{lesson.pk}-', dir=final_dir.parent))
+
+    try:
+        variants = []
+        threads  = getattr(settings, 'FFMPEG_THREADS', 0)
+        for height, v_bitrate, a_bitrate in _renditions(info['height']):
+            width = _even(info['width'] * height / info['height']) if info['height'] else _even(height * 16 / 9)
+            name  = f'{height}p'
+            (work_dir / name).mkdir()
+
+            args = [
+                '-i', source,
+                '-threads', threads,
+                '-vf', f'scale={width}:{height}',
+                '-c:v', 'libx264', '-preset', 'veryfast', '-profile:v', 'main',
+                '-b:v', v_bitrate, '-maxrate', int(v_bitrate * 1.07), '-bufsize', v_bitrate * 2,
+                # فریم کلیدی در ابتدای هر segment تا جابه‌جایی بین کیفیت‌ها بدون پرش باشد
+                '-force_key_frames', f'expr:gte(t,n_forced*{SEGMENT_SECONDS})', '-sc_threshold', 0,
+            ]
+            if info['has_audio']:
+                args += ['-c:a', 'aac', '-b:a', a_bitrate, '-ac', 2]
+            else:
+                args += ['-an']
+            args += [
+                '-f', 'hls',
+                '-hls_time', SEGMENT_SECONDS,
+                '-hls_playlist_type', 'vod',
+                '-hls_segment_filename', work_dir / name / 'seg_%04d.ts',
+                work_dir / name / 'index.m3u8',
+            ]
+            run(args)
+            variants.append((name, width, height, v_bitrate + (a_bitrate if info['has_audio'] else 0)))
+
+        lines = ['#EXTM3U', '#EXT-X-VERSION:3']
+        for name, width, height, bandwidth in variants:
+            lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={width}x{height}')
+            lines.append(f'{name}/index.m3u8')
+        (work_dir / 'master.m3u8').write_text('\n'.join(lines) + '\n')
+
+        run([
+            '-ss', min(5, info['duration'] / 2),
+            '-i', source,
+            '-frames:v', 1,
+            '-vf', 'scale=480:-2',
+            work_dir / 'thumb.jpg',
+        ])
+
+        # جایگزینی یکجای خروجی قبلی
+        if final_dir.exists():
+            shutil.rmtree(final_dir)
+        work_dir.rename(final_dir)
+    except Exception:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+
+    return {
+        'manifest':  f'{rel_dir}/master.m3u8',
+        'thumbnail': f'{rel_dir}/thumb.jpg',
+        'duration':  int(round(info['duration'])),
+    }
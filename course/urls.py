@@ -7,5 +7,6 @@ urlpatterns = [
     re_path(r'^$',                                    views.courses_list,        name='courses_list'),
     re_path(r'^category/(?P<slug>[^/]+)/$',           views.courses_by_category, name='courses_by_category'),
     path('<slug:course_slug>/lesson/<int:lesson_id>/', views.lesson_view,         name='lesson_view'),
+    path('<slug:course_slug>/lesson/<int:lesson_id>/hls/<path:playlist>', views.lesson_hls, name='lesson_hls'),
     re_path(r'^(?P<slug>[^/]+)/$',                    views.course_detail,        name='course_detail'),
 ]
\ No newline at end of file
@@ -1,6 +1,10 @@
 """course/views.py"""
+import re
+
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, HttpResponseForbidden
 from .models import Course, CourseCategory, CourseSection, CourseLesson
 
 GRADIENTS = [
@@ -65,10 +69,7 @@ def course_detail(request, slug):
     sections = course.sections.prefetch_related('lessons').order_by('order')
 
     from purchase.models import Purchase
-    has_access = (
-        course.access_type == 'free'
-        or Purchase.has_access(request.user, 'course', course.pk)
-    )
+    has_access = Purchase.can_access(request.user, 'course', course)
 
     # اولین درس رایگان (preview)
     first_lesson = None
@@ -95,11 +96,7 @@ def lesson_view(request, course_slug, lesson_id):
     lesson = get_object_or_404(CourseLesson, pk=lesson_id, section__course=course)
 
     from purchase.models import Purchase
-    has_access = (
-        lesson.is_preview
-        or course.access_type == 'free'
-        or Purchase.has_access(request.user, 'course', course.pk)
-    )
+    has_access = lesson.is_preview or Purchase.can_access(request.user, 'course', course)
 
     if not has_access:
         return render(request, 'courses/lesson_locked.html', {
@@ -120,6 +117,46 @@ def lesson_view(request, course_slug, lesson_id):
     })
 
 
+HLS_PLAYLIST_RE = re.compile(r'^(master|\d+p/index)\.m3u8$')
+
+
+def lesson_hls(request, course_slug, lesson_id, playlist):
+    """
+    GET /courses/<slug>/lesson/<id>/hls/<playlist>
+    playlistهای HLS درس — پس از بررسی دسترسی، آدرس segmentها با لینک امضاشده بازنویسی می‌شوند
+    تا خود segmentها بدون عبور از Django/DB سرو شوند.
+    """
+    if not HLS_PLAYLIST_RE.match(playlist):
+        raise Http404
+    course = get_object_or_404(Course, slug=course_slug, is_active=True)
+    lesson = get_object_or_404(CourseLesson, pk=lesson_id, section__course=course)
+    if not lesson.has_hls:
+        raise Http404
+
+    from purchase.models import Purchase
+    if not (lesson.is_preview or Purchase.can_access(request.user, 'course', course)):
+        return HttpResponseForbidden()
+
+    from main.signing import signed_url
+    base = lesson.hls_manifest.rsplit('/', 1)[0]
+    name = f'{base}/{playlist}'
+    if not default_storage.exists(name):
+        raise Http404
+    with default_storage.open(name, 'r') as f:
+        source = f.read()
+
+    folder = name.rsplit('/', 1)[0]
+    lines  = []
+    for line in source.splitlines():
+        if line and not line.startswith('#') and not line.endswith('.m3u8'):
+            line = signed_url(f'{folder}/{line}', request.user)
+        lines.append(line)
+
+    response = HttpResponse('\n'.join(lines) + '\n', content_type='application/vnd.apple.mpegurl')
+    response['Cache-Control'] = 'private, max-age=60'
+    return response
+
+
 def courses_by_category(request, slug):
     category = get_object_or_404(CourseCategory, slug=slug)
     qs = Course.objects.filter(is_active=True, category=category).select_related('category')
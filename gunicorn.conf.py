@@ -0,0 +1,80 @@
+"""
+gunicorn.conf.py
+پیکربندی گونیکورن (خودکار از پوشه جاری خوانده می‌شود):
+
+    DJANGO_ENV=production gunicorn core.wsgi
+    DJANGO_ENV=production GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker gunicorn core.asgi
+
+با worker uvicorn هر پردازه یک event loop دارد و viewهای async (ارسال OTP، زرین‌پال، صوت) هنگام
+انتظار برای شبکه worker را اشغال نمی‌کنند؛ تعداد workerها را می‌شود به تعداد هسته‌ها کم کرد.
+
+preload_app: برنامه و warm-up قالب‌ها (main/warmup.py) یک بار در master اجرا می‌شود و
+workerها بعد از fork آماده پاسخ‌اند؛ حافظه قالب‌های کامپایل‌شده هم copy-on-write مشترک می‌ماند.
+"""
+import multiprocessing
+import os
+
+bind        = os.getenv('GUNICORN_BIND', '127.0.0.1:8000')
+workers     = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads     = int(os.getenv('GUNICORN_THREADS', 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+timeout     = int(os.getenv('GUNICORN_TIMEOUT', 30))
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') != '0'
+
+# بازنشستگی تدریجی workerها در برابر نشت حافظه
+max_requests        = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog  = '-'
+
+# متریک‌های Prometheus چندپردازه‌ای (main/metrics.py): هر worker در فایل mmap خودش در این پوشه
+# می‌نویسد و /metrics همه را جمع می‌زند. متغیر باید پیش از import شدن prometheus_client (preload_app)
+# تنظیم شود؛ پاک کردن فایل‌های اجرای قبلی در on_starting است، نه هنگام خواندن همین فایل.
+# فایل workerهای بازنشسته تا پایان همین اجرا می‌مانند تا شمارنده‌ها عقب نروند
+METRICS_MARKER = '.gunicorn-metrics'
+
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/mahboub-metrics')
+if not os.path.exists(os.environ['PROMETHEUS_MULTIPROC_DIR']):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], mode=0o700)
+    open(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], METRICS_MARKER), 'w').close()
+
+
+def on_starting(server):
+    """
+    پاک کردن فایل‌های *.db اجرای قبلی، فقط در پوشه‌ای که خود ما ساخته‌ایم (نشانه METRICS_MARKER)
+    یا پوشه‌ای از آن همین کاربر که جز *.db چیزی در آن نیست (از این پس نشانه‌دار می‌شود).
+    PROMETHEUS_MULTIPROC_DIR اشتباه (مثلاً / یا پوشه پروژه) هرگز پاک نمی‌شود.
+    """
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    if os.path.islink(path) or not os.path.isdir(path) or os.stat(path).st_uid != os.getuid():
+        server.log.warning('PROMETHEUS_MULTIPROC_DIR=%s is not a directory owned by this user; not cleared', path)
+        return
+    names = os.listdir(path)
+    if METRICS_MARKER not in names:
+        if any(not name.endswith('.db') for name in names):
+            server.log.warning('PROMETHEUS_MULTIPROC_DIR=%s holds non-metrics files; not cleared', path)
+            return
+        open(os.path.join(path, METRICS_MARKER), 'w').close()
+    for name in names:
+        file = os.path.join(path, name)
+        if name.endswith('.db') and os.path.isfile(file) and not os.path.islink(file):
+            os.remove(file)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    # flush دوره‌ای پیشرفت مطالعه بافرشده این worker (book/progress.py)
+    from book.progress import buffer
+    buffer.start()
+
+
+def worker_exit(server, worker):
+    # باقی‌مانده پیشرفت مطالعه بافرشده این worker (book/progress.py)
+    from book.progress import buffer
+    buffer.stop()
+    buffer.flush()
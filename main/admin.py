@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from .images import thumbnail_url
 from .models import SiteSettings, Slider, SliderSlide, Banner, MenuItem
 
 
@@ -16,7 +17,7 @@ class SliderSlideInline(admin.StackedInline):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-width:300px;max-height:120px;object-fit:cover;border-radius:6px;"/>',
-                obj.image.url
+                thumbnail_url(obj.image, 768)
             )
         return '—'
     slide_preview.short_description = 'پیش‌نمایش تصویر'
@@ -88,7 +89,7 @@ class BannerAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-width:120px;max-height:50px;object-fit:cover;border-radius:4px;"/>',
-                obj.image.url
+                thumbnail_url(obj.image, 320)
             )
         return '—'
     banner_preview.short_description = 'پیش‌نمایش'
@@ -97,7 +98,7 @@ class BannerAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-width:400px;border-radius:8px;"/>',
-                obj.image.url
+                thumbnail_url(obj.image, 768)
             )
         return '—'
     banner_preview_field.short_description = 'پیش‌نمایش بنر'
@@ -253,8 +254,12 @@ class SiteSettingsAdmin(admin.ModelAdmin):
     
 
 
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from .models import FAQ, GuideCategory, GuideArticle, SupportTicket, SupportTicketReply
+from .exports import export_action
+from .querybudget import QueryBudgetMixin
 
 @admin.register(FAQ)
 class FAQAdmin(admin.ModelAdmin):
@@ -282,7 +287,7 @@ class SupportTicketReplyInline(admin.TabularInline):
 
 
 @admin.register(SupportTicket)
-class SupportTicketAdmin(admin.ModelAdmin):
+class SupportTicketAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ['id', 'subject_preview', 'fullname', 'email', 'category_badge', 'status_badge', 'created_at', 'last_activity']
     list_filter = ['status', 'category', 'created_at']
     search_fields = ['subject', 'message', 'fullname', 'email']
@@ -303,7 +308,10 @@ class SupportTicketAdmin(admin.ModelAdmin):
         }),
     )
     
-    actions = ['mark_as_pending', 'mark_as_processing', 'mark_as_answered', 'mark_as_closed', 'send_reply_email']
+    actions = [
+        'mark_as_pending', 'mark_as_processing', 'mark_as_answered', 'mark_as_closed', 'send_reply_email',
+        export_action('tickets'), export_action('tickets', 'jsonl'),
+    ]
     
     def subject_preview(self, obj):
         return obj.subject[:50] + '...' if len(obj.subject) > 50 else obj.subject
@@ -346,13 +354,19 @@ class SupportTicketAdmin(admin.ModelAdmin):
         )
     status_badge.short_description = "وضعیت"
     
+    def get_queryset(self, request):
+        last_reply = (
+            SupportTicketReply.objects.filter(ticket=OuterRef('pk'))
+            .order_by('-created_at').values('created_at')[:1]
+        )
+        return super().get_queryset(request).annotate(
+            _last_activity=Coalesce(Subquery(last_reply), 'created_at')
+        )
+
     def last_activity(self, obj):
-        if obj.replies.exists():
-            last_reply = obj.replies.latest('created_at')
-            return last_reply.created_at
-        return obj.created_at
+        return obj._last_activity
     last_activity.short_description = "آخرین فعالیت"
-    last_activity.admin_order_field = 'updated_at'
+    last_activity.admin_order_field = '_last_activity'
     
     def mark_as_pending(self, request, queryset):
         queryset.update(status='pending')
@@ -384,7 +398,7 @@ class SupportTicketAdmin(admin.ModelAdmin):
 
 
 @admin.register(GuideCategory)
-class GuideCategoryAdmin(admin.ModelAdmin):
+class GuideCategoryAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ['name', 'icon_display', 'article_count', 'order', 'is_active']
     list_filter = ['is_active']
     search_fields = ['name', 'description']
@@ -398,11 +412,16 @@ class GuideCategoryAdmin(admin.ModelAdmin):
         return "-"
     icon_display.short_description = "آیکون"
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _article_count=Count('articles', filter=Q(articles__is_active=True))
+        )
+
     def article_count(self, obj):
-        count = obj.articles.filter(is_active=True).count()
-        url = reverse('admin:support_guidearticle_changelist') + f'?category__id__exact={obj.id}'
-        return format_html('<a href="{}">{}</a>', url, count)
+        url = reverse('admin:main_guidearticle_changelist') + f'?category__id__exact={obj.id}'
+        return format_html('<a href="{}">{}</a>', url, obj._article_count)
     article_count.short_description = "تعداد مقالات"
+    article_count.admin_order_field = '_article_count'
 
 
 @admin.register(GuideArticle)
@@ -440,23 +459,22 @@ class GuideArticleAdmin(admin.ModelAdmin):
 
 
 @admin.register(SupportTicketReply)
-class SupportTicketReplyAdmin(admin.ModelAdmin):
+class SupportTicketReplyAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ['id', 'ticket_link', 'user_info', 'message_preview', 'is_staff', 'created_at']
     list_filter = ['is_staff', 'created_at']
-    search_fields = ['message', 'ticket__subject', 'user__username']
+    search_fields = ['message', 'ticket__subject', 'user__phone_number']
     ordering = ['-created_at']
     readonly_fields = ['created_at']
+    list_select_related = ['ticket', 'user']
     
     def ticket_link(self, obj):
-        url = reverse('admin:support_supportticket_change', args=[obj.ticket.id])
-        return format_html('<a href="{}">تیکت #{}</a>', url, obj.ticket.id)
+        url = reverse('admin:main_supportticket_change', args=[obj.ticket_id])
+        return format_html('<a href="{}">تیکت #{}</a>', url, obj.ticket_id)
     ticket_link.short_description = "تیکت"
     
     def user_info(self, obj):
         if obj.user:
-            if obj.user.get_full_name():
-                return obj.user.get_full_name()
-            return obj.user.username
+            return obj.user.phone_number
         return obj.ticket.fullname
     user_info.short_description = "کاربر"
     
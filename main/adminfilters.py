@@ -0,0 +1,105 @@
+"""
+main/adminfilters.py
+فیلتر و صفحه‌بندی admin برای جدول‌های بزرگ
+
+  - AutocompleteListFilter: به‌جای چاپ همه ردیف‌های مرتبط در نوار کناری، یک select2 که از
+    endpoint autocomplete خود admin (admin/autocomplete/) جستجو و صفحه‌به‌صفحه بارگذاری می‌کند.
+    admin مدل مقصد باید search_fields داشته باشد.
+  - EstimatedCountPaginator: برای changelist بدون فیلتر، تعداد ردیف از آمار PostgreSQL
+    (pg_class.reltuples) خوانده می‌شود نه COUNT(*) روی کل جدول.
+
+    @admin.register(BookPage)
+    class BookPageAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
+        list_filter = (('book', AutocompleteListFilter), ('chapter', AutocompleteListFilter))
+        paginator   = EstimatedCountPaginator
+        show_full_result_count = False      # کوئری COUNT دوم («از n نتیجه») حذف می‌شود
+"""
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# ── فیلتر autocomplete ────────────────────────────────────────────────────
+
+
+class AutocompleteListFilter(admin.FieldListFilter):
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        super().__init__(field, request, params, model, model_admin, field_path)
+        values          = self.used_parameters.get(self.lookup_kwarg) or ['']
+        self.lookup_val = values[-1]
+        self.form_field = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            required=False,
+            widget=AutocompleteSelect(
+                field, model_admin.admin_site,
+                attrs={'class': 'autocomplete-filter', 'data-lookup': self.lookup_kwarg, 'data-width': '100%'},
+            ),
+        )
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def get_facet_counts(self, pk_attname, filtered_qs):
+        # شمارش به تفکیک همه ردیف‌های مرتبط همان کاری است که این فیلتر از آن پرهیز می‌کند
+        return {}
+
+    def choices(self, changelist):
+        yield {
+            'selected':     not self.lookup_val,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg]),
+            'display':      'همه',
+        }
+
+    def widget(self):
+        """select با گزینه انتخاب‌شده فعلی؛ بقیه گزینه‌ها با AJAX"""
+        return self.form_field.widget.render(self.lookup_kwarg, self.lookup_val)
+
+
+class AutocompleteFilterMixin:
+    """اسکریپت‌های select2 را به صفحه changelist اضافه می‌کند"""
+
+    @property
+    def media(self):
+        return (
+            super().media
+            + AutocompleteSelect(None, self.admin_site).media
+            + forms.Media(js=['js/admin-autocomplete-filter.js'])
+        )
+
+
+# ── شمارش تقریبی ──────────────────────────────────────────────────────────
+
+
+def estimated_count(queryset):
+    """تعداد تقریبی ردیف‌ها برای queryset بدون فیلتر روی PostgreSQL؛ در غیر این صورت None"""
+    query = getattr(queryset, 'query', None)
+    if query is None or query.where or query.distinct or query.is_sliced or query.combinator:
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    # -1 یعنی جدول هنوز ANALYZE نشده (PostgreSQL 14+)
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    # زیر این تعداد، COUNT(*) دقیق ارزان است و عدد دقیق نمایش داده می‌شود
+    estimate_threshold = 10_000
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
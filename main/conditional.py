@@ -0,0 +1,62 @@
+"""
+main/conditional.py
+کش نسخه‌دار و GET شرطی (ETag / Last-Modified) برای خروجی‌های XML پرخواننده (sitemap، فید پادکست)
+
+    @versioned_cache(lambda request, slug: series_version(slug))
+    def series_feed(request, slug): ...
+
+version(request, *args, **kwargs) → (last_modified، token) با یک کوئری aggregate ارزان
+(مثلاً Max(updated_at) و Count). هر تغییر محتوا token را عوض می‌کند، پس کلید کش و ETag تازه
+می‌شوند و فقط همان بخش دوباره ساخته می‌شود؛ نسخه‌های قدیمی با timeout از کش بیرون می‌روند.
+کلید شامل دامنه است چون نشانی‌های داخل XML مطلق‌اند.
+درخواست با If-None-Match / If-Modified-Since برابر، بدون رندر پاسخ 304 می‌گیرد.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def versioned_cache(version, timeout: int = None, max_age: int = None):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            last_modified, token = version(request, *args, **kwargs)
+            digest        = hashlib.md5(f'{request.build_absolute_uri()}|{token}'.encode()).hexdigest()
+            etag          = f'"{digest}"'
+            last_modified = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                key    = f'xml:{digest}'
+                cached = cache.get(key)
+                if cached is None:
+                    response = view(request, *args, **kwargs)
+                    if hasattr(response, 'render') and not response.is_rendered:
+                        response.render()
+                    if response.status_code != 200:
+                        return response
+                    cache.set(
+                        key, (response.content, response['Content-Type']),
+                        timeout if timeout is not None else getattr(settings, 'XML_CACHE_TIMEOUT', 24 * 3600),
+                    )
+                else:
+                    response = HttpResponse(cached[0], content_type=cached[1])
+
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(
+                response, public=True,
+                max_age=max_age if max_age is not None else getattr(settings, 'XML_CACHE_MAX_AGE', 15 * 60),
+            )
+            return response
+        return wrapper
+    return decorator
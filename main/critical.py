@@ -0,0 +1,185 @@
+"""
+main/critical.py
+استخراج CSS بحرانی (critical) هر صفحه بدون مرورگر
+
+قواعدی از باندل‌های CSS صفحه نگه داشته می‌شوند که selector آن‌ها با کلاس‌ها، idها و تگ‌های
+به‌کاررفته در قالب‌های همان صفحه جور باشد (شامل {% include %}ها و کلاس‌هایی که JS با
+classList اضافه می‌کند). اگر قالب نشانه {# fold #} داشته باشد، فقط بخش بالای آن بررسی می‌شود.
+
+خروجی manage.py build_critical_css در static/critical/<name>.css ذخیره می‌شود و تگ
+{% critical_css %} آن را inline می‌کند و بقیه CSS را غیرمسدودکننده بارگذاری می‌کند.
+"""
+import re
+
+from django.conf import settings
+from django.template import Engine, TemplateDoesNotExist
+
+FOLD_MARKER = '{# fold #}'
+
+TEMPLATE_TAG_RE = re.compile(r'{%.*?%}|{{.*?}}|{#.*?#}', re.S)
+INCLUDE_RE      = re.compile(r'{%\s*include\s+[\'"]([^\'"]+)[\'"]')
+CLASS_ATTR_RE   = re.compile(r'\bclass\s*=\s*"([^"]*)"')
+ID_ATTR_RE      = re.compile(r'\bid\s*=\s*"([^"]*)"')
+TAG_RE          = re.compile(r'<([a-zA-Z][a-zA-Z0-9-]*)')
+JS_CLASS_RE     = re.compile(r'classList\.(?:add|toggle|replace)\(\s*[\'"]([\w-]+)[\'"](?:\s*,\s*[\'"]([\w-]+)[\'"])?')
+COMMENT_RE      = re.compile(r'/\*.*?\*/', re.S)
+
+# عناصری که در هر صفحه وجود دارند حتی اگر در قالب نوشته نشده باشند
+ALWAYS_TAGS = {'html', 'head', 'body', '*', ''}
+
+
+def crit_settings() -> dict:
+    return getattr(settings, 'CRITICAL_CSS', {})
+
+
+def enabled() -> bool:
+    return getattr(settings, 'CRITICAL_CSS_ENABLED', not settings.DEBUG)
+
+
+def critical_path(name: str) -> str:
+    return f'critical/{name}.css'
+
+
+# ── واژگان قالب‌ها ──────────────────────────────────────────────────────
+
+def _template_source(name: str) -> str:
+    """متن خام قالب بدون کامپایل (فقط markup لازم است)"""
+    engine = Engine.get_default()
+    for loader in engine.template_loaders:
+        for origin in loader.get_template_sources(name):
+            try:
+                return loader.get_contents(origin)
+            except TemplateDoesNotExist:
+                continue
+    raise TemplateDoesNotExist(name)
+
+
+def vocabulary(template_names) -> dict:
+    """{'class': set, 'id': set, 'tag': set} برای قالب‌ها و includeهای آن‌ها"""
+    vocab = {'class': set(), 'id': set(), 'tag': set(ALWAYS_TAGS)}
+    seen, queue = set(), list(template_names)
+    while queue:
+        name = queue.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        source = _template_source(name)
+        if FOLD_MARKER in source:
+            source = source.split(FOLD_MARKER, 1)[0]
+        queue.extend(INCLUDE_RE.findall(source))
+
+        for first, second in JS_CLASS_RE.findall(source):
+            vocab['class'].update(c for c in (first, second) if c)
+        # تگ‌های قالب (مثل {% if %}active{% endif %}) با فاصله جایگزین می‌شوند
+        markup = TEMPLATE_TAG_RE.sub(' ', source)
+        for value in CLASS_ATTR_RE.findall(markup):
+            vocab['class'].update(value.split())
+        for value in ID_ATTR_RE.findall(markup):
+            vocab['id'].update(value.split())
+        vocab['tag'].update(t.lower() for t in TAG_RE.findall(markup))
+    return vocab
+
+
+def add_js_vocabulary(vocab: dict, js_sources):
+    for source in js_sources:
+        for first, second in JS_CLASS_RE.findall(source):
+            vocab['class'].update(c for c in (first, second) if c)
+
+
+# ── تطبیق selector ───────────────────────────────────────────────────────
+
+_PARENS_RE     = re.compile(r'\([^()]*\)')
+_ATTR_RE       = re.compile(r'\[[^\]]*\]')
+_PSEUDO_RE     = re.compile(r'::?[\w-]+')
+_COMBINATOR_RE = re.compile(r'\s*[>+~]\s*|\s+')
+_COMPOUND_RE   = re.compile(r'^([a-zA-Z][\w-]*|\*)?')
+
+
+def _selector_matches(selector: str, vocab: dict) -> bool:
+    selector = selector.strip()
+    if not selector or selector.startswith(':root'):
+        return True
+    # آرگومان‌های :not(...) و :is(...) و شرط‌های [attr] در تطبیق نادیده گرفته می‌شوند
+    while _PARENS_RE.search(selector):
+        selector = _PARENS_RE.sub('', selector)
+    selector = _PSEUDO_RE.sub('', _ATTR_RE.sub('', selector))
+
+    for compound in _COMBINATOR_RE.split(selector.strip()):
+        if not compound:
+            continue
+        tag = _COMPOUND_RE.match(compound).group(1) or ''
+        if tag.lower() not in vocab['tag']:
+            return False
+        if not set(re.findall(r'\.([\w-]+)', compound)) <= vocab['class']:
+            return False
+        if not set(re.findall(r'#([\w-]+)', compound)) <= vocab['id']:
+            return False
+    return True
+
+
+# ── پارس CSS ─────────────────────────────────────────────────────────────
+
+def parse(css: str) -> list:
+    """
+    [(prelude, body)] برای قواعد سطح بالا؛ body برای @media/@supports خودش لیست است
+    و برای بقیه متن داخل {...}
+    """
+    css   = COMMENT_RE.sub('', css)
+    rules = []
+    i, n  = 0, len(css)
+    while i < n:
+        start = i
+        # پیدا کردن { یا ; سطح بالا (بیرون از رشته)
+        while i < n and css[i] not in '{;':
+            if css[i] in '"\'':
+                i = css.index(css[i], i + 1)
+            i += 1
+        if i >= n:
+            break
+        prelude = css[start:i].strip()
+        if css[i] == ';':
+            # @import / @charset
+            rules.append((prelude, None))
+            i += 1
+            continue
+        depth, j = 1, i + 1
+        while j < n and depth:
+            if css[j] in '"\'':
+                j = css.index(css[j], j + 1)
+            elif css[j] == '{':
+                depth += 1
+            elif css[j] == '}':
+                depth -= 1
+            j += 1
+        body = css[i + 1:j - 1]
+        if prelude.startswith(('@media', '@supports', '@layer')):
+            rules.append((prelude, parse(body)))
+        else:
+            rules.append((prelude, body.strip()))
+        i = j
+    return rules
+
+
+def select(rules: list, vocab: dict) -> str:
+    out = []
+    for prelude, body in rules:
+        if body is None:
+            continue
+        if isinstance(body, list):
+            inner = select(body, vocab)
+            if inner:
+                out.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@font-face'):
+            out.append(f'{prelude}{{{body}}}')
+        elif prelude.startswith('@'):
+            # @keyframes و مانند آن با CSS کامل می‌رسند
+            continue
+        elif any(_selector_matches(s, vocab) for s in prelude.split(',')):
+            out.append(f'{prelude}{{{body}}}')
+    return '\n'.join(out)
+
+
+def minify(css: str) -> str:
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
@@ -0,0 +1,204 @@
+"""
+main/exports.py
+خروجی CSV / JSONL جریانی خریدها، تیکت‌ها و کاربران برای مالی و گزارش‌گیری
+
+ردیف‌ها با values_list و iterator(chunk_size) (server-side cursor در PostgreSQL) خوانده و
+همان لحظه نوشته می‌شوند؛ حافظه مصرفی به تعداد ردیف بستگی ندارد. زیر ASGI پاسخ iterator غیرهمزمان
+می‌گیرد (main/streaming.py)، وگرنه Django کل خروجی را پیش از ارسال در حافظه جمع می‌کند.
+
+    # admin: اکشن «خروجی CSV / JSONL» روی ردیف‌های انتخاب‌شده یا کل نتیجه فیلترشده
+    actions = [export_action('purchases'), export_action('purchases', 'jsonl')]
+
+    # خط فرمان
+    python manage.py export_data purchases --since 2026-01-01 --until 2026-03-31 -o q1.csv.gz
+"""
+import csv
+import datetime
+import io
+import json
+
+from django.apps import apps
+from django.contrib import admin
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .streaming import aiter_sync
+
+# ستون اول همیشه شناسه است (برای صفحه‌بندی keyset در iter_rows)
+EXPORTS = {
+    'purchases': {
+        'model':      'purchase.Purchase',
+        'date_field': 'created_at',
+        'columns': [
+            ('id',           'pk'),
+            ('ref_id',       'ref_id'),
+            ('user',         'user__phone_number'),
+            ('content_type', 'content_type'),
+            ('object_id',    'object_id'),
+            ('amount',       'amount'),
+            ('status',       'status'),
+            ('zp_ref_id',    'zp_ref_id'),
+            ('order',        'order__ref_id'),
+            ('created_at',   'created_at'),
+            ('paid_at',      'paid_at'),
+        ],
+    },
+    'tickets': {
+        'model':      'main.SupportTicket',
+        'date_field': 'created_at',
+        'columns': [
+            ('id',         'pk'),
+            ('created_at', 'created_at'),
+            ('status',     'status'),
+            ('category',   'category'),
+            ('fullname',   'fullname'),
+            ('email',      'email'),
+            ('user',       'user__phone_number'),
+            ('subject',    'subject'),
+            ('message',    'message'),
+            ('updated_at', 'updated_at'),
+        ],
+    },
+    'users': {
+        'model':      'account.User',
+        'date_field': 'date_joined',
+        'columns': [
+            ('id',            'pk'),
+            ('phone_number',  'phone_number'),
+            ('date_joined',   'date_joined'),
+            ('last_login',    'last_login'),
+            ('is_active',     'is_active'),
+            ('is_staff',      'is_staff'),
+            ('premium_until', 'premium_until'),
+        ],
+    },
+}
+
+FORMATS = {
+    'csv':   'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+CHUNK_SIZE = 2000
+
+
+# ── خواندن ردیف‌ها ─────────────────────────────────────────────────────────
+
+def _day_start(day: datetime.date):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def export_queryset(name: str, queryset=None, since: datetime.date = None, until: datetime.date = None):
+    """
+    queryset: مثلاً نتیجه فیلترشده admin؛ پیش‌فرض همه ردیف‌های مدل
+    since / until: بازه تاریخ (هر دو شامل) روی date_field
+    """
+    spec = EXPORTS[name]
+    if queryset is None:
+        queryset = apps.get_model(spec['model'])._default_manager.all()
+    if since:
+        queryset = queryset.filter(**{f'{spec["date_field"]}__gte': _day_start(since)})
+    if until:
+        queryset = queryset.filter(**{f'{spec["date_field"]}__lt': _day_start(until + datetime.timedelta(days=1))})
+    return queryset.order_by('pk').values_list(*(lookup for _, lookup in spec['columns']))
+
+
+def iter_rows(queryset, chunk_size: int = CHUNK_SIZE):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql' or not connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    # پشت PgBouncer (transaction pooling) server-side cursor خاموش است و iterator() کل نتیجه را
+    # یکجا از سرور می‌گیرد؛ به‌جای آن صفحه‌بندی keyset روی شناسه (ستون اول)
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        rows = list(page[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1][0]
+
+
+def _plain(value, tz):
+    # tz یک بار برای کل خروجی گرفته می‌شود؛ timezone.localtime برای هر خانه کند است
+    if isinstance(value, datetime.datetime):
+        return (value.astimezone(tz) if value.tzinfo else value).isoformat()
+    return value
+
+
+# خانه‌ای که با این نویسه‌ها شروع شود در Excel / LibreOffice فرمول اجرا می‌شود (=HYPERLINK(...)، DDE)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value, tz):
+    """_plain به‌علاوه خنثی‌سازی فرمول با «'» — فقط برای CSV؛ JSONL داده را دست‌نخورده می‌دهد"""
+    value = _plain(value, tz)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+# ── نوشتن ─────────────────────────────────────────────────────────────────
+
+def csv_chunks(headers: list, rows, rows_per_chunk: int = 500):
+    """هر چند صد ردیف یک رشته؛ BOM برای باز شدن درست متن فارسی در Excel، متن کاربر بدون فرمول"""
+    buf    = io.StringIO()
+    writer = csv.writer(buf)
+    tz     = timezone.get_current_timezone()
+    buf.write('\ufeff')
+    writer.writerow(headers)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow([_csv_cell(value, tz) for value in row])
+        if i % rows_per_chunk == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def jsonl_chunks(headers: list, rows, rows_per_chunk: int = 500):
+    lines = []
+    tz    = timezone.get_current_timezone()
+    for row in rows:
+        lines.append(json.dumps(
+            {header: _plain(value, tz) for header, value in zip(headers, row)}, ensure_ascii=False, default=str,
+        ))
+        if len(lines) == rows_per_chunk:
+            yield '\n'.join(lines) + '\n'
+            lines.clear()
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+WRITERS = {'csv': csv_chunks, 'jsonl': jsonl_chunks}
+
+
+def export_chunks(name: str, fmt: str, queryset=None, since=None, until=None, chunk_size: int = CHUNK_SIZE):
+    headers = [header for header, _ in EXPORTS[name]['columns']]
+    rows    = iter_rows(export_queryset(name, queryset, since, until), chunk_size)
+    return WRITERS[fmt](headers, rows)
+
+
+def export_response(name: str, fmt: str = 'csv', queryset=None, since=None, until=None,
+                    request=None) -> StreamingHttpResponse:
+    chunks = (chunk.encode() for chunk in export_chunks(name, fmt, queryset, since, until))
+    if isinstance(request, ASGIRequest):
+        chunks = aiter_sync(chunks)
+    response = StreamingHttpResponse(chunks, content_type=FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{name}-{timezone.localdate():%Y%m%d}.{fmt}"'
+    return response
+
+
+def export_action(name: str, fmt: str = 'csv'):
+    """اکشن admin؛ با «انتخاب همه» کل نتیجه فیلترشده changelist (مثلاً بازه date_hierarchy) خروجی می‌شود"""
+
+    @admin.action(description=f'خروجی {fmt.upper()} ردیف‌های انتخاب‌شده', permissions=['view'])
+    def action(modeladmin, request, queryset):
+        return export_response(name, fmt, queryset=queryset, request=request)
+
+    action.__name__ = f'export_{fmt}'
+    return action
@@ -0,0 +1,76 @@
+"""
+main/ffmpeg.py
+فراخوانی ffmpeg / ffprobe برای پردازش آفلاین رسانه (فقط CPU)
+"""
+import json
+import subprocess
+
+from django.conf import settings
+
+
+class FFmpegError(Exception):
+    pass
+
+
+def _bin(name: str) -> str:
+    return getattr(settings, f'{name.upper()}_BINARY', name)
+
+
+def run(args: list, timeout: int = 3600):
+    """اجرای ffmpeg با آرگومان‌های داده‌شده — در صورت خطا FFmpegError"""
+    cmd = [_bin('ffmpeg'), '-hide_banner', '-loglevel', 'error', '-y', *map(str, args)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise FFmpegError(str(e)) from e
+    if proc.returncode != 0:
+        raise FFmpegError(proc.stderr.strip()[-2000:] or f'ffmpeg exited with {proc.returncode}')
+
+
+def probe(path: str) -> dict:
+    """
+    مشخصات فایل رسانه
+    Returns: {'duration': float, 'width': int, 'height': int, 'has_video': bool, 'has_audio': bool, 'bit_rate': int}
+    """
+    cmd = [
+        _bin('ffprobe'), '-v', 'error', '-print_format', 'json',
+        '-show_format', '-show_streams', str(path),
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise FFmpegError(str(e)) from e
+    if proc.returncode != 0:
+        raise FFmpegError(proc.stderr.strip() or f'ffprobe exited with {proc.returncode}')
+
+    data    = json.loads(proc.stdout or '{}')
+    streams = data.get('streams', [])
+    video   = next((s for s in streams if s.get('codec_type') == 'video' and not s.get('disposition', {}).get('attached_pic')), None)
+    audio   = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+    fmt     = data.get('format', {})
+
+    return {
+        'duration':  float(fmt.get('duration') or 0),
+        'width':     int(video.get('width', 0)) if video else 0,
+        'height':    int(video.get('height', 0)) if video else 0,
+        'has_video': video is not None,
+        'has_audio': audio is not None,
+        'bit_rate':  int(fmt.get('bit_rate') or 0),
+    }
+
+
+def normalize_audio(source: str, dest: str, bitrate: int = 64_000, loudness: float = -16.0):
+    """
+    نسخه سبک و هم‌بلندی از یک فایل صوتی:
+    AAC مونو در کانتینر m4a (پخش در همه مرورگرها از جمله Safari)،
+    بلندی طبق EBU R128 روی loudness LUFS و moov در ابتدای فایل برای شروع سریع پخش
+    """
+    run([
+        '-i', source,
+        '-vn',
+        '-af', f'loudnorm=I={loudness}:TP=-1.5:LRA=11',
+        '-ac', 1, '-ar', 44100,
+        '-c:a', 'aac', '-b:a', bitrate,
+        '-movflags', '+faststart',
+        dest,
+    ])
@@ -0,0 +1,42 @@
+"""
+main/httpclient.py
+کلاینت HTTP غیرهمزمان (httpx) برای تماس‌های بیرونی viewهای async: پیامک sms.ir و درگاه زرین‌پال
+
+    async with http_client() as http:
+        resp = await http.post(url, json=payload)
+
+  - زیر ASGI (settings.ASGI، با core/asgi.py): یک کلاینت مشترک برای هر event loop، پس اتصال TLS به
+    درگاه بین درخواست‌ها keep-alive می‌ماند و صدها تماس همزمان در یک worker منتظر می‌مانند
+  - زیر WSGI / runserver هر view async در loop تازه‌ای اجرا می‌شود؛ کلاینت همان‌جا ساخته و بسته می‌شود
+"""
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+
+import httpx
+from django.conf import settings
+
+_clients = weakref.WeakKeyDictionary()   # event loop → AsyncClient
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=getattr(settings, 'HTTP_CLIENT_TIMEOUT', 10),
+        limits=httpx.Limits(
+            max_connections=getattr(settings, 'HTTP_CLIENT_MAX_CONNECTIONS', 200),
+            max_keepalive_connections=getattr(settings, 'HTTP_CLIENT_MAX_KEEPALIVE', 20),
+        ),
+    )
+
+
+@asynccontextmanager
+async def http_client():
+    if not getattr(settings, 'ASGI', False):
+        async with _new_client() as http:
+            yield http
+        return
+    loop = asyncio.get_running_loop()
+    http = _clients.get(loop)
+    if http is None or http.is_closed:
+        http = _clients[loop] = _new_client()
+    yield http
@@ -0,0 +1,148 @@
+"""
+main/images.py
+نسخه‌های کوچک‌شده (derivative) تصاویر کاور، اسلایدر و بنر در قالب‌های AVIF / WebP
+
+خروجی کنار MEDIA_ROOT/derivatives/ با همان مسیر فایل اصلی:
+    derivatives/books/covers/abc-160w.avif
+    derivatives/books/covers/abc-160w.webp
+    ...
+    derivatives/books/covers/abc.json     ← عرض‌های ساخته‌شده + ابعاد اصلی (آخر از همه نوشته می‌شود)
+
+ساخت توسط manage.py build_image_derivatives (process pool) انجام می‌شود؛
+تا وقتی فایل json وجود ندارد، تگ‌های قالب همان تصویر اصلی را برمی‌گردانند.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path, PurePosixPath
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+DEFAULT_WIDTHS  = (160, 320, 480, 768, 1200)
+DEFAULT_FORMATS = ('avif', 'webp')
+
+# (مدل، فیلد) تصاویری که نسخه کوچک‌شده می‌گیرند
+SOURCES = (
+    ('book.Book',             'cover_image'),
+    ('podcast.Podcast',       'cover_image'),
+    ('podcast.PodcastSeries', 'cover_image'),
+    ('course.Course',         'cover_image'),
+    ('main.SliderSlide',      'image'),
+    ('main.SliderSlide',      'mobile_image'),
+    ('main.Banner',           'image'),
+)
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+_SAVE_OPTIONS = {
+    'avif': {'quality': 55, 'speed': 6},
+    'webp': {'quality': 78, 'method': 4},
+}
+
+
+def widths() -> tuple:
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', DEFAULT_WIDTHS))
+
+
+def formats() -> tuple:
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_FORMATS', DEFAULT_FORMATS))
+
+
+def _stem(name: str) -> str:
+    path = PurePosixPath(name)
+    return str(PurePosixPath('derivatives') / path.parent / path.stem)
+
+
+def derivative_name(name: str, width: int, fmt: str) -> str:
+    return f'{_stem(name)}-{width}w.{fmt}'
+
+
+def meta_name(name: str) -> str:
+    return f'{_stem(name)}.json'
+
+
+# ── ساخت (بدون دیتابیس — داخل process pool اجرا می‌شود) ─────────────────
+
+def build(name: str, media_root: str, target_widths, target_formats) -> dict:
+    """
+    ساخت همه نسخه‌های یک تصویر و نوشتن فایل json
+    Returns: {'w': [عرض‌ها], 'f': [قالب‌ها], 'width': عرض اصلی, 'height': ارتفاع اصلی}
+    """
+    from PIL import Image, ImageOps
+
+    root = Path(media_root)
+    with Image.open(root / name) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'A' in img.getbands() or img.mode == 'P' else 'RGB')
+        src_w, src_h = img.size
+
+        # بزرگ‌نمایی نداریم — عرض‌های بزرگ‌تر از اصلی به عرض اصلی محدود می‌شوند
+        sizes = sorted({min(w, src_w) for w in target_widths})
+        for width in sizes:
+            height  = max(1, round(src_h * width / src_w))
+            resized = img if width == src_w else img.resize((width, height), Image.LANCZOS)
+            for fmt in target_formats:
+                dest = root / derivative_name(name, width, fmt)
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                tmp = dest.with_name(dest.name + '.part')
+                resized.save(tmp, format=fmt.upper(), **_SAVE_OPTIONS.get(fmt, {}))
+                os.replace(tmp, dest)
+
+    meta = {'w': sizes, 'f': list(target_formats), 'width': src_w, 'height': src_h}
+    dest = root / meta_name(name)
+    tmp  = dest.with_name(dest.name + '.part')
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, dest)
+    return meta
+
+
+def is_built(name: str) -> bool:
+    return (Path(settings.MEDIA_ROOT) / meta_name(name)).exists()
+
+
+# ── خواندن (در درخواست‌ها) ─────────────────────────────────────────────────
+
+def _cache_key(name: str) -> str:
+    return 'imgd:' + hashlib.md5(name.encode()).hexdigest()
+
+
+def forget(name: str):
+    cache.delete(_cache_key(name))
+
+
+def get_meta(name: str):
+    """اطلاعات نسخه‌های ساخته‌شده یا None — نتیجه در کش نگه داشته می‌شود"""
+    if not name:
+        return None
+    key  = _cache_key(name)
+    meta = cache.get(key)
+    if meta is not None:
+        return meta or None
+    try:
+        meta = json.loads((Path(settings.MEDIA_ROOT) / meta_name(name)).read_text())
+    except (OSError, ValueError):
+        # هنوز ساخته نشده — نتیجه منفی کوتاه‌مدت کش می‌شود تا worker فرصت ساخت داشته باشد
+        cache.set(key, {}, 60)
+        return None
+    cache.set(key, meta, 24 * 3600)
+    return meta
+
+
+def srcset(name: str, meta: dict, fmt: str) -> str:
+    return ', '.join(
+        f'{default_storage.url(derivative_name(name, w, fmt))} {w}w' for w in meta['w']
+    )
+
+
+def thumbnail_url(fieldfile, width: int) -> str:
+    """آدرس کوچک‌ترین نسخه WebP با عرض ≥ width — اگر ساخته نشده باشد آدرس اصلی"""
+    if not fieldfile:
+        return ''
+    meta = get_meta(fieldfile.name)
+    if not meta or 'webp' not in meta['f']:
+        return fieldfile.url
+    best = next((w for w in meta['w'] if w >= width), meta['w'][-1])
+    return default_storage.url(derivative_name(fieldfile.name, best, 'webp'))
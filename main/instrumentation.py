@@ -0,0 +1,353 @@
+"""
+main/instrumentation.py
+اندازه‌گیری هزینه هر درخواست: تعداد و زمان کوئری، کوئری تکراری، hit/miss کش و زمان رندر قالب
+
+    MIDDLEWARE = ['main.instrumentation.InstrumentationMiddleware', ...]
+
+  - هدر Server-Timing (db / dup / cache / tpl / app) — در DevTools مرورگر، تب Timing دیده می‌شود
+  - درخواست کندتر از INSTRUMENTATION_SLOW_MS با کندترین و پرتکرارترین SQLها در log (main.instrumentation)
+  - هیستوگرام زمان و تعداد کوئری به ازای نام URL در همان پردازه: /_instrumentation/ (فقط staff)
+
+هزینه: کوئری‌ها با connection.execute_wrapper شمرده می‌شوند (بدون debug cursor). برای تشخیص تکرار
+فقط hash متن SQL و اثر انگشت محدود پارامترها (PARAMS_FINGERPRINT / VALUE_FINGERPRINT) نگه داشته
+می‌شود، نه repr کامل آن‌ها؛ IN با هزار شناسه یا متن بلند هزینه‌ای جدا ندارد. درخواست‌های
+نمونه‌برداری‌نشده فقط در هیستوگرام زمان شمرده می‌شوند؛ production پیش‌فرض ۵٪ است (core/settings/prod.py).
+
+ASGI: wrapper روی هر اتصال یک بار و برای همیشه نصب می‌شود و پروفایل را از contextvar می‌خواند،
+پس کوئری‌های ORM async هم (که در thread دیگری با اتصال دیگری اجرا می‌شوند) به همان درخواست می‌رسند.
+"""
+import bisect
+import contextvars
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+from django.template.base import Template
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_profile', default=None)
+_MISS    = object()
+
+TIME_BUCKETS  = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)   # میلی‌ثانیه
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# اثر انگشت پارامترها: چند پارامتر اول و چند نویسه اول هر متن، به‌علاوه تعداد و طول کل
+PARAMS_FINGERPRINT = 16
+VALUE_FINGERPRINT  = 64
+_SCALARS           = (int, float, bool, type(None))
+
+
+def _value_fingerprint(value):
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, (str, bytes)):
+        return (len(value), value[:VALUE_FINGERPRINT])
+    if isinstance(value, memoryview):
+        return (len(value), bytes(value[:VALUE_FINGERPRINT]))
+    if isinstance(value, (list, tuple)):
+        # executemany یا آرایه PostgreSQL؛ فقط تعداد و عضو اول
+        return (len(value), _value_fingerprint(value[0]) if value else None)
+    return str(value)[:VALUE_FINGERPRINT]        # Decimal، datetime، UUID و ...
+
+
+def query_key(sql: str, params) -> int:
+    """hash متن SQL و اثر انگشت محدود پارامترها؛ هزینه مستقل از تعداد و طول پارامترها"""
+    if isinstance(params, dict):
+        params = tuple(params.values())
+    if not params:
+        return hash(sql)
+    head = itertools.islice(params, PARAMS_FINGERPRINT)
+    return hash((sql, len(params), tuple(_value_fingerprint(value) for value in head)))
+
+
+class RequestProfile:
+    __slots__ = ('queries', 'db_ms', 'statements', 'calls', 'cache_hits', 'cache_misses', 'template_ms', '_template_depth')
+
+    def __init__(self):
+        self.queries         = 0
+        self.db_ms           = 0.0
+        self.statements      = {}    # sql → [تعداد، مجموع ms]
+        self.calls           = {}    # query_key → تعداد
+        self.cache_hits      = 0
+        self.cache_misses    = 0
+        self.template_ms     = 0.0
+        self._template_depth = 0
+
+    def record_query(self, sql: str, params, ms: float):
+        self.queries += 1
+        self.db_ms   += ms
+        entry = self.statements.get(sql)
+        if entry is None:
+            entry = self.statements[sql] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += ms
+        key = query_key(sql, params)
+        self.calls[key] = self.calls.get(key, 0) + 1
+
+    @property
+    def duplicates(self) -> int:
+        """کوئری‌هایی که با همان SQL و همان پارامترها (اثر انگشت) بیش از یک بار اجرا شده‌اند (اضافه‌ها)"""
+        return sum(n - 1 for n in self.calls.values() if n > 1)
+
+    def slowest(self, limit: int = 5) -> list:
+        return sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+
+    def most_repeated(self, limit: int = 5) -> list:
+        return [item for item in sorted(self.statements.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+                if item[1][0] > 1]
+
+
+# ── جمع‌آوری ──────────────────────────────────────────────────────────────
+
+def _query_wrapper(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(sql, params, (time.perf_counter() - start) * 1000)
+
+
+def _instrument_connection(connection, **kwargs):
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
+
+
+connection_created.connect(_instrument_connection)
+
+
+def _instrument_cache(cache):
+    """get / get_many روی خود نمونه (هر thread نمونه خودش را دارد) یک بار پوشانده می‌شوند"""
+    if getattr(cache, '_instrumented', False):
+        return
+    get, get_many = cache.get, cache.get_many
+
+    def counted_get(key, default=None, version=None):
+        value   = get(key, _MISS, version=version)
+        profile = _current.get()
+        if profile is not None:
+            if value is _MISS:
+                profile.cache_misses += 1
+            else:
+                profile.cache_hits += 1
+        return default if value is _MISS else value
+
+    def counted_get_many(keys, version=None):
+        keys    = list(keys)
+        found   = get_many(keys, version=version)
+        profile = _current.get()
+        if profile is not None:
+            profile.cache_hits   += len(found)
+            profile.cache_misses += len(keys) - len(found)
+        return found
+
+    cache.get, cache.get_many, cache._instrumented = counted_get, counted_get_many, True
+
+
+def _instrument_templates():
+    """مثل django.test.utils؛ فقط بیرونی‌ترین _render زمان‌گیری می‌شود (include / extends درونش‌اند)"""
+    if getattr(Template, '_instrumented', False):
+        return
+    render = Template._render
+
+    def timed_render(self, context):
+        profile = _current.get()
+        if profile is None:
+            return render(self, context)
+        profile._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            profile._template_depth -= 1
+            if not profile._template_depth:
+                profile.template_ms += (time.perf_counter() - start) * 1000
+
+    Template._render, Template._instrumented = timed_render, True
+
+
+# ── هیستوگرام به ازای نام URL ─────────────────────────────────────────────
+
+class Histograms:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def observe(self, name: str, ms: float, queries: int = None):
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                entry = self._data[name] = {
+                    'count': 0, 'sum_ms': 0.0, 'time': [0] * (len(TIME_BUCKETS) + 1),
+                    'sampled': 0, 'sum_queries': 0, 'queries': [0] * (len(QUERY_BUCKETS) + 1),
+                }
+            entry['count']  += 1
+            entry['sum_ms'] += ms
+            entry['time'][bisect.bisect_left(TIME_BUCKETS, ms)] += 1
+            if queries is not None:
+                entry['sampled']     += 1
+                entry['sum_queries'] += queries
+                entry['queries'][bisect.bisect_left(QUERY_BUCKETS, queries)] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {**entry, 'time': list(entry['time']), 'queries': list(entry['queries'])}
+                for name, entry in self._data.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
+histograms = Histograms()
+
+
+# ── middleware ────────────────────────────────────────────────────────────
+
+class InstrumentationMiddleware:
+    """
+    INSTRUMENTATION_SAMPLE_RATE    سهم درخواست‌هایی که کوئری / کش / قالبشان شمرده می‌شود (0 تا 1)
+    INSTRUMENTATION_SLOW_MS        آستانه log درخواست کند؛ 0 = خاموش
+    INSTRUMENTATION_SERVER_TIMING  True (همه)، 'staff' یا False
+    """
+
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response  = get_response
+        self.sample_rate   = getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 1.0)
+        self.slow_ms       = getattr(settings, 'INSTRUMENTATION_SLOW_MS', 500)
+        self.server_timing = getattr(settings, 'INSTRUMENTATION_SERVER_TIMING', 'staff')
+        self.async_mode    = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        _instrument_templates()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        if not self._sampled():
+            response = self.get_response(request)
+            histograms.observe(self._name(request), (time.perf_counter() - start) * 1000)
+            return response
+
+        profile, token = self._begin(request)
+        try:
+            response = self.get_response(request)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, profile, start, self._show_timing(request))
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        if not self._sampled():
+            response = await self.get_response(request)
+            histograms.observe(self._name(request), (time.perf_counter() - start) * 1000)
+            return response
+
+        profile, token = self._begin(request)
+        try:
+            response = await self.get_response(request)
+            if hasattr(response, 'render') and not response.is_rendered:
+                await sync_to_async(response.render)()
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, profile, start, await self._ashow_timing(request))
+
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    @staticmethod
+    def _begin(request) -> tuple:
+        profile = request.instrumentation_profile = RequestProfile()   # main/metrics.py هم می‌خواند
+        token   = _current.set(profile)
+        for alias in settings.CACHES:
+            _instrument_cache(caches[alias])
+        for connection in connections.all(initialized_only=True):
+            _instrument_connection(connection)      # اتصال‌هایی که پیش از این ماژول باز شده‌اند
+        return profile, token
+
+    def _finish(self, request, response, profile: RequestProfile, start: float, show_timing: bool):
+        total = (time.perf_counter() - start) * 1000
+        name  = self._name(request)
+        histograms.observe(name, total, profile.queries)
+        if show_timing:
+            response['Server-Timing'] = self._header(profile, total)
+        if self.slow_ms and total >= self.slow_ms:
+            self._log_slow(request, name, profile, total)
+        return response
+
+    @staticmethod
+    def _name(request) -> str:
+        match = getattr(request, 'resolver_match', None)
+        return match.view_name if match else '<unresolved>'
+
+    def _show_timing(self, request) -> bool:
+        if self.server_timing == 'staff':
+            user = getattr(request, 'user', None)
+            return bool(user is not None and user.is_staff)
+        return bool(self.server_timing)
+
+    async def _ashow_timing(self, request) -> bool:
+        if self.server_timing == 'staff':
+            # request.user تنبل است و در event loop نمی‌تواند کوئری بزند
+            user = await request.auser() if hasattr(request, 'auser') else None
+            return bool(user is not None and user.is_staff)
+        return bool(self.server_timing)
+
+    @staticmethod
+    def _header(profile: RequestProfile, total: float) -> str:
+        app = max(total - profile.db_ms - profile.template_ms, 0)
+        return ', '.join([
+            f'db;dur={profile.db_ms:.1f};desc="{profile.queries} queries"',
+            f'dup;desc="{profile.duplicates} duplicate queries"',
+            f'cache;desc="{profile.cache_hits} hit / {profile.cache_misses} miss"',
+            f'tpl;dur={profile.template_ms:.1f};desc="templates (incl. lazy queries)"',
+            f'app;dur={app:.1f}',
+            f'total;dur={total:.1f}',
+        ])
+
+    @staticmethod
+    def _log_slow(request, name: str, profile: RequestProfile, total: float):
+        lines = [
+            f'slow request {request.method} {request.path} ({name}): {total:.0f}ms, '
+            f'{profile.queries} queries / {profile.db_ms:.0f}ms, {profile.duplicates} duplicates, '
+            f'templates {profile.template_ms:.0f}ms, cache {profile.cache_hits}/{profile.cache_misses} (pid {os.getpid()})',
+        ]
+        for title, items in (('slowest', profile.slowest()), ('repeated', profile.most_repeated())):
+            for sql, (count, ms) in items:
+                lines.append(f'  [{title}] {count}× {ms:.1f}ms  {sql[:500]}')
+        logger.warning('\n'.join(lines))
+
+
+@staff_member_required
+def instrumentation_stats(request):
+    """هیستوگرام‌های همین پردازه (هر worker گونیکورن جدا می‌شمارد)؛ ?reset=1 صفر می‌کند"""
+    data = histograms.snapshot()
+    if request.GET.get('reset') == '1':
+        histograms.reset()
+    return JsonResponse({
+        'pid':           os.getpid(),
+        'time_buckets':  list(TIME_BUCKETS) + ['+Inf'],
+        'query_buckets': list(QUERY_BUCKETS) + ['+Inf'],
+        'views':         data,
+    }, json_dumps_params={'ensure_ascii': False})
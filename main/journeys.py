@@ -0,0 +1,135 @@
+"""
+main/journeys.py
+مسیرهای اصلی کاربر برای بنچمارک تکرارپذیر (manage.py benchmark_journeys)
+
+  browse:   (کاربر واردشده) خانه → دسته‌بندی → جزئیات کتاب → صفحه خواندن → ورق زدن (page-api) → پادکست و دوره
+  purchase: شروع خرید کتاب پولی → callback موفق زرین‌پال
+  login:    ارسال OTP → تأیید کد → پروفایل
+
+همه چیز آفلاین است: پیامک و درگاه با offline_services() جایگزین می‌شوند. برای هر درخواست
+زمان پاسخ و تعداد کوئری (از پروفایل main/instrumentation.py) ثبت می‌شود.
+"""
+import statistics
+import time
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+from django.urls import reverse
+
+PAGE_FLIPS = 5
+
+
+class Run:
+    """اجرای مسیرها با یک Client و ثبت نمونه‌ها به ازای نام گام"""
+
+    def __init__(self, client, data: dict):
+        self.client    = client
+        self.data      = data
+        self.samples   = {}      # گام → [(ms, کوئری)]
+        self.errors    = []
+        self.otp_codes = {}
+        self._cursor   = {}
+
+    def next(self, kind: str):
+        """مورد بعدی از data[kind] به‌صورت چرخشی؛ هر تکرار روی ردیف دیگری اجرا می‌شود"""
+        items = self.data[kind]
+        index = self._cursor.get(kind, 0)
+        self._cursor[kind] = index + 1
+        return items[index % len(items)]
+
+    def request(self, step: str, method: str, path: str, expect: int = 200, **kwargs):
+        start    = time.perf_counter()
+        response = getattr(self.client, method)(path, **kwargs)
+        elapsed  = (time.perf_counter() - start) * 1000
+        profile  = getattr(response.wsgi_request, 'instrumentation_profile', None)
+        self.samples.setdefault(step, []).append((elapsed, profile.queries if profile else None))
+        if response.status_code != expect:
+            self.errors.append(f'{step}: {method.upper()} {path} → HTTP {response.status_code} (expected {expect})')
+        return response
+
+    def get(self, step: str, path: str, expect: int = 200, **kwargs):
+        return self.request(step, 'get', path, expect, **kwargs)
+
+    def post(self, step: str, path: str, data: dict = None, expect: int = 302, **kwargs):
+        return self.request(step, 'post', path, expect, data=data or {}, **kwargs)
+
+
+# ── مسیرها ────────────────────────────────────────────────────────────────
+
+def browse(run: Run):
+    book = run.next('books')
+    run.client.force_login(run.next('readers'))     # صفحه خواندن نیاز به ورود دارد
+    run.get('home', '/')
+    run.get('category', reverse('books:books_by_category', args=[book.category.slug]))
+    run.get('book_detail', reverse('books:book_detail', args=[book.slug]))
+    run.get('reader', reverse('books:book_reader', args=[book.slug]) + '?page=1')
+    page_api = reverse('books:book_page_api', args=[book.slug])
+    for page in range(2, PAGE_FLIPS + 2):
+        run.get('page_flip', f'{page_api}?page={page}')
+    run.get('podcast_detail', reverse('podcasts:podcast_detail', args=[run.next('podcasts').slug]))
+    run.get('course_detail', reverse('courses:course_detail', args=[run.next('courses').slug]))
+    run.client.logout()
+
+
+def purchase(run: Run):
+    from purchase.models import Purchase
+
+    user, book = run.next('buyers'), run.next('paid_books')
+    run.client.force_login(user)
+    run.post('purchase_start', reverse('purchase:start', args=['book', book.pk]))
+    ref_id = Purchase.objects.filter(user=user, object_id=book.pk).values_list('ref_id', flat=True).last()
+    run.get('purchase_callback', reverse('purchase:callback', args=[ref_id]) + '?Status=OK&Authority=BENCH')
+    run.client.logout()
+
+
+def login(run: Run):
+    phone = run.next('phones')
+    run.post('otp_send', reverse('account:send_code'), {'phone': phone[1:]})
+    run.post('otp_verify', reverse('account:verify_code'), {'code': run.otp_codes.get(phone, '')})
+    run.get('profile', reverse('account:profile'))
+    run.client.logout()
+
+
+JOURNEYS = {'browse': browse, 'purchase': purchase, 'login': login}
+
+
+@contextmanager
+def offline_services(run: Run):
+    """پیامک کد را در run.otp_codes نگه می‌دارد؛ درگاه همیشه authority می‌دهد و verify موفق است"""
+
+    async def asend_otp_sms(phone, code):
+        run.otp_codes[phone] = code
+        return True
+
+    def request_payment(amount_toman, description, callback_url, mobile=''):
+        return {'ok': True, 'authority': 'BENCH', 'gateway_url': 'https://gateway.invalid/StartPay/BENCH'}
+
+    async def arequest_payment(amount_toman, description, callback_url, mobile=''):
+        return request_payment(amount_toman, description, callback_url, mobile)
+
+    def verify_payment(authority, amount):
+        return {'ok': True, 'ref_id': '1'}
+
+    async def averify_payment(authority, amount):
+        return verify_payment(authority, amount)
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch('account.views.asend_otp_sms', asend_otp_sms))
+        stack.enter_context(mock.patch('purchase.views.request_payment', request_payment))
+        stack.enter_context(mock.patch('purchase.views.arequest_payment', arequest_payment))
+        stack.enter_context(mock.patch('purchase.services.verify_payment', verify_payment))
+        stack.enter_context(mock.patch('purchase.services.averify_payment', averify_payment))
+        yield
+
+
+# ── آمار ──────────────────────────────────────────────────────────────────
+
+def summarize(samples: list) -> dict:
+    times   = sorted(ms for ms, _ in samples)
+    queries = [q for _, q in samples if q is not None]
+    return {
+        'n':       len(times),
+        'p50':     round(statistics.median(times), 2),
+        'p95':     round(statistics.quantiles(times, n=20)[18] if len(times) > 1 else times[0], 2),
+        'queries': max(queries) if queries else None,
+    }
@@ -0,0 +1,165 @@
+"""
+main/management/commands/benchmark_audio.py
+سنجش سرو صوت پادکست از مسیر کامل: /podcasts/<slug>/audio/ → لینک امضاشده → فایل (کامل و Range)
+
+یک فایل مصنوعی (پیش‌فرض ۶۴MB) در MEDIA_ROOT موقت و یک پادکست پولی با خرید موفق داخل یک
+تراکنش ساخته و در پایان rollback می‌شوند. MEDIA_ACCEL_REDIRECT_PREFIX خاموش می‌شود تا خود Django
+بایت‌ها را بفرستد. برای هر handler (wsgi با Client، asgi با AsyncClient) گزارش می‌شود:
+  link  — بررسی دسترسی و redirect به لینک امضاشده
+  full  — دانلود کل فایل
+  range — پرش‌های تصادفی پخش‌کننده (--range-kb از offset تصادفی، پاسخ 206)
+p50 / p95 زمان کامل پاسخ، p50 زمان اولین بایت، MB/s و رشد اوج حافظه پردازه (ru_maxrss)؛
+اوج حافظه باید نزدیک صفر بماند چون فایل بلوک به بلوک خوانده می‌شود، نه یکجا.
+
+    python manage.py benchmark_audio
+    python manage.py benchmark_audio --size-mb 256 --ranges 500 --handlers asgi
+"""
+import random
+import resource
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from account.models import User
+from podcast.models import Podcast
+from purchase.models import Purchase
+
+NAME  = 'podcasts/audio/benchmark.mp3'
+BLOCK = 1024 * 1024
+
+
+def _p95(times: list) -> float:
+    return statistics.quantiles(times, n=20)[18] if len(times) > 1 else times[0]
+
+
+class Command(BaseCommand):
+    help = 'بنچمارک سرو صوت پادکست (لینک امضاشده، فایل کامل و درخواست‌های Range) زیر WSGI و ASGI'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=int, default=64, help='اندازه فایل صوتی مصنوعی')
+        parser.add_argument('--full', type=int, default=5, help='تعداد دانلود کامل')
+        parser.add_argument('--ranges', type=int, default=200, help='تعداد درخواست Range')
+        parser.add_argument('--range-kb', type=int, default=256, help='اندازه هر بازه')
+        parser.add_argument('--handlers', nargs='+', choices=('wsgi', 'asgi'), default=['wsgi', 'asgi'])
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as media, override_settings(
+            MEDIA_ROOT=media, MEDIA_ACCEL_REDIRECT_PREFIX='', MEDIA_SIGNING_MODE='hmac',
+            ALLOWED_HOSTS=['testserver'], INSTRUMENTATION_SAMPLE_RATE=0.0,
+        ):
+            size = self._write_file(Path(media) / NAME, options['size_mb'])
+            with transaction.atomic():
+                user, url = self._seed()
+                self.stdout.write(
+                    f'{"handler":<8} {"step":<6} {"n":>5} {"p50":>9} {"p95":>9} {"ttfb p50":>9} {"MB/s":>8} {"+peak RSS":>10}'
+                )
+                for handler in options['handlers']:
+                    run  = self._wsgi if handler == 'wsgi' else async_to_sync(self._asgi)
+                    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                    self._report(handler, run(user, url, size, options), base)
+                transaction.set_rollback(True)
+
+    def _write_file(self, path: Path, size_mb: int) -> int:
+        path.parent.mkdir(parents=True)
+        block = random.Random(0).randbytes(BLOCK)
+        with path.open('wb') as f:
+            for _ in range(size_mb):
+                f.write(block)
+        return size_mb * BLOCK
+
+    def _seed(self) -> tuple:
+        user    = User.objects.create(phone_number='09990000000')
+        podcast = Podcast.objects.create(
+            title='بنچمارک صوت', slug='benchmark-audio', access_type='paid', price=20000, audio_file=NAME,
+        )
+        Purchase.objects.create(
+            user=user, content_type='podcast', object_id=podcast.pk, amount=20000, status=Purchase.Status.SUCCESS,
+        )
+        return user, reverse('podcasts:podcast_audio', args=[podcast.slug])
+
+    def _requests(self, size: int, options) -> list:
+        """ترتیب ثابت درخواست‌ها: چند دانلود کامل و سپس پرش‌های تصادفی"""
+        rng    = random.Random(options['seed'])
+        length = min(options['range_kb'] * 1024, size)
+        ranges = [rng.randrange(size - length + 1) for _ in range(options['ranges'])]
+        return (
+            [('full', {}, 200, size)] * options['full']
+            + [('range', {'Range': f'bytes={start}-{start + length - 1}'}, 206, length) for start in ranges]
+        )
+
+    # ── WSGI: Client و FileResponse sync ──
+    def _wsgi(self, user, url: str, size: int, options):
+        client = Client()
+        client.force_login(user)
+        links  = []
+        for _ in range(options['full']):
+            start    = time.perf_counter()
+            response = client.get(url)
+            links.append(((time.perf_counter() - start) * 1000, None, 0))
+        self._check(response, 302, None)
+        signed  = response['Location']
+        samples = {'link': links}
+        for step, headers, status, length in self._requests(size, options):
+            start    = time.perf_counter()
+            response = client.get(signed, headers=headers)
+            first, received = None, 0
+            for chunk in response.streaming_content:
+                first = first or time.perf_counter()
+                received += len(chunk)
+            self._check(response, status, (received, length))
+            samples.setdefault(step, []).append(self._sample(start, first, received))
+        return samples
+
+    # ── ASGI: AsyncClient و خواندن بلوک‌ها در thread pool (main.streaming.aread_blocks) ──
+    async def _asgi(self, user, url: str, size: int, options):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        links  = []
+        for _ in range(options['full']):
+            start    = time.perf_counter()
+            response = await client.get(url)
+            links.append(((time.perf_counter() - start) * 1000, None, 0))
+        self._check(response, 302, None)
+        signed  = response['Location']
+        samples = {'link': links}
+        for step, headers, status, length in self._requests(size, options):
+            start    = time.perf_counter()
+            response = await client.get(signed, headers=headers)
+            first, received = None, 0
+            async for chunk in response.streaming_content:
+                first = first or time.perf_counter()
+                received += len(chunk)
+            self._check(response, status, (received, length))
+            samples.setdefault(step, []).append(self._sample(start, first, received))
+        return samples
+
+    def _sample(self, start: float, first, received: int) -> tuple:
+        end = time.perf_counter()
+        return (end - start) * 1000, ((first or end) - start) * 1000, received
+
+    def _check(self, response, status: int, sizes):
+        if response.status_code != status:
+            raise CommandError(f'پاسخ {response.status_code} به‌جای {status}')
+        if sizes and sizes[0] != sizes[1]:
+            raise CommandError(f'{sizes[0]:,} بایت به‌جای {sizes[1]:,}')
+
+    def _report(self, handler: str, samples: dict, base: int):
+        # ru_maxrss فقط بالا می‌رود: رشد نسبت به شروع همین handler (KB در لینوکس)
+        peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) / 1024
+        for step, rows in samples.items():
+            times = [total for total, _, _ in rows]
+            ttfb  = [first for _, first, _ in rows if first is not None]
+            rate  = sum(size for _, _, size in rows) / 1024 / 1024 / (sum(times) / 1000)
+            self.stdout.write(
+                f'{handler:<8} {step:<6} {len(rows):>5} {statistics.median(times):>7.1f}ms {_p95(times):>7.1f}ms '
+                f'{(f"{statistics.median(ttfb):.1f}ms" if ttfb else "-"):>9} {(f"{rate:,.0f}" if rate else "-"):>8} '
+                f'{peak:>8.1f}MB'
+            )
@@ -0,0 +1,86 @@
+"""
+main/management/commands/benchmark_cards.py
+مقایسه زمان رندر صفحه‌های کاتالوگ با و بدون کش کارت‌ها ({% cachecard %})
+
+برای هر صفحه: میانگین و میانه زمان پاسخ بدون کش، و با کش گرم (بعد از یک درخواست اولیه)
+به‌همراه تعداد رفت‌وبرگشت‌های کش کارت در هر درخواست. روی داده واقعی یا seed شده اجرا شود.
+
+    python manage.py benchmark_cards
+    python manage.py benchmark_cards /books/ -n 50
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from main.templatetags import card_tags
+
+DEFAULT_PAGES = ('/', '/books/', '/courses/', '/podcasts/')
+
+
+class _CountingCache:
+    """شمارش فراخوانی‌های کش کارت (هر فراخوانی یک رفت‌وبرگشت به backend)"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self.cache, name)
+        if name in ('get', 'get_many', 'set', 'set_many'):
+            def counted(*args, **kwargs):
+                self.calls += 1
+                return attr(*args, **kwargs)
+            return counted
+        return attr
+
+
+class Command(BaseCommand):
+    help = 'بنچمارک زمان رندر صفحه‌های کاتالوگ با و بدون کش کارت'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES)
+        parser.add_argument('-n', '--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        host   = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        client = Client(HTTP_HOST=host)
+        n      = options['iterations']
+
+        counter = _CountingCache(card_tags.card_cache())
+        original, card_tags.card_cache = card_tags.card_cache, lambda: counter
+        try:
+            self.stdout.write(f'{"page":<16} {"uncached":>18} {"cached":>18} {"speedup":>8} {"cache calls":>12}')
+            for page in options['pages']:
+                with override_settings(CARD_CACHE_ENABLED=False):
+                    cold = self._time(client, page, n)
+                if cold is None:
+                    self.stdout.write(f'{page:<16} HTTP error')
+                    continue
+
+                client.get(page)            # گرم کردن کش
+                counter.calls = 0
+                warm  = self._time(client, page, n)
+                calls = counter.calls / n
+
+                self.stdout.write(
+                    f'{page:<16} {self._fmt(cold):>18} {self._fmt(warm):>18} '
+                    f'{statistics.mean(cold) / statistics.mean(warm):>7.2f}x {calls:>12.1f}'
+                )
+        finally:
+            card_tags.card_cache = original
+
+    def _time(self, client, page, n):
+        samples = []
+        for _ in range(n):
+            start    = time.perf_counter()
+            response = client.get(page)
+            samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                return None
+        return samples
+
+    def _fmt(self, samples) -> str:
+        return f'{statistics.mean(samples):.1f}ms (p50 {statistics.median(samples):.1f})'
@@ -0,0 +1,98 @@
+"""
+main/management/commands/benchmark_db_connections.py
+مقایسه زمان پاسخ با و بدون اتصال ماندگار دیتابیس (CONN_MAX_AGE)
+
+درخواست‌ها از WSGIHandler خود Django عبور می‌کنند تا سیگنال‌های request_started /
+request_finished مثل محیط واقعی اتصال‌ها را ببندند یا نگه دارند (test client این کار را نمی‌کند).
+برای هر حالت: میانگین، میانه و p95 زمان پاسخ و تعداد اتصال‌های تازه.
+
+    DJANGO_ENV=production ... python manage.py benchmark_db_connections
+    python manage.py benchmark_db_connections /books/ -n 200 --max-age 300
+"""
+import statistics
+import sys
+import time
+from io import BytesIO
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+DEFAULT_PAGES = ('/', '/books/', '/podcasts/')
+
+
+class Command(BaseCommand):
+    help = 'بنچمارک زمان پاسخ با و بدون اتصال ماندگار دیتابیس'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES)
+        parser.add_argument('-n', '--requests', type=int, default=100, help='تعداد درخواست هر حالت')
+        parser.add_argument('--max-age', type=int, default=60, help='CONN_MAX_AGE حالت ماندگار')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        alias   = options['database']
+        handler = WSGIHandler()
+        host    = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        created = []
+
+        def on_created(sender, connection, **kwargs):
+            if connection.alias == alias:
+                created.append(1)
+
+        connection_created.connect(on_created)
+        original = connections[alias].settings_dict['CONN_MAX_AGE']
+        try:
+            self.stdout.write(
+                f'{connections[alias].vendor}: {"CONN_MAX_AGE":<14} {"mean":>8} {"p50":>8} {"p95":>8} {"connects":>9}'
+            )
+            for max_age in (0, options['max_age']):
+                connections[alias].close()
+                connections[alias].settings_dict['CONN_MAX_AGE'] = max_age
+                created.clear()
+
+                samples = []
+                for i in range(options['requests']):
+                    page  = options['pages'][i % len(options['pages'])]
+                    start = time.perf_counter()
+                    self._request(handler, page, host)
+                    samples.append((time.perf_counter() - start) * 1000)
+
+                samples.sort()
+                p95 = samples[int(len(samples) * 0.95) - 1]
+                self.stdout.write(
+                    f'{"":<{len(connections[alias].vendor) + 2}}{max_age:<14} '
+                    f'{statistics.mean(samples):>6.1f}ms {statistics.median(samples):>6.1f}ms '
+                    f'{p95:>6.1f}ms {len(created):>9}'
+                )
+        finally:
+            connection_created.disconnect(on_created)
+            connections[alias].settings_dict['CONN_MAX_AGE'] = original
+            connections[alias].close()
+
+    def _request(self, handler, page: str, host: str):
+        environ = {
+            'REQUEST_METHOD':    'GET',
+            'PATH_INFO':         page,
+            'QUERY_STRING':      '',
+            'SERVER_NAME':       host,
+            'SERVER_PORT':       '80',
+            'HTTP_HOST':         host,
+            'SERVER_PROTOCOL':   'HTTP/1.1',
+            'wsgi.version':      (1, 0),
+            'wsgi.url_scheme':   'http',
+            'wsgi.input':        BytesIO(),
+            'wsgi.errors':       sys.stderr,
+            'wsgi.multithread':  False,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once':     False,
+        }
+        response = handler(environ, lambda status, headers, exc_info=None: None)
+        try:
+            for _ in response:
+                pass
+        finally:
+            # request_finished → close_old_connections (رفتار CONN_MAX_AGE)
+            response.close()
@@ -0,0 +1,83 @@
+"""
+main/management/commands/benchmark_exports.py
+سنجش زمان و حافظه خروجی جریانی خریدها روی داده مصنوعی (پیش‌فرض ۱ میلیون ردیف)
+
+خریدهای مصنوعی داخل یک تراکنش ساخته و در پایان rollback می‌شوند. برای هر فرمت
+زمان، ردیف در ثانیه و رشد اوج حافظه پردازه (ru_maxrss) گزارش می‌شود؛ با --compare همان
+خروجی با list(queryset) هم اندازه‌گیری می‌شود (آخر از همه، چون اوج حافظه فقط بالا می‌رود).
+
+    python manage.py benchmark_exports
+    python manage.py benchmark_exports --rows 200000 --compare
+"""
+import datetime
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from account.models import User
+from main.exports import EXPORTS, WRITERS, export_chunks, export_queryset
+from purchase.models import Purchase
+
+CONTENT_TYPES = [choice for choice, _ in Purchase.ContentType.choices]
+STATUSES      = [choice for choice, _ in Purchase.Status.choices]
+
+
+class Command(BaseCommand):
+    help = 'بنچمارک خروجی جریانی CSV / JSONL روی خریدهای مصنوعی'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--users', type=int, default=5_000)
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--compare', action='store_true', help='مقایسه با list(queryset)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._seed(options['rows'], options['users'])
+            self.stdout.write(f'{"mode":<16} {"rows":>9} {"time":>8} {"rows/s":>10} {"+peak RSS":>10} {"output":>9}')
+            for fmt in WRITERS:
+                self._measure(f'stream {fmt}', lambda: export_chunks('purchases', fmt, chunk_size=options['chunk_size']))
+            if options['compare']:
+                headers = [header for header, _ in EXPORTS['purchases']['columns']]
+                self._measure('list() csv', lambda: WRITERS['csv'](headers, list(export_queryset('purchases'))))
+            transaction.set_rollback(True)
+
+    def _seed(self, rows: int, users: int):
+        start = time.perf_counter()
+        User.objects.bulk_create(
+            [User(phone_number=f'0999{i:07d}') for i in range(users)], batch_size=5000,
+        )
+        user_ids = list(User.objects.filter(phone_number__startswith='0999').values_list('pk', flat=True))
+        batch    = []
+        for i in range(rows):
+            batch.append(Purchase(
+                ref_id=f'BENCH{i:011d}', user_id=user_ids[i % len(user_ids)],
+                content_type=CONTENT_TYPES[i % len(CONTENT_TYPES)], object_id=i % 500 + 1,
+                amount=(i % 40 + 1) * 10_000, status=STATUSES[i % len(STATUSES)],
+            ))
+            if len(batch) == 10_000:
+                Purchase.objects.bulk_create(batch)
+                batch.clear()
+        Purchase.objects.bulk_create(batch)
+        # نیمی از ردیف‌ها شش ماه قبل (created_at با auto_now_add ساخته می‌شود)
+        Purchase.objects.filter(ref_id__startswith='BENCH', object_id__lte=250).update(
+            created_at=timezone.now() - datetime.timedelta(days=180),
+        )
+        self.stdout.write(f'seeded {rows:,} purchases in {time.perf_counter() - start:.1f}s')
+
+    def _measure(self, label: str, make_chunks):
+        base  = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start, size, rows = time.perf_counter(), 0, 0
+        for chunk in make_chunks():
+            size += len(chunk.encode())
+            rows += chunk.count('\n')
+        elapsed = time.perf_counter() - start
+        peak    = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) * 1024   # KB در لینوکس
+        rows -= 1 if label.endswith('csv') else 0   # سطر عنوان
+        self.stdout.write(
+            f'{label:<16} {rows:>9,} {elapsed:>7.1f}s {rows / elapsed:>10,.0f} '
+            f'{peak / 1024 / 1024:>8.1f}MB {size / 1024 / 1024:>7.1f}MB'
+        )
@@ -0,0 +1,164 @@
+"""
+main/management/commands/benchmark_gateway.py
+چند تماس درگاه همزمان در یک worker؟ — start_purchase زیر WSGI (thread) در برابر ASGI (event loop)
+
+یک زرین‌پال جعلی با تأخیر --delay روی uvicorn محلی بالا می‌آید و بیشترین تعداد تماس همزمانی را
+که به آن رسیده می‌شمارد. سپس --requests درخواست POST /purchase/start/ با --concurrency کاربر همزمان
+به یک worker فرستاده می‌شود:
+  - wsgi: هر thread یک درخواست (مثل worker گونیکورن با --threads)؛ هر تماس درگاه یک thread را نگه می‌دارد
+  - asgi: یک event loop (مثل UvicornWorker)؛ view async در انتظار درگاه فقط یک coroutine است
+
+داده با prefix «gwbench» ساخته و در پایان پاک می‌شود.
+
+    python manage.py benchmark_gateway
+    python manage.py benchmark_gateway --mode asgi --concurrency 500 --requests 2000 --delay 1000
+"""
+import asyncio
+import json
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import uvicorn
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from main.synthetic import CatalogGenerator
+from purchase.models import Purchase
+
+
+class FakeGateway:
+    """ASGI app زرین‌پال جعلی؛ فقط از loop خودش صدا زده می‌شود، پس شمارنده‌ها قفل نمی‌خواهند"""
+
+    def __init__(self, delay: float):
+        self.delay    = delay
+        self.inflight = 0
+        self.peak     = 0
+        self.calls    = 0
+        self.server   = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        while (await receive()).get('more_body'):
+            pass
+        self.calls    += 1
+        self.inflight += 1
+        self.peak      = max(self.peak, self.inflight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.inflight -= 1
+        body = json.dumps({'data': {'code': 100, 'authority': f'A{self.calls:035d}'}, 'errors': []}).encode()
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def reset(self):
+        self.inflight = self.peak = self.calls = 0
+
+    def start(self) -> str:
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        self.server = uvicorn.Server(uvicorn.Config(self, lifespan='off', log_level='warning', backlog=4096))
+        threading.Thread(target=self.server.run, kwargs={'sockets': [sock]}, daemon=True).start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return 'http://127.0.0.1:%d/pg/v4/payment/request.json' % sock.getsockname()[1]
+
+    def stop(self):
+        self.server.should_exit = True
+
+
+class Command(BaseCommand):
+    help = 'بیشترین تماس همزمان درگاه در یک worker: start_purchase زیر WSGI و ASGI'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=('wsgi', 'asgi', 'both'), default='both')
+        parser.add_argument('-c', '--concurrency', type=int, default=200, help='کاربران همزمان')
+        parser.add_argument('-n', '--requests', type=int, default=600)
+        parser.add_argument('--delay', type=int, default=300, help='تأخیر درگاه جعلی (ms)')
+        parser.add_argument('--threads', type=int, default=4, help='threadهای worker در حالت wsgi')
+
+    def handle(self, *args, **options):
+        gen     = CatalogGenerator(seed=1, prefix='gwbench', phones='0992')
+        gateway = FakeGateway(options['delay'] / 1000)
+        if Purchase.objects.filter(user__phone_number__startswith=gen.phones).exists():
+            raise CommandError('داده اجرای قبلی مانده است؛ ابتدا seed_catalog --flush-only --prefix gwbench --phones 0992')
+
+        users = gen.users(max(options['threads'], 1))
+        book  = gen.books(1, pages_per_book=1, chapters_per_book=1, paid_ratio=1.0)[0]
+        path  = reverse('purchase:start', args=['book', book.pk])
+        url   = gateway.start()
+        self.stdout.write(
+            f'gateway delay {options["delay"]}ms, {options["requests"]} requests, concurrency {options["concurrency"]}'
+        )
+        self.stdout.write(f'{"mode":<6} {"workers":<14} {"peak in-flight":>14} {"req/s":>8} {"p50":>9} {"p95":>9}')
+        try:
+            with mock.patch('purchase.zarinpal.REQUEST_URL', url), override_settings(
+                ALLOWED_HOSTS=['testserver'], INSTRUMENTATION_SLOW_MS=0,
+            ):
+                for mode in (('wsgi', 'asgi') if options['mode'] == 'both' else (options['mode'],)):
+                    gateway.reset()
+                    started = time.perf_counter()
+                    if mode == 'wsgi':
+                        times  = self._wsgi(path, users, options)
+                        worker = f'{options["threads"]} thread(s)'
+                    else:
+                        with override_settings(ASGI=True):
+                            times = asyncio.run(self._asgi(path, users[0], options))
+                        worker = '1 event loop'
+                    wall = time.perf_counter() - started
+                    self._report(mode, worker, gateway, times, wall)
+        finally:
+            gateway.stop()
+            Purchase.objects.filter(user__in=users).delete()
+            gen.flush()
+
+    def _wsgi(self, path: str, users: list, options) -> list:
+        local = threading.local()
+        slots = iter(users)
+        lock  = threading.Lock()
+
+        def one(_):
+            if not hasattr(local, 'client'):
+                with lock:
+                    user = next(slots)
+                local.client = Client()
+                local.client.force_login(user)
+            start    = time.perf_counter()
+            response = local.client.post(path)
+            return self._sample(response, start)
+
+        with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+            return list(pool.map(one, range(options['requests'])))
+
+    async def _asgi(self, path: str, user, options) -> list:
+        client = AsyncClient()
+        await client.aforce_login(user)
+        limit = asyncio.Semaphore(options['concurrency'])
+
+        async def one():
+            async with limit:
+                start    = time.perf_counter()
+                response = await client.post(path)
+                return self._sample(response, start)
+
+        return await asyncio.gather(*(one() for _ in range(options['requests'])))
+
+    @staticmethod
+    def _sample(response, start: float) -> float:
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code != 302 or 'StartPay' not in response.get('Location', ''):
+            raise CommandError(f'start_purchase → HTTP {response.status_code} {response.get("Location", "")}')
+        return elapsed
+
+    def _report(self, mode: str, worker: str, gateway: FakeGateway, times: list, wall: float):
+        p95 = statistics.quantiles(times, n=20)[18] if len(times) > 1 else times[0]
+        self.stdout.write(
+            f'{mode:<6} {worker:<14} {gateway.peak:>14} {len(times) / wall:>8.1f} '
+            f'{statistics.median(times):>7.0f}ms {p95:>7.0f}ms'
+        )
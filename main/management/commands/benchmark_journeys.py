@@ -0,0 +1,148 @@
+"""
+main/management/commands/benchmark_journeys.py
+بنچمارک تکرارپذیر مسیرهای اصلی کاربر (main/journeys.py) روی داده مصنوعی و مقایسه با baseline
+
+داده با main/synthetic.py داخل یک تراکنش ساخته و در پایان rollback می‌شود؛ پیامک و درگاه
+پرداخت جایگزین آفلاین دارند. برای هر گام p50 / p95 زمان پاسخ و بیشترین تعداد کوئری گزارش و با
+فایل baseline مقایسه می‌شود. پسرفت (p50 و p95 هر دو کندتر از tolerance، یا کوئری بیشتر) خروجی غیرصفر دارد.
+
+    python manage.py benchmark_journeys --save-baseline          # ثبت baseline روی همین ماشین
+    python manage.py benchmark_journeys                          # مقایسه (مثلاً در CI)
+    python manage.py benchmark_journeys --journeys browse -n 50 --books 500 --pages 300
+"""
+import datetime
+import json
+import platform
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+
+from book.models import Book
+from main.journeys import JOURNEYS, Run, offline_services, summarize
+from main.synthetic import CatalogGenerator
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'perf-baseline.json'
+
+
+class Command(BaseCommand):
+    help = 'بنچمارک مسیرهای اصلی کاربر (p50 / p95 / کوئری) و مقایسه با baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--iterations', type=int, default=20, help='تکرار هر مسیر')
+        parser.add_argument('--journeys', nargs='+', choices=list(JOURNEYS), default=list(JOURNEYS))
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--books', type=int, default=60)
+        parser.add_argument('--pages', type=int, default=40, help='صفحه هر کتاب')
+        parser.add_argument('--podcasts', type=int, default=200)
+        parser.add_argument('--courses', type=int, default=30)
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--purchases', type=int, default=2000)
+        parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+        parser.add_argument('--save-baseline', action='store_true', help='نتیجه را baseline جدید کن')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='کندی مجاز p50 و p95 نسبت به baseline')
+        parser.add_argument('--noise-ms', type=float, default=2.0, help='اختلاف‌های کمتر از این نادیده گرفته می‌شوند')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            data = self._seed(options)
+            run  = self._run(data, options)
+            transaction.set_rollback(True)
+
+        if run.errors:
+            raise CommandError('خطا در اجرای مسیرها:\n  ' + '\n  '.join(list(dict.fromkeys(run.errors))[:10]))
+
+        results  = {step: summarize(samples) for step, samples in run.samples.items()}
+        baseline = self._load(options['baseline'])
+        regressions = self._report(results, baseline.get('steps', {}), options)
+
+        if options['save_baseline']:
+            options['baseline'].write_text(json.dumps({
+                'meta': {
+                    'created':  datetime.datetime.now().isoformat(timespec='seconds'),
+                    'database': connection.vendor,
+                    'python':   platform.python_version(),
+                    'django':   django.get_version(),
+                    'scale':    {key: options[key] for key in ('books', 'pages', 'podcasts', 'courses', 'users', 'purchases')},
+                },
+                'steps': results,
+            }, indent=2, ensure_ascii=False) + '\n')
+            self.stdout.write(f'baseline → {options["baseline"]}')
+        elif regressions:
+            raise CommandError(f'{len(regressions)} پسرفت نسبت به baseline: {", ".join(regressions)}')
+
+    def _seed(self, options) -> dict:
+        gen      = CatalogGenerator(seed=options['seed'], prefix='bench')
+        books    = gen.books(options['books'], pages_per_book=options['pages'])
+        podcasts = gen.podcasts(options['podcasts'])
+        courses  = gen.courses(options['courses'])
+        users    = gen.users(options['users'])
+        gen.purchases(options['purchases'], users, {'book': books, 'podcast': podcasts, 'course': courses})
+
+        # خریداران و شماره‌های ورود جدا از کاربران دارای خرید، تا هر تکرار مسیر کامل را برود
+        fresh = gen.users(options['iterations'] + 1, start=options['users'])
+        paid  = [book for book in books if book.access_type == Book.AccessType.PAID]
+        if not paid:
+            raise CommandError('هیچ کتاب پولی ساخته نشد؛ --books را بیشتر کنید')
+        return {
+            'books':      list(Book.objects.filter(pk__in=[b.pk for b in books]).select_related('category').order_by('pk')),
+            'paid_books': paid,
+            'podcasts':   podcasts,
+            'courses':    courses,
+            'readers':    users,
+            'buyers':     fresh,
+            'phones':     [user.phone_number for user in fresh],
+        }
+
+    def _run(self, data: dict, options) -> Run:
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        with override_settings(
+            INSTRUMENTATION_SAMPLE_RATE=1.0, INSTRUMENTATION_SLOW_MS=0, INSTRUMENTATION_SERVER_TIMING=False,
+        ):
+            run = Run(Client(HTTP_HOST=host), data)
+            with offline_services(run):
+                for name in options['journeys']:
+                    JOURNEYS[name](run)             # گرم کردن (قالب‌ها، کش کارت‌ها)
+                run.samples.clear()
+                for _ in range(options['iterations']):
+                    for name in options['journeys']:
+                        JOURNEYS[name](run)
+        return run
+
+    def _load(self, path: Path) -> dict:
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text())
+
+    def _report(self, results: dict, baseline: dict, options) -> list:
+        tolerance, noise = options['tolerance'], options['noise_ms']
+        regressions = []
+        self.stdout.write(
+            f'{"step":<18} {"n":>4} {"p50":>8} {"p95":>8} {"queries":>8}   {"base p50":>9} {"base p95":>9} {"base q":>7}  verdict'
+        )
+        for step, result in results.items():
+            base    = baseline.get(step)
+            verdict = ''
+            if base:
+                # هر دو صدک باید جابه‌جا شوند؛ p95 تنها با یک نمونه پرت (GC) تکان می‌خورد
+                delta = {key: result[key] - base[key] for key in ('p50', 'p95')}
+                if all(delta[key] > noise and result[key] > base[key] * (1 + tolerance) for key in delta):
+                    verdict = f'SLOWER +{delta["p50"]:.1f}ms p50'
+                elif all(-delta[key] > noise and result[key] < base[key] * (1 - tolerance) for key in delta):
+                    verdict = f'faster {delta["p50"]:.1f}ms p50'
+                if (result['queries'] or 0) > (base['queries'] or 0):
+                    verdict = f'{verdict} QUERIES +{result["queries"] - (base["queries"] or 0)}'.strip()
+                if 'SLOWER' in verdict or 'QUERIES' in verdict:
+                    regressions.append(step)
+            self.stdout.write(
+                f'{step:<18} {result["n"]:>4} {result["p50"]:>6.1f}ms {result["p95"]:>6.1f}ms {result["queries"] or "-":>8}'
+                f'   {self._fmt(base, "p50"):>9} {self._fmt(base, "p95"):>9} {base["queries"] if base else "-":>7}  {verdict or ("ok" if base else "new")}'
+            )
+        return regressions
+
+    @staticmethod
+    def _fmt(base, key) -> str:
+        return f'{base[key]:.1f}ms' if base else '-'
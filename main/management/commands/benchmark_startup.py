@@ -0,0 +1,104 @@
+"""
+main/management/commands/benchmark_startup.py
+زمان اولین پاسخ بعد از بالا آمدن گونیکورن، با و بدون warm-up قالب‌ها
+
+برای هر حالت یک گونیکورن تک‌worker با gunicorn.conf.py پروژه اجرا می‌شود و اندازه‌گیری می‌شود:
+  ready  — از اجرای پردازه تا باز شدن پورت
+  first  — اولین پاسخ هر صفحه (کامپایل قالب‌ها اگر warm-up نشده باشد)
+  steady — پاسخ دوم همان صفحه
+
+روی پروفایل production اجرا شود تا cached loader فعال باشد:
+    DJANGO_ENV=production ... python manage.py benchmark_startup
+    python manage.py benchmark_startup /books/ /podcasts/ --runs 3
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PAGES = ('/', '/books/', '/podcasts/', '/courses/', '/account/login/')
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = 'بنچمارک زمان اولین پاسخ گونیکورن با و بدون warm-up قالب‌ها'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES)
+        parser.add_argument('--runs', type=int, default=3, help='تعداد اجرای هر حالت')
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stderr.write('هشدار: DEBUG فعال است و cached loader خاموش؛ نتیجه نماینده production نیست')
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+
+        self.stdout.write(f'{"warm-up":<8} {"ready":>9} {"first":>9} {"steady":>9}   first response per page')
+        for warmup in (False, True):
+            runs = [self._run(warmup, options['pages'], host, options['timeout']) for _ in range(options['runs'])]
+            ready  = statistics.median(r['ready'] for r in runs)
+            first  = statistics.median(sum(r['first'].values()) for r in runs)
+            steady = statistics.median(sum(r['steady'].values()) for r in runs)
+            pages  = '  '.join(
+                f'{p} {statistics.median(r["first"][p] for r in runs):.0f}' for p in options['pages']
+            )
+            self.stdout.write(
+                f'{"on" if warmup else "off":<8} {ready:>7.0f}ms {first:>7.0f}ms {steady:>7.0f}ms   {pages}'
+            )
+
+    def _run(self, warmup: bool, pages, host: str, timeout: float) -> dict:
+        port = _free_port()
+        env  = {
+            **os.environ,
+            'DJANGO_TEMPLATE_WARMUP': '1' if warmup else '0',
+            'GUNICORN_BIND':          f'127.0.0.1:{port}',
+            'GUNICORN_WORKERS':       '1',
+            'GUNICORN_ACCESS_LOG':    '/dev/null',
+        }
+        base  = Path(settings.BASE_DIR)
+        start = time.perf_counter()
+        proc  = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'core.wsgi', '-c', str(base / 'gunicorn.conf.py')],
+            cwd=base, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        try:
+            while True:
+                if proc.poll() is not None:
+                    raise CommandError(f'gunicorn exited: {proc.stderr.read().decode(errors="ignore")[-2000:]}')
+                if time.perf_counter() - start > timeout:
+                    raise CommandError('gunicorn did not start in time')
+                try:
+                    socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+                    break
+                except OSError:
+                    time.sleep(0.005)
+            result = {'ready': (time.perf_counter() - start) * 1000, 'first': {}, 'steady': {}}
+            for page in pages:
+                result['first'][page]  = self._get(port, page, host)
+                result['steady'][page] = self._get(port, page, host)
+            return result
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    def _get(self, port: int, page: str, host: str) -> float:
+        request = urllib.request.Request(f'http://127.0.0.1:{port}{page}', headers={'Host': host})
+        start = time.perf_counter()
+        try:
+            urllib.request.urlopen(request, timeout=30).read()
+        except urllib.error.HTTPError as e:
+            e.read()
+        return (time.perf_counter() - start) * 1000
@@ -0,0 +1,58 @@
+"""
+main/management/commands/build_critical_css.py
+ساخت CSS بحرانی هر صفحه (settings.CRITICAL_CSS) در static/critical/<name>.css
+
+بعد از تغییر CSS یا قالب‌ها اجرا و خروجی commit شود؛ در CI با --check بررسی می‌شود
+که خروجی‌ها به‌روز باشند.
+
+    python manage.py build_critical_css
+    python manage.py build_critical_css --check
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main import critical
+from main.staticfiles import bundles, read_static, _rebase_css
+
+
+class Command(BaseCommand):
+    help = 'استخراج CSS بحرانی هر صفحه برای inline شدن در <head>'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='فقط بررسی به‌روز بودن خروجی‌ها')
+        parser.add_argument('--output', default=str(Path(settings.BASE_DIR) / 'static'))
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        stale  = []
+
+        for name, conf in critical.crit_settings().items():
+            target = critical.critical_path(name)
+            vocab  = critical.vocabulary(conf['templates'])
+
+            css_parts, js_sources = [], [read_static('js/theme-manager.js') or b'']
+            for bundle in conf['bundles']:
+                for source in bundles()[bundle].get('css', []):
+                    content = read_static(source)
+                    if content is None:
+                        raise CommandError(f'{source} پیدا نشد')
+                    css_parts.append(_rebase_css(content.decode('utf-8'), source, target))
+                js_sources += [read_static(s) or b'' for s in bundles()[bundle].get('js', [])]
+            critical.add_js_vocabulary(vocab, (s.decode('utf-8', 'ignore') for s in js_sources))
+
+            full   = '\n'.join(css_parts)
+            result = critical.minify(critical.select(critical.parse(full), vocab)) + '\n'
+
+            path = output / target
+            if options['check']:
+                if not path.exists() or path.read_text() != result:
+                    stale.append(name)
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(result)
+            self.stdout.write(f'{name:<16} full={len(full.encode()):>7} critical={len(result.encode()):>6} bytes')
+
+        if stale:
+            raise CommandError(f'CSS بحرانی قدیمی است: {", ".join(stale)} — manage.py build_critical_css را اجرا کنید')
@@ -0,0 +1,137 @@
+"""
+main/management/commands/build_icons.py
+ساخت زیرمجموعه Font Awesome فقط با آیکون‌هایی که در قالب‌ها و JS استفاده شده‌اند
+
+خروجی (در مخزن commit می‌شود و جای CDN را می‌گیرد):
+    static/vendor/fontawesome/css/icons.css
+    static/vendor/fontawesome/webfonts/fa-solid-900.woff2, fa-regular-400.woff2, fa-brands-400.woff2
+
+بعد از اضافه کردن آیکون جدید به قالب‌ها دوباره اجرا شود. نیازمندی‌های فقط-توسعه:
+    pip install fontawesomefree fonttools brotli
+    python manage.py build_icons
+"""
+import importlib.util
+import json
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+ICON_RE = re.compile(r'\bfa-([a-z0-9]+(?:-[a-z0-9]+)*)')
+
+SCAN = (
+    ('templates', '*.html'),
+    ('static/js', '*.js'),
+)
+
+# (سبک، نام فونت، وزن، نام خانواده CSS)
+FONTS = (
+    ('solid',   'fa-solid-900',   900, 'Font Awesome 6 Free'),
+    ('regular', 'fa-regular-400', 400, 'Font Awesome 6 Free'),
+    ('brands',  'fa-brands-400',  400, 'Font Awesome 6 Brands'),
+)
+
+CORE_CSS = """\
+.fa,.fas,.far,.fab,.fa-solid,.fa-regular,.fa-brands{-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;display:var(--fa-display,inline-block);font-style:normal;font-variant:normal;line-height:1;text-rendering:auto}
+.fa,.fas,.far,.fa-solid,.fa-regular{font-family:"Font Awesome 6 Free"!important}
+.fab,.fa-brands{font-family:"Font Awesome 6 Brands"!important;font-weight:400}
+.fa,.fas,.fa-solid{font-weight:900}
+.far,.fa-regular{font-weight:400}
+.fa-fw{text-align:center;width:1.25em}
+.fa-spin{animation:fa-spin 2s linear infinite}
+@keyframes fa-spin{0%{transform:rotate(0)}to{transform:rotate(1turn)}}
+@media (prefers-reduced-motion:reduce){.fa-spin{animation:none}}
+"""
+
+
+def _default_source():
+    spec = importlib.util.find_spec('fontawesomefree')
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return Path(list(spec.submodule_search_locations)[0]) / 'static' / 'fontawesomefree'
+
+
+class Command(BaseCommand):
+    help = 'ساخت زیرمجموعه Font Awesome برای آیکون‌های استفاده‌شده در قالب‌ها'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', help='پوشه fontawesomefree (شامل metadata/ و webfonts/)')
+        parser.add_argument('--output', default=str(Path(settings.BASE_DIR) / 'static' / 'vendor' / 'fontawesome'))
+
+    def handle(self, *args, **options):
+        try:
+            from fontTools import subset
+        except ImportError:
+            raise CommandError('fonttools نصب نیست: pip install fonttools brotli')
+
+        source = Path(options['source']) if options['source'] else _default_source()
+        if source is None or not (source / 'metadata' / 'icons.json').exists():
+            raise CommandError('فایل‌های Font Awesome پیدا نشد: pip install fontawesomefree یا --source')
+
+        meta  = json.loads((source / 'metadata' / 'icons.json').read_text())
+        index = {}   # نام یا نام مستعار → (نام اصلی، codepoint)
+        for icon, data in meta.items():
+            if not data.get('free'):
+                continue
+            index[icon] = (icon, data['unicode'])
+            for alias in data.get('aliases', {}).get('names', []):
+                index.setdefault(alias, (icon, data['unicode']))
+
+        used = set()
+        base = Path(settings.BASE_DIR)
+        for folder, pattern in SCAN:
+            for path in (base / folder).rglob(pattern):
+                if 'vendor' in path.parts:
+                    continue
+                used.update(ICON_RE.findall(path.read_text(errors='ignore')))
+        names = sorted(n for n in used if n in index)
+
+        output = Path(options['output'])
+        (output / 'css').mkdir(parents=True, exist_ok=True)
+        (output / 'webfonts').mkdir(parents=True, exist_ok=True)
+
+        css = [
+            f'/* Font Awesome Free {self._version(source)} subset — generated by manage.py build_icons, do not edit.',
+            ' * Icons: CC BY 4.0, Fonts: SIL OFL 1.1, Code: MIT — https://fontawesome.com/license/free */',
+        ]
+        for style, font, weight, family in FONTS:
+            codepoints = {
+                int(index[n][1], 16) for n in names
+                if style in meta[index[n][0]]['free']
+            }
+            target = output / 'webfonts' / f'{font}.woff2'
+            if not codepoints:
+                target.unlink(missing_ok=True)
+                continue
+            self._subset(subset, source / 'webfonts' / f'{font}.ttf', target, codepoints)
+            css.append(
+                f'@font-face{{font-family:"{family}";font-style:normal;font-weight:{weight};'
+                f'font-display:block;src:url(../webfonts/{font}.woff2) format("woff2")}}'
+            )
+            self.stdout.write(f'{font}.woff2: {len(codepoints)} glyphs, {target.stat().st_size} bytes')
+
+        css.append(CORE_CSS.rstrip())
+        css += [f'.fa-{n}::before{{content:"\\{index[n][1]}"}}' for n in names]
+        (output / 'css' / 'icons.css').write_text('\n'.join(css) + '\n')
+
+        unknown = sorted(used - set(names) - {'spin', 'fw', 'solid', 'regular', 'brands'})
+        self.stdout.write(f'icons={len(names)} css={(output / "css" / "icons.css").stat().st_size} bytes')
+        if unknown:
+            self.stdout.write(f'ignored (not icons): {" ".join(unknown)}')
+
+    def _version(self, source: Path) -> str:
+        match = re.search(r'Font Awesome Free (\S+)', (source / 'css' / 'fontawesome.css').read_text()[:300])
+        return match.group(1) if match else ''
+
+    def _subset(self, subset, font_path: Path, target: Path, codepoints: set):
+        opts = subset.Options()
+        opts.flavor          = 'woff2'
+        opts.layout_features = []
+        opts.name_IDs        = ['*']
+        opts.notdef_outline  = True
+        font = subset.load_font(str(font_path), opts)
+        subsetter = subset.Subsetter(opts)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        subset.save_font(font, str(target), opts)
@@ -0,0 +1,79 @@
+"""
+main/management/commands/build_image_derivatives.py
+worker ساخت نسخه‌های کوچک‌شده AVIF / WebP برای تصاویر کاور، اسلایدر و بنر
+
+تصاویری که هنوز فایل json نسخه‌هایشان را ندارند (آپلودهای جدید) در یک
+process pool ساخته می‌شوند؛ ذخیره‌ی admin منتظر این کار نمی‌ماند.
+
+    python manage.py build_image_derivatives                  # حلقه دائمی (systemd service)
+    python manage.py build_image_derivatives --once -w 4      # ساخت نسخه‌های جاافتاده و خروج
+    python manage.py build_image_derivatives --once --force   # ساخت دوباره همه (بعد از تغییر عرض‌ها)
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main import images
+
+logger = logging.getLogger(__name__)
+
+
+def pending_names(force: bool = False, skip: set = frozenset()) -> list:
+    """نام فایل‌های تصویری که نسخه کوچک‌شده ندارند — فقط ستون فیلد خوانده می‌شود"""
+    names = set()
+    for label, field in images.SOURCES:
+        model = apps.get_model(label)
+        names.update(
+            model._default_manager.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+            .values_list(field, flat=True).distinct()
+        )
+    return sorted(n for n in names if n not in skip and (force or not images.is_built(n)))
+
+
+class Command(BaseCommand):
+    help = 'ساخت نسخه‌های کوچک‌شده AVIF / WebP تصاویر (worker آفلاین)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='ساخت نسخه‌های جاافتاده و خروج')
+        parser.add_argument('--force', action='store_true', help='ساخت دوباره نسخه‌های موجود')
+        parser.add_argument('--sleep', type=int, default=60, help='فاصله بررسی تصاویر جدید (ثانیه)')
+        parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 2, help='تعداد پردازه‌ها')
+
+    def handle(self, *args, **options):
+        widths, formats = images.widths(), images.formats()
+        force  = options['force']
+        failed = set()   # تصاویر خراب در این اجرا دوباره امتحان نمی‌شوند
+
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                names = pending_names(force, failed)
+                force = False
+                if not names:
+                    if options['once']:
+                        return
+                    time.sleep(options['sleep'])
+                    continue
+
+                started = time.monotonic()
+                jobs = {
+                    pool.submit(images.build, name, str(settings.MEDIA_ROOT), widths, formats): name
+                    for name in names
+                }
+                built = 0
+                for future in as_completed(jobs):
+                    name = jobs[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.warning('image derivatives failed for %s: %s', name, e)
+                        failed.add(name)
+                        continue
+                    images.forget(name)
+                    built += 1
+
+                self.stdout.write(f'built={built} failed={len(failed)} elapsed={time.monotonic() - started:.1f}s')
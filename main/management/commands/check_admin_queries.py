@@ -0,0 +1,76 @@
+"""
+main/management/commands/check_admin_queries.py
+رندر changelist همه مدل‌های admin با ۱۰۰ ردیف در صفحه و مقایسه تعداد کوئری با سقف
+
+هر changelist یک بار با ۱ ردیف و یک بار با --rows ردیف رندر می‌شود؛ اگر تعداد کوئری با
+تعداد ردیف بالا برود (N+1) یا از سقف (query_budget مدل یا settings.ADMIN_QUERY_BUDGET)
+بیشتر شود، دستور با خطا تمام می‌شود. main.tests.AdminQueryBudgetTests همین را در مجموعه تست
+بررسی می‌کند؛ این دستور برای داده واقعی (مثلاً نسخه staging) است:
+
+    python manage.py check_admin_queries
+    python manage.py check_admin_queries book main --rows 100 -v 2
+"""
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from main.querybudget import budget_for, measure_changelist
+
+
+class _NoChangelist(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'بررسی تعداد کوئری changelistهای admin (N+1 و سقف کوئری)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('app_labels', nargs='*', help='فقط این اپ‌ها')
+        parser.add_argument('--rows', type=int, default=100, help='ردیف در هر صفحه (list_per_page)')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        user     = get_user_model()(is_active=True, is_staff=True, is_superuser=True)
+        failures = []
+
+        self.stdout.write(f'{"model":<32} {"rows":>5} {"q@1":>5} {"q@rows":>7} {"budget":>7}')
+        for model, model_admin in sorted(admin.site._registry.items(), key=lambda i: i[0]._meta.label):
+            if options['app_labels'] and model._meta.app_label not in options['app_labels']:
+                continue
+            try:
+                single, _      = self._count(model_admin, user, 1)
+                queries, rows  = self._count(model_admin, user, options['rows'])
+            except _NoChangelist as e:
+                # مثلاً مدل‌های singleton که changelist آن‌ها به صفحه ویرایش redirect می‌شود
+                self.stdout.write(f'{model._meta.label:<32} skipped: {e}')
+                continue
+            except Exception as e:
+                failures.append(f'{model._meta.label}: {type(e).__name__}: {e}')
+                self.stdout.write(f'{model._meta.label:<32} error: {e}')
+                continue
+
+            budget   = budget_for(model_admin)
+            problems = []
+            if queries > budget:
+                problems.append('over budget')
+            if rows > 1 and queries > single:
+                problems.append(f'N+1 (+{queries - single})')
+            if problems:
+                failures.append(f'{model._meta.label}: {queries} queries at {rows} rows — {", ".join(problems)}')
+            self.stdout.write(
+                f'{model._meta.label:<32} {rows:>5} {single:>5} {queries:>7} {budget:>7}'
+                + (f'  {", ".join(problems)}' if problems else '')
+            )
+
+        if failures:
+            raise CommandError('\n'.join(['changelist query check failed:'] + failures))
+
+    def _count(self, model_admin, user, per_page: int) -> tuple:
+        """(تعداد کوئری، تعداد ردیف نمایش‌داده‌شده)"""
+        response, queries = measure_changelist(model_admin, user, per_page)
+        if self.verbosity > 1 and per_page > 1:
+            for query in queries:
+                self.stdout.write(f'    {query["sql"][:160]}')
+        if 'cl' not in (getattr(response, 'context_data', None) or {}):
+            raise _NoChangelist(f'HTTP {response.status_code}')
+        return len(queries), len(response.context_data['cl'].result_list)
@@ -0,0 +1,63 @@
+"""
+main/management/commands/export_data.py
+خروجی CSV / JSONL خریدها، تیکت‌ها یا کاربران (main/exports.py) در فایل یا stdout
+
+    python manage.py export_data purchases --since 2026-01-01 --until 2026-03-31 -o q1.csv.gz
+    python manage.py export_data users --format jsonl > users.jsonl
+"""
+import datetime
+import gzip
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.exports import CHUNK_SIZE, EXPORTS, WRITERS, export_chunks
+
+
+def _date(value: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'تاریخ نامعتبر: {value} (YYYY-MM-DD)')
+
+
+class Command(BaseCommand):
+    help = 'خروجی جریانی CSV / JSONL خریدها، تیکت‌ها یا کاربران'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=list(EXPORTS))
+        parser.add_argument('--format', default=None, choices=list(WRITERS), help='پیش‌فرض: از پسوند خروجی، وگرنه csv')
+        parser.add_argument('--since', type=_date, help='از این تاریخ (شامل)')
+        parser.add_argument('--until', type=_date, help='تا این تاریخ (شامل)')
+        parser.add_argument('-o', '--output', default='-', help='مسیر فایل (.gz فشرده می‌شود)؛ - برای stdout')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        output = options['output']
+        fmt    = options['format'] or ('jsonl' if '.jsonl' in output else 'csv')
+
+        if output == '-':
+            stream = None
+        elif output.endswith('.gz'):
+            stream = gzip.open(output, 'wt', encoding='utf-8', newline='')
+        else:
+            stream = open(output, 'w', encoding='utf-8', newline='')
+
+        start, written = time.perf_counter(), 0
+        try:
+            for chunk in export_chunks(
+                options['name'], fmt,
+                since=options['since'], until=options['until'], chunk_size=options['chunk_size'],
+            ):
+                if stream is None:
+                    self.stdout.write(chunk, ending='')
+                else:
+                    stream.write(chunk)
+                written += len(chunk)
+        finally:
+            if stream is not None:
+                stream.close()
+
+        self.stderr.write(
+            f'{options["name"]} → {output} ({fmt}): {written / 1024 / 1024:.1f}MB in {time.perf_counter() - start:.1f}s'
+        )
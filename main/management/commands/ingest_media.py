@@ -0,0 +1,142 @@
+"""
+main/management/commands/ingest_media.py
+worker آفلاین پردازش صوت پادکست‌ها و مدت درس‌ها
+
+  - پادکست‌هایی که فایل صوتی جدید دارند (audio_status=pending): اندازه‌گیری مدت،
+    ساخت نسخه سبک AAC هم‌بلند برای موبایل و پر کردن duration
+  - درس‌هایی که فایل دارند ولی duration=0 است: اندازه‌گیری مدت با ffprobe
+  - به‌روزرسانی Course.total_duration دوره‌های تغییرکرده
+
+کار ffmpeg در یک process pool (بدون دسترسی به دیتابیس) انجام می‌شود؛
+ذخیره‌ی admin فقط رکورد را در صف می‌گذارد و منتظر پردازش نمی‌ماند.
+
+    python manage.py ingest_media                 # حلقه دائمی (systemd service)
+    python manage.py ingest_media --once -w 4     # پردازش صف فعلی با ۴ پردازه و خروج
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.utils import timezone
+
+from course.models import Course, CourseLesson
+from podcast.ingest import build_mobile_rendition, mobile_name, probe_duration
+from podcast.models import Podcast
+
+logger = logging.getLogger(__name__)
+
+Status = Podcast.ProcessingStatus
+
+
+def claim_podcasts(limit: int) -> list:
+    """برداشتن پادکست‌های در صف و علامت‌گذاری PROCESSING (چند worker همزمان مجاز است)"""
+    with transaction.atomic():
+        podcasts = list(
+            Podcast.objects.select_for_update(skip_locked=True)
+            .filter(audio_status=Status.PENDING)
+            .exclude(audio_file='')
+            .order_by('pk')[:limit]
+        )
+        Podcast.objects.filter(pk__in=[p.pk for p in podcasts]).update(audio_status=Status.PROCESSING)
+    return podcasts
+
+
+def lessons_without_duration(limit: int, skip: set) -> list:
+    # درس‌های ویدیویی در صف HLS مدتشان را از transcode_lessons می‌گیرند
+    busy = (CourseLesson.ProcessingStatus.PENDING, CourseLesson.ProcessingStatus.PROCESSING)
+    return list(
+        CourseLesson.objects.filter(duration=0)
+        .exclude(video_file='')
+        .exclude(hls_status__in=busy)
+        .exclude(pk__in=skip)
+        .select_related('section')
+        .order_by('pk')[:limit]
+    )
+
+
+class Command(BaseCommand):
+    help = 'اندازه‌گیری مدت و ساخت نسخه سبک صوت پادکست‌ها (worker آفلاین)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='پردازش صف فعلی و خروج')
+        parser.add_argument('--sleep', type=int, default=30, help='فاصله بررسی صف وقتی خالی است (ثانیه)')
+        parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 2, help='تعداد پردازه‌های ffmpeg')
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--requeue-failed', action='store_true', help='پادکست‌های خطادار را دوباره در صف بگذار')
+
+    def handle(self, *args, **options):
+        if options['requeue_failed']:
+            n = Podcast.objects.filter(audio_status=Status.FAILED).update(audio_status=Status.PENDING)
+            self.stdout.write(f'requeued={n}')
+
+        bitrate  = getattr(settings, 'AUDIO_MOBILE_BITRATE', 64_000)
+        loudness = getattr(settings, 'AUDIO_LOUDNESS_LUFS', -16.0)
+        batch    = options['batch_size']
+        skipped  = set()   # درس‌هایی که در این اجرا قابل اندازه‌گیری نبودند
+
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                podcasts = claim_podcasts(batch)
+                lessons  = lessons_without_duration(batch, skipped)
+                if not podcasts and not lessons:
+                    if options['once']:
+                        return
+                    time.sleep(options['sleep'])
+                    continue
+
+                # پردازه‌های فرزند از اتصال دیتابیس والد استفاده نکنند
+                connections.close_all()
+                started = time.monotonic()
+
+                jobs = {}
+                for podcast in podcasts:
+                    name = mobile_name(podcast.pk, podcast.audio_file.name)
+                    dest = os.path.join(settings.MEDIA_ROOT, name)
+                    future = pool.submit(build_mobile_rendition, podcast.audio_file.path, dest, bitrate, loudness)
+                    jobs[future] = ('podcast', podcast, name)
+                for lesson in lessons:
+                    jobs[pool.submit(probe_duration, lesson.video_file.path)] = ('lesson', lesson, None)
+
+                counts  = {'podcasts': 0, 'lessons': 0, 'failed': 0}
+                courses = set()
+                for future in as_completed(jobs):
+                    kind, obj, name = jobs[future]
+                    try:
+                        duration = future.result()
+                    except Exception as e:
+                        logger.warning('ingest failed for %s %s: %s', kind, obj.pk, e)
+                        counts['failed'] += 1
+                        if kind == 'podcast':
+                            Podcast.objects.filter(pk=obj.pk, audio_status=Status.PROCESSING).update(
+                                audio_status=Status.FAILED, audio_error=str(e)[:2000],
+                            )
+                        else:
+                            skipped.add(obj.pk)
+                        continue
+
+                    if kind == 'podcast':
+                        # اگر در این فاصله فایل تازه‌ای آپلود شده باشد، وضعیت دیگر PROCESSING نیست
+                        Podcast.objects.filter(pk=obj.pk, audio_status=Status.PROCESSING).update(
+                            audio_status=Status.READY, audio_mobile=name, audio_error='', duration=duration,
+                            updated_at=timezone.now(),
+                        )
+                        counts['podcasts'] += 1
+                    else:
+                        if duration:
+                            CourseLesson.objects.filter(pk=obj.pk, duration=0).update(duration=duration)
+                            courses.add(obj.section.course_id)
+                        else:
+                            skipped.add(obj.pk)
+                        counts['lessons'] += 1
+
+                if courses:
+                    Course.refresh_total_duration(courses)
+
+                self.stdout.write(
+                    f"podcasts={counts['podcasts']} lessons={counts['lessons']} failed={counts['failed']} "
+                    f"courses={len(courses)} elapsed={time.monotonic() - started:.1f}s"
+                )
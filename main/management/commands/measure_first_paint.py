@@ -0,0 +1,110 @@
+"""
+main/management/commands/measure_first_paint.py
+برآورد زمان اولین رندر (first paint) هر صفحه، با و بدون CSS بحرانی
+
+مرورگر headless در دسترس نیست؛ مثل مدل Lighthouse (شبکه شبیه‌سازی‌شده)، زمان اولین
+رندر از روی منابع مسدودکننده <head> محاسبه می‌شود:
+    اتصال (DNS + TCP + TLS) + دریافت HTML + یک رفت‌وبرگشت و دریافت gzip همه CSS/JS مسدودکننده
+و هر دامنه خارجی یک اتصال جدید اضافه می‌کند. دریافت‌ها با TCP slow start (پنجره اولیه ۱۰ بسته ≈ 14KB)
+مدل می‌شوند؛ به همین دلیل HTML + CSS بحرانی زیر 14KB در یک رفت‌وبرگشت می‌رسد. پیش‌فرض‌ها مطابق پروفایل «4G کند» Lighthouse است.
+
+    python manage.py measure_first_paint
+    python manage.py measure_first_paint /books/ --rtt 300 --bandwidth 0.7
+"""
+import gzip
+import math
+import re
+from urllib.parse import urlsplit, unquote
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from main.management.commands.static_report import DEFAULT_PAGES, _kb
+from main.staticfiles import read_static
+
+HEAD_RE   = re.compile(r'<head>(.*?)</head>', re.S | re.I)
+NOSCRIPT  = re.compile(r'<noscript>.*?</noscript>', re.S | re.I)
+LINK_RE   = re.compile(r'<link\b[^>]*>', re.I)
+SCRIPT_RE = re.compile(r'<script\b([^>]*)>', re.I)
+STYLE_RE  = re.compile(r'<style\b[^>]*>(.*?)</style>', re.S | re.I)
+ATTR_RE   = re.compile(r'([\w-]+)\s*=\s*"([^"]*)"')
+
+INITIAL_WINDOW = 14_600   # initcwnd = 10 × 1460 bytes
+
+
+def round_trips(size: int) -> int:
+    """تعداد رفت‌وبرگشت‌های لازم برای دریافت size بایت روی اتصال تازه (پنجره هر بار دو برابر)"""
+    return max(1, math.ceil(math.log2(size / INITIAL_WINDOW + 1)))
+
+
+def blocking_resources(html: str) -> tuple:
+    """(آدرس منابع مسدودکننده، حجم CSS inline) در <head>"""
+    match = HEAD_RE.search(html)
+    head  = NOSCRIPT.sub('', match.group(1) if match else '')
+    urls  = []
+    for tag in LINK_RE.findall(head):
+        attrs = dict(ATTR_RE.findall(tag))
+        if attrs.get('rel') == 'stylesheet' and attrs.get('media', 'all') in ('all', 'screen'):
+            urls.append(attrs['href'])
+    for raw in SCRIPT_RE.findall(head):
+        attrs = dict(ATTR_RE.findall(raw))
+        if 'src' in attrs and not re.search(r'\b(defer|async)\b', raw) and attrs.get('type') != 'module':
+            urls.append(attrs['src'])
+    inline = sum(len(s.encode()) for s in STYLE_RE.findall(head))
+    return urls, inline
+
+
+class Command(BaseCommand):
+    help = 'برآورد زمان اولین رندر صفحه‌ها با و بدون CSS بحرانی'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES)
+        parser.add_argument('--rtt', type=float, default=150, help='رفت‌وبرگشت شبکه (ms)')
+        parser.add_argument('--bandwidth', type=float, default=1.6, help='پهنای باند دانلود (Mbps)')
+        parser.add_argument('--external-size', type=int, default=20_000,
+                            help='حجم فرضی (gzip) هر منبع خارجی که خوانده نمی‌شود (bytes)')
+
+    def handle(self, *args, **options):
+        host   = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        rtt    = options['rtt']
+        bps    = options['bandwidth'] * 1_000_000 / 8 / 1000   # bytes per ms
+
+        self.stdout.write(f'{"page":<24} {"":>8} {"blocking":>9} {"gzip":>8} {"inline":>8} {"first paint":>12}')
+        for page in options['pages']:
+            results = {}
+            for label, enabled in (('before', False), ('after', True)):
+                with override_settings(CRITICAL_CSS_ENABLED=enabled):
+                    response = Client(HTTP_HOST=host).get(page, follow=True)
+                if response.status_code != 200:
+                    self.stdout.write(f'{page:<24} HTTP {response.status_code}')
+                    break
+                html = response.content
+                urls, inline = blocking_resources(html.decode('utf-8', 'ignore'))
+
+                origins, size = set(), 0
+                for url in urls:
+                    netloc = urlsplit(url).netloc
+                    if netloc:
+                        origins.add(netloc)
+                        size += options['external_size']
+                    else:
+                        size += len(gzip.compress(self._read(url) or b'', compresslevel=9))
+
+                html_gz  = len(gzip.compress(html, compresslevel=9))
+                estimate = 3 * rtt + round_trips(html_gz) * rtt + html_gz / bps
+                if urls:
+                    estimate += round_trips(size) * rtt + size / bps + 3 * rtt * bool(origins)
+                results[label] = estimate
+                self.stdout.write(
+                    f'{page if label == "before" else "":<24} {label:>8} {len(urls):>9} {_kb(size):>8} '
+                    f'{_kb(inline):>8} {estimate:>10.0f}ms'
+                )
+            if len(results) == 2:
+                self.stdout.write(f'{"":<24} {"saving":>8} {results["before"] - results["after"]:>40.0f}ms')
+
+    def _read(self, url: str):
+        path = unquote(urlsplit(url).path)
+        if not path.startswith(settings.STATIC_URL):
+            return None
+        return read_static(path[len(settings.STATIC_URL):])
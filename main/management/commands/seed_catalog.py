@@ -0,0 +1,198 @@
+"""
+main/management/commands/seed_catalog.py
+ساخت کاتالوگ مصنوعی در مقیاس تولید برای سنجش ایندکس‌ها و کش (همه مدل‌های book، podcast، course، main و purchase)
+
+متن فارسی و همه مقادیر از main/synthetic.py می‌آیند و فقط به --seed بستگی دارند. کار به بازه‌های
+مستقل (shard) تقسیم و در چند پردازه با bulk_create اجرا می‌شود، پس خروجی با هر --workers یکی است
+(به‌جز pkها). سه مرحله:
+  1. ردیف‌های مشترک: دسته‌بندی‌ها، مجموعه پادکست، طرح اشتراک، تنظیمات سایت، اسلایدر، FAQ و راهنما
+  2. کتاب با فصل و صفحه، پادکست، دوره با بخش و درس، کاربران — موازی
+  3. خرید، سفارش با اقلام، اشتراک، خرید بایگانی‌شده، تیکت با پاسخ — موازی، روی خروجی مرحله ۲
+
+SQLite نوشتن‌ها را سریال می‌کند، پس پیش‌فرض آنجا یک پردازه است؛ روی PostgreSQL / MySQL همه هسته‌ها.
+
+    python manage.py seed_catalog --books 20000 --pages-per-book 300 --podcasts 50000
+    python manage.py seed_catalog --books 200 --podcasts 1000 --users 5000 --flush
+    python manage.py seed_catalog --flush-only
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from account.models import User
+from book.models import Book, BookCategory
+from course.models import Course, CourseCategory
+from main.synthetic import CatalogGenerator
+from podcast.models import Podcast, PodcastCategory
+
+SHARD = {
+    'books':         100,      # هر کتاب با صفحه‌هایش چند صد ردیف است
+    'podcasts':      5_000,
+    'courses':       500,
+    'users':         20_000,
+    'purchases':     20_000,
+    'orders':        5_000,
+    'subscriptions': 20_000,
+    'archived':      20_000,
+    'tickets':       5_000,
+}
+CATALOG    = ('books', 'podcasts', 'courses', 'users')
+DEPENDENTS = ('purchases', 'orders', 'subscriptions', 'archived', 'tickets')
+PARAMS     = ('seed', 'prefix', 'phones', 'pages_per_book', 'page_chars', 'series', 'users') + CATALOG + DEPENDENTS
+APPS       = ('account', 'book', 'podcast', 'course', 'main', 'purchase')
+
+_dependencies = {}   # کاربران و محتوای پولی، یک بار در هر پردازه
+
+
+# ── کار هر shard (در پردازه فرزند) ─────────────────────────────────────────
+
+def _paid_contents(gen: CatalogGenerator) -> tuple:
+    """کاربران و محتوای پولی مرحله ۲ به ترتیب کلید طبیعی (نه pk)، تا خروجی به تعداد پردازه بستگی نداشته باشد"""
+    key = (gen.seed, gen.prefix)
+    if key not in _dependencies:
+        users = list(
+            User.objects.filter(phone_number__startswith=gen.phones, password='').only('pk').order_by('phone_number')
+        )
+        contents = {
+            kind: list(
+                model.objects.filter(slug__startswith=f'{gen.prefix}-{kind}-', access_type='paid')
+                .only('pk', 'title', 'price', 'access_type').order_by('slug')
+            )
+            for kind, model in (('book', Book), ('podcast', Podcast), ('course', Course))
+        }
+        _dependencies[key] = (users, contents)
+    return _dependencies[key]
+
+
+def _generate(gen: CatalogGenerator, kind: str, start: int, count: int, params: dict) -> int:
+    if kind == 'books':
+        gen.books(count, start=start, pages_per_book=params['pages_per_book'], page_chars=params['page_chars'])
+    elif kind == 'podcasts':
+        gen.podcasts(count, start=start, series=params['series'])
+    elif kind == 'courses':
+        gen.courses(count, start=start)
+    elif kind == 'users':
+        gen.users(count, start=start)
+    elif kind == 'subscriptions':
+        users, _ = _paid_contents(gen)
+        return gen.subscriptions(count, users, start=start)
+    elif kind == 'tickets':
+        users, _ = _paid_contents(gen)
+        return gen.tickets(count, users, start=start)
+    else:
+        users, contents = _paid_contents(gen)
+        method = {'purchases': gen.purchases, 'orders': gen.orders, 'archived': gen.archived_purchases}[kind]
+        return method(count, users, contents, start=start)
+    return count
+
+
+def run_shard(kind: str, start: int, count: int, params: dict, now) -> tuple:
+    gen     = CatalogGenerator(seed=params['seed'], prefix=params['prefix'], phones=params['phones'], now=now)
+    started = time.perf_counter()
+    made    = _generate(gen, kind, start, count, params)
+    return kind, made, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'ساخت کاتالوگ مصنوعی فارسی در مقیاس تولید (bulk_create، قطعی، چندپردازه‌ای)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=2_000)
+        parser.add_argument('--pages-per-book', type=int, default=100)
+        parser.add_argument('--page-chars', type=int, default=2_000, help='طول تقریبی متن هر صفحه')
+        parser.add_argument('--podcasts', type=int, default=5_000)
+        parser.add_argument('--series', type=int, default=200, help='مجموعه‌های پادکست')
+        parser.add_argument('--courses', type=int, default=300)
+        parser.add_argument('--users', type=int, default=20_000)
+        parser.add_argument('--purchases', type=int, default=100_000)
+        parser.add_argument('--orders', type=int, default=10_000)
+        parser.add_argument('--subscriptions', type=int, default=5_000)
+        parser.add_argument('--archived', type=int, default=50_000, help='خریدهای بایگانی‌شده')
+        parser.add_argument('--tickets', type=int, default=5_000)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--prefix', default='seed', help='پیشوند اسلاگ / ref_id برای جداسازی و پاک‌کردن')
+        parser.add_argument('--phones', default='0991', help='چهار رقم اول شماره کاربران مصنوعی')
+        parser.add_argument('-w', '--workers', type=int, default=0, help='پیش‌فرض: ۱ روی SQLite، وگرنه تعداد هسته‌ها')
+        parser.add_argument('--flush', action='store_true', help='اول داده قبلی همین prefix را پاک کن')
+        parser.add_argument('--flush-only', action='store_true', help='فقط پاک کن و خارج شو')
+
+    def handle(self, *args, **options):
+        params  = {key: options[key] for key in PARAMS}
+        now     = timezone.now().replace(microsecond=0)
+        gen     = CatalogGenerator(seed=params['seed'], prefix=params['prefix'], phones=params['phones'], now=now)
+        workers = options['workers'] or (1 if connection.vendor == 'sqlite' else os.cpu_count() or 1)
+
+        if options['flush'] or options['flush_only']:
+            deleted = gen.flush()
+            self.stdout.write('flush: ' + ', '.join(f'{name}={n}' for name, n in deleted.items() if n))
+            if options['flush_only']:
+                return
+        if Book.objects.filter(slug__startswith=f'{gen.prefix}-').exists():
+            raise CommandError(f'داده‌ای با prefix «{gen.prefix}» از قبل هست؛ --flush یا --prefix دیگری بدهید')
+
+        self.stdout.write(f'{connection.vendor}, {workers} worker(s), seed={params["seed"]}, prefix={gen.prefix}')
+        started = time.perf_counter()
+        self._phase('shared', lambda: self._shared(gen, params))
+        verbose = options['verbosity'] >= 2
+        self._phase('catalog', lambda: self._parallel(CATALOG, params, now, workers, verbose))
+        self._phase('purchases', lambda: self._parallel(DEPENDENTS, params, now, workers, verbose))
+        self.stdout.write(f'total {time.perf_counter() - started:.1f}s')
+        self._table_sizes()
+
+    def _shared(self, gen: CatalogGenerator, params: dict):
+        gen.site()
+        gen.plans()
+        gen.categories(BookCategory, 'bookcat', 12)
+        gen.categories(PodcastCategory, 'podcat', 6)
+        gen.categories(CourseCategory, 'coursecat', 8)
+        gen.series(params['series'])
+
+    def _phase(self, name: str, run):
+        """made: نوع → (تعداد ردیف اصلی، مجموع زمان shardها)"""
+        started = time.perf_counter()
+        made    = run() or {}
+        wall    = time.perf_counter() - started
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{name}: {wall:.1f}s'))
+        for kind, (n, busy) in made.items():
+            self.stdout.write(f'  {kind:<14} {n:>10,}  {n / busy if busy else 0:>10,.0f}/s per worker')
+        if made:
+            total = sum(n for n, _ in made.values())
+            self.stdout.write(f'  {"total":<14} {total:>10,}  {total / wall:>10,.0f}/s wall')
+
+    def _parallel(self, kinds: tuple, params: dict, now, workers: int, verbose: bool) -> dict:
+        shards = [
+            (kind, start, min(SHARD[kind], params[kind] - start))
+            for kind in kinds for start in range(0, params[kind], SHARD[kind])
+        ]
+        made = {kind: (0, 0.0) for kind in kinds}
+
+        def collect(kind, n, seconds):
+            made[kind] = (made[kind][0] + n, made[kind][1] + seconds)
+            if verbose:
+                self.stdout.write(f'    {kind} +{n} ({seconds:.1f}s)')
+
+        if workers == 1:
+            for shard in shards:
+                collect(*run_shard(*shard, params, now))
+            return made
+
+        # فرزندها با fork ساخته می‌شوند (Django آماده است) و اتصال دیتابیس والد را به ارث نبرند
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+            for future in as_completed([pool.submit(run_shard, *shard, params, now) for shard in shards]):
+                collect(*future.result())
+        return made
+
+    def _table_sizes(self):
+        self.stdout.write(self.style.MIGRATE_HEADING('rows per table'))
+        for label in APPS:
+            for model in apps.get_app_config(label).get_models():
+                count = model.objects.count()
+                if count:
+                    self.stdout.write(f'  {model._meta.label:<32} {count:>12,}')
@@ -0,0 +1,122 @@
+"""
+main/management/commands/static_report.py
+گزارش حجم فایل‌های استاتیکی که هر صفحه دریافت می‌کند (خام / gzip / brotli)
+
+صفحه‌ها با test client همین پروژه رندر می‌شوند و CSS / JS لینک‌شده در HTML
+به‌همراه فونت‌های url(...) داخل CSSها شمرده می‌شوند.
+
+    python manage.py static_report                       # صفحه‌های پیش‌فرض
+    python manage.py static_report /books/ /podcasts/ -v 2
+"""
+import gzip
+import re
+from urllib.parse import urlsplit, unquote
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from main.staticfiles import read_static
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_RE = re.compile(
+    r'<link[^>]+rel="stylesheet"[^>]+href="([^"]+)"|<link[^>]+href="([^"]+)"[^>]+rel="stylesheet"|<script[^>]+src="([^"]+)"'
+)
+CSS_URL_RE = re.compile(r'url\(\s*[\'"]?([^\'")]+\.(?:woff2?|ttf|otf))[\'"]?\s*\)')
+
+DEFAULT_PAGES = ('/', '/books/', '/podcasts/', '/courses/', '/account/login/')
+
+
+def _sizes(data: bytes) -> tuple:
+    return (
+        len(data),
+        len(gzip.compress(data, compresslevel=9)),
+        len(brotli.compress(data)) if brotli else 0,
+    )
+
+
+def _kb(n: int) -> str:
+    return f'{n / 1024:.1f}K'
+
+
+class Command(BaseCommand):
+    help = 'گزارش حجم CSS / JS / فونت دریافتی هر صفحه'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES)
+
+    def handle(self, *args, **options):
+        host    = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        client  = Client(HTTP_HOST=host)
+        verbose = options['verbosity'] > 1
+        cache   = {}
+
+        for page in options['pages']:
+            response = client.get(page, follow=True)
+            if response.status_code != 200:
+                self.stdout.write(f'{page:<28} HTTP {response.status_code}')
+                continue
+            html = response.content
+            totals = {'css': [0, 0, 0], 'js': [0, 0, 0], 'font': [0, 0, 0]}
+            external, assets = [], []
+
+            urls = [next(g for g in m.groups() if g) for m in ASSET_RE.finditer(html.decode('utf-8', 'ignore'))]
+            seen = set()
+            while urls:
+                url = urls.pop(0)
+                if url in seen:
+                    continue
+                seen.add(url)
+                if urlsplit(url).netloc:
+                    external.append(url)
+                    continue
+                data = cache.get(url) or self._read(url)
+                if data is None:
+                    assets.append((url, None))
+                    continue
+                cache[url] = data
+                kind = 'css' if url.split('?')[0].endswith('.css') else 'js' if url.split('?')[0].endswith('.js') else 'font'
+                if kind == 'css':
+                    base = url.rsplit('/', 1)[0]
+                    for ref in CSS_URL_RE.findall(data.decode('utf-8', 'ignore')):
+                        urls.append(ref if ref.startswith('/') else self._join(base, ref))
+                sizes = _sizes(data)
+                totals[kind] = [a + b for a, b in zip(totals[kind], sizes)]
+                assets.append((url, sizes))
+
+            html_sizes = _sizes(html)
+            shipped = [sum(t[i] for t in totals.values()) + html_sizes[i] for i in range(3)]
+            self.stdout.write(
+                f'{page:<28} html {_kb(html_sizes[0])}  '
+                + '  '.join(f'{k} {_kb(v[0])}' for k, v in totals.items())
+                + f'  total {_kb(shipped[0])} (gzip {_kb(shipped[1])}'
+                + (f', br {_kb(shipped[2])}' if brotli else '') + ')'
+                + (f'  external={len(external)}' if external else '')
+            )
+            if verbose:
+                for url, sizes in assets:
+                    if sizes is None:
+                        self.stdout.write(f'    {url}  (not found)')
+                    else:
+                        self.stdout.write(f'    {url}  {_kb(sizes[0])} gzip {_kb(sizes[1])}')
+                for url in external:
+                    self.stdout.write(f'    {url}  (external)')
+
+    def _join(self, base: str, ref: str) -> str:
+        parts = base.split('/')
+        for piece in ref.split('/'):
+            if piece == '..':
+                parts.pop()
+            elif piece != '.':
+                parts.append(piece)
+        return '/'.join(parts)
+
+    def _read(self, url: str):
+        path = unquote(urlsplit(url).path)
+        if not path.startswith(settings.STATIC_URL):
+            return None
+        return read_static(path[len(settings.STATIC_URL):])
@@ -0,0 +1,143 @@
+"""
+main/metrics.py
+متریک‌های عملیاتی با فرمت Prometheus در /metrics
+
+  - تأخیر هر view (نام URL، متد، کلاس وضعیت) و تعداد کوئری / hit و miss کش درخواست‌های نمونه‌برداری‌شده
+  - ارسال و تأیید OTP، تأخیر پیامک (sms.ir) و زرین‌پال، نتیجه پرداخت‌ها
+
+گونیکورن چندپردازه‌ای: gunicorn.conf.py متغیر PROMETHEUS_MULTIPROC_DIR را تنظیم می‌کند؛ هر worker
+مقدارها را در فایل mmap خودش می‌نویسد و /metrics فایل‌های همه workerها را جمع می‌زند.
+بدون آن متغیر (runserver) رجیستری همان پردازه خوانده می‌شود.
+
+دسترسی: هدر Authorization: Bearer <METRICS_TOKEN> یا کاربر staff
+    curl -H "Authorization: Bearer $METRICS_TOKEN" https://example.com/metrics
+"""
+import hmac
+import os
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# ── درخواست‌ها ────────────────────────────────────────────────────────────
+REQUEST_LATENCY = Histogram(
+    'mahboub_request_duration_seconds', 'Request latency per view',
+    ['view', 'method', 'status'], buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    'mahboub_request_db_queries', 'DB queries per sampled request',
+    ['view'], buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+CACHE_REQUESTS = Counter(
+    'mahboub_cache_requests_total', 'Cache lookups in sampled requests', ['result'],
+)
+
+# ── ورود با OTP ───────────────────────────────────────────────────────────
+OTP_SENT = Counter(
+    'mahboub_otp_send_total', 'OTP send attempts', ['kind', 'result'],
+)
+OTP_VERIFY = Counter(
+    'mahboub_otp_verify_total', 'OTP verification attempts', ['result'],
+)
+SMS_LATENCY = Histogram(
+    'mahboub_sms_duration_seconds', 'SMS provider call latency',
+    ['provider', 'outcome'], buckets=LATENCY_BUCKETS,
+)
+
+# ── پرداخت ────────────────────────────────────────────────────────────────
+ZARINPAL_LATENCY = Histogram(
+    'mahboub_zarinpal_duration_seconds', 'Zarinpal API call latency',
+    ['operation', 'outcome'], buckets=LATENCY_BUCKETS,
+)
+PAYMENTS = Counter(
+    'mahboub_payments_total', 'Payment verification results', ['kind', 'result'],
+)
+
+
+@contextmanager
+def observe(histogram, **labels):
+    """
+    زمان یک تماس بیرونی؛ نتیجه را داخل بلوک در call['outcome'] بنویسید
+
+        with metrics.observe(metrics.ZARINPAL_LATENCY, operation='verify') as call:
+            ...
+            call['outcome'] = 'ok'
+
+    استثنا (timeout، خطای شبکه) با outcome=error ثبت می‌شود.
+    """
+    call  = {'outcome': 'error'}
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        histogram.labels(**labels, outcome=call['outcome']).observe(time.perf_counter() - start)
+
+
+# ── middleware و endpoint ─────────────────────────────────────────────────
+
+class MetricsMiddleware:
+    """بیرونی‌ترین middleware؛ کوئری و کش را از پروفایل InstrumentationMiddleware می‌خواند"""
+
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode   = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start    = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        start    = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, start)
+        return response
+
+    @staticmethod
+    def _observe(request, response, start: float):
+        match    = getattr(request, 'resolver_match', None)
+        view     = match.view_name if match else '<unresolved>'
+        REQUEST_LATENCY.labels(view, request.method, f'{response.status_code // 100}xx').observe(
+            time.perf_counter() - start
+        )
+        profile = getattr(request, 'instrumentation_profile', None)
+        if profile is not None:
+            REQUEST_QUERIES.labels(view).observe(profile.queries)
+            if profile.cache_hits:
+                CACHE_REQUESTS.labels('hit').inc(profile.cache_hits)
+            if profile.cache_misses:
+                CACHE_REQUESTS.labels('miss').inc(profile.cache_misses)
+
+
+def _authorized(request) -> bool:
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_staff)
+
+
+def metrics_view(request):
+    if not _authorized(request):
+        return HttpResponseForbidden()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
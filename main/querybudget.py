@@ -0,0 +1,80 @@
+"""
+main/querybudget.py
+سقف تعداد کوئری برای changelistهای admin (جلوگیری از N+1)
+
+    @admin.register(BookChapter)
+    class BookChapterAdmin(QueryBudgetMixin, admin.ModelAdmin):
+        query_budget = 8        # پیش‌فرض: settings.ADMIN_QUERY_BUDGET
+
+  - ADMIN_QUERY_BUDGET_CHECK (پیش‌فرض: DEBUG): شمارش کوئری‌های هر رندر changelist
+  - ADMIN_QUERY_BUDGET_STRICT: به‌جای هشدار در log، QueryBudgetExceeded (برای CI / توسعه)
+
+main.tests.AdminQueryBudgetTests همه changelistها را روی ۱۰۰ ردیف seed شده با سقف مقایسه می‌کند؛
+manage.py check_admin_queries همین بررسی را روی دیتابیس واقعی (مثلاً staging) انجام می‌دهد.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.db import connections, router
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 12
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def budget_for(model_admin) -> int:
+    return getattr(model_admin, 'query_budget', None) or getattr(settings, 'ADMIN_QUERY_BUDGET', DEFAULT_BUDGET)
+
+
+def render_changelist(model_admin, request) -> tuple:
+    """(response, کوئری‌های ثبت‌شده) — قالب هم داخل شمارش رندر می‌شود چون ستون‌های list_display آنجا صدا زده می‌شوند"""
+    alias = router.db_for_read(model_admin.model)
+    with CaptureQueriesContext(connections[alias]) as ctx:
+        response = model_admin.changelist_view(request)
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+    return response, ctx.captured_queries
+
+
+def measure_changelist(model_admin, user, per_page: int) -> tuple:
+    """(response, کوئری‌ها) رندر changelist با per_page ردیف در صفحه، بدون هشدار خود mixin"""
+    request = RequestFactory().get('/')
+    request.user              = user
+    request.skip_query_budget = True
+    request._messages         = CookieStorage(request)
+
+    original, model_admin.list_per_page = model_admin.list_per_page, per_page
+    try:
+        return render_changelist(model_admin, request)
+    finally:
+        model_admin.list_per_page = original
+
+
+class QueryBudgetMixin:
+    query_budget = None
+
+    def changelist_view(self, request, extra_context=None):
+        # check_admin_queries خودش می‌شمارد و گزارش می‌دهد
+        if not getattr(settings, 'ADMIN_QUERY_BUDGET_CHECK', settings.DEBUG) or getattr(request, 'skip_query_budget', False):
+            return super().changelist_view(request, extra_context)
+
+        alias = router.db_for_read(self.model)
+        with CaptureQueriesContext(connections[alias]) as ctx:
+            response = super().changelist_view(request, extra_context)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+
+        count, budget = len(ctx.captured_queries), budget_for(self)
+        if count > budget:
+            message = f'{self.model._meta.label} changelist: {count} queries (budget {budget})'
+            if getattr(settings, 'ADMIN_QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
@@ -0,0 +1,86 @@
+"""
+main/signing.py
+لینک‌های امضاشده و تاریخ‌دار برای فایل‌های رسانه پولی (صوت، ویدیو، تصویر صفحات کتاب)
+
+اعتبارسنجی با HMAC و زمان انقضا انجام می‌شود و کوئری محتوا/خرید ندارد، پس سرو بایت‌ها
+می‌تواند کاملاً به nginx سپرده شود.
+
+شناسه کاربر (u) در امضا است تا لینک کپی‌شده به کاربر دیگر کار نکند:
+  - hmac : signed_media آن را با کاربر نشست مقایسه می‌کند (فقط خواندن نشست، نه سطر کاربر)؛
+           u=0 لینک بدون مالک است (کاربر مهمان) و نشست بررسی نمی‌شود
+  - nginx: nginx نشست Django را نمی‌شناسد؛ u فقط برای ثبت در access log است و لینک تا انقضا
+           برای هر کسی کار می‌کند — TTL را کوتاه نگه دارید
+
+دو قالب:
+  - hmac  (پیش‌فرض): /media-signed/<path>?e=<expires>&u=<user>&s=<sig>
+    امضا = HMAC-SHA256(MEDIA_SIGNING_KEY, "path:expires:user") — بررسی در main.views.signed_media
+  - nginx : /media/<path>?md5=<token>&expires=<expires>&u=<user>
+    سازگار با ماژول secure_link در nginx:
+        location /media/ {
+            secure_link     $arg_md5,$arg_expires;
+            secure_link_md5 "$secure_link_expires$uri$arg_u <MEDIA_SIGNING_KEY>";
+            if ($secure_link = "")  { return 403; }
+            if ($secure_link = "0") { return 410; }
+        }
+"""
+import base64
+import hashlib
+import hmac
+import time
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+
+
+def _key() -> bytes:
+    return (getattr(settings, 'MEDIA_SIGNING_KEY', '') or settings.SECRET_KEY).encode()
+
+
+def _b64(digest: bytes) -> str:
+    return base64.urlsafe_b64encode(digest).decode().rstrip('=')
+
+
+def _expires(ttl: int) -> int:
+    """
+    انقضا به مضرب ttl/4 گرد می‌شود تا لینک یک فایل برای چند دقیقه ثابت بماند
+    و مرورگر/CDN بتواند پاسخ را کش کند
+    """
+    step = max(1, ttl // 4)
+    return (int(time.time()) + ttl) // step * step + step
+
+
+def hmac_signature(path: str, expires: int, user_id: int) -> str:
+    msg = f'{path}:{expires}:{user_id}'.encode()
+    return _b64(hmac.new(_key(), msg, hashlib.sha256).digest())[:32]
+
+
+def nginx_token(uri: str, expires: int, user_id: int) -> str:
+    raw = f'{expires}{uri}{user_id} '.encode() + _key()
+    return _b64(hashlib.md5(raw).digest())
+
+
+def signed_url(name: str, user=None, ttl: int = None) -> str:
+    """آدرس امضاشده برای فایل name (مسیر نسبی داخل MEDIA_ROOT)"""
+    ttl     = ttl or getattr(settings, 'MEDIA_SIGNED_URL_TTL', 3600)
+    expires = _expires(ttl)
+    user_id = user.pk if user is not None and user.is_authenticated else 0
+
+    if getattr(settings, 'MEDIA_SIGNING_MODE', 'hmac') == 'nginx':
+        uri = settings.MEDIA_URL + name
+        query = urlencode({'md5': nginx_token(uri, expires, user_id), 'expires': expires, 'u': user_id})
+        return f'{quote(uri)}?{query}'
+
+    prefix = getattr(settings, 'MEDIA_SIGNED_URL_PREFIX', '/media-signed/')
+    query  = urlencode({'e': expires, 'u': user_id, 's': hmac_signature(name, expires, user_id)})
+    return f'{prefix}{quote(name)}?{query}'
+
+
+def verify(path: str, expires: str, user_id: str, signature: str) -> bool:
+    """بررسی امضا و انقضا — بدون دسترسی به دیتابیس؛ مالک لینک را signed_media بررسی می‌کند"""
+    try:
+        expires, user_id = int(expires), int(user_id)
+    except (TypeError, ValueError):
+        return False
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(hmac_signature(path, expires, user_id), signature or '')
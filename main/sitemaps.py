@@ -0,0 +1,139 @@
+"""
+main/sitemaps.py
+sitemap.xml (index) و sitemap-<بخش>.xml برای صفحه‌های اصلی، کتاب‌ها، پادکست‌ها، دوره‌ها و مقاله‌های راهنما
+
+هر بخش در صفحه‌های ۵۰٬۰۰۰ نشانی (?p=2، ...) شکسته می‌شود و index به همه صفحه‌ها لینک می‌دهد.
+هر صفحه جدا با نسخه ردیف‌های همان صفحه کش می‌شود (main/conditional.py)؛ ویرایش یک کتاب فقط
+صفحه‌ای از sitemap کتاب‌ها را که آن کتاب در آن است دوباره می‌سازد.
+"""
+from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps import views as sitemap_views
+from django.db.models import Count, Max, Min
+from django.http import Http404
+from django.urls import reverse
+
+from book.models import Book
+from course.models import Course
+from podcast.models import Podcast
+
+from .conditional import versioned_cache
+from .models import GuideArticle
+
+
+class ModelSitemap(Sitemap):
+    model         = None
+    url_name      = None
+    lastmod_field = 'updated_at'
+    changefreq    = 'weekly'
+
+    def queryset(self):
+        return self.model._default_manager.filter(is_active=True)
+
+    def items(self):
+        return self.queryset().only('pk', 'slug', self.lastmod_field).order_by('pk')
+
+    def location(self, obj):
+        return reverse(self.url_name, args=[obj.slug])
+
+    def lastmod(self, obj):
+        return getattr(obj, self.lastmod_field)
+
+    def get_latest_lastmod(self):
+        # پیاده‌سازی پیش‌فرض Django همه ردیف‌ها را برای گرفتن max می‌خواند
+        return self.queryset().aggregate(latest=Max(self.lastmod_field))['latest']
+
+    def version(self, page: int = None) -> dict:
+        """آخرین تغییر، تعداد و بازه شناسه ردیف‌های یک صفحه (یا کل بخش)"""
+        queryset = self.queryset().order_by('pk')
+        if page is not None:
+            queryset = queryset[(page - 1) * self.limit:page * self.limit]
+        return queryset.aggregate(
+            latest=Max(self.lastmod_field), count=Count('pk'), first=Min('pk'), last=Max('pk'),
+        )
+
+
+class BookSitemap(ModelSitemap):
+    model    = Book
+    url_name = 'books:book_detail'
+    priority = 0.8
+
+
+class PodcastSitemap(ModelSitemap):
+    model    = Podcast
+    url_name = 'podcasts:podcast_detail'
+    priority = 0.7
+
+
+class CourseSitemap(ModelSitemap):
+    model    = Course
+    url_name = 'courses:course_detail'
+    priority = 0.8
+
+
+class GuideArticleSitemap(ModelSitemap):
+    model      = GuideArticle
+    url_name   = 'main:guide_article'
+    changefreq = 'monthly'
+    priority   = 0.4
+
+    def queryset(self):
+        # مسیر مقاله <slug:slug> است و اسلاگ غیر ASCII نشانی معتبری ندارد
+        return super().queryset().filter(slug__regex=r'^[-a-zA-Z0-9_]+$')
+
+
+class StaticSitemap(Sitemap):
+    changefreq = 'daily'
+    priority   = 1.0
+
+    def items(self):
+        return ['main:main', 'books:books_list', 'podcasts:podcasts_list', 'courses:courses_list', 'main:faq']
+
+    def location(self, item):
+        return reverse(item)
+
+
+SITEMAPS = {
+    'pages':    StaticSitemap,
+    'books':    BookSitemap,
+    'podcasts': PodcastSitemap,
+    'courses':  CourseSitemap,
+    'guides':   GuideArticleSitemap,
+}
+
+
+def _token(version: dict) -> str:
+    return f'{version["count"]}:{version["first"]}:{version["last"]}:{version["latest"]}'
+
+
+def _index_version(request):
+    latest, parts = None, []
+    for name, sitemap in SITEMAPS.items():
+        if issubclass(sitemap, ModelSitemap):
+            version = sitemap().version()
+            parts.append(f'{name}={_token(version)}')
+            if version['latest'] and (latest is None or version['latest'] > latest):
+                latest = version['latest']
+    return latest, '|'.join(parts)
+
+
+def _section_version(request, section):
+    if section not in SITEMAPS:
+        raise Http404
+    if not issubclass(SITEMAPS[section], ModelSitemap):
+        return None, section
+    try:
+        page = max(int(request.GET.get('p', 1)), 1)
+    except ValueError:
+        raise Http404
+    version = SITEMAPS[section]().version(page)
+    return version['latest'], _token(version)
+
+
+@versioned_cache(_index_version)
+def sitemap_index(request):
+    return sitemap_views.index(request, SITEMAPS, sitemap_url_name='sitemap_section')
+
+
+@versioned_cache(_section_version)
+def sitemap_section(request, section):
+    return sitemap_views.sitemap(request, SITEMAPS, section=section)
@@ -0,0 +1,135 @@
+"""
+main/staticfiles.py
+باندل‌های استاتیک هر صفحه + storage با نام‌های hash‌دار و فشرده‌سازی brotli/gzip
+
+باندل‌ها در settings.STATIC_BUNDLES تعریف می‌شوند:
+    STATIC_BUNDLES = {
+        'reader': {'css': ['css/book-reader.css'], 'js': ['js/book-reader.js']},
+    }
+
+  - DEBUG: تگ {% bundle %} تک‌تک فایل‌های منبع را لینک می‌کند (ویرایش و رفرش)
+  - production: collectstatic هر باندل را در bundles/<name>.<kind> می‌سازد، سپس
+    WhiteNoise نام فایل‌ها را hash‌دار می‌کند (کش یک‌ساله immutable) و نسخه‌های .br/.gz می‌سازد.
+
+AsyncWhiteNoiseMiddleware همان WhiteNoise است که زیر ASGI زنجیره middleware را async نگه می‌دارد
+(middleware فقط-sync هر درخواست را به thread می‌برد) و فایل را بلوک به بلوک می‌فرستد.
+"""
+import posixpath
+import re
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.files.base import ContentFile
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from .streaming import aread_blocks
+
+CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def bundles() -> dict:
+    return getattr(settings, 'STATIC_BUNDLES', {})
+
+
+def bundle_path(name: str, kind: str) -> str:
+    return f'bundles/{name}.{kind}'
+
+
+def rewrite_css_urls(content: str, source: str, to_url) -> str:
+    """
+    هر url(...) نسبی در فایل source (مسیر داخل static) را با to_url(مسیر کامل داخل static) جایگزین می‌کند
+    """
+    source_dir = posixpath.dirname(source)
+
+    def repl(match):
+        quote, url = match.groups()
+        if url.startswith(('/', 'data:', 'http:', 'https:', '#')):
+            return match.group(0)
+        return f'url({quote}{to_url(posixpath.normpath(posixpath.join(source_dir, url)))}{quote})'
+
+    return CSS_URL_RE.sub(repl, content)
+
+
+def _rebase_css(content: str, source: str, target: str) -> str:
+    """آدرس‌های نسبی url(...) را نسبت به محل فایل باندل بازنویسی می‌کند"""
+    target_dir = posixpath.dirname(target) or '.'
+    return rewrite_css_urls(content, source, lambda path: posixpath.relpath(path, target_dir))
+
+
+def read_static(path: str) -> bytes | None:
+    """محتوای فایل استاتیک — ابتدا خروجی collectstatic (نام hash‌دار)، سپس پوشه‌های منبع"""
+    candidate = Path(settings.STATIC_ROOT) / path if settings.STATIC_ROOT else None
+    if candidate is None or not candidate.is_file():
+        found = finders.find(path)
+        candidate = Path(found) if found else None
+    return candidate.read_bytes() if candidate and candidate.is_file() else None
+
+
+def build_bundle(name: str, kind: str, read) -> str:
+    """read(path) → متن فایل منبع"""
+    target = bundle_path(name, kind)
+    parts  = []
+    for source in bundles()[name].get(kind, []):
+        content = read(source)
+        if kind == 'css':
+            content = _rebase_css(content, source, target)
+        parts.append(f'/* {source} */\n{content}')
+    # ; جداکننده تا فایل‌های JS بدون ; پایانی به هم نچسبند
+    return (';\n' if kind == 'js' else '\n').join(parts)
+
+
+class BundledManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """ساخت باندل‌ها پیش از hash و فشرده‌سازی WhiteNoise در collectstatic"""
+
+    # فایل جاافتاده (مثلاً imgs/logo.svg) نباید کل صفحه را 500 کند؛ آدرس بدون hash برمی‌گردد
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            def read(path):
+                storage, source_path = paths[path]
+                with storage.open(source_path) as f:
+                    return f.read().decode('utf-8')
+
+            for name, kinds in bundles().items():
+                for kind in kinds:
+                    target = bundle_path(name, kind)
+                    content = build_bundle(name, kind, read)
+                    if self.exists(target):
+                        self.delete(target)
+                    self.save(target, ContentFile(content.encode('utf-8')))
+                    paths[target] = (self, target)
+
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # DEBUG: جستجو در پوشه‌های منبع روی دیسک
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        response = await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        if response.file_to_stream is not None:
+            response.streaming_content = aread_blocks(response.file_to_stream, response.block_size)
+        return response
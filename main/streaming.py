@@ -0,0 +1,138 @@
+"""
+main/streaming.py
+سرو فایل‌های رسانه (صوت / ویدیو) با پشتیبانی از هدر Range و پاسخ 206
+
+دو حالت:
+  - MEDIA_ACCEL_REDIRECT_PREFIX تنظیم شده باشد: فقط هدر X-Accel-Redirect برگردانده می‌شود
+    و nginx خودش فایل را (zero-copy با sendfile، همراه با Range) می‌فرستد.
+  - در غیر این صورت Django خودش بازه درخواستی را با FileResponse می‌فرستد. زیر ASGI بلوک‌ها با
+    iterator غیرهمزمان خوانده می‌شوند؛ iterator sync را Django پیش از ارسال کامل در حافظه می‌خواند.
+"""
+import mimetypes
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+_DONE    = object()
+# هر بلوک زیر ASGI یک رفت‌وبرگشت به thread pool است؛ block_size پیش‌فرض FileResponse (4KB) برای صوت کوچک است
+ASYNC_BLOCK_SIZE = 256 * 1024
+
+
+class RangeFile:
+    """پوشش فایل که فقط length بایت از start را برمی‌گرداند"""
+
+    def __init__(self, f, start: int, length: int):
+        f.seek(start)
+        self.f = f
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+async def aread_blocks(f, block_size: int):
+    """خواندن فایل بلوک به بلوک در thread pool، برای streaming_content پاسخ ASGI"""
+    read = sync_to_async(f.read, thread_sensitive=False)
+    while chunk := await read(block_size):
+        yield chunk
+
+
+async def aiter_sync(iterator):
+    """
+    پیمایش iterator sync (مثلاً خروجی ORM در main/exports.py) از event loop، یک آیتم در هر گام
+    thread_sensitive: همه گام‌ها در thread همین درخواست، پس cursor دیتابیس روی همان اتصال می‌ماند
+    """
+    step = sync_to_async(next, thread_sensitive=True)
+    while (item := await step(iterator, _DONE)) is not _DONE:
+        yield item
+
+
+def parse_range(header: str, size: int):
+    """
+    'bytes=500-999' → (500, 999)
+    خروجی None یعنی هدر نامعتبر یا چندبازه‌ای است (کل فایل ارسال شود)
+    خروجی ()  یعنی بازه خارج از فایل است (416)
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-500 → ۵۰۰ بایت آخر
+        length = int(end)
+        if length == 0:
+            return ()
+        return max(0, size - length), size - 1
+    start = int(start)
+    end   = int(end) if end else size - 1
+    if start >= size or end < start:
+        return ()
+    return start, min(end, size - 1)
+
+
+def serve_media(request, fieldfile, as_attachment: bool = False):
+    """پاسخ HTTP برای یک FieldFile با پشتیبانی Range / X-Accel-Redirect"""
+    return serve_storage_file(request, fieldfile.storage, fieldfile.name, as_attachment=as_attachment)
+
+
+def serve_storage_file(request, storage, name: str, as_attachment: bool = False):
+    """پاسخ HTTP برای فایل name در storage با پشتیبانی Range / X-Accel-Redirect"""
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    filename     = name.rsplit('/', 1)[-1]
+
+    prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '')
+    if prefix:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+        if as_attachment:
+            response['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+        return response
+
+    size   = storage.size(name)
+    header = request.headers.get('Range', '')
+    byte_range = parse_range(header, size) if header else None
+
+    if byte_range == ():
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        # کل فایل — FileResponse از wsgi.file_wrapper (sendfile) استفاده می‌کند
+        response = FileResponse(
+            storage.open(name, 'rb'), content_type=content_type,
+            as_attachment=as_attachment, filename=filename,
+        )
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            RangeFile(storage.open(name, 'rb'), start, length), content_type=content_type,
+            as_attachment=as_attachment, filename=filename,
+        )
+        response.status_code = 206
+        response['Content-Range']  = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+
+    if isinstance(request, ASGIRequest):
+        # فایل همچنان با _resource_closers پاسخ بسته می‌شود
+        response.streaming_content = aread_blocks(response.file_to_stream, ASYNC_BLOCK_SIZE)
+
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,531 @@
+"""
+main/synthetic.py
+داده مصنوعی قطعی با متن فارسی برای بنچمارک، تست بار و دیتابیس در مقیاس تولید
+(manage.py benchmark_journeys و manage.py seed_catalog)
+
+هر ردیف فقط به (seed، prefix، نوع، شماره) بستگی دارد، نه به ترتیب ساخت؛ پس بازه‌های
+[start, start+count) را می‌شود در چند پردازه جدا ساخت و نتیجه با اجرای تک‌پردازه‌ای یکی است.
+همه ردیف‌ها با bulk_create ساخته می‌شوند و اسلاگ / شماره تلفن / ref_id با پیشوند prefix شروع
+می‌شوند تا از داده واقعی جدا و قابل پاک‌کردن باشند.
+
+    gen   = CatalogGenerator(seed=1)
+    books = gen.books(200, pages_per_book=50)
+    gen.books(1000, start=200)        # بازه بعدی، مثلاً در پردازه دیگر
+"""
+import datetime
+import random
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.utils import timezone
+
+from account.models import User
+from book.models import Book, BookCategory, BookChapter, BookPage
+from course.models import Course, CourseCategory, CourseLesson, CourseSection
+from main.models import (
+    FAQ, Banner, GuideArticle, GuideCategory, MenuItem, SiteSettings, Slider, SliderSlide,
+    SupportTicket, SupportTicketReply,
+)
+from podcast.models import Podcast, PodcastCategory, PodcastSeries
+from purchase.models import ArchivedPurchase, Order, OrderItem, Purchase, Subscription, SubscriptionPlan
+
+BATCH      = 2000
+BOOK_CHUNK = 100        # کتاب‌هایی که با فصل و صفحه‌هایشان در یک تراکنش ساخته می‌شوند
+HISTORY    = 3 * 365    # بازه تاریخ ساخت ردیف‌ها (روز)
+
+# ── واژگان ───────────────────────────────────────────────────────────────
+FIRST_NAMES = (
+    'محمد علی حسین مهدی رضا حسن محسن مرتضی مجتبی امیر جواد سجاد هادی '
+    'فاطمه زهرا مریم زینب سارا معصومه نرگس طاهره ریحانه کوثر سمیه'
+).split()
+LAST_NAMES = (
+    'محمدی حسینی رضایی کریمی موسوی احمدی جعفری صادقی رحیمی هاشمی قاسمی کاظمی '
+    'نوری طباطبایی شریفی انصاری مرادی یزدانی فاضلی شاکری'
+).split()
+PUBLISHERS = (
+    'انتشارات صدرا', 'نشر معارف', 'بوستان کتاب', 'دفتر نشر فرهنگ اسلامی', 'انتشارات امیرکبیر',
+    'نشر نی', 'انتشارات سروش', 'کانون اندیشه جوان', 'انتشارات هاجر', 'نشر شهید کاظمی',
+)
+TOPICS = (
+    'اخلاق معرفت ایمان عقل توحید معاد امامت خانواده تربیت جوانی ازدواج صبر توکل شکر دعا نماز '
+    'قرآن سیره تاریخ جامعه فرهنگ عدالت آزادی محبت بندگی امید زندگی سعادت عرفان مسئولیت آرامش'
+).split()
+ADJECTIVES = 'اسلامی قرآنی معنوی اجتماعی عملی کاربردی جامع مقدماتی تحلیلی نوین'.split()
+TITLE_PATTERNS = (
+    '{t1} در {t2}', 'درس‌هایی از {t1}', 'شرح {t1} {a}', 'راهی به سوی {t1}', 'جستاری در {t1} و {t2}',
+    'آشنایی با {t1} {a}', '{t1} و {t2}', 'مبانی {t1} {a}', 'گفتارهایی درباره {t1}', 'نگاهی نو به {t1}',
+)
+SUBJECTS   = ('انسان', 'هر مؤمن', 'جامعه', 'خانواده', 'جوان امروز', 'اهل معرفت', 'قرآن کریم', 'این نکته', 'آن حقیقت')
+PREDICATES = (
+    'را آشکار می‌کند', 'را نیازمند است', 'را به ما می‌آموزد', 'را روشن‌تر می‌سازد', 'را معنا می‌بخشد',
+    'را تقویت می‌کند', 'را در پی دارد', 'را یادآوری می‌کند',
+)
+CONNECTORS = ('از این رو', 'بنابراین', 'در نتیجه', 'به بیان دیگر', 'همچنین', 'اما', 'افزون بر این')
+ICONS      = ('fa-book', 'fa-quran', 'fa-mosque', 'fa-heart', 'fa-lightbulb', 'fa-users', 'fa-star', 'fa-leaf')
+
+
+class Text:
+    """عنوان، جمله و پاراگراف فارسی از یک Random مشخص"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def person(self) -> str:
+        return f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}'
+
+    def title(self) -> str:
+        t1, t2 = self.rng.sample(TOPICS, 2)
+        return self.rng.choice(TITLE_PATTERNS).format(t1=t1, t2=t2, a=self.rng.choice(ADJECTIVES))
+
+    def sentence(self) -> str:
+        lead  = f'{self.rng.choice(CONNECTORS)}، ' if self.rng.random() < 0.4 else ''
+        topic = ' و '.join(self.rng.sample(TOPICS, self.rng.randint(1, 2)))
+        return f'{lead}{self.rng.choice(SUBJECTS)} {topic} {self.rng.choice(ADJECTIVES)} {self.rng.choice(PREDICATES)}.'
+
+    def paragraph(self, sentences: int = 0) -> str:
+        return ' '.join(self.sentence() for _ in range(sentences or self.rng.randint(3, 7)))
+
+    def html(self, chars: int) -> str:
+        parts, size = [], 0
+        while size < chars:
+            paragraph = f'<p>{self.paragraph()}</p>'
+            parts.append(paragraph)
+            size += len(paragraph)
+        return '\n'.join(parts)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    auto_now / auto_now_add موقتاً خاموش، تا created_at / updated_at پراکنده در گذشته ذخیره شوند
+    (نه همه «الان»)؛ فقط برای همین پردازه seed
+    """
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    for field, _, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class CatalogGenerator:
+    def __init__(self, seed: int = 0, prefix: str = 'perf', phones: str = '0990', now: datetime.datetime = None):
+        self.seed   = seed
+        self.prefix = prefix
+        self.phones = phones                # چهار رقم اول شماره کاربران مصنوعی
+        self.now    = now or timezone.now().replace(microsecond=0)   # بین پردازه‌ها یکی باشد
+
+    def rng(self, kind: str, i) -> random.Random:
+        return random.Random(f'{self.seed}:{self.prefix}:{kind}:{i}')
+
+    def slug(self, kind: str, i: int) -> str:
+        return f'{self.prefix}-{kind}-{i}'
+
+    def ref(self, kind: str, i: int) -> str:
+        return f'{self.prefix.upper()}{kind}{i:012d}'
+
+    def phone(self, i: int) -> str:
+        return f'{self.phones}{i:07d}'
+
+    def ago(self, rng: random.Random, days: int = HISTORY) -> datetime.datetime:
+        return self.now - datetime.timedelta(seconds=rng.randint(0, days * 86400))
+
+    @staticmethod
+    def access(rng: random.Random, paid_ratio: float) -> tuple:
+        """(access_type, price) — بقیه رایگان؛ بخش کوچکی اشتراکی"""
+        roll = rng.random()
+        if roll < paid_ratio:
+            return 'paid', rng.randrange(10_000, 300_000, 5_000)
+        if roll < paid_ratio + 0.1:
+            return 'premium', 0
+        return 'free', 0
+
+    def _fetch(self, model, kind: str, start: int, count: int) -> list:
+        slugs = [self.slug(kind, i) for i in range(start, start + count)]
+        return list(model.objects.filter(slug__in=slugs).order_by('pk'))
+
+    # ── ردیف‌های مشترک (idempotent؛ هر پردازه می‌تواند دوباره صدا بزند) ─────
+
+    def categories(self, model, kind: str, count: int) -> list:
+        model.objects.bulk_create([
+            model(name=self.rng(kind, i).choice(TOPICS), slug=self.slug(kind, i), icon=ICONS[i % len(ICONS)], order=i)
+            for i in range(count)
+        ], ignore_conflicts=True)
+        return self._fetch(model, kind, 0, count)
+
+    def series(self, count: int = 20) -> list:
+        categories = self.categories(PodcastCategory, 'podcat', 6)
+        rows = []
+        for i in range(count):
+            rng, text = self.rng('series', i), Text(self.rng('series', i))
+            rows.append(PodcastSeries(
+                title=text.title(), slug=self.slug('series', i), host=text.person(), description=text.paragraph(),
+                category=rng.choice(categories), bundle_discount_percent=rng.choice((0, 0, 10, 20)),
+            ))
+        PodcastSeries.objects.bulk_create(rows, ignore_conflicts=True)
+        return self._fetch(PodcastSeries, 'series', 0, count)
+
+    def site(self, faqs: int = 40, guides: int = 60) -> None:
+        """ردیف‌های کم‌تعداد main: تنظیمات، اسلایدر، بنر، منو، FAQ و راهنما؛ اگر از قبل باشند دست نمی‌خورند"""
+        if not SiteSettings.objects.exists():
+            SiteSettings.objects.create(
+                site_description='کتاب، پادکست و دوره‌های آموزشی', email='support@example.com', phone='02100000000',
+            )
+        if not Slider.objects.filter(title__startswith=self.prefix).exists():
+            for position in Slider.SliderPosition.values:
+                slider = Slider.objects.create(title=f'{self.prefix} {position}', position=position)
+                SliderSlide.objects.bulk_create([
+                    SliderSlide(slider=slider, title=Text(self.rng(f'slide-{position}', i)).title(),
+                                image=f'settings/sliders/{self.prefix}-{position}-{i}.jpg', order=i)
+                    for i in range(4)
+                ])
+            Banner.objects.bulk_create([
+                Banner(title=f'{self.prefix} {position}', image=f'settings/banners/{self.prefix}-{position}.jpg',
+                       position=position)
+                for position in Banner.BannerPosition.values
+            ])
+        if not MenuItem.objects.exists():
+            MenuItem.objects.bulk_create([
+                MenuItem(label=label, url=url, location=location, order=i)
+                for location in MenuItem.MenuLocation.values
+                for i, (label, url) in enumerate((
+                    ('کتاب‌ها', '/books/'), ('پادکست‌ها', '/podcasts/'), ('دوره‌ها', '/courses/'), ('پشتیبانی', '/support/'),
+                ))
+            ])
+        if not FAQ.objects.filter(category=self.prefix).exists():
+            FAQ.objects.bulk_create([
+                FAQ(question=Text(self.rng('faq', i)).sentence()[:-1] + '؟', answer=Text(self.rng('faq-a', i)).paragraph(),
+                    category=self.prefix, order=i)
+                for i in range(faqs)
+            ])
+
+        GuideCategory.objects.bulk_create([
+            GuideCategory(name=Text(self.rng('guidecat', i)).title(), slug=self.slug('guidecat', i),
+                          icon=ICONS[i], order=i)
+            for i in range(6)
+        ], ignore_conflicts=True)
+        categories = self._fetch(GuideCategory, 'guidecat', 0, 6)
+        rows = []
+        for i in range(guides):
+            rng, text = self.rng('guide', i), Text(self.rng('guide', i))
+            rows.append(GuideArticle(
+                category=rng.choice(categories), title=text.title(), slug=self.slug('guide', i),
+                summary=text.sentence(), content=text.html(3000), is_popular=rng.random() < 0.1,
+                views=rng.randint(0, 10_000),
+            ))
+        GuideArticle.objects.bulk_create(rows, ignore_conflicts=True)
+
+    def plans(self) -> list:
+        if not SubscriptionPlan.objects.filter(description=self.prefix).exists():
+            SubscriptionPlan.objects.bulk_create([
+                SubscriptionPlan(title=title, duration_days=days, price=price, description=self.prefix, order=i)
+                for i, (title, days, price) in enumerate((
+                    ('یک‌ماهه', 30, 99_000), ('سه‌ماهه', 90, 249_000), ('سالانه', 365, 790_000),
+                ))
+            ])
+        return list(SubscriptionPlan.objects.filter(description=self.prefix).order_by('order'))
+
+    # ── کاتالوگ ──────────────────────────────────────────────────────────
+
+    def books(self, count: int, start: int = 0, pages_per_book: int = 50, chapters_per_book: int = 5,
+              page_chars: int = 2000, paid_ratio: float = 0.4) -> list:
+        categories = self.categories(BookCategory, 'bookcat', 12)
+        books = []
+        for chunk in range(start, start + count, BOOK_CHUNK):
+            size = min(BOOK_CHUNK, start + count - chunk)
+            with transaction.atomic(), explicit_timestamps(Book):
+                books += self._books(chunk, size, categories, pages_per_book, chapters_per_book, page_chars, paid_ratio)
+        return books
+
+    def _books(self, start, count, categories, pages_per_book, chapters_per_book, page_chars, paid_ratio) -> list:
+        rows = []
+        for i in range(start, start + count):
+            rng, text = self.rng('book', i), Text(self.rng('book', i))
+            access_type, price = self.access(rng, paid_ratio)
+            created = self.ago(rng)
+            rows.append(Book(
+                title=text.title(), slug=self.slug('book', i), author=text.person(),
+                translator=text.person() if rng.random() < 0.2 else '', publisher=rng.choice(PUBLISHERS),
+                description=text.paragraph(8), category=rng.choice(categories),
+                access_type=access_type, price=price, discount_percent=rng.choice((0, 0, 0, 10, 25)),
+                volume=rng.choice((1, 1, 1, 2, 3)), publish_year=str(rng.randint(1370, 1404)),
+                views=rng.randint(0, 50_000), rating=round(rng.uniform(3, 5), 1), is_featured=rng.random() < 0.05,
+                created_at=created, updated_at=created + datetime.timedelta(days=rng.randint(0, 60)),
+            ))
+        Book.objects.bulk_create(rows, batch_size=BATCH)
+        books = self._fetch(Book, 'book', start, count)
+
+        BookChapter.objects.bulk_create([
+            BookChapter(book=book, title=Text(self.rng(f'chapter-{book.slug}', order)).title(), order=order,
+                        is_preview=order == 1)
+            for book in books for order in range(1, chapters_per_book + 1)
+        ], batch_size=BATCH)
+        chapters = {}
+        for chapter in BookChapter.objects.filter(book__in=books).order_by('book_id', 'order'):
+            chapters.setdefault(chapter.book_id, []).append(chapter)
+
+        per_chapter = max(pages_per_book // chapters_per_book, 1)
+        batch = []
+        for book in books:
+            text = Text(self.rng('pages', book.slug))     # یک Random برای همه صفحه‌های کتاب
+            for order in range(1, pages_per_book + 1):
+                chapter = chapters[book.pk][min((order - 1) // per_chapter, chapters_per_book - 1)]
+                batch.append(BookPage(
+                    book=book, chapter=chapter, order=order, page_number=str(order),
+                    heading=chapter.title if (order - 1) % per_chapter == 0 else '',
+                    content=text.html(page_chars),
+                ))
+                if len(batch) >= BATCH:
+                    BookPage.objects.bulk_create(batch)
+                    batch.clear()
+        BookPage.objects.bulk_create(batch)
+        return books
+
+    def podcasts(self, count: int, start: int = 0, series: int = 20, paid_ratio: float = 0.3) -> list:
+        categories = self.categories(PodcastCategory, 'podcat', 6)
+        all_series = self.series(series)
+        rows = []
+        for i in range(start, start + count):
+            rng, text = self.rng('podcast', i), Text(self.rng('podcast', i))
+            access_type, price = self.access(rng, paid_ratio)
+            created = self.ago(rng)
+            rows.append(Podcast(
+                title=text.title(), slug=self.slug('podcast', i),
+                series=all_series[i % len(all_series)] if all_series else None,
+                category=rng.choice(categories), host=text.person(), description=text.paragraph(),
+                audio_url=f'https://cdn.example.com/{self.slug("podcast", i)}.mp3', duration=rng.randint(300, 5400),
+                episode_number=i // max(len(all_series), 1) + 1, access_type=access_type, price=price,
+                plays=rng.randint(0, 100_000), downloads=rng.randint(0, 20_000), rating=round(rng.uniform(3, 5), 1),
+                is_featured=rng.random() < 0.03, created_at=created, updated_at=created,
+            ))
+        with transaction.atomic(), explicit_timestamps(Podcast):
+            Podcast.objects.bulk_create(rows, batch_size=BATCH)
+        return self._fetch(Podcast, 'podcast', start, count)
+
+    def courses(self, count: int, start: int = 0, sections: int = 4, lessons_per_section: int = 6,
+                paid_ratio: float = 0.5) -> list:
+        categories = self.categories(CourseCategory, 'coursecat', 8)
+        rows = []
+        for i in range(start, start + count):
+            rng, text = self.rng('course', i), Text(self.rng('course', i))
+            access_type, price = self.access(rng, paid_ratio)
+            created = self.ago(rng)
+            rows.append(Course(
+                title=text.title(), slug=self.slug('course', i), instructor=text.person(),
+                category=rng.choice(categories), description=text.paragraph(10), short_desc=text.sentence(),
+                access_type=access_type, price=price, level=rng.choice(Course.Level.values),
+                lessons_count=sections * lessons_per_section, total_duration=sections * lessons_per_section * 15,
+                has_certificate=rng.random() < 0.3, views=rng.randint(0, 30_000), enrollments=rng.randint(0, 5_000),
+                rating=round(rng.uniform(3, 5), 1), created_at=created, updated_at=created,
+            ))
+        with transaction.atomic(), explicit_timestamps(Course):
+            Course.objects.bulk_create(rows, batch_size=BATCH)
+            courses = self._fetch(Course, 'course', start, count)
+            CourseSection.objects.bulk_create([
+                CourseSection(course=course, title=Text(self.rng(f'section-{course.slug}', order)).title(), order=order)
+                for course in courses for order in range(1, sections + 1)
+            ], batch_size=BATCH)
+            lessons = []
+            for section in CourseSection.objects.filter(course__in=courses).select_related('course').order_by('pk'):
+                for order in range(1, lessons_per_section + 1):
+                    rng = self.rng(f'lesson-{section.course.slug}-{section.order}', order)
+                    lessons.append(CourseLesson(
+                        section=section, title=Text(rng).title(), order=order, duration=rng.randint(300, 1800),
+                        video_url=f'https://cdn.example.com/{section.course.slug}/{section.order}-{order}.mp4',
+                        is_preview=section.order == 1 and order == 1,
+                    ))
+            CourseLesson.objects.bulk_create(lessons, batch_size=BATCH)
+        return courses
+
+    # ── کاربران، پرداخت‌ها و پشتیبانی ───────────────────────────────────────
+
+    def users(self, count: int, start: int = 0) -> list:
+        phones = [self.phone(i) for i in range(start, start + count)]
+        rows   = []
+        for i, phone in enumerate(phones, start=start):
+            rng     = self.rng('user', i)
+            premium = rng.random() < 0.05
+            rows.append(User(
+                phone_number=phone, date_joined=self.ago(rng),
+                premium_until=self.now + datetime.timedelta(days=rng.randint(1, 365)) if premium else None,
+            ))
+        with explicit_timestamps(User):
+            User.objects.bulk_create(rows, batch_size=BATCH)
+        return list(User.objects.filter(phone_number__in=phones).order_by('pk'))
+
+    @staticmethod
+    def _paid(contents: dict) -> list:
+        return [(kind, obj) for kind, objs in contents.items() for obj in objs if obj.access_type == 'paid']
+
+    def _payment(self, rng: random.Random) -> dict:
+        """فیلدهای مشترک Payment: بیشتر موفق، بعضی ناموفق و تعداد کمی هنوز در انتظار"""
+        created = self.ago(rng)
+        roll    = rng.random()
+        status  = Purchase.Status.SUCCESS if roll < 0.85 else Purchase.Status.FAILED if roll < 0.97 else Purchase.Status.PENDING
+        success = status == Purchase.Status.SUCCESS
+        return {
+            'status':     status,
+            'authority':  f'A{rng.getrandbits(60):035d}',
+            'zp_ref_id':  str(rng.randint(10**9, 10**10)) if success else '',
+            'created_at': created,
+            'updated_at': created,
+            'paid_at':    created + datetime.timedelta(minutes=rng.randint(1, 15)) if success else None,
+        }
+
+    def purchases(self, count: int, users: list, contents: dict, start: int = 0) -> int:
+        """contents: {'book': [...], 'podcast': [...], 'course': [...]} — فقط موارد پولی خریده می‌شوند"""
+        paid = self._paid(contents)
+        if not paid or not users:
+            return 0
+        rows = []
+        for i in range(start, start + count):
+            rng       = self.rng('purchase', i)
+            kind, obj = paid[rng.randrange(len(paid))]
+            rows.append(Purchase(
+                ref_id=self.ref('P', i), user=users[i % len(users)], content_type=kind, object_id=obj.pk,
+                amount=obj.price, **self._payment(rng),
+            ))
+        with transaction.atomic(), explicit_timestamps(Purchase):
+            Purchase.objects.bulk_create(rows, batch_size=BATCH)
+        return len(rows)
+
+    def orders(self, count: int, users: list, contents: dict, start: int = 0) -> int:
+        """سفارش چندقلمی با اقلام؛ سفارش موفق مثل grant_order برای هر قلم Purchase هم دارد"""
+        paid = self._paid(contents)
+        if not paid or not users:
+            return 0
+        orders, items = [], {}
+        for i in range(start, start + count):
+            rng   = self.rng('order', i)
+            picks = [paid[j] for j in sorted({rng.randrange(len(paid)) for _ in range(rng.randint(2, 5))})]
+            ref   = self.ref('O', i)
+            orders.append(Order(
+                ref_id=ref, user=users[i % len(users)], title=f'خرید {len(picks)} محتوا',
+                amount=sum(obj.price for _, obj in picks), **self._payment(rng),
+            ))
+            items[ref] = picks
+        with transaction.atomic(), explicit_timestamps(Order, Purchase):
+            Order.objects.bulk_create(orders, batch_size=BATCH)
+            saved = {order.ref_id: order for order in Order.objects.filter(ref_id__in=list(items))}
+            OrderItem.objects.bulk_create([
+                OrderItem(order=saved[ref], content_type=kind, object_id=obj.pk, title=obj.title,
+                          unit_price=obj.price, price=obj.price)
+                for ref, picks in items.items() for kind, obj in picks
+            ], batch_size=BATCH)
+            Purchase.objects.bulk_create([
+                Purchase(
+                    ref_id=f'{ref}-{n}', user_id=order.user_id, order=order, content_type=kind, object_id=obj.pk,
+                    amount=obj.price, authority=order.authority, zp_ref_id=order.zp_ref_id, status=order.status,
+                    created_at=order.created_at, updated_at=order.updated_at, paid_at=order.paid_at,
+                )
+                for ref, order in saved.items() if order.status == Order.Status.SUCCESS
+                for n, (kind, obj) in enumerate(items[ref])
+            ], batch_size=BATCH)
+        return len(orders)
+
+    def subscriptions(self, count: int, users: list, start: int = 0) -> int:
+        plans = self.plans()
+        if not users:
+            return 0
+        rows = []
+        for i in range(start, start + count):
+            rng     = self.rng('subscription', i)
+            plan    = rng.choice(plans)
+            payment = self._payment(rng)
+            starts  = payment['paid_at']
+            rows.append(Subscription(
+                ref_id=self.ref('S', i), user=users[i % len(users)], plan=plan, amount=plan.price,
+                starts_at=starts, ends_at=starts + datetime.timedelta(days=plan.duration_days) if starts else None,
+                **payment,
+            ))
+        with transaction.atomic(), explicit_timestamps(Subscription):
+            Subscription.objects.bulk_create(rows, batch_size=BATCH)
+        return len(rows)
+
+    def archived_purchases(self, count: int, users: list, contents: dict, start: int = 0) -> int:
+        """خریدهای قدیمی‌تر از بازه HISTORY که به بایگانی رفته‌اند"""
+        paid = self._paid(contents)
+        if not paid or not users:
+            return 0
+        rows = []
+        for i in range(start, start + count):
+            rng       = self.rng('archived', i)
+            kind, obj = paid[rng.randrange(len(paid))]
+            rows.append(ArchivedPurchase(
+                ref_id=self.ref('A', i), user=users[i % len(users)], content_type=kind, object_id=obj.pk,
+                amount=obj.price, authority=f'A{rng.getrandbits(60):035d}',
+                status=rng.choice((Purchase.Status.SUCCESS, Purchase.Status.FAILED)),
+                created_at=self.now - datetime.timedelta(days=HISTORY + rng.randint(1, 2 * 365)),
+            ))
+        ArchivedPurchase.objects.bulk_create(rows, batch_size=BATCH)
+        return len(rows)
+
+    def tickets(self, count: int, users: list, start: int = 0) -> int:
+        if not users:
+            return 0
+        categories = [value for value, _ in SupportTicket.CATEGORY_CHOICES]
+        statuses   = [value for value, _ in SupportTicket.STATUS_CHOICES]
+        tickets, threads = [], {}
+        for i in range(start, start + count):
+            rng, text = self.rng('ticket', i), Text(self.rng('ticket', i))
+            user      = users[i % len(users)]
+            created   = self.ago(rng)
+            subject   = f'{text.title()} ({self.prefix}-{i})'
+            tickets.append(SupportTicket(
+                user=user, fullname=text.person(), email=f'{self.prefix}{i}@example.com', subject=subject,
+                message=text.paragraph(), category=rng.choice(categories), status=rng.choice(statuses),
+                created_at=created, updated_at=created,
+            ))
+            threads[subject] = [
+                (None if n % 2 == 0 else user, text.paragraph(2), n % 2 == 0, created + datetime.timedelta(hours=n + 1))
+                for n in range(rng.randint(0, 3))
+            ]
+        with transaction.atomic(), explicit_timestamps(SupportTicket, SupportTicketReply):
+            SupportTicket.objects.bulk_create(tickets, batch_size=BATCH)
+            ids = dict(SupportTicket.objects.filter(subject__in=list(threads)).values_list('subject', 'pk'))
+            SupportTicketReply.objects.bulk_create([
+                SupportTicketReply(ticket_id=ids[subject], user=user, message=message, is_staff=staff, created_at=at)
+                for subject, thread in threads.items() for user, message, staff, at in thread
+            ], batch_size=BATCH)
+        return len(tickets)
+
+    # ── پاک‌سازی ─────────────────────────────────────────────────────────
+
+    def flush(self) -> dict:
+        """
+        حذف همه ردیف‌های همین prefix (تنظیمات سایت و منو که بدون نشانه‌اند می‌مانند)؛
+        کاربر مصنوعی = شماره در بلوک phones و رمز خالی (create_user همیشه رمز یا رمز غیرقابل‌استفاده می‌گذارد)
+        """
+        slug, ref = f'{self.prefix}-', self.prefix.upper()
+        querysets = [
+            ('purchases',     Purchase.objects.filter(ref_id__startswith=ref)),
+            ('orders',        Order.objects.filter(ref_id__startswith=ref)),
+            ('subscriptions', Subscription.objects.filter(ref_id__startswith=ref)),
+            ('archived',      ArchivedPurchase.objects.filter(ref_id__startswith=ref)),
+            ('plans',         SubscriptionPlan.objects.filter(description=self.prefix)),
+            ('tickets',       SupportTicket.objects.filter(email__startswith=self.prefix, email__endswith='@example.com')),
+            ('users',         User.objects.filter(phone_number__startswith=self.phones, password='')),
+            ('books',         Book.objects.filter(slug__startswith=slug)),
+            ('podcasts',      Podcast.objects.filter(slug__startswith=slug)),
+            ('series',        PodcastSeries.objects.filter(slug__startswith=slug)),
+            ('courses',       Course.objects.filter(slug__startswith=slug)),
+            ('guides',        GuideCategory.objects.filter(slug__startswith=slug)),
+            ('faqs',          FAQ.objects.filter(category=self.prefix)),
+            ('sliders',       Slider.objects.filter(title__startswith=f'{self.prefix} ')),
+            ('banners',       Banner.objects.filter(title__startswith=f'{self.prefix} ')),
+        ] + [
+            (model._meta.model_name, model.objects.filter(slug__startswith=slug))
+            for model in (BookCategory, PodcastCategory, CourseCategory)
+        ]
+        deleted = {}
+        for name, queryset in querysets:
+            with transaction.atomic():
+                deleted[name] = queryset.delete()[0]
+        return deleted
+
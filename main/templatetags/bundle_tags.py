@@ -0,0 +1,71 @@
+"""
+main/templatetags/bundle_tags.py
+{% load bundle_tags %}
+{% bundle 'base' 'css' %}
+{% bundle 'reader' 'js' %}
+{% critical_css 'books' %}
+"""
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from main import critical
+from main.staticfiles import bundles, bundle_path, read_static, rewrite_css_urls
+
+register = template.Library()
+
+TAGS = {
+    'css': '<link rel="stylesheet" href="{}">',
+    'js':  '<script src="{}"></script>',
+}
+
+
+@register.simple_tag
+def bundle(name, kind):
+    """در DEBUG فایل‌های منبع جداگانه، در production یک فایل باندل hash‌دار"""
+    if settings.DEBUG:
+        sources = bundles()[name].get(kind, [])
+        return format_html_join('\n', TAGS[kind], ((static(path),) for path in sources))
+    return format_html(TAGS[kind], static(bundle_path(name, kind)))
+
+
+def _css_urls(names) -> list:
+    if settings.DEBUG:
+        return [static(path) for name in names for path in bundles()[name].get('css', [])]
+    return [static(bundle_path(name, 'css')) for name in names]
+
+
+_inline_cache = {}
+
+
+def _inline(name: str):
+    """متن CSS بحرانی با آدرس‌های url() نهایی (hash‌دار) — یک بار در هر پردازه خوانده می‌شود"""
+    if name in _inline_cache and not settings.DEBUG:
+        return _inline_cache[name]
+    path    = critical.critical_path(name)
+    content = read_static(path)
+    if content is not None:
+        content = rewrite_css_urls(content.decode('utf-8').strip(), path, static)
+    _inline_cache[name] = content
+    return content
+
+
+@register.simple_tag
+def critical_css(name):
+    """
+    CSS بحرانی صفحه به‌صورت inline + بارگذاری غیرمسدودکننده باندل‌های کامل.
+    اگر غیرفعال باشد یا خروجی build_critical_css وجود نداشته باشد، لینک‌های معمولی.
+    """
+    urls   = _css_urls(critical.crit_settings()[name]['bundles'])
+    inline = _inline(name) if critical.enabled() else None
+    if not inline:
+        return format_html_join('\n', TAGS['css'], ((url,) for url in urls))
+
+    return format_html(
+        '<style>{}</style>\n{}\n<noscript>{}</noscript>',
+        mark_safe(inline),
+        format_html_join('\n', '<link rel="stylesheet" href="{}" media="print" onload="this.media=\'all\'">', ((u,) for u in urls)),
+        format_html_join('', TAGS['css'], ((u,) for u in urls)),
+    )
@@ -0,0 +1,105 @@
+"""
+main/templatetags/card_tags.py
+کش HTML کارت‌های کاتالوگ با کلید نسخه‌دار مدل
+
+{% load card_tags %}
+{% for book in books %}
+    {% cachecard book in books %}
+        ... HTML کارت ...
+    {% endcachecard %}
+{% endfor %}
+
+کلید = متن قالب کارت (hash) + app_label.model + pk + updated_at؛ با ذخیره شدن ردیف
+(auto_now) کلید عوض می‌شود و نیازی به پاک کردن دستی کش نیست.
+با «in books» اولین کارت کلید همه کارت‌های لیست را با یک get_many می‌خواند
+(یک رفت‌وبرگشت کش برای کل صفحه؛ برای صفحه‌های گروه‌بندی‌شده «in grouped.values»)؛ کارت‌های ناموجود رندر و ذخیره می‌شوند.
+
+محتوای کارت نباید به کاربر یا درخواست وابسته باشد.
+"""
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+KEY_PREFIX = 'card'
+
+
+def card_cache():
+    return caches[getattr(settings, 'CARD_CACHE_ALIAS', 'default')]
+
+
+def card_key(fragment: str, obj):
+    """None یعنی ردیف updated_at ندارد و کش نمی‌شود"""
+    updated = getattr(obj, 'updated_at', None)
+    if updated is None or obj.pk is None:
+        return None
+    return f'{KEY_PREFIX}:{fragment}:{obj._meta.label_lower}:{obj.pk}:{updated.timestamp():.6f}'
+
+
+def _flatten(items):
+    for item in items:
+        if hasattr(item, '_meta'):
+            yield item
+        else:
+            yield from item
+
+
+class CacheCardNode(template.Node):
+    def __init__(self, nodelist, obj, items, fragment):
+        self.nodelist = nodelist
+        self.obj      = obj
+        self.items    = items
+        self.fragment = fragment
+
+    def _prefetch(self, context, state):
+        """یک get_many برای همه اشیای لیست (لیست تو در تو مثل grouped.values هم پذیرفته می‌شود)"""
+        keys = [k for k in (card_key(self.fragment, o) for o in _flatten(self.items.resolve(context) or ())) if k]
+        state['prefetched'].update(keys)
+        state['hits'].update(card_cache().get_many(keys))
+
+    def render(self, context):
+        if not getattr(settings, 'CARD_CACHE_ENABLED', True):
+            return self.nodelist.render(context)
+
+        obj = self.obj.resolve(context)
+        key = card_key(self.fragment, obj)
+        if key is None:
+            return self.nodelist.render(context)
+
+        state = context.render_context.setdefault(self, {'hits': {}, 'prefetched': set()})
+        if self.items is not None and key not in state['prefetched']:
+            self._prefetch(context, state)
+
+        if key in state['hits']:
+            return mark_safe(state['hits'][key])
+        if key not in state['prefetched']:
+            html = card_cache().get(key)
+            if html is not None:
+                return mark_safe(html)
+
+        html = self.nodelist.render(context)
+        card_cache().set(key, str(html), getattr(settings, 'CARD_CACHE_TIMEOUT', 15 * 60))
+        return html
+
+
+@register.tag
+def cachecard(parser, token):
+    """{% cachecard obj [in items] %} ... {% endcachecard %}"""
+    bits = token.split_contents()
+    if len(bits) not in (2, 4) or (len(bits) == 4 and bits[2] != 'in'):
+        raise template.TemplateSyntaxError(f"'{bits[0]}' usage: {{% {bits[0]} obj [in items] %}}")
+
+    # متن قالب کارت در کلید است تا با تغییر قالب، کش قبلی خودبه‌خود کنار برود
+    before   = parser.tokens[:]
+    nodelist = parser.parse(('endcachecard',))
+    consumed = before[len(parser.tokens):][::-1] if len(before) > len(parser.tokens) else []
+    parser.delete_first_token()
+    source   = '\x00'.join(f'{t.token_type.value}:{t.contents}' for t in consumed)
+    fragment = hashlib.md5(source.encode('utf-8')).hexdigest()[:12]
+
+    items = parser.compile_filter(bits[3]) if len(bits) == 4 else None
+    return CacheCardNode(nodelist, parser.compile_filter(bits[1]), items, fragment)
@@ -0,0 +1,75 @@
+"""
+main/templatetags/media_tags.py
+{% load media_tags %}
+{{ lesson.video_file|signed_url:user }}
+{{ book.cover_image|thumbnail_url:96 }}
+{% responsive_image book.cover_image sizes="(max-width: 768px) 45vw, 200px" alt=book.title class="book-cover" %}
+"""
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from main import images
+from main.signing import signed_url as _signed_url
+
+register = template.Library()
+
+
+@register.filter
+def signed_url(fieldfile, user=None):
+    """لینک امضاشده و تاریخ‌دار برای یک FileField/ImageField"""
+    if not fieldfile:
+        return ''
+    return _signed_url(fieldfile.name, user)
+
+
+@register.filter
+def thumbnail_url(fieldfile, width=320):
+    """آدرس نسخه WebP کوچک‌شده (برای پس‌زمینه CSS و لیست admin)"""
+    return images.thumbnail_url(fieldfile, int(width))
+
+
+def _sources(fieldfile, meta, sizes, media=None):
+    return [
+        (images.MIME_TYPES[fmt], images.srcset(fieldfile.name, meta, fmt), sizes, media)
+        for fmt in meta['f'] if fmt in images.MIME_TYPES
+    ]
+
+
+@register.simple_tag
+def responsive_image(fieldfile, sizes='100vw', default='', mobile=None, **attrs):
+    """
+    <picture> با منبع‌های AVIF / WebP در چند عرض و <img> اصلی به‌عنوان fallback.
+    mobile: تصویر جایگزین برای صفحه‌های باریک (مثلاً SliderSlide.mobile_image)
+    اگر نسخه‌ها هنوز ساخته نشده باشند فقط <img> اصلی برگردانده می‌شود.
+    """
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+
+    if not fieldfile:
+        if not default:
+            return ''
+        return format_html('<img src="{}"{}>', default, flatatt(attrs))
+
+    meta = images.get_meta(fieldfile.name)
+    img  = format_html('<img src="{}"{}>', fieldfile.url, flatatt(attrs))
+
+    sources = []
+    mobile_meta = images.get_meta(mobile.name) if mobile else None
+    if mobile_meta:
+        sources += _sources(mobile, mobile_meta, '100vw', '(max-width: 768px)')
+    elif mobile:
+        sources.append(('', mobile.url, '', '(max-width: 768px)'))
+    if meta:
+        sources += _sources(fieldfile, meta, sizes)
+    if not sources:
+        return img
+
+    return format_html(
+        '<picture>{}{}</picture>',
+        format_html_join('', '<source{}>', (
+            (flatatt({k: v for k, v in (('media', media), ('type', mime), ('srcset', srcset), ('sizes', size)) if v}),)
+            for mime, srcset, size, media in sources
+        )),
+        img,
+    )
@@ -1,3 +1,428 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import runpy
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.template import Context, Template
+from django.urls import reverse
+
+from account.models import User
+from book.models import Book
+from course.models import Course, CourseLesson, CourseSection
+from main import ffmpeg, images
+from main.exports import csv_chunks, jsonl_chunks
+from main.instrumentation import RequestProfile, query_key
+from main.management.commands.benchmark_gateway import FakeGateway
+from main.querybudget import budget_for, measure_changelist
+from main.signing import signed_url
+from podcast.models import Podcast
+from purchase.models import Purchase
+
+
+class BenchmarkGatewayTests(TransactionTestCase):
+    """درگاه جعلی به‌جای uvicorn از ASGITransport خود httpx صدا زده می‌شود"""
+
+    def run_command(self, **options):
+        gateways = []
+
+        def start(gateway):
+            gateways.append(gateway)
+            return 'http://gateway.test/pg/v4/payment/request.json'
+
+        def new_client():
+            return httpx.AsyncClient(transport=httpx.ASGITransport(app=gateways[0]))
+
+        out = StringIO()
+        with mock.patch.object(FakeGateway, 'start', start), mock.patch.object(FakeGateway, 'stop'), \
+                mock.patch('main.httpclient._new_client', new_client):
+            call_command('benchmark_gateway', stdout=out, **options)
+        return gateways[0], out.getvalue()
+
+    def test_asgi_overlaps_gateway_calls(self):
+        gateway, out = self.run_command(mode='asgi', requests=12, concurrency=6, delay=100)
+        self.assertEqual(gateway.calls, 12)
+        self.assertGreater(gateway.peak, 1)
+        self.assertLessEqual(gateway.peak, 6)
+        self.assertIn('1 event loop', out)
+
+    def test_cleans_up_synthetic_rows(self):
+        self.run_command(mode='asgi', requests=2, concurrency=2, delay=0)
+        self.assertFalse(Book.objects.filter(slug__startswith='gwbench-').exists())
+        self.assertFalse(Purchase.objects.exists())
+
+
+class SignedMediaTests(TestCase):
+    """لینک شخصی فقط با نشست همان کاربر باز می‌شود"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create(phone_number='09120000001')
+        cls.other = User.objects.create(phone_number='09120000002')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name, MEDIA_SIGNING_MODE='hmac', MEDIA_ACCEL_REDIRECT_PREFIX='')
+        settings.enable()
+        self.addCleanup(settings.disable)
+        default_storage.save('podcasts/audio/ep.mp3', ContentFile(b'ID3' + b'\0' * 61))
+
+    def get(self, url):
+        response = self.client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def test_owner_session_is_required(self):
+        url = signed_url('podcasts/audio/ep.mp3', self.owner)
+        self.assertEqual(self.get(url).status_code, 403)          # مهمان
+
+        self.client.force_login(self.other)
+        self.assertEqual(self.get(url).status_code, 403)          # لینک کپی‌شده
+
+        self.client.force_login(self.owner)
+        self.assertEqual(self.get(url).status_code, 200)
+
+    def test_guest_link_needs_no_session(self):
+        self.assertEqual(self.get(signed_url('podcasts/audio/ep.mp3')).status_code, 200)
+
+    def test_tampered_user_breaks_signature(self):
+        self.client.force_login(self.other)
+        url = signed_url('podcasts/audio/ep.mp3', self.owner).replace(f'u={self.owner.pk}', f'u={self.other.pk}')
+        self.assertEqual(self.get(url).status_code, 403)
+
+
+@override_settings(METRICS_TOKEN='s3cret')
+class MetricsEndpointTests(TestCase):
+    """/metrics فقط با توکن Bearer یا کاربر staff"""
+
+    def setUp(self):
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+        self.url = reverse('metrics')
+
+    def test_anonymous_and_wrong_token_are_forbidden(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(self.client.get(self.url, headers={'Authorization': 'Bearer wrong'}).status_code, 403)
+        self.client.force_login(User.objects.create(phone_number='09120000001'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_empty_token_is_never_accepted(self):
+        self.assertEqual(self.client.get(self.url, headers={'Authorization': 'Bearer '}).status_code, 403)
+
+    def test_bearer_token(self):
+        self.client.get(self.url)      # یک نمونه تأخیر برای همین view
+        response = self.client.get(self.url, headers={'Authorization': 'Bearer s3cret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertContains(response, 'mahboub_request_duration_seconds_bucket{')
+        self.assertContains(response, 'mahboub_payments_total')
+
+    def test_staff_user(self):
+        self.client.force_login(User.objects.create(phone_number='09120000002', is_staff=True))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'mahboub_request_duration_seconds')
+
+
+@override_settings(FFMPEG_BINARY='/opt/ffmpeg/bin/ffmpeg', FFPROBE_BINARY='/opt/ffmpeg/bin/ffprobe')
+class FFmpegTests(SimpleTestCase):
+    """subprocess.run جعلی؛ فقط ساخت فرمان و تبدیل خطاها به FFmpegError"""
+
+    def patch_run(self, **result):
+        completed = subprocess.CompletedProcess([], result.pop('returncode', 0), result.pop('stdout', ''), result.pop('stderr', ''))
+        return mock.patch('main.ffmpeg.subprocess.run', return_value=completed)
+
+    def test_run_command_line(self):
+        with self.patch_run() as run:
+            ffmpeg.run(['-i', 'in.mp3', '-ar', 44100, 'out.m4a'], timeout=30)
+        cmd = run.call_args.args[0]
+        self.assertEqual(cmd, ['/opt/ffmpeg/bin/ffmpeg', '-hide_banner', '-loglevel', 'error', '-y',
+                               '-i', 'in.mp3', '-ar', '44100', 'out.m4a'])
+        self.assertEqual(run.call_args.kwargs['timeout'], 30)
+
+    def test_run_errors(self):
+        with self.patch_run(returncode=1, stderr='x' * 3000 + 'Invalid data\n'):
+            with self.assertRaises(ffmpeg.FFmpegError) as ctx:
+                ffmpeg.run(['-i', 'in.mp3', 'out.m4a'])
+        self.assertTrue(str(ctx.exception).endswith('Invalid data'))
+        self.assertEqual(len(str(ctx.exception)), 2000)
+
+        with self.patch_run(returncode=139), self.assertRaisesMessage(ffmpeg.FFmpegError, 'ffmpeg exited with 139'):
+            ffmpeg.run([])
+        for error in (FileNotFoundError('ffmpeg'), subprocess.TimeoutExpired('ffmpeg', 5)):
+            with self.subTest(error=type(error).__name__):
+                with mock.patch('main.ffmpeg.subprocess.run', side_effect=error), self.assertRaises(ffmpeg.FFmpegError):
+                    ffmpeg.run([])
+
+    def test_probe_skips_cover_art(self):
+        data = {
+            'streams': [
+                {'codec_type': 'audio'},
+                {'codec_type': 'video', 'width': 600, 'height': 600, 'disposition': {'attached_pic': 1}},
+            ],
+            'format': {'duration': '1834.52', 'bit_rate': '128000'},
+        }
+        with self.patch_run(stdout=json.dumps(data)) as run:
+            info = ffmpeg.probe('ep.mp3')
+        self.assertEqual(run.call_args.args[0][0], '/opt/ffmpeg/bin/ffprobe')
+        self.assertEqual(info, {
+            'duration': 1834.52, 'width': 0, 'height': 0, 'has_video': False, 'has_audio': True, 'bit_rate': 128000,
+        })
+
+    def test_probe_error(self):
+        with self.patch_run(returncode=1, stderr='ep.mp3: No such file or directory'):
+            with self.assertRaisesMessage(ffmpeg.FFmpegError, 'No such file'):
+                ffmpeg.probe('ep.mp3')
+
+
+class IngestMediaTests(TransactionTestCase):
+    """pool پردازه‌ای با thread جایگزین می‌شود تا subprocess.run جعلی به کارها برسد"""
+
+    DURATIONS = {'ok.mp3': 1834.52, 'lesson.mp4': 61.2}
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name, FFMPEG_BINARY='ffmpeg', FFPROBE_BINARY='ffprobe')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def fake_run(self, cmd, **kwargs):
+        if cmd[0] == 'ffprobe':
+            name = Path(cmd[-1]).name
+            if name not in self.DURATIONS:
+                return subprocess.CompletedProcess(cmd, 1, '', f'{name}: Invalid data found when processing input')
+            data = {'streams': [{'codec_type': 'audio'}], 'format': {'duration': str(self.DURATIONS[name])}}
+            return subprocess.CompletedProcess(cmd, 0, json.dumps(data), '')
+        Path(cmd[-1]).write_bytes(b'm4a')
+        return subprocess.CompletedProcess(cmd, 0, '', '')
+
+    def test_once(self):
+        ok     = Podcast.objects.create(title='ok', slug='ok', audio_file='podcasts/audio/ok.mp3')
+        broken = Podcast.objects.create(title='broken', slug='broken', audio_file='podcasts/audio/broken.mp3')
+        course = Course.objects.create(title='دوره', slug='c', instructor='مدرس')
+        lesson = CourseLesson.objects.create(
+            section=CourseSection.objects.create(course=course, title='فصل'),
+            title='درس', lesson_type='audio', video_file='courses/videos/lesson.mp4',
+        )
+
+        out = StringIO()
+        with mock.patch('main.ffmpeg.subprocess.run', side_effect=self.fake_run), \
+                mock.patch('main.management.commands.ingest_media.ProcessPoolExecutor', ThreadPoolExecutor), \
+                self.assertLogs('main.management.commands.ingest_media', 'WARNING') as logs:
+            call_command('ingest_media', once=True, workers=2, stdout=out)
+        self.assertIn('podcasts=1 lessons=1 failed=1 courses=1', out.getvalue())
+        self.assertEqual(len(logs.records), 1)
+
+        ok.refresh_from_db()
+        self.assertEqual((ok.audio_status, ok.duration), (Podcast.ProcessingStatus.READY, 1835))
+        self.assertEqual(ok.audio_mobile.name, f'podcasts/audio/mobile/{ok.pk}-ok.m4a')
+        self.assertTrue(Path(ok.audio_mobile.path).exists())
+
+        broken.refresh_from_db()
+        self.assertEqual(broken.audio_status, Podcast.ProcessingStatus.FAILED)
+        self.assertIn('Invalid data', broken.audio_error)
+
+        lesson.refresh_from_db()
+        course.refresh_from_db()
+        self.assertEqual((lesson.duration, course.total_duration), (61, 2))
+
+
+class ImageDerivativeTests(SimpleTestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media = Path(media.name)
+        settings   = override_settings(MEDIA_ROOT=media.name, MEDIA_URL='/media/', IMAGE_DERIVATIVE_WIDTHS=(160, 320, 480, 768))
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(cache.clear)
+
+        from PIL import Image
+        (self.media / 'books/covers').mkdir(parents=True)
+        Image.new('P', (500, 250)).save(self.media / 'books/covers/cover.png')
+        self.name  = 'books/covers/cover.png'
+        self.cover = mock.Mock(url='/media/books/covers/cover.png')
+        self.cover.name = self.name
+
+    def build(self):
+        meta = images.build(self.name, str(self.media), images.widths(), images.formats())
+        images.forget(self.name)
+        return meta
+
+    def test_build_never_upscales(self):
+        from PIL import Image
+        meta = self.build()
+        self.assertEqual(meta, {'w': [160, 320, 480, 500], 'f': ['avif', 'webp'], 'width': 500, 'height': 250})
+        with Image.open(self.media / images.derivative_name(self.name, 160, 'webp')) as img:
+            self.assertEqual((img.format, img.size), ('WEBP', (160, 80)))
+        with Image.open(self.media / images.derivative_name(self.name, 500, 'avif')) as img:
+            self.assertEqual(img.size, (500, 250))
+        self.assertEqual(json.loads((self.media / 'derivatives/books/covers/cover.json').read_text()), meta)
+        self.assertFalse(list(self.media.rglob('*.part')))
+
+    def test_thumbnail_url_falls_back_until_built(self):
+        self.assertEqual(images.thumbnail_url(self.cover, 300), self.cover.url)
+        self.build()
+        self.assertEqual(images.thumbnail_url(self.cover, 300), '/media/derivatives/books/covers/cover-320w.webp')
+        self.assertEqual(images.thumbnail_url(self.cover, 2000), '/media/derivatives/books/covers/cover-500w.webp')
+        self.assertEqual(images.thumbnail_url(None, 300), '')
+
+    def test_responsive_image_tag(self):
+        template = Template('{% load media_tags %}{% responsive_image cover sizes="200px" alt="جلد" %}')
+        html = template.render(Context({'cover': self.cover}))
+        self.assertHTMLEqual(html, '<img src="/media/books/covers/cover.png" alt="جلد" loading="lazy" decoding="async">')
+
+        self.build()
+
+        def srcset(fmt):
+            return ', '.join(f'/media/derivatives/books/covers/cover-{w}w.{fmt} {w}w' for w in (160, 320, 480, 500))
+
+        self.assertHTMLEqual(template.render(Context({'cover': self.cover})), (
+            '<picture>'
+            f'<source type="image/avif" srcset="{srcset("avif")}" sizes="200px">'
+            f'<source type="image/webp" srcset="{srcset("webp")}" sizes="200px">'
+            '<img src="/media/books/covers/cover.png" alt="جلد" loading="lazy" decoding="async">'
+            '</picture>'
+        ))
+
+
+class AdminQueryBudgetTests(TestCase):
+    """
+    هر changelist ثبت‌شده با ۱۰۰ ردیف seed شده رندر می‌شود: تعداد کوئری نباید از سقف
+    (query_budget یا ADMIN_QUERY_BUDGET) بیشتر شود و نباید با تعداد ردیف رشد کند (N+1)
+    """
+
+    ROWS = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_catalog', workers=1, prefix='qb', stdout=StringIO(),
+            books=cls.ROWS, pages_per_book=2, page_chars=40, podcasts=cls.ROWS, series=cls.ROWS, courses=cls.ROWS,
+            users=cls.ROWS, purchases=cls.ROWS, orders=cls.ROWS, subscriptions=cls.ROWS, archived=cls.ROWS,
+            tickets=cls.ROWS,
+        )
+
+    def test_changelists_stay_within_budget(self):
+        user = User(is_active=True, is_staff=True, is_superuser=True)
+        for model, model_admin in sorted(admin.site._registry.items(), key=lambda item: item[0]._meta.label):
+            with self.subTest(model=model._meta.label):
+                response, single = measure_changelist(model_admin, user, 1)
+                if 'cl' not in (getattr(response, 'context_data', None) or {}):
+                    continue      # singleton مثل SiteSettings که به صفحه ویرایش redirect می‌شود
+                response, queries = measure_changelist(model_admin, user, self.ROWS)
+                rows = len(response.context_data['cl'].result_list)
+
+                self.assertLessEqual(len(queries), budget_for(model_admin), f'{rows} rows')
+                self.assertEqual(len(queries), len(single), f'N+1: query count grows with rows ({rows} rows)')
+
+
+class ExportFormulaTests(SimpleTestCase):
+    HEADERS = ['id', 'subject', 'amount']
+    ROWS    = [
+        (1, '=HYPERLINK("http://x","کلیک")', -5000),
+        (2, '+98 912', 0),
+        (3, '-1+2', 1),
+        (4, '@SUM(A1)', 2),
+        (5, '\tمتن', 3),
+        (6, '\r=1', 4),
+        (7, 'a=b', 5),
+    ]
+
+    def test_csv_cells_cannot_start_a_formula(self):
+        text = ''.join(csv_chunks(self.HEADERS, self.ROWS)).lstrip('\ufeff')
+        rows = list(csv.reader(StringIO(text)))[1:]
+        self.assertEqual([row[1] for row in rows], [
+            "'=HYPERLINK(\"http://x\",\"کلیک\")", "'+98 912", "'-1+2", "'@SUM(A1)", "'\tمتن", "'\r=1", 'a=b',
+        ])
+        self.assertEqual(rows[0][2], '-5000')     # عدد منفی خانه عددی است، نه متن
+
+    def test_jsonl_keeps_values(self):
+        lines = ''.join(jsonl_chunks(self.HEADERS, self.ROWS)).splitlines()
+        self.assertEqual([json.loads(line)['subject'] for line in lines], [row[1] for row in self.ROWS])
+
+
+class GunicornMetricsDirTests(SimpleTestCase):
+    """gunicorn.conf.py هنگام خواندن چیزی پاک نمی‌کند؛ on_starting فقط *.db پوشه خودمان را"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root   = Path(tmp.name)
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        self.server = mock.Mock()
+
+    def load(self, path: Path) -> dict:
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = str(path)
+        return runpy.run_path(str(Path(settings.BASE_DIR) / 'gunicorn.conf.py'))
+
+    def test_created_directory_is_cleared_on_starting(self):
+        path = self.root / 'metrics'
+        conf = self.load(path)
+        (path / 'counter_12.db').write_bytes(b'x')
+        (path / 'keep.txt').write_text('x')
+
+        self.load(path)                    # خواندن دوباره config (مثلاً HUP) چیزی پاک نمی‌کند
+        self.assertTrue((path / 'counter_12.db').exists())
+        conf['on_starting'](self.server)
+        self.assertEqual(sorted(p.name for p in path.iterdir()), [conf['METRICS_MARKER'], 'keep.txt'])
+
+    def test_foreign_directory_is_left_alone(self):
+        (self.root / 'manage.py').write_text('x')
+        (self.root / 'data.db').write_bytes(b'x')
+        conf = self.load(self.root)
+        conf['on_starting'](self.server)
+        self.assertEqual(sorted(p.name for p in self.root.iterdir()), ['data.db', 'manage.py'])
+        self.server.log.warning.assert_called_once()
+
+    def test_existing_metrics_only_directory_is_adopted(self):
+        (self.root / 'histogram_7.db').write_bytes(b'x')
+        conf = self.load(self.root)
+        self.assertTrue((self.root / 'histogram_7.db').exists())
+        conf['on_starting'](self.server)
+        self.assertEqual([p.name for p in self.root.iterdir()], [conf['METRICS_MARKER']])
+
+
+class DuplicateQueryTests(SimpleTestCase):
+    SQL = 'SELECT * FROM "book_book" WHERE "book_book"."id" IN (%s)'
+
+    def test_duplicates_need_same_sql_and_params(self):
+        profile = RequestProfile()
+        for sql, params in (
+            (self.SQL, (1,)), (self.SQL, (1,)), (self.SQL, [1]), (self.SQL, (2,)),
+            ('SELECT 1', None), ('SELECT 1', ()), ('SELECT 2', None),
+        ):
+            profile.record_query(sql, params, 1.0)
+        self.assertEqual(profile.queries, 7)
+        self.assertEqual(profile.duplicates, 3)
+        self.assertEqual(profile.most_repeated(1), [(self.SQL, [4, 4.0])])
+
+    def test_fingerprint_is_bounded(self):
+        ids = tuple(range(10_000))
+        self.assertEqual(query_key(self.SQL, ids), query_key(self.SQL, list(ids)))
+        self.assertNotEqual(query_key(self.SQL, ids), query_key(self.SQL, ids[:-1]))
+        text = 'ا' * 100_000
+        self.assertNotEqual(query_key(self.SQL, (text,)), query_key(self.SQL, (text[:-1],)))
+        self.assertEqual(query_key(self.SQL, {'id': 5}), query_key(self.SQL, (5,)))
@@ -1,14 +1,20 @@
 # Updated views.py with ajax views for dynamic filtering
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from django.utils import timezone
 from django.db.models import Q
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.contrib.auth import SESSION_KEY
 from django.core.paginator import Paginator
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponseForbidden
 from .models import SiteSettings, Slider, Banner, MenuItem, FAQ, GuideCategory,GuideArticle,SupportTicket
 from book.models import Book, BookCategory  # Assuming books app
 from podcast.models import Podcast, PodcastCategory  # Assuming podcasts app
 from course.models import Course, CourseCategory  # Assuming courses app
+from .signing import verify
+from .streaming import serve_storage_file
 
 def main(request):
     settings = SiteSettings.get()
@@ -223,4 +229,27 @@ def contact_support(request):
         'support_hours': '۹ صبح تا ۹ شب',
         'response_time': '۲۴ ساعت',
     }
-    return render(request, 'support/contact.html', context)
\ No newline at end of file
+    return render(request, 'support/contact.html', context)
+
+
+async def signed_media(request, path):
+    """
+    GET /media-signed/<path>?e=&u=&s=
+    سرو فایل رسانه با لینک امضاشده — HMAC و انقضا، و برای لینک شخصی کاربر نشست
+    (فقط خواندن نشست؛ بدون کوئری محتوا یا خرید)
+    async: دسترسی به فایل در thread pool و ارسال بلوک‌ها در event loop (main/streaming.py)
+    """
+    user_id = request.GET.get('u')
+    if not verify(path, request.GET.get('e'), user_id, request.GET.get('s')):
+        return HttpResponseForbidden('لینک نامعتبر یا منقضی شده است.')
+    # لینک شخصی فقط برای همان کاربر — پیش از سپردن فایل به nginx (X-Accel-Redirect)
+    user_id = int(user_id)
+    if user_id and await request.session.aget(SESSION_KEY) != str(user_id):
+        return HttpResponseForbidden('این لینک متعلق به حساب دیگری است.')
+    if not await sync_to_async(default_storage.exists, thread_sensitive=False)(path):
+        raise Http404
+    response = await sync_to_async(serve_storage_file, thread_sensitive=False)(
+        request, default_storage, path, as_attachment=request.GET.get('download') == '1',
+    )
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
@@ -0,0 +1,58 @@
+"""
+main/warmup.py
+گرم کردن پردازه قبل از اولین درخواست: کامپایل همه قالب‌ها در cached loader و ساخت URL resolver
+
+از core/wsgi.py صدا زده می‌شود (settings.TEMPLATE_WARMUP). با preload_app گونیکورن
+(gunicorn.conf.py) در master اجرا می‌شود و workerها بعد از fork آن را به ارث می‌برند.
+به دیتابیس وصل نمی‌شود تا اتصالی بین پردازه‌های fork شده مشترک نماند.
+"""
+import logging
+import time
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# قالب‌های admin خود Django فقط در صورت استفاده کامپایل شوند
+SKIP_PREFIXES = ('admin/', 'registration/', 'django/')
+
+
+def template_names() -> list:
+    """نام همه قالب‌های .html در DIRS و پوشه templates اپ‌ها (بدون تکرار)"""
+    names = set()
+    for engine in engines.all():
+        dirs = list(getattr(engine, 'dirs', [])) + list(get_app_template_dirs('templates'))
+        for directory in dirs:
+            root = Path(directory)
+            for path in root.rglob('*.html'):
+                name = path.relative_to(root).as_posix()
+                if not name.startswith(SKIP_PREFIXES):
+                    names.add(name)
+    return sorted(names)
+
+
+def warm_templates() -> tuple:
+    """(تعداد قالب‌های کامپایل‌شده، لیست قالب‌های خراب)"""
+    engine = engines['django']
+    done, broken = 0, []
+    for name in template_names():
+        try:
+            engine.get_template(name)
+            done += 1
+        except TemplateSyntaxError as e:
+            broken.append(name)
+            logger.warning('template warm-up: %s: %s', name, e)
+    return done, broken
+
+
+def warm_up():
+    start = time.perf_counter()
+    done, broken = warm_templates()
+    get_resolver()._populate()
+    logger.info(
+        'warm-up: %d templates (%d broken), urls in %.0fms',
+        done, len(broken), (time.perf_counter() - start) * 1000,
+    )
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.db.models import Count, Sum
+from main.images import thumbnail_url
+from main.adminfilters import AutocompleteFilterMixin, AutocompleteListFilter
+from main.querybudget import QueryBudgetMixin
 from .models import PodcastCategory, PodcastSeries, Podcast
 
 
@@ -36,8 +39,9 @@ class PodcastInline(admin.TabularInline):
 # ── مجموعه پادکست ─────────────────────────────────────────────────────────
 
 @admin.register(PodcastSeries)
-class PodcastSeriesAdmin(admin.ModelAdmin):
+class PodcastSeriesAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display   = ('cover_thumbnail', 'title', 'host', 'category', 'episodes_count', 'is_featured', 'is_active')
+    list_select_related = ('category',)
     list_display_links = ('cover_thumbnail', 'title')
     list_editable  = ('is_featured', 'is_active')
     list_filter    = ('category', 'is_active', 'is_featured')
@@ -54,6 +58,9 @@ class PodcastSeriesAdmin(admin.ModelAdmin):
         ('تصویر', {
             'fields': ('cover_image', 'cover_preview'),
         }),
+        ('خرید یکجا', {
+            'fields': ('bundle_discount_percent',),
+        }),
         ('وضعیت', {
             'fields': ('is_active', 'is_featured', 'created_at'),
         }),
@@ -63,14 +70,14 @@ class PodcastSeriesAdmin(admin.ModelAdmin):
         if obj.cover_image:
             return format_html(
                 '<img src="{}" style="width:50px;height:50px;object-fit:cover;border-radius:50%;"/>',
-                obj.cover_image.url
+                thumbnail_url(obj.cover_image, 160)
             )
         return format_html('<div style="width:50px;height:50px;background:#f0f0f0;border-radius:50%;display:flex;align-items:center;justify-content:center;">🎙️</div>')
     cover_thumbnail.short_description = 'کاور'
 
     def cover_preview(self, obj):
         if obj.cover_image:
-            return format_html('<img src="{}" style="max-height:180px;border-radius:8px;"/>', obj.cover_image.url)
+            return format_html('<img src="{}" style="max-height:180px;border-radius:8px;"/>', thumbnail_url(obj.cover_image, 480))
         return '—'
     cover_preview.short_description = 'پیش‌نمایش'
 
@@ -99,7 +106,7 @@ class AccessTypeFilter(admin.SimpleListFilter):
 
 
 @admin.register(Podcast)
-class PodcastAdmin(admin.ModelAdmin):
+class PodcastAdmin(QueryBudgetMixin, AutocompleteFilterMixin, admin.ModelAdmin):
     list_display = (
         'cover_thumbnail', 'title', 'host', 'series', 'category',
         'episode_number', 'duration_display', 'access_badge',
@@ -107,13 +114,18 @@ class PodcastAdmin(admin.ModelAdmin):
     )
     list_display_links = ('cover_thumbnail', 'title')
     list_editable      = ('is_featured', 'is_active')
-    list_filter        = (AccessTypeFilter, 'series', 'category', 'is_active', 'is_featured')
+    list_filter        = (AccessTypeFilter, ('series', AutocompleteListFilter), 'category', 'audio_status', 'is_active', 'is_featured')
+    list_select_related = ('series', 'category')
     search_fields      = ('title', 'host', 'description')
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields    = ('plays', 'downloads', 'created_at', 'updated_at', 'cover_preview', 'duration_readable')
+    readonly_fields    = (
+        'plays', 'downloads', 'created_at', 'updated_at', 'cover_preview', 'duration_readable',
+        'audio_mobile', 'audio_status', 'audio_error',
+    )
     list_per_page      = 25
     date_hierarchy     = 'created_at'
     save_on_top        = True
+    actions            = ['requeue_audio']
 
     fieldsets = (
         ('اطلاعات قسمت', {
@@ -126,6 +138,10 @@ class PodcastAdmin(admin.ModelAdmin):
         ('فایل صوتی', {
             'fields': ('audio_file', 'audio_url', 'duration', 'duration_readable'),
         }),
+        ('نسخه سبک (موبایل)', {
+            'fields': ('audio_status', 'audio_mobile', 'audio_error'),
+            'classes': ('collapse',),
+        }),
         ('دسترسی و قیمت', {
             'fields': ('access_type', 'price', 'discount_percent'),
         }),
@@ -138,18 +154,23 @@ class PodcastAdmin(admin.ModelAdmin):
         }),
     )
 
+    @admin.action(description='پردازش مجدد صوت قسمت‌های انتخاب‌شده')
+    def requeue_audio(self, request, queryset):
+        n = queryset.exclude(audio_file='').update(audio_status=Podcast.ProcessingStatus.PENDING)
+        self.message_user(request, f'{n} قسمت در صف پردازش قرار گرفت.')
+
     def cover_thumbnail(self, obj):
         if obj.cover_image:
             return format_html(
                 '<img src="{}" style="width:45px;height:45px;object-fit:cover;border-radius:6px;"/>',
-                obj.cover_image.url
+                thumbnail_url(obj.cover_image, 160)
             )
         return '🎧'
     cover_thumbnail.short_description = 'کاور'
 
     def cover_preview(self, obj):
         if obj.cover_image:
-            return format_html('<img src="{}" style="max-height:180px;border-radius:8px;"/>', obj.cover_image.url)
+            return format_html('<img src="{}" style="max-height:180px;border-radius:8px;"/>', thumbnail_url(obj.cover_image, 480))
         return '—'
     cover_preview.short_description = 'پیش‌نمایش'
 
@@ -173,5 +194,5 @@ class PodcastAdmin(admin.ModelAdmin):
     def price_display(self, obj):
         if obj.access_type == 'free':
             return format_html('<span style="color:#198754;font-weight:bold;">رایگان</span>')
-        return format_html('{:,} تومان', obj.final_price)
+        return format_html('{} تومان', f'{obj.final_price:,}')
     price_display.short_description = 'قیمت'
\ No newline at end of file
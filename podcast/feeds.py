@@ -0,0 +1,156 @@
+"""
+podcast/feeds.py
+فید RSS سازگار با iTunes برای هر مجموعه پادکست: /podcasts/series/<slug>/feed/
+
+فقط قسمت‌های رایگان و فعالِ دارای صوت در فید می‌آیند؛ enclosure به podcast_audio اشاره می‌کند
+(پس شمارش پخش و لینک امضاشده مثل سایت است). خروجی با main/conditional.py کش می‌شود و
+فقط وقتی مجموعه یا یکی از قسمت‌هایش تغییر کند دوباره ساخته می‌شود.
+"""
+import mimetypes
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.db.models import Count, Max
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Rss201rev2Feed
+
+from main.conditional import versioned_cache
+
+from .models import Podcast, PodcastSeries
+
+
+class ITunesFeed(Rss201rev2Feed):
+    """RSS 2.0 به‌علاوه تگ‌های itunes:* که Apple Podcasts و بیشتر اپ‌های پادکست می‌خوانند"""
+
+    def rss_attributes(self):
+        attrs = super().rss_attributes()
+        attrs['xmlns:itunes'] = 'http://www.itunes.com/dtds/podcast-1.0.dtd'
+        return attrs
+
+    def add_root_elements(self, handler):
+        super().add_root_elements(handler)
+        handler.addQuickElement('itunes:author', self.feed['itunes_author'])
+        handler.addQuickElement('itunes:summary', self.feed['description'])
+        handler.addQuickElement('itunes:type', 'episodic')
+        handler.addQuickElement('itunes:explicit', 'false')
+        handler.addQuickElement('itunes:category', '', {'text': self.feed['itunes_category']})
+        if self.feed['itunes_image']:
+            handler.addQuickElement('itunes:image', '', {'href': self.feed['itunes_image']})
+        if self.feed['itunes_email']:
+            handler.startElement('itunes:owner', {})
+            handler.addQuickElement('itunes:name', self.feed['itunes_author'])
+            handler.addQuickElement('itunes:email', self.feed['itunes_email'])
+            handler.endElement('itunes:owner')
+
+    def add_item_elements(self, handler, item):
+        super().add_item_elements(handler, item)
+        handler.addQuickElement('itunes:duration', str(item['itunes_duration']))
+        handler.addQuickElement('itunes:explicit', 'false')
+        if item['itunes_episode']:
+            handler.addQuickElement('itunes:episode', str(item['itunes_episode']))
+        if item['itunes_image']:
+            handler.addQuickElement('itunes:image', '', {'href': item['itunes_image']})
+
+
+def _absolute(series, url: str) -> str:
+    return url if url.startswith(('http://', 'https://')) else series.base_url + url.lstrip('/')
+
+
+class SeriesFeed(Feed):
+    feed_type = ITunesFeed
+
+    def get_object(self, request, slug):
+        series = get_object_or_404(PodcastSeries, slug=slug, is_active=True)
+        # نمونه Feed بین درخواست‌ها مشترک است؛ نشانی پایه روی شیء همین درخواست می‌ماند
+        series.base_url = request.build_absolute_uri('/')
+        return series
+
+    def title(self, series):
+        return series.title
+
+    def description(self, series):
+        return series.description or series.title
+
+    def link(self, series):
+        return reverse('podcasts:podcasts_list')
+
+    def author_name(self, series):
+        return series.host
+
+    def feed_extra_kwargs(self, series):
+        from main.models import SiteSettings
+        site = SiteSettings.objects.first()
+        return {
+            'itunes_author':   series.host,
+            'itunes_category': getattr(settings, 'PODCAST_ITUNES_CATEGORY', 'Religion & Spirituality'),
+            'itunes_image':    _absolute(series, series.cover_image.url) if series.cover_image else '',
+            'itunes_email':    site.email if site else '',
+        }
+
+    def items(self, series):
+        episodes = list(
+            series.episodes.filter(is_active=True, access_type=Podcast.AccessType.FREE)
+            .exclude(audio_file='', audio_url='')
+            .order_by('-episode_number', '-created_at')
+        )
+        for episode in episodes:
+            episode.series = series
+        return episodes
+
+    def item_title(self, episode):
+        return episode.title
+
+    def item_description(self, episode):
+        return episode.description
+
+    def item_link(self, episode):
+        return reverse('podcasts:podcast_detail', args=[episode.slug])
+
+    def item_guid(self, episode):
+        return f'podcast-{episode.pk}'
+
+    item_guid_is_permalink = False
+
+    def item_pubdate(self, episode):
+        return episode.created_at
+
+    def item_updateddate(self, episode):
+        return episode.updated_at
+
+    def item_enclosure_url(self, episode):
+        if episode.audio_url:
+            return episode.audio_url
+        # فایل اصلی (نه نسخه سبک) تا enclosure_length با بایت‌های سروشده یکی باشد
+        url = reverse('podcasts:podcast_audio', args=[episode.slug]) + '?quality=original'
+        return _absolute(episode.series, url)
+
+    def item_enclosure_length(self, episode):
+        if episode.audio_url or not episode.audio_file:
+            return 0
+        try:
+            return episode.audio_file.size
+        except OSError:
+            return 0
+
+    def item_enclosure_mime_type(self, episode):
+        name = episode.audio_url or episode.audio_file.name
+        return mimetypes.guess_type(name)[0] or 'audio/mpeg'
+
+    def item_extra_kwargs(self, episode):
+        cover = episode.cover_image or episode.series.cover_image
+        return {
+            'itunes_duration': episode.duration,
+            'itunes_episode':  episode.episode_number,
+            'itunes_image':    _absolute(episode.series, cover.url) if cover else '',
+        }
+
+
+def _series_version(request, slug):
+    series = get_object_or_404(PodcastSeries.objects.only('pk', 'updated_at'), slug=slug, is_active=True)
+    stats  = Podcast.objects.filter(series=series).aggregate(latest=Max('updated_at'), count=Count('pk'))
+    latest = max(filter(None, [series.updated_at, stats['latest']]))
+    return latest, f'{series.updated_at}:{stats["latest"]}:{stats["count"]}'
+
+
+series_feed = versioned_cache(_series_version)(SeriesFeed())
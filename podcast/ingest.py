@@ -0,0 +1,41 @@
+"""
+podcast/ingest.py
+پردازش فایل صوتی پادکست: اندازه‌گیری مدت + ساخت نسخه سبک و هم‌بلند برای موبایل
+
+این توابع فقط با فایل کار می‌کنند (بدون دیتابیس) تا در process pool
+فرمان ingest_media اجرا شوند.
+"""
+import os
+from pathlib import Path
+
+from main.ffmpeg import probe, normalize_audio, FFmpegError
+
+
+def mobile_name(podcast_pk: int, source_name: str) -> str:
+    """مسیر نسبی نسخه سبک داخل MEDIA_ROOT"""
+    return f'podcasts/audio/mobile/{podcast_pk}-{Path(source_name).stem}.m4a'
+
+
+def build_mobile_rendition(source: str, dest: str, bitrate: int, loudness: float) -> int:
+    """
+    source: مسیر کامل فایل اصلی، dest: مسیر کامل خروجی
+    Returns: مدت فایل اصلی (ثانیه)
+    Raises: FFmpegError
+    """
+    info = probe(source)
+    if not info['has_audio']:
+        raise FFmpegError('فایل جریان صوتی ندارد')
+
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f'{dest}.part.m4a'
+    try:
+        normalize_audio(source, tmp, bitrate=bitrate, loudness=loudness)
+        os.replace(tmp, dest)
+    except Exception:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return int(round(info['duration']))
+
+
+def probe_duration(source: str) -> int:
+    return int(round(probe(source)['duration']))
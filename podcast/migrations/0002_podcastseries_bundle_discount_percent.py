@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('podcast', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='podcastseries',
+            name='bundle_discount_percent',
+            field=models.PositiveSmallIntegerField(default=0, help_text='اگر کاربر همه قسمت\u200cهای پولی مجموعه را یکجا بخرد، این تخفیف روی هر قسمت اعمال می\u200cشود.', verbose_name='تخفیف خرید کل مجموعه (درصد)'),
+        ),
+    ]
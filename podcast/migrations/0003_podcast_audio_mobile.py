@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('podcast', '0002_podcastseries_bundle_discount_percent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='podcast',
+            name='audio_error',
+            field=models.TextField(blank=True, verbose_name='خطای پردازش'),
+        ),
+        migrations.AddField(
+            model_name='podcast',
+            name='audio_mobile',
+            field=models.FileField(blank=True, upload_to='podcasts/audio/mobile/', verbose_name='نسخه سبک (موبایل)'),
+        ),
+        migrations.AddField(
+            model_name='podcast',
+            name='audio_status',
+            field=models.CharField(choices=[('none', 'بدون پردازش'), ('pending', 'در صف پردازش'), ('processing', 'در حال پردازش'), ('ready', 'آماده'), ('failed', 'خطا')], default='none', max_length=12, verbose_name='وضعیت پردازش صوت'),
+        ),
+        migrations.AddIndex(
+            model_name='podcast',
+            index=models.Index(fields=['audio_status'], name='podcast_pod_audio_s_6b7640_idx'),
+        ),
+    ]
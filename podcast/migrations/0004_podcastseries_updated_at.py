@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('podcast', '0003_podcast_audio_mobile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='podcastseries',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+            preserve_default=False,
+        ),
+    ]
@@ -35,9 +35,14 @@ class PodcastSeries(models.Model):
     )
     description = models.TextField(blank=True, verbose_name="توضیحات")
     cover_image = models.ImageField(upload_to='podcasts/covers/', blank=True, verbose_name="تصویر کاور")
+    bundle_discount_percent = models.PositiveSmallIntegerField(
+        default=0, verbose_name="تخفیف خرید کل مجموعه (درصد)",
+        help_text="اگر کاربر همه قسمت‌های پولی مجموعه را یکجا بخرد، این تخفیف روی هر قسمت اعمال می‌شود."
+    )
     is_active   = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False, verbose_name="ویژه")
     created_at  = models.DateTimeField(auto_now_add=True)
+    updated_at  = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "مجموعه پادکست"
@@ -53,6 +58,13 @@ class Podcast(models.Model):
         PAID    = 'paid',    'پولی'
         PREMIUM = 'premium', 'اشتراکی'
 
+    class ProcessingStatus(models.TextChoices):
+        NONE       = 'none',       'بدون پردازش'
+        PENDING    = 'pending',    'در صف پردازش'
+        PROCESSING = 'processing', 'در حال پردازش'
+        READY      = 'ready',      'آماده'
+        FAILED     = 'failed',     'خطا'
+
     # ── اطلاعات اصلی ──────────────────────────────────────────────────────
     title       = models.CharField(max_length=255, verbose_name="عنوان قسمت")
     slug        = models.SlugField(unique=True, allow_unicode=True)
@@ -77,6 +89,11 @@ class Podcast(models.Model):
     audio_url   = models.URLField(blank=True, verbose_name="لینک خارجی صوت (CDN)")
     duration    = models.PositiveIntegerField(default=0, verbose_name="مدت زمان (ثانیه)")
 
+    # ── نسخه سبک موبایل — توسط manage.py ingest_media پر می‌شود ───────────
+    audio_mobile = models.FileField(upload_to='podcasts/audio/mobile/', blank=True, verbose_name="نسخه سبک (موبایل)")
+    audio_status = models.CharField(max_length=12, choices=ProcessingStatus.choices, default=ProcessingStatus.NONE, verbose_name="وضعیت پردازش صوت")
+    audio_error  = models.TextField(blank=True, verbose_name="خطای پردازش")
+
     # ── دسترسی و قیمت ─────────────────────────────────────────────────────
     access_type     = models.CharField(max_length=20, choices=AccessType.choices, default=AccessType.FREE, verbose_name="نوع دسترسی")
     price           = models.PositiveIntegerField(default=0, verbose_name="قیمت (تومان)")
@@ -100,10 +117,31 @@ class Podcast(models.Model):
         verbose_name = "پادکست"
         verbose_name_plural = "پادکست‌ها"
         ordering = ['series', 'episode_number', '-created_at']
+        indexes  = [
+            models.Index(fields=['audio_status']),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_audio_name = instance.__dict__.get('audio_file')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # فایل صوتی جدید → در صف نرمال‌سازی و اندازه‌گیری مدت
+        loaded = getattr(self, '_loaded_audio_name', None)
+        if self.audio_file and self.audio_file.name != loaded:
+            self.audio_status = self.ProcessingStatus.PENDING
+            self.audio_mobile = ''
+            self.audio_error  = ''
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'audio_status', 'audio_mobile', 'audio_error'}
+        super().save(*args, **kwargs)
+        self._loaded_audio_name = self.audio_file.name if self.audio_file else None
+
     @property
     def duration_display(self):
         m, s = divmod(self.duration, 60)
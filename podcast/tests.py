@@ -1,3 +1,249 @@
-from django.test import TestCase
+import asyncio
+import json
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from account.models import User
+from main.ffmpeg import FFmpegError
+from main import streaming
+from main.streaming import parse_range, serve_storage_file
+from purchase.models import Purchase
+
+from .ingest import build_mobile_rendition, mobile_name
+from .models import Podcast
+
+AUDIO = bytes(range(256)) * 4      # ۱۰۲۴ بایت
+
+
+def _body(response) -> bytes:
+    return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+class ParseRangeTests(SimpleTestCase):
+
+    def test_ranges(self):
+        cases = {
+            'bytes=0-99':     (0, 99),
+            'bytes=1000-':    (1000, 1023),
+            'bytes=-100':     (924, 1023),
+            'bytes=-5000':    (0, 1023),
+            'bytes=500-9999': (500, 1023),
+            ' bytes=0-0 ':    (0, 0),
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1024), expected)
+
+    def test_unsatisfiable(self):
+        for header in ('bytes=1024-', 'bytes=2000-3000', 'bytes=50-10', 'bytes=-0'):
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1024), ())
+
+    def test_unsupported_means_whole_file(self):
+        for header in ('bytes=-', 'bytes=0-1,5-9', 'items=0-9', 'bytes=a-b'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 1024))
+
+
+class ServeStorageFileTests(SimpleTestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.storage = FileSystemStorage(location=media.name)
+        self.storage.save('ep.mp3', ContentFile(AUDIO))
+        self.factory = RequestFactory()
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='')
+    def serve(self, **headers):
+        return serve_storage_file(self.factory.get('/', headers=headers), self.storage, 'ep.mp3')
+
+    def test_partial_content(self):
+        response = self.serve(Range='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 100-199/1024')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(_body(response), AUDIO[100:200])
+
+    def test_suffix_range(self):
+        response = self.serve(Range='bytes=-24')
+        self.assertEqual(response['Content-Range'], 'bytes 1000-1023/1024')
+        self.assertEqual(_body(response), AUDIO[-24:])
+
+    def test_unsatisfiable_range(self):
+        response = self.serve(Range='bytes=4096-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_full_file(self):
+        for headers in ({}, {'Range': 'bytes=0-1,5-9'}):
+            with self.subTest(headers=headers):
+                response = self.serve(**headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(response.has_header('Content-Range'))
+                self.assertEqual(response['Content-Type'], 'audio/mpeg')
+                self.assertEqual(_body(response), AUDIO)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='')
+    def test_asgi_streams_large_blocks(self):
+        async def blocks(**headers):
+            request  = AsyncRequestFactory().get('/', headers=headers)
+            response = serve_storage_file(request, self.storage, 'ep.mp3')
+            return [chunk async for chunk in response.streaming_content]
+
+        # هر بلوک یک رفت‌وبرگشت به thread pool است، نه block_size چهار کیلوبایتی FileResponse
+        with mock.patch.object(streaming, 'ASYNC_BLOCK_SIZE', 300):
+            self.assertEqual([len(b) for b in asyncio.run(blocks())], [300, 300, 300, 124])
+            self.assertEqual(b''.join(asyncio.run(blocks(Range='bytes=100-799'))), AUDIO[100:800])
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_accel_redirect_hands_off_to_nginx(self):
+        request  = self.factory.get('/', headers={'Range': 'bytes=0-9'})
+        response = serve_storage_file(request, self.storage, 'ep.mp3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/ep.mp3')
+        self.assertEqual(response.content, b'')
+
+
+class PodcastAudioTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(phone_number='09120000001')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name, MEDIA_SIGNING_MODE='hmac', MEDIA_ACCEL_REDIRECT_PREFIX='')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        name = default_storage.save('podcasts/audio/ep.mp3', ContentFile(AUDIO))
+        self.podcast = Podcast.objects.create(
+            title='قسمت ۱', slug='ep-1', access_type='paid', price=20000, audio_file=name,
+        )
+        self.url = reverse('podcasts:podcast_audio', args=[self.podcast.slug])
+
+    def test_denied_without_purchase(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.podcast.refresh_from_db()
+        self.assertEqual((self.podcast.plays, self.podcast.downloads), (0, 0))
+
+    def test_buyer_gets_signed_range_capable_link(self):
+        Purchase.objects.create(
+            user=self.user, content_type='podcast', object_id=self.podcast.pk, amount=20000,
+            status=Purchase.Status.SUCCESS,
+        )
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        signed = response['Location']
+        self.assertTrue(signed.startswith('/media-signed/podcasts/audio/ep.mp3?'))
+
+        response = self.client.get(signed, headers={'Range': 'bytes=0-15'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(_body(response), AUDIO[:16])
+
+        self.client.get(self.url)      # پخش دوباره در همان نشست یک بار شمرده می‌شود
+        self.podcast.refresh_from_db()
+        self.assertEqual(self.podcast.plays, 1)
+
+    def test_bad_signature_is_forbidden(self):
+        Purchase.objects.create(
+            user=self.user, content_type='podcast', object_id=self.podcast.pk, amount=20000,
+            status=Purchase.Status.SUCCESS,
+        )
+        self.client.force_login(self.user)
+        signed = self.client.get(self.url)['Location']
+        self.assertEqual(self.client.get(signed[:-4] + 'AAAA').status_code, 403)
+        self.assertEqual(self.client.get(signed.replace('ep.mp3', 'ep2.mp3')).status_code, 403)
+
+
+class FakeAudioFFmpeg:
+    """جایگزین subprocess.run: ffprobe مدت ثابت، ffmpeg بخشی از خروجی را می‌نویسد و در صورت fail خطا می‌دهد"""
+
+    def __init__(self, duration=1834.52, audio=True, fail=False):
+        self.probe = {
+            'streams': [{'codec_type': 'audio'}] if audio else [{'codec_type': 'video', 'width': 2, 'height': 2}],
+            'format':  {'duration': str(duration)},
+        }
+        self.fail  = fail
+        self.calls = []
+
+    def __call__(self, cmd, **kwargs):
+        if cmd[0] == 'ffprobe':
+            return subprocess.CompletedProcess(cmd, 0, json.dumps(self.probe), '')
+        self.calls.append(cmd)
+        Path(cmd[-1]).write_bytes(b'm4a')
+        return subprocess.CompletedProcess(cmd, 1 if self.fail else 0, '', 'Error while filtering' if self.fail else '')
+
+
+@override_settings(FFMPEG_BINARY='ffmpeg', FFPROBE_BINARY='ffprobe')
+class MobileRenditionTests(SimpleTestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.dest = Path(media.name) / mobile_name(12, 'podcasts/audio/قسمت-۱.mp3')
+
+    def build(self, fake):
+        with mock.patch('main.ffmpeg.subprocess.run', side_effect=fake):
+            return build_mobile_rendition('/media/ep.mp3', str(self.dest), 48_000, -18.0)
+
+    def test_normalized_mono_aac(self):
+        fake = FakeAudioFFmpeg(duration=1834.52)
+        self.assertEqual(self.build(fake), 1835)
+        self.assertEqual(self.dest.name, '12-قسمت-۱.m4a')
+        self.assertEqual(self.dest.read_bytes(), b'm4a')
+        self.assertEqual(list(self.dest.parent.iterdir()), [self.dest])
+
+        cmd = fake.calls[0]
+        self.assertEqual(cmd[cmd.index('-i') + 1], '/media/ep.mp3')
+        self.assertIn('-vn', cmd)
+        self.assertEqual(cmd[cmd.index('-af') + 1], 'loudnorm=I=-18.0:TP=-1.5:LRA=11')
+        self.assertEqual(cmd[cmd.index('-ac') + 1], '1')
+        self.assertEqual(cmd[cmd.index('-b:a') + 1], '48000')
+        self.assertEqual(cmd[cmd.index('-movflags') + 1], '+faststart')
+        self.assertEqual(cmd[-1], f'{self.dest}.part.m4a')
+
+    def test_failure_removes_partial_file(self):
+        with self.assertRaisesMessage(FFmpegError, 'Error while filtering'):
+            self.build(FakeAudioFFmpeg(fail=True))
+        self.assertEqual(list(self.dest.parent.iterdir()), [])
+
+    def test_file_without_audio_is_rejected(self):
+        fake = FakeAudioFFmpeg(audio=False)
+        with self.assertRaises(FFmpegError):
+            self.build(fake)
+        self.assertEqual(fake.calls, [])
+        self.assertFalse(self.dest.exists())
+
+
+class PodcastRequeueTests(TestCase):
+
+    def test_new_audio_is_queued_once(self):
+        Status  = Podcast.ProcessingStatus
+        podcast = Podcast.objects.create(title='قسمت', slug='ep', audio_file='podcasts/audio/a.mp3')
+        self.assertEqual(podcast.audio_status, Status.PENDING)
+
+        Podcast.objects.filter(pk=podcast.pk).update(audio_status=Status.READY, audio_mobile='podcasts/audio/mobile/1-a.m4a')
+        podcast = Podcast.objects.get(pk=podcast.pk)
+        podcast.title = 'قسمت ۱'
+        podcast.save()
+        podcast.refresh_from_db()
+        self.assertEqual(podcast.audio_status, Status.READY)
+
+        podcast.audio_file = 'podcasts/audio/b.mp3'
+        podcast.save(update_fields=['audio_file'])
+        podcast.refresh_from_db()
+        self.assertEqual((podcast.audio_status, podcast.audio_mobile.name), (Status.PENDING, ''))
@@ -1,10 +1,13 @@
 from django.urls import re_path
 from . import views
+from .feeds import series_feed
 
 app_name = 'podcasts'
 
 urlpatterns = [
     re_path(r'^$',                               views.podcasts_list,        name='podcasts_list'),
     re_path(r'^category/(?P<slug>[^/]+)/$',      views.podcasts_by_category, name='podcasts_by_category'),
+    re_path(r'^series/(?P<slug>[^/]+)/feed/$',   series_feed,                name='series_feed'),
+    re_path(r'^(?P<slug>[^/]+)/audio/$',         views.podcast_audio,        name='podcast_audio'),
     re_path(r'^(?P<slug>[^/]+)/$',               views.podcast_detail,       name='podcast_detail'),
 ]
\ No newline at end of file
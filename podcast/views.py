@@ -1,6 +1,8 @@
 """podcast/views.py"""
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render, aget_object_or_404, get_object_or_404, redirect
 from django.core.paginator import Paginator
+from django.db.models import F
+from django.http import Http404, HttpResponseForbidden
 from .models import Podcast, PodcastCategory, PodcastSeries
 
 GRADIENTS = [
@@ -56,7 +58,6 @@ def podcasts_list(request):
 
 def podcast_detail(request, slug):
     podcast = get_object_or_404(Podcast, slug=slug, is_active=True)
-    Podcast.objects.filter(pk=podcast.pk).update(plays=podcast.plays + 1)
 
     idx = podcast.pk % len(GRADIENTS)
     podcast.gradient   = GRADIENTS[idx]
@@ -73,10 +74,7 @@ def podcast_detail(request, slug):
 
     # بررسی دسترسی
     from purchase.models import Purchase
-    has_access = (
-        podcast.access_type == 'free'
-        or Purchase.has_access(request.user, 'podcast', podcast.pk)
-    )
+    has_access = Purchase.can_access(request.user, 'podcast', podcast)
 
     return render(request, 'podcasts/podcast_detail.html', {
         'podcast':         podcast,
@@ -86,6 +84,49 @@ def podcast_detail(request, slug):
     })
 
 
+async def _count_once(request, podcast, field):
+    """افزایش plays/downloads فقط یک بار در هر session — نه برای هر تکه Range"""
+    key  = f'podcast_{field}'
+    seen = await request.session.aget(key, [])
+    if podcast.pk in seen:
+        return
+    await Podcast.objects.filter(pk=podcast.pk).aupdate(**{field: F(field) + 1})
+    await request.session.aset(key, (seen + [podcast.pk])[-200:])
+
+
+async def podcast_audio(request, slug):
+    """
+    GET /podcasts/<slug>/audio/[?download=1][&quality=original]
+    بررسی دسترسی و شمارش پخش، سپس redirect به لینک امضاشده (با پشتیبانی Range)
+    پخش آنلاین در صورت آماده بودن از نسخه سبک موبایل است؛ دانلود همیشه فایل اصلی
+    async: چند کوئری کوتاه، بدون رندر قالب — زیر ASGI thread اشغال نمی‌کند
+    """
+    podcast = await aget_object_or_404(Podcast, slug=slug, is_active=True)
+
+    from purchase.models import Purchase
+    user = await request.auser()
+    if not await Purchase.acan_access(user, 'podcast', podcast):
+        return HttpResponseForbidden('دسترسی به این پادکست نیاز به خرید دارد.')
+
+    download = request.GET.get('download') == '1'
+    await _count_once(request, podcast, 'downloads' if download else 'plays')
+
+    if podcast.audio_url:
+        return redirect(podcast.audio_url)
+    if podcast.audio_file:
+        # بایت‌ها از لینک امضاشده سرو می‌شوند؛ درخواست‌های Range بعدی مرورگر
+        # مستقیم به همان لینک می‌روند و دیگر به این view (و DB) نمی‌رسند
+        from main.signing import signed_url
+        use_mobile = (
+            not download and request.GET.get('quality') != 'original'
+            and podcast.audio_status == Podcast.ProcessingStatus.READY and podcast.audio_mobile
+        )
+        name = podcast.audio_mobile.name if use_mobile else podcast.audio_file.name
+        url  = signed_url(name, user)
+        return redirect(url + ('&download=1' if download else ''))
+    raise Http404
+
+
 def podcasts_by_category(request, slug):
     category = get_object_or_404(PodcastCategory, slug=slug)
     qs = Podcast.objects.filter(is_active=True, category=category).select_related('series')
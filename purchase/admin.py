@@ -1,16 +1,23 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Purchase
+from main.adminfilters import EstimatedCountPaginator
+from main.exports import export_action
+from main.querybudget import QueryBudgetMixin
+from .models import Purchase, ArchivedPurchase, Order, OrderItem, SubscriptionPlan, Subscription
 
 
 @admin.register(Purchase)
-class PurchaseAdmin(admin.ModelAdmin):
-    list_display  = ('ref_id', 'user', 'content_type', 'object_id', 'amount_display', 'status_badge', 'created_at', 'paid_at')
+class PurchaseAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    list_display  = ('ref_id', 'user', 'content_type', 'object_id', 'amount_display', 'status_badge', 'order', 'created_at', 'paid_at')
     list_filter   = ('status', 'content_type', 'created_at')
+    list_select_related = ('user', 'order')
     search_fields = ('ref_id', 'user__phone_number', 'authority', 'zp_ref_id')
-    readonly_fields = ('ref_id', 'authority', 'zp_ref_id', 'created_at', 'paid_at')
+    paginator     = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = ('ref_id', 'authority', 'zp_ref_id', 'status_message', 'order', 'created_at', 'updated_at', 'paid_at')
     ordering      = ('-created_at',)
     date_hierarchy= 'created_at'
+    actions       = [export_action('purchases'), export_action('purchases', 'jsonl')]
 
     def amount_display(self, obj):
         return f'{obj.amount:,} تومان'
@@ -19,6 +26,7 @@ class PurchaseAdmin(admin.ModelAdmin):
     def status_badge(self, obj):
         colors = {
             'pending':  ('#fd7e14', '#fff3cd'),
+            'verifying':('#0d6efd', '#cfe2ff'),
             'success':  ('#198754', '#d1e7dd'),
             'failed':   ('#dc3545', '#f8d7da'),
             'refunded': ('#6c757d', '#e2e3e5'),
@@ -28,4 +36,65 @@ class PurchaseAdmin(admin.ModelAdmin):
             '<span style="background:{};color:{};padding:2px 10px;border-radius:12px;font-size:11px;font-weight:bold;">{}</span>',
             bg, color, obj.get_status_display()
         )
-    status_badge.short_description = 'وضعیت'
\ No newline at end of file
+    status_badge.short_description = 'وضعیت'
+
+
+@admin.register(ArchivedPurchase)
+class ArchivedPurchaseAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    list_display  = ('ref_id', 'user', 'content_type', 'object_id', 'amount', 'status', 'created_at', 'archived_at')
+    list_filter   = ('status', 'content_type')
+    list_select_related = ('user',)
+    search_fields = ('ref_id', 'user__phone_number', 'authority')
+    ordering      = ('-created_at',)
+    paginator     = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+
+class OrderItemInline(admin.TabularInline):
+    model  = OrderItem
+    extra  = 0
+    fields = ('content_type', 'object_id', 'title', 'unit_price', 'price')
+    readonly_fields = fields
+    can_delete = False
+
+
+@admin.register(Order)
+class OrderAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    list_display  = ('ref_id', 'user', 'title', 'amount_display', 'status_badge', 'created_at', 'paid_at')
+    list_filter   = ('status', 'created_at')
+    list_select_related = ('user',)
+    search_fields = ('ref_id', 'user__phone_number', 'authority', 'zp_ref_id')
+    readonly_fields = ('ref_id', 'authority', 'zp_ref_id', 'status_message', 'created_at', 'updated_at', 'paid_at')
+    ordering      = ('-created_at',)
+    date_hierarchy= 'created_at'
+    inlines       = [OrderItemInline]
+
+    amount_display = PurchaseAdmin.amount_display
+    status_badge   = PurchaseAdmin.status_badge
+
+
+
+@admin.register(SubscriptionPlan)
+class SubscriptionPlanAdmin(admin.ModelAdmin):
+    list_display  = ('title', 'duration_days', 'price', 'order', 'is_active')
+    list_editable = ('order', 'is_active')
+
+
+@admin.register(Subscription)
+class SubscriptionAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    list_display  = ('ref_id', 'user', 'plan', 'amount_display', 'status_badge', 'starts_at', 'ends_at', 'created_at')
+    list_filter   = ('status', 'plan', 'created_at')
+    list_select_related = ('user', 'plan')
+    search_fields = ('ref_id', 'user__phone_number', 'authority', 'zp_ref_id')
+    readonly_fields = ('ref_id', 'authority', 'zp_ref_id', 'status_message', 'starts_at', 'ends_at', 'created_at', 'updated_at', 'paid_at')
+    ordering      = ('-created_at',)
+
+    amount_display = PurchaseAdmin.amount_display
+    status_badge   = PurchaseAdmin.status_badge
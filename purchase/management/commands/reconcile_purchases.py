@@ -0,0 +1,117 @@
+"""
+purchase/management/commands/reconcile_purchases.py
+بررسی دوره‌ای خریدها، سفارش‌ها و اشتراک‌های معلق (کاربر تب درگاه را بسته) و آرشیو خریدهای ناموفق قدیمی
+
+اجرا (مثلاً هر ۵ دقیقه با cron / systemd timer):
+    python manage.py reconcile_purchases --older-than 15 --workers 4
+"""
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from purchase.models import Purchase, Order, Subscription, ArchivedPurchase
+from purchase.services import verify_purchase, verify_order, verify_subscription
+
+logger = logging.getLogger(__name__)
+
+
+VERIFIERS = (
+    (Purchase, verify_purchase),
+    (Order,    verify_order),
+    (Subscription, verify_subscription),
+)
+
+
+def _reconcile_one(job) -> str:
+    """تأیید یک خرید/سفارش در thread جداگانه — خروجی: وضعیت نهایی یا 'error'"""
+    verifier, pk = job
+    try:
+        return verifier(pk).status
+    except Exception:
+        logger.exception('reconcile failed for %s %s', verifier.__name__, pk)
+        return 'error'
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'تأیید دسته‌ای خریدها و سفارش‌های معلق قدیمی با درگاه و آرشیو خریدهای ناموفق'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=15,
+                            help='فقط خریدهایی که بیش از N دقیقه معلق مانده‌اند (پیش‌فرض ۱۵)')
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help='حداکثر تعداد خرید (و سفارش) در هر اجرا')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='تعداد thread همزمان برای تماس با درگاه')
+        parser.add_argument('--archive-after', type=int, default=30,
+                            help='انتقال خریدهای ناموفق قدیمی‌تر از N روز به آرشیو (0 = غیرفعال)')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        cutoff  = timezone.now() - timedelta(minutes=options['older_than'])
+
+        abandoned = stuck = 0
+        jobs = []
+        for model, verifier in VERIFIERS:
+            # ── رکوردهایی که هرگز به درگاه نرسیدند ─────────────────────────
+            abandoned += model.objects.filter(
+                status=model.Status.PENDING, authority='', updated_at__lt=cutoff,
+            ).update(status=model.Status.FAILED, status_message='اتصال به درگاه برقرار نشد.')
+
+            # ── VERIFYING گیرکرده (مثلاً worker وسط تماس کشته شده) ─────────
+            stuck += model.objects.filter(
+                status=model.Status.VERIFYING, updated_at__lt=cutoff,
+            ).update(status=model.Status.PENDING)
+
+            ids = (
+                model.objects.filter(status=model.Status.PENDING, updated_at__lt=cutoff)
+                .exclude(authority='')
+                .order_by('updated_at')
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            jobs.extend((verifier, pk) for pk in ids)
+
+        results = Counter()
+        if jobs:
+            with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+                results.update(pool.map(_reconcile_one, jobs))
+
+        archived = self._archive(options['archive_after']) if options['archive_after'] else 0
+
+        elapsed = time.monotonic() - started
+        rate    = len(jobs) / elapsed if elapsed else 0
+        summary = (
+            f"checked={len(jobs)} success={results[Purchase.Status.SUCCESS]} "
+            f"failed={results[Purchase.Status.FAILED]} retry={results[Purchase.Status.PENDING]} "
+            f"errors={results['error']} abandoned={abandoned} unstuck={stuck} "
+            f"archived={archived} elapsed={elapsed:.2f}s rate={rate:.1f}/s"
+        )
+        logger.info('reconcile_purchases: %s', summary)
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def _archive(self, days: int, chunk: int = 1000) -> int:
+        """انتقال خریدهای ناموفق قدیمی به جدول آرشیو در دسته‌های chunk تایی"""
+        cutoff = timezone.now() - timedelta(days=days)
+        total  = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Purchase.objects.select_for_update(skip_locked=True)
+                    .filter(status=Purchase.Status.FAILED, updated_at__lt=cutoff)
+                    .order_by('pk')[:chunk]
+                )
+                if not batch:
+                    return total
+                ArchivedPurchase.objects.bulk_create(
+                    [ArchivedPurchase.from_purchase(p) for p in batch],
+                    ignore_conflicts=True,
+                )
+                Purchase.objects.filter(pk__in=[p.pk for p in batch]).delete()
+            total += len(batch)
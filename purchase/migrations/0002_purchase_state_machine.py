@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchase',
+            name='status_message',
+            field=models.CharField(blank=True, max_length=255, verbose_name='پیام آخرین تأیید'),
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='status',
+            field=models.CharField(choices=[('pending', 'در انتظار پرداخت'), ('verifying', 'در حال تأیید'), ('success', 'موفق'), ('failed', 'ناموفق'), ('refunded', 'بازگشت وجه')], default='pending', max_length=10, verbose_name='وضعیت'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase', '0002_purchase_state_machine'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPurchase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('book', 'کتاب'), ('podcast', 'پادکست'), ('course', 'دوره ویدیویی')], max_length=10, verbose_name='نوع محتوا')),
+                ('object_id', models.PositiveIntegerField(verbose_name='شناسه محتوا')),
+                ('amount', models.PositiveIntegerField(verbose_name='مبلغ (تومان)')),
+                ('ref_id', models.CharField(max_length=32, unique=True, verbose_name='شماره سفارش')),
+                ('authority', models.CharField(blank=True, max_length=64, verbose_name='Authority زرین\u200cپال')),
+                ('status', models.CharField(choices=[('pending', 'در انتظار پرداخت'), ('verifying', 'در حال تأیید'), ('success', 'موفق'), ('failed', 'ناموفق'), ('refunded', 'بازگشت وجه')], max_length=10, verbose_name='وضعیت')),
+                ('status_message', models.CharField(blank=True, max_length=255, verbose_name='پیام آخرین تأیید')),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'خرید آرشیوشده',
+                'verbose_name_plural': 'خریدهای آرشیوشده',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['status', 'updated_at'], name='purchase_pu_status_4c66f4_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedpurchase',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='کاربر'),
+        ),
+    ]
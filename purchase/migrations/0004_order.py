@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:26
+
+import django.db.models.deletion
+import purchase.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase', '0003_archivedpurchase'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.PositiveIntegerField(verbose_name='مبلغ (تومان)')),
+                ('ref_id', models.CharField(default=purchase.models._ref, max_length=32, unique=True, verbose_name='شماره سفارش')),
+                ('authority', models.CharField(blank=True, max_length=64, verbose_name='Authority زرین\u200cپال')),
+                ('zp_ref_id', models.CharField(blank=True, max_length=64, verbose_name='RefID زرین\u200cپال (نهایی)')),
+                ('status', models.CharField(choices=[('pending', 'در انتظار پرداخت'), ('verifying', 'در حال تأیید'), ('success', 'موفق'), ('failed', 'ناموفق'), ('refunded', 'بازگشت وجه')], default='pending', max_length=10, verbose_name='وضعیت')),
+                ('status_message', models.CharField(blank=True, max_length=255, verbose_name='پیام آخرین تأیید')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('paid_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=255, verbose_name='شرح سفارش')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to=settings.AUTH_USER_MODEL, verbose_name='کاربر')),
+            ],
+            options={
+                'verbose_name': 'سفارش',
+                'verbose_name_plural': 'سفارش\u200cها',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='order',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='purchases', to='purchase.order', verbose_name='سفارش'),
+        ),
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('book', 'کتاب'), ('podcast', 'پادکست'), ('course', 'دوره ویدیویی')], max_length=10, verbose_name='نوع محتوا')),
+                ('object_id', models.PositiveIntegerField(verbose_name='شناسه محتوا')),
+                ('title', models.CharField(max_length=255, verbose_name='عنوان')),
+                ('unit_price', models.PositiveIntegerField(verbose_name='قیمت واحد (تومان)')),
+                ('price', models.PositiveIntegerField(verbose_name='قیمت نهایی (تومان)')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='purchase.order', verbose_name='سفارش')),
+            ],
+            options={
+                'verbose_name': 'قلم سفارش',
+                'verbose_name_plural': 'اقلام سفارش',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'updated_at'], name='purchase_or_status_ac6676_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='orderitem',
+            unique_together={('order', 'content_type', 'object_id')},
+        ),
+    ]
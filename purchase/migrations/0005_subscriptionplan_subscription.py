@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:27
+
+import django.db.models.deletion
+import purchase.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchase', '0004_order'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriptionPlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100, verbose_name='عنوان طرح')),
+                ('duration_days', models.PositiveSmallIntegerField(verbose_name='مدت (روز)')),
+                ('price', models.PositiveIntegerField(verbose_name='قیمت (تومان)')),
+                ('description', models.CharField(blank=True, max_length=255, verbose_name='توضیح کوتاه')),
+                ('order', models.PositiveSmallIntegerField(default=0, verbose_name='ترتیب نمایش')),
+                ('is_active', models.BooleanField(default=True, verbose_name='فعال')),
+            ],
+            options={
+                'verbose_name': 'طرح اشتراک',
+                'verbose_name_plural': 'طرح\u200cهای اشتراک',
+                'ordering': ['order', 'duration_days'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Subscription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.PositiveIntegerField(verbose_name='مبلغ (تومان)')),
+                ('ref_id', models.CharField(default=purchase.models._ref, max_length=32, unique=True, verbose_name='شماره سفارش')),
+                ('authority', models.CharField(blank=True, max_length=64, verbose_name='Authority زرین\u200cپال')),
+                ('zp_ref_id', models.CharField(blank=True, max_length=64, verbose_name='RefID زرین\u200cپال (نهایی)')),
+                ('status', models.CharField(choices=[('pending', 'در انتظار پرداخت'), ('verifying', 'در حال تأیید'), ('success', 'موفق'), ('failed', 'ناموفق'), ('refunded', 'بازگشت وجه')], default='pending', max_length=10, verbose_name='وضعیت')),
+                ('status_message', models.CharField(blank=True, max_length=255, verbose_name='پیام آخرین تأیید')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('paid_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('starts_at', models.DateTimeField(blank=True, null=True, verbose_name='شروع')),
+                ('ends_at', models.DateTimeField(blank=True, null=True, verbose_name='پایان')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subscriptions', to=settings.AUTH_USER_MODEL, verbose_name='کاربر')),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='subscriptions', to='purchase.subscriptionplan', verbose_name='طرح')),
+            ],
+            options={
+                'verbose_name': 'اشتراک',
+                'verbose_name_plural': 'اشتراک\u200cها',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='purchase_su_status_65d4f7_idx')],
+            },
+        ),
+    ]
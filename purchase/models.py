@@ -1,6 +1,6 @@
 """
 purchase/models.py
-خرید تکی بدون سبد خرید — یکپارچه با زرین‌پال
+خرید تکی و سفارش چندقلمی (سبد / کل مجموعه) — یکپارچه با زرین‌پال
 """
 import uuid
 from django.db import models
@@ -11,20 +11,74 @@ def _ref():
     return uuid.uuid4().hex[:16].upper()
 
 
-class Purchase(models.Model):
-    """هر سطر = یک خرید موفق یا در‌حال‌انجام"""
+class Payment(models.Model):
+    """
+    فیلدهای مشترک پرداخت + ماشین حالت وضعیت
+    هم خرید تکی (Purchase) و هم سفارش چندقلمی (Order) از این ارث می‌برند
+    """
+
+    class Status(models.TextChoices):
+        PENDING   = 'pending',   'در انتظار پرداخت'
+        VERIFYING = 'verifying', 'در حال تأیید'
+        SUCCESS   = 'success',   'موفق'
+        FAILED    = 'failed',    'ناموفق'
+        REFUNDED  = 'refunded',  'بازگشت وجه'
+
+    # گذارهای مجاز وضعیت — SUCCESS و FAILED نهایی‌اند (به‌جز بازگشت وجه)
+    TRANSITIONS = {
+        Status.PENDING:   {Status.VERIFYING, Status.FAILED},
+        Status.VERIFYING: {Status.SUCCESS, Status.FAILED, Status.PENDING},
+        Status.SUCCESS:   {Status.REFUNDED},
+        Status.FAILED:    set(),
+        Status.REFUNDED:  set(),
+    }
+
+    # ── مالی ──────────────────────────────────────────────────────────────
+    amount     = models.PositiveIntegerField(verbose_name='مبلغ (تومان)')
+    ref_id     = models.CharField(max_length=32, unique=True, default=_ref, verbose_name='شماره سفارش')
+    authority  = models.CharField(max_length=64, blank=True, verbose_name='Authority زرین‌پال')
+    zp_ref_id  = models.CharField(max_length=64, blank=True, verbose_name='RefID زرین‌پال (نهایی)')
+    status     = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, verbose_name='وضعیت')
+    status_message = models.CharField(max_length=255, blank=True, verbose_name='پیام آخرین تأیید')
+
+    # ── زمان ──────────────────────────────────────────────────────────────
+    created_at = models.DateTimeField(auto_now_add=True)
+    paid_at    = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    # ── helpers ───────────────────────────────────────────────────────────
+    @property
+    def is_paid(self):
+        return self.status == self.Status.SUCCESS
+
+    @property
+    def is_final(self):
+        return self.status in (self.Status.SUCCESS, self.Status.FAILED, self.Status.REFUNDED)
+
+    def can_transition(self, new_status) -> bool:
+        return new_status in self.TRANSITIONS.get(self.status, set())
+
+    def transition(self, new_status, **fields):
+        """تغییر وضعیت طبق ماشین حالت — باید روی سطر قفل‌شده (select_for_update) صدا زده شود"""
+        if not self.can_transition(new_status):
+            raise ValueError(f'گذار نامعتبر: {self.status} → {new_status}')
+        self.status = new_status
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.save(update_fields=['status', 'updated_at', *fields])
+
+
+class Purchase(Payment):
+    """هر سطر = یک خرید موفق یا در‌حال‌انجام (دسترسی کاربر به یک محتوا)"""
 
     class ContentType(models.TextChoices):
         BOOK    = 'book',    'کتاب'
         PODCAST = 'podcast', 'پادکست'
         COURSE  = 'course',  'دوره ویدیویی'
 
-    class Status(models.TextChoices):
-        PENDING  = 'pending',  'در انتظار پرداخت'
-        SUCCESS  = 'success',  'موفق'
-        FAILED   = 'failed',   'ناموفق'
-        REFUNDED = 'refunded', 'بازگشت وجه'
-
     # ── کاربر ─────────────────────────────────────────────────────────────
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -41,16 +95,14 @@ class Purchase(models.Model):
     )
     object_id = models.PositiveIntegerField(verbose_name='شناسه محتوا')
 
-    # ── مالی ──────────────────────────────────────────────────────────────
-    amount     = models.PositiveIntegerField(verbose_name='مبلغ (تومان)')
-    ref_id     = models.CharField(max_length=32, unique=True, default=_ref, verbose_name='شماره سفارش')
-    authority  = models.CharField(max_length=64, blank=True, verbose_name='Authority زرین‌پال')
-    zp_ref_id  = models.CharField(max_length=64, blank=True, verbose_name='RefID زرین‌پال (نهایی)')
-    status     = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, verbose_name='وضعیت')
-
-    # ── زمان ──────────────────────────────────────────────────────────────
-    created_at = models.DateTimeField(auto_now_add=True)
-    paid_at    = models.DateTimeField(null=True, blank=True)
+    # ── سفارش (برای خریدهای سبد / مجموعه) ────────────────────────────────
+    order = models.ForeignKey(
+        'Order',
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='purchases',
+        verbose_name='سفارش'
+    )
 
     class Meta:
         verbose_name        = 'خرید'
@@ -59,16 +111,12 @@ class Purchase(models.Model):
         indexes             = [
             models.Index(fields=['user', 'content_type', 'object_id']),
             models.Index(fields=['authority']),
+            models.Index(fields=['status', 'updated_at']),
         ]
 
     def __str__(self):
         return f"#{self.ref_id} — {self.get_content_type_display()} {self.object_id} — {self.get_status_display()}"
 
-    # ── helpers ───────────────────────────────────────────────────────────
-    @property
-    def is_paid(self):
-        return self.status == self.Status.SUCCESS
-
     @classmethod
     def has_access(cls, user, content_type: str, object_id: int) -> bool:
         """آیا کاربر به این محتوا دسترسی دارد؟"""
@@ -79,4 +127,182 @@ class Purchase(models.Model):
             content_type=content_type,
             object_id=object_id,
             status=cls.Status.SUCCESS
-        ).exists()
\ No newline at end of file
+        ).exists()
+
+    @classmethod
+    def can_access(cls, user, content_type: str, obj) -> bool:
+        """
+        دسترسی کامل کاربر به یک محتوا (کتاب / پادکست / دوره)
+        رایگان و اشتراکی (با اشتراک فعال) بدون کوئری؛ بقیه با جستجوی خرید
+        """
+        if obj.access_type == 'free':
+            return True
+        if not user or not user.is_authenticated:
+            return False
+        if obj.access_type == 'premium' and user.has_active_premium:
+            return True
+        return cls.has_access(user, content_type, obj.pk)
+
+    @classmethod
+    async def ahas_access(cls, user, content_type: str, object_id: int) -> bool:
+        """has_access برای viewهای async"""
+        if not user or not user.is_authenticated:
+            return False
+        return await cls.objects.filter(
+            user=user,
+            content_type=content_type,
+            object_id=object_id,
+            status=cls.Status.SUCCESS
+        ).aexists()
+
+    @classmethod
+    async def acan_access(cls, user, content_type: str, obj) -> bool:
+        """can_access برای viewهای async — user باید از request.auser() آمده باشد"""
+        if obj.access_type == 'free':
+            return True
+        if not user or not user.is_authenticated:
+            return False
+        if obj.access_type == 'premium' and user.has_active_premium:
+            return True
+        return await cls.ahas_access(user, content_type, obj.pk)
+
+    @classmethod
+    def owned_ids(cls, user, content_type: str, object_ids) -> set:
+        """شناسه‌هایی از object_ids که کاربر قبلاً خریده — یک کوئری برای کل لیست"""
+        if not user or not user.is_authenticated:
+            return set()
+        return set(cls.objects.filter(
+            user=user,
+            content_type=content_type,
+            object_id__in=list(object_ids),
+            status=cls.Status.SUCCESS
+        ).values_list('object_id', flat=True))
+
+
+class Order(Payment):
+    """سفارش چندقلمی — یک تراکنش درگاه برای چند محتوا (سبد خرید / کل مجموعه)"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='orders',
+        verbose_name='کاربر'
+    )
+    title = models.CharField(max_length=255, verbose_name='شرح سفارش')
+
+    class Meta:
+        verbose_name        = 'سفارش'
+        verbose_name_plural = 'سفارش‌ها'
+        ordering            = ['-created_at']
+        indexes             = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"#{self.ref_id} — {self.title} — {self.get_status_display()}"
+
+
+class OrderItem(models.Model):
+    """یک قلم از سفارش — قیمت در لحظه سفارش ثبت می‌شود"""
+
+    order        = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items', verbose_name='سفارش')
+    content_type = models.CharField(max_length=10, choices=Purchase.ContentType.choices, verbose_name='نوع محتوا')
+    object_id    = models.PositiveIntegerField(verbose_name='شناسه محتوا')
+    title        = models.CharField(max_length=255, verbose_name='عنوان')
+    unit_price   = models.PositiveIntegerField(verbose_name='قیمت واحد (تومان)')
+    price        = models.PositiveIntegerField(verbose_name='قیمت نهایی (تومان)')
+
+    class Meta:
+        verbose_name        = 'قلم سفارش'
+        verbose_name_plural = 'اقلام سفارش'
+        unique_together     = [('order', 'content_type', 'object_id')]
+
+    def __str__(self):
+        return f"{self.get_content_type_display()}: {self.title}"
+
+
+class SubscriptionPlan(models.Model):
+    """طرح اشتراک ویژه — دسترسی به همه محتوای «اشتراکی» برای مدت مشخص"""
+
+    title         = models.CharField(max_length=100, verbose_name='عنوان طرح')
+    duration_days = models.PositiveSmallIntegerField(verbose_name='مدت (روز)')
+    price         = models.PositiveIntegerField(verbose_name='قیمت (تومان)')
+    description   = models.CharField(max_length=255, blank=True, verbose_name='توضیح کوتاه')
+    order         = models.PositiveSmallIntegerField(default=0, verbose_name='ترتیب نمایش')
+    is_active     = models.BooleanField(default=True, verbose_name='فعال')
+
+    class Meta:
+        verbose_name        = 'طرح اشتراک'
+        verbose_name_plural = 'طرح‌های اشتراک'
+        ordering            = ['order', 'duration_days']
+
+    def __str__(self):
+        return f"{self.title} ({self.duration_days} روز)"
+
+
+class Subscription(Payment):
+    """یک دوره اشتراک خریداری‌شده — پس از پرداخت موفق premium_until کاربر تمدید می‌شود"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='subscriptions',
+        verbose_name='کاربر'
+    )
+    plan = models.ForeignKey(
+        SubscriptionPlan,
+        on_delete=models.PROTECT,
+        related_name='subscriptions',
+        verbose_name='طرح'
+    )
+    starts_at = models.DateTimeField(null=True, blank=True, verbose_name='شروع')
+    ends_at   = models.DateTimeField(null=True, blank=True, verbose_name='پایان')
+
+    class Meta:
+        verbose_name        = 'اشتراک'
+        verbose_name_plural = 'اشتراک‌ها'
+        ordering            = ['-created_at']
+        indexes             = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"#{self.ref_id} — {self.plan.title} — {self.get_status_display()}"
+
+
+class ArchivedPurchase(models.Model):
+    """آرشیو سرد خریدهای ناموفق قدیمی — تا جدول اصلی و کوئری‌های has_access سبک بمانند"""
+
+    user         = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='+',
+        verbose_name='کاربر'
+    )
+    content_type = models.CharField(max_length=10, choices=Purchase.ContentType.choices, verbose_name='نوع محتوا')
+    object_id    = models.PositiveIntegerField(verbose_name='شناسه محتوا')
+    amount       = models.PositiveIntegerField(verbose_name='مبلغ (تومان)')
+    ref_id       = models.CharField(max_length=32, unique=True, verbose_name='شماره سفارش')
+    authority    = models.CharField(max_length=64, blank=True, verbose_name='Authority زرین‌پال')
+    status       = models.CharField(max_length=10, choices=Payment.Status.choices, verbose_name='وضعیت')
+    status_message = models.CharField(max_length=255, blank=True, verbose_name='پیام آخرین تأیید')
+    created_at   = models.DateTimeField()
+    archived_at  = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name        = 'خرید آرشیوشده'
+        verbose_name_plural = 'خریدهای آرشیوشده'
+        ordering            = ['-created_at']
+
+    def __str__(self):
+        return f"#{self.ref_id} — {self.get_status_display()} (آرشیو)"
+
+    ARCHIVED_FIELDS = ('user_id', 'content_type', 'object_id', 'amount', 'ref_id',
+                       'authority', 'status', 'status_message', 'created_at')
+
+    @classmethod
+    def from_purchase(cls, purchase):
+        return cls(**{f: getattr(purchase, f) for f in cls.ARCHIVED_FIELDS})
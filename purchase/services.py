@@ -0,0 +1,253 @@
+"""
+purchase/services.py
+تأیید پرداخت به‌صورت idempotent — مشترک بین callback و reconciler
+
+هر پرداخت (خرید تکی، سفارش یا اشتراک) فقط یک بار به درگاه verify فرستاده می‌شود:
+  PENDING ──(قفل سطر)──▶ VERIFYING ──(پاسخ درگاه)──▶ SUCCESS / FAILED
+callback‌های تکراری (رفرش کاربر، retry درگاه) نتیجه ذخیره‌شده را برمی‌گردانند.
+"""
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from main import metrics
+
+from .models import Purchase, Order, OrderItem, Subscription
+from .zarinpal import averify_payment, verify_payment
+
+CANCELLED_MESSAGE = 'پرداخت توسط کاربر لغو شد.'
+
+
+def _claim(model, pk: int, authority: str = '', cancelled: bool = False):
+    """
+    مرحله ۱: تصاحب رکورد زیر قفل سطر.
+    خروجی (obj, claimed) — claimed=False یعنی نتیجه از قبل معلوم است و نباید به درگاه رفت
+    """
+    with transaction.atomic():
+        obj = model.objects.select_for_update().get(pk=pk)
+
+        if obj.status != model.Status.PENDING:
+            # قبلاً پردازش شده یا درخواست دیگری در حال تأیید آن است
+            return obj, False
+
+        if cancelled:
+            obj.transition(model.Status.FAILED, status_message=CANCELLED_MESSAGE)
+            metrics.PAYMENTS.labels(model._meta.model_name, 'cancelled').inc()
+            return obj, False
+
+        obj.transition(
+            model.Status.VERIFYING,
+            authority=obj.authority or authority,
+        )
+    return obj, True
+
+
+def _settle(model, pk: int, result: dict, on_success=None):
+    """مرحله ۳: ثبت پاسخ درگاه؛ on_success(obj) داخل همان تراکنشی اجرا می‌شود که SUCCESS ثبت می‌شود"""
+    with transaction.atomic():
+        obj = model.objects.select_for_update().get(pk=pk)
+        if obj.status != model.Status.VERIFYING:
+            return obj
+
+        if result['ok']:
+            obj.transition(
+                model.Status.SUCCESS,
+                zp_ref_id=result['ref_id'],
+                paid_at=timezone.now(),
+                status_message='',
+            )
+            if on_success:
+                on_success(obj)
+            outcome = 'success'
+        elif result.get('transient'):
+            # درگاه در دسترس نبود — برای تلاش مجدد به PENDING برمی‌گردد
+            obj.transition(model.Status.PENDING, status_message=result['error'][:255])
+            outcome = 'retry'
+        else:
+            obj.transition(model.Status.FAILED, status_message=result['error'][:255])
+            outcome = 'failed'
+    # بعد از commit؛ هر پرداخت فقط یک بار به نتیجه نهایی می‌رسد
+    metrics.PAYMENTS.labels(model._meta.model_name, outcome).inc()
+    return obj
+
+
+def _verify(model, pk: int, authority: str = '', cancelled: bool = False, on_success=None):
+    """
+    پردازش نتیجه پرداخت یک رکورد Payment.
+    cancelled=True یعنی درگاه Status=NOK برگردانده است.
+    خروجی: رکورد با آخرین وضعیت ذخیره‌شده
+    """
+    obj, claimed = _claim(model, pk, authority, cancelled)
+    if not claimed:
+        return obj
+    # مرحله ۲: تماس با درگاه — خارج از تراکنش تا قفل طولانی نشود
+    return _settle(model, pk, verify_payment(obj.authority, obj.amount), on_success)
+
+
+async def _averify(model, pk: int, authority: str = '', cancelled: bool = False, on_success=None):
+    """
+    همان _verify برای viewهای async: تراکنش‌ها (قفل سطر) در thread اجرا می‌شوند و فقط
+    تماس با درگاه در event loop منتظر می‌ماند
+    """
+    obj, claimed = await sync_to_async(_claim)(model, pk, authority, cancelled)
+    if not claimed:
+        return obj
+    result = await averify_payment(obj.authority, obj.amount)
+    return await sync_to_async(_settle)(model, pk, result, on_success)
+
+
+def verify_purchase(purchase_id: int, authority: str = '', cancelled: bool = False) -> Purchase:
+    """تأیید یک خرید تکی"""
+    return _verify(Purchase, purchase_id, authority=authority, cancelled=cancelled)
+
+
+async def averify_purchase(purchase_id: int, authority: str = '', cancelled: bool = False) -> Purchase:
+    """تأیید یک خرید تکی (callback async)"""
+    return await _averify(Purchase, purchase_id, authority=authority, cancelled=cancelled)
+
+
+def verify_order(order_id: int, authority: str = '', cancelled: bool = False) -> Order:
+    """تأیید یک سفارش چندقلمی و اعطای دسترسی همه اقلام در همان تراکنش"""
+    return _verify(Order, order_id, authority=authority, cancelled=cancelled, on_success=grant_order)
+
+
+def grant_order(order: Order):
+    """ساخت رکوردهای Purchase موفق برای اقلام سفارش — یک INSERT دسته‌ای"""
+    items = list(order.items.all())
+    owned = {
+        ct: Purchase.owned_ids(order.user, ct, [i.object_id for i in items if i.content_type == ct])
+        for ct in {i.content_type for i in items}
+    } if order.user else {}
+
+    Purchase.objects.bulk_create([
+        Purchase(
+            user         = order.user,
+            order        = order,
+            content_type = item.content_type,
+            object_id    = item.object_id,
+            amount       = item.price,
+            authority    = order.authority,
+            zp_ref_id    = order.zp_ref_id,
+            status       = Purchase.Status.SUCCESS,
+            paid_at      = order.paid_at,
+        )
+        for item in items
+        if item.object_id not in owned.get(item.content_type, set())
+    ])
+
+
+def verify_subscription(subscription_id: int, authority: str = '', cancelled: bool = False) -> Subscription:
+    """تأیید پرداخت اشتراک و تمدید premium_until کاربر در همان تراکنش"""
+    return _verify(Subscription, subscription_id, authority=authority, cancelled=cancelled,
+                   on_success=activate_subscription)
+
+
+def activate_subscription(subscription: Subscription):
+    """
+    دوره اشتراک از انتهای اشتراک فعلی (یا همین لحظه) شروع می‌شود.
+    سطر کاربر قفل می‌شود تا دو پرداخت همزمان یکدیگر را بازنویسی نکنند.
+    """
+    if not subscription.user_id:
+        return
+    User = get_user_model()
+    user = User.objects.select_for_update().only('pk', 'premium_until').get(pk=subscription.user_id)
+
+    now   = timezone.now()
+    start = max(now, user.premium_until or now)
+    end   = start + timedelta(days=subscription.plan.duration_days)
+
+    subscription.starts_at = start
+    subscription.ends_at   = end
+    subscription.save(update_fields=['starts_at', 'ends_at'])
+    User.objects.filter(pk=user.pk).update(premium_until=end)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# قیمت‌گذاری سبد / مجموعه
+# ─────────────────────────────────────────────────────────────────────────
+
+def _content_models():
+    from book.models import Book
+    from podcast.models import Podcast
+    from course.models import Course
+    return {'book': Book, 'podcast': Podcast, 'course': Course}
+
+
+def _discounted(price: int, percent: int) -> int:
+    return int(price * (1 - percent / 100))
+
+
+def price_items(user, items) -> list:
+    """
+    items: لیست (content_type, object_id)
+    خروجی: لیست OrderItem ذخیره‌نشده — محتوای رایگان، غیرفعال یا قبلاً خریداری‌شده حذف می‌شود.
+    اگر همه قسمت‌های پولی باقی‌مانده یک مجموعه پادکست در سبد باشد، تخفیف مجموعه اعمال می‌شود.
+    هر نوع محتوا فقط یک کوئری می‌زند.
+    """
+    models_map = _content_models()
+    wanted = {}
+    for content_type, object_id in items:
+        if content_type in models_map:
+            wanted.setdefault(content_type, set()).add(int(object_id))
+
+    lines = []
+    for content_type, ids in wanted.items():
+        model = models_map[content_type]
+        owned = Purchase.owned_ids(user, content_type, ids)
+        qs = model.objects.filter(pk__in=ids - owned, is_active=True).exclude(access_type='free')
+        if content_type == 'podcast':
+            qs = qs.select_related('series')
+        for obj in qs:
+            if obj.final_price <= 0:
+                continue
+            lines.append((obj, OrderItem(
+                content_type = content_type,
+                object_id    = obj.pk,
+                title        = obj.title,
+                unit_price   = obj.final_price,
+                price        = obj.final_price,
+            )))
+
+    _apply_series_bundles(user, lines)
+    return [item for _, item in lines]
+
+
+def _apply_series_bundles(user, lines):
+    """تخفیف خرید کل مجموعه پادکست"""
+    from podcast.models import Podcast
+
+    by_series = {}
+    for obj, item in lines:
+        series = getattr(obj, 'series', None) if item.content_type == 'podcast' else None
+        if series and series.bundle_discount_percent:
+            by_series.setdefault(series, []).append(item)
+
+    for series, series_items in by_series.items():
+        paid_ids = set(
+            Podcast.objects.filter(series=series, is_active=True)
+            .exclude(access_type='free').values_list('pk', flat=True)
+        )
+        missing = paid_ids - Purchase.owned_ids(user, 'podcast', paid_ids)
+        if missing <= {i.object_id for i in series_items}:
+            for item in series_items:
+                item.price = _discounted(item.unit_price, series.bundle_discount_percent)
+
+
+def create_order(user, items, title: str) -> Order | None:
+    """ساخت سفارش و اقلام آن در یک تراکنش — اگر قلم قابل خریدی نماند None"""
+    lines = price_items(user, items)
+    if not lines:
+        return None
+    with transaction.atomic():
+        order = Order.objects.create(
+            user   = user,
+            title  = title[:255],
+            amount = sum(item.price for item in lines),
+        )
+        for item in lines:
+            item.order = order
+        OrderItem.objects.bulk_create(lines)
+    return order
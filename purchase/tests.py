@@ -1,3 +1,243 @@
-from django.test import TestCase
+import asyncio
+import json
+import threading
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import requests
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+
+from account.models import User
+from book.models import Book
+
+from . import zarinpal
+from .models import Purchase
+from .services import CANCELLED_MESSAGE, verify_purchase
+
+AUTHORITY = 'A' * 36
+SUCCESS   = {'ok': True, 'ref_id': '201'}
+
+# بدنه‌های واقعی REST v4 زرین‌پال
+V4_PAID     = {'data': {'code': 100, 'message': 'Paid', 'card_pan': '502229******5995', 'ref_id': 201, 'fee': 0}, 'errors': []}
+V4_VERIFIED = {'data': {'code': 101, 'message': 'Verified', 'ref_id': 201}, 'errors': []}
+V4_NOT_PAID = {'data': [], 'errors': {'code': -51, 'message': 'Session is not valid, session is not active paid try.', 'validations': []}}
+V4_BAD_AUTH = {'data': [], 'errors': {'code': -54, 'message': 'Invalid authority.', 'validations': []}}
+V4_INVALID  = {'data': [], 'errors': {'code': -9, 'message': 'The input params invalid, validation error.',
+                                      'validations': [{'amount': 'The amount must be at least 1000.'}]}}
+V4_CREATED  = {'data': {'code': 100, 'message': 'Success', 'authority': AUTHORITY, 'fee': 0}, 'errors': []}
+
+
+def _response(status: int, body) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content    = body if isinstance(body, bytes) else json.dumps(body).encode()
+    return response
+
+
+class ZarinpalResultTests(SimpleTestCase):
+
+    def test_verify_bodies(self):
+        self.assertEqual(zarinpal._verify_result(V4_PAID, {}), {'ok': True, 'ref_id': '201'})
+        self.assertEqual(zarinpal._verify_result(V4_VERIFIED, {}), {'ok': True, 'ref_id': '201'})
+        for body, code in ((V4_NOT_PAID, -51), (V4_BAD_AUTH, -54)):
+            with self.subTest(code=code):
+                call   = {}
+                result = zarinpal._verify_result(body, call)
+                self.assertEqual((result['ok'], result['transient']), (False, False))
+                self.assertIn(f'({code})', result['error'])
+                self.assertEqual(call['outcome'], 'rejected')
+
+    def test_request_bodies(self):
+        self.assertEqual(zarinpal._request_result(V4_CREATED, {})['authority'], AUTHORITY)
+        result = zarinpal._request_result(V4_INVALID, {})
+        self.assertFalse(result['ok'])
+        self.assertIn('(-9)', result['error'])
+        self.assertFalse(zarinpal._request_result([], {})['ok'])
+
+    def test_only_unanswered_calls_are_transient(self):
+        cases = [
+            (_response(400, V4_NOT_PAID), False),
+            (_response(200, V4_BAD_AUTH), False),
+            (_response(502, b'<html>Bad Gateway</html>'), True),
+            (_response(200, b'<html>maintenance</html>'), True),
+            (requests.ConnectionError('connection reset'), True),
+            (requests.Timeout('read timed out'), True),
+        ]
+        for outcome, transient in cases:
+            with self.subTest(outcome=outcome):
+                with mock.patch('purchase.zarinpal.requests.post', side_effect=[outcome]):
+                    result = zarinpal.verify_payment(AUTHORITY, 50000)
+                self.assertFalse(result['ok'])
+                self.assertIs(result['transient'], transient)
+
+    def test_async_verify_uses_same_rules(self):
+        def averify(status, body):
+            transport = httpx.MockTransport(lambda request: httpx.Response(status, json=body))
+            with mock.patch('main.httpclient._new_client', lambda: httpx.AsyncClient(transport=transport)):
+                return asyncio.run(zarinpal.averify_payment(AUTHORITY, 50000))
+
+        self.assertEqual(averify(200, V4_PAID), {'ok': True, 'ref_id': '201'})
+        self.assertIs(averify(400, V4_BAD_AUTH)['transient'], False)
+        self.assertIs(averify(503, None)['transient'], True)
+
+
+class StartPurchaseTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(phone_number='09120000001')
+        cls.book = Book.objects.create(title='کتاب', slug='book', author='نویسنده', access_type='paid', price=50000)
+
+    def test_authority_bumps_updated_at(self):
+        """reconciler خریدهای PENDING را با updated_at پیدا می‌کند؛ ذخیره authority باید آن را جلو ببرد"""
+        stale = timezone.now() - timedelta(hours=1)
+
+        async def gateway(**kwargs):
+            await Purchase.objects.aupdate(updated_at=stale)      # تماس کند با درگاه
+            return {'ok': True, 'authority': AUTHORITY, 'gateway_url': f'https://pay.test/{AUTHORITY}'}
+
+        self.client.force_login(self.user)
+        with mock.patch('purchase.views.arequest_payment', side_effect=gateway):
+            response = self.client.post(reverse('purchase:start', args=['book', self.book.pk]))
+        self.assertEqual(response['Location'], f'https://pay.test/{AUTHORITY}')
+        purchase = Purchase.objects.get()
+        self.assertEqual(purchase.authority, AUTHORITY)
+        self.assertGreater(purchase.updated_at, stale)
+
+
+class VerifyPurchaseTests(TransactionTestCase):
+    """ماشین حالت تأیید با درگاه (verify_payment) جعلی؛ callback دوم در thread جدا با اتصال خودش"""
+
+    def setUp(self):
+        self.user     = User.objects.create(phone_number='09120000001')
+        self.purchase = Purchase.objects.create(
+            user=self.user, content_type='book', object_id=1, amount=50000, authority=AUTHORITY,
+        )
+
+    def gateway(self, *results):
+        return mock.patch('purchase.services.verify_payment', side_effect=results)
+
+    def test_callback_during_verification_does_not_call_gateway(self):
+        in_gateway = threading.Event()
+        release    = threading.Event()
+        statuses   = {}
+
+        def slow_gateway(authority, amount):
+            in_gateway.set()
+            release.wait(5)
+            return SUCCESS
+
+        def callback(name):
+            try:
+                statuses[name] = verify_purchase(self.purchase.pk, authority=AUTHORITY).status
+            finally:
+                connection.close()
+
+        with mock.patch('purchase.services.verify_payment', side_effect=slow_gateway) as verify:
+            first  = threading.Thread(target=callback, args=('first',))
+            second = threading.Thread(target=callback, args=('second',))
+            first.start()
+            self.assertTrue(in_gateway.wait(5))
+            # اولی قفل را رها کرده و منتظر درگاه است؛ دومی همان لحظه callback می‌زند
+            second.start()
+            second.join(5)
+            release.set()
+            first.join(5)
+
+        verify.assert_called_once_with(AUTHORITY, 50000)
+        self.assertEqual(statuses, {'first': Purchase.Status.SUCCESS, 'second': Purchase.Status.VERIFYING})
+        self.purchase.refresh_from_db()
+        self.assertEqual((self.purchase.status, self.purchase.zp_ref_id), (Purchase.Status.SUCCESS, '201'))
+        self.assertIsNotNone(self.purchase.paid_at)
+
+        # callback تکراری بعد از نتیجه نهایی فقط نتیجه ذخیره‌شده را برمی‌گرداند
+        with self.gateway() as verify:
+            self.assertEqual(verify_purchase(self.purchase.pk).status, Purchase.Status.SUCCESS)
+        verify.assert_not_called()
+
+    def test_transient_error_returns_to_pending(self):
+        transient = {'ok': False, 'transient': True, 'error': 'Read timed out'}
+        with self.gateway(transient, SUCCESS) as verify:
+            purchase = verify_purchase(self.purchase.pk)
+            self.assertEqual((purchase.status, purchase.status_message), (Purchase.Status.PENDING, 'Read timed out'))
+
+            purchase = verify_purchase(self.purchase.pk)
+        self.assertEqual(verify.call_count, 2)
+        self.assertEqual(purchase.status, Purchase.Status.SUCCESS)
+        self.assertEqual(purchase.status_message, '')
+
+    def test_cancelled_payment_fails_without_gateway(self):
+        with self.gateway() as verify:
+            purchase = verify_purchase(self.purchase.pk, cancelled=True)
+            self.assertEqual((purchase.status, purchase.status_message), (Purchase.Status.FAILED, CANCELLED_MESSAGE))
+            # بازگشت دوباره کاربر از درگاه (حتی با Status=OK) نتیجه را عوض نمی‌کند
+            self.assertEqual(verify_purchase(self.purchase.pk).status, Purchase.Status.FAILED)
+        verify.assert_not_called()
+
+    def test_gateway_rejection_is_final(self):
+        with self.gateway({'ok': False, 'error': 'کد 101'}) as verify:
+            self.assertEqual(verify_purchase(self.purchase.pk).status, Purchase.Status.FAILED)
+            self.assertEqual(verify_purchase(self.purchase.pk).status, Purchase.Status.FAILED)
+        verify.assert_called_once()
+
+    def test_v4_rejection_body_fails_the_purchase(self):
+        """پاسخ -51 قطعی است؛ خرید نباید به PENDING برگردد و reconciler دوباره آن را بفرستد"""
+        with mock.patch('purchase.zarinpal.requests.post', return_value=_response(400, V4_NOT_PAID)) as post:
+            purchase = verify_purchase(self.purchase.pk)
+            self.assertEqual(purchase.status, Purchase.Status.FAILED)
+            self.assertIn('(-51)', purchase.status_message)
+            verify_purchase(self.purchase.pk)
+        post.assert_called_once()
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentCallbackTests(TransactionTestCase):
+    """
+    N درخواست همزمان به payment_callback پشت یک barrier. قفل سطر (select_for_update) در _claim
+    باید فقط یکی را به درگاه بفرستد. SQLite قفل سطر ندارد، پس این تست فقط روی PostgreSQL اجرا می‌شود.
+    """
+
+    CALLBACKS = 8
+
+    def setUp(self):
+        book          = Book.objects.create(title='کتاب', slug='book', author='نویسنده', access_type='paid', price=50000)
+        self.purchase = Purchase.objects.create(
+            user=User.objects.create(phone_number='09120000001'),
+            content_type='book', object_id=book.pk, amount=50000, authority=AUTHORITY,
+        )
+
+    @override_settings(ALLOWED_HOSTS=['testserver'])
+    def test_hammered_callback_verifies_once(self):
+        url     = reverse('purchase:callback', args=[self.purchase.ref_id]) + f'?Status=OK&Authority={AUTHORITY}'
+        barrier = threading.Barrier(self.CALLBACKS)
+        calls   = []
+        codes   = []
+
+        async def gateway(authority, amount):
+            calls.append(authority)
+            await asyncio.sleep(0.2)      # بقیه callbackها در این فاصله به قفل یا وضعیت VERIFYING می‌رسند
+            return SUCCESS
+
+        def callback():
+            client = Client()
+            try:
+                barrier.wait(5)
+                codes.append(client.get(url).status_code)
+            finally:
+                connection.close()
+
+        with mock.patch('purchase.services.averify_payment', side_effect=gateway):
+            threads = [threading.Thread(target=callback) for _ in range(self.CALLBACKS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(30)
+
+        self.assertEqual(calls, [AUTHORITY])
+        self.assertEqual(codes, [200] * self.CALLBACKS)
+        self.purchase.refresh_from_db()
+        self.assertEqual((self.purchase.status, self.purchase.zp_ref_id), (Purchase.Status.SUCCESS, '201'))
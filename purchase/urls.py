@@ -6,4 +6,10 @@ app_name = 'purchase'
 urlpatterns = [
     path('start/<str:content_type>/<int:object_id>/', views.start_purchase, name='start'),
     path('callback/<str:ref_id>/', views.payment_callback, name='callback'),
+    path('checkout/', views.checkout, name='checkout'),
+    path('series/<int:series_id>/', views.series_checkout, name='series_checkout'),
+    path('order-callback/<str:ref_id>/', views.order_callback, name='order_callback'),
+    path('subscribe/', views.subscription_plans, name='plans'),
+    path('subscribe/<int:plan_id>/', views.start_subscription, name='subscribe'),
+    path('subscription-callback/<str:ref_id>/', views.subscription_callback, name='subscription_callback'),
 ]
\ No newline at end of file
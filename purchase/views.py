@@ -1,16 +1,22 @@
 """
 purchase/views.py
-جریان خرید تکی: start → zarinpal → callback
+جریان خرید تکی:   start    → zarinpal → callback
+جریان سفارش چندقلمی: checkout → zarinpal → order_callback
+جریان اشتراک ویژه:  subscribe → zarinpal → subscription_callback
 """
-from django.shortcuts import render, get_object_or_404, redirect
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, aget_object_or_404, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
-from django.utils import timezone
 from django.urls import reverse
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.contrib import messages
 
-from .models import Purchase
-from .zarinpal import request_payment, verify_payment
+from .models import Purchase, Order, Subscription, SubscriptionPlan
+from .services import (
+    averify_purchase, verify_order, verify_subscription, create_order, CANCELLED_MESSAGE,
+)
+from .zarinpal import arequest_payment, request_payment
 
 
 # ─────────────────────────────────────────────────────────────────────────
@@ -31,6 +37,28 @@ def _get_content_object(content_type: str, object_id: int):
     return None
 
 
+async def _aget_content_object(content_type: str, object_id: int):
+    """_get_content_object برای viewهای async"""
+    if content_type == 'book':
+        from book.models import Book
+        return await aget_object_or_404(Book, pk=object_id, is_active=True)
+    elif content_type == 'podcast':
+        from podcast.models import Podcast
+        return await aget_object_or_404(Podcast, pk=object_id, is_active=True)
+    elif content_type == 'course':
+        from course.models import Course
+        return await aget_object_or_404(Course, pk=object_id, is_active=True)
+    return None
+
+
+def _safe_next(request) -> str:
+    """آدرس بازگشت از فرم — فقط آدرس‌های همین سایت"""
+    url = request.POST.get('next', '')
+    if url and url_has_allowed_host_and_scheme(url, allowed_hosts={request.get_host()}):
+        return url
+    return '/'
+
+
 def _content_redirect(content_type: str, obj) -> str:
     """آدرس بعد از خرید موفق"""
     if content_type == 'book':
@@ -48,19 +76,21 @@ def _content_redirect(content_type: str, obj) -> str:
 
 @login_required
 @require_POST
-def start_purchase(request, content_type, object_id):
+async def start_purchase(request, content_type, object_id):
     """
     POST /purchase/start/<content_type>/<object_id>/
     ایجاد رکورد Purchase و redirect به درگاه
+    async: تماس با زرین‌پال worker را تا پاسخ درگاه اشغال نمی‌کند
     """
     if content_type not in ('book', 'podcast', 'course'):
         messages.error(request, 'نوع محتوای نامعتبر')
         return redirect('/')
 
-    obj = _get_content_object(content_type, object_id)
+    user = await request.auser()
+    obj  = await _aget_content_object(content_type, object_id)
 
     # بررسی دسترسی قبلی
-    if Purchase.has_access(request.user, content_type, object_id):
+    if await Purchase.ahas_access(user, content_type, object_id):
         messages.info(request, 'شما قبلاً این محتوا را خریداری کرده‌اید.')
         return redirect(_content_redirect(content_type, obj))
 
@@ -80,8 +110,8 @@ def start_purchase(request, content_type, object_id):
         return redirect(_content_redirect(content_type, obj))
 
     # ساخت رکورد خرید
-    purchase = Purchase.objects.create(
-        user         = request.user,
+    purchase = await Purchase.objects.acreate(
+        user         = user,
         content_type = content_type,
         object_id    = object_id,
         amount       = amount,
@@ -91,20 +121,19 @@ def start_purchase(request, content_type, object_id):
         reverse('purchase:callback', kwargs={'ref_id': purchase.ref_id})
     )
 
-    result = request_payment(
+    result = await arequest_payment(
         amount_toman = amount,
         description  = desc,
         callback_url = callback_url,
-        mobile       = request.user.phone_number,
+        mobile       = user.phone_number,
     )
 
     if result['ok']:
         purchase.authority = result['authority']
-        purchase.save(update_fields=['authority'])
+        await purchase.asave(update_fields=['authority', 'updated_at'])
         return redirect(result['gateway_url'])
     else:
-        purchase.status = Purchase.Status.FAILED
-        purchase.save(update_fields=['status'])
+        await sync_to_async(purchase.transition)(Purchase.Status.FAILED, status_message=result['error'][:255])
         messages.error(request, f'خطا در اتصال به درگاه: {result["error"]}')
         return redirect(_content_redirect(content_type, obj))
 
@@ -113,46 +142,218 @@ def start_purchase(request, content_type, object_id):
 # callback
 # ─────────────────────────────────────────────────────────────────────────
 
-def payment_callback(request, ref_id):
+def _render_result(request, payment, success_message, content_url):
+    """
+    صفحه نتیجه پرداخت بر اساس وضعیت ذخیره‌شده
+    content_url: تابعی که فقط در صورت موفقیت صدا زده می‌شود
+    """
+    if payment.is_paid:
+        return render(request, 'purchase/result.html', {
+            'success':      True,
+            'message':      success_message,
+            'purchase':     payment,
+            'content_url':  content_url(),
+            'ref_id':       payment.zp_ref_id,
+        })
+
+    if not payment.is_final:
+        # درخواست دیگری در حال تأیید است یا درگاه پاسخ نداد
+        return render(request, 'purchase/result.html', {
+            'success':  False,
+            'pending':  True,
+            'message':  'پرداخت شما در حال بررسی است. چند لحظه دیگر این صفحه را دوباره باز کنید.',
+            'purchase': payment,
+        })
+
+    if payment.status_message == CANCELLED_MESSAGE:
+        message = payment.status_message
+    else:
+        message = f'تأیید پرداخت ناموفق: {payment.status_message}'
+    return render(request, 'purchase/result.html', {
+        'success': False,
+        'message': message,
+        'purchase': payment,
+    })
+
+
+async def payment_callback(request, ref_id):
     """
     GET /purchase/callback/<ref_id>/
     زرین‌پال کاربر را اینجا باز می‌گرداند
+    فراخوانی‌های تکراری، نتیجه ذخیره‌شده را بدون تماس مجدد با درگاه نمایش می‌دهند
     """
-    purchase = get_object_or_404(Purchase, ref_id=ref_id)
+    purchase = await aget_object_or_404(Purchase, ref_id=ref_id)
     status   = request.GET.get('Status', '')
     authority= request.GET.get('Authority', '')
 
-    if status != 'OK':
-        purchase.status = Purchase.Status.FAILED
-        purchase.save(update_fields=['status'])
-        return render(request, 'purchase/result.html', {
-            'success': False,
-            'message': 'پرداخت توسط کاربر لغو شد.',
-            'purchase': purchase,
-        })
+    purchase = await averify_purchase(purchase.pk, authority=authority, cancelled=(status != 'OK'))
 
-    result = verify_payment(authority, purchase.amount)
+    def content_url():
+        obj = _get_content_object(purchase.content_type, purchase.object_id)
+        return _content_redirect(purchase.content_type, obj)
+
+    # رندر قالب و context processorها sync هستند
+    return await sync_to_async(_render_result)(request, purchase, 'پرداخت موفق بود!', content_url)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# checkout — چند محتوا در یک تراکنش درگاه
+# ─────────────────────────────────────────────────────────────────────────
+
+def _start_order(request, items, title, fallback_url):
+    """ساخت سفارش و redirect به درگاه — یک request_payment برای کل سفارش"""
+    order = create_order(request.user, items, title)
+    if order is None:
+        messages.info(request, 'موردی برای خرید وجود ندارد؛ اقلام رایگان هستند یا قبلاً خریداری شده‌اند.')
+        return redirect(fallback_url)
+
+    callback_url = request.build_absolute_uri(
+        reverse('purchase:order_callback', kwargs={'ref_id': order.ref_id})
+    )
+
+    result = request_payment(
+        amount_toman = order.amount,
+        description  = order.title,
+        callback_url = callback_url,
+        mobile       = request.user.phone_number,
+    )
 
     if result['ok']:
-        purchase.status   = Purchase.Status.SUCCESS
-        purchase.zp_ref_id= result['ref_id']
-        purchase.authority= authority
-        purchase.paid_at  = timezone.now()
-        purchase.save(update_fields=['status', 'zp_ref_id', 'authority', 'paid_at'])
+        order.authority = result['authority']
+        order.save(update_fields=['authority', 'updated_at'])
+        return redirect(result['gateway_url'])
+    else:
+        order.transition(Order.Status.FAILED, status_message=result['error'][:255])
+        messages.error(request, f'خطا در اتصال به درگاه: {result["error"]}')
+        return redirect(fallback_url)
 
-        obj = _get_content_object(purchase.content_type, purchase.object_id)
-        return render(request, 'purchase/result.html', {
-            'success':      True,
-            'message':      'پرداخت موفق بود!',
-            'purchase':     purchase,
-            'content_url':  _content_redirect(purchase.content_type, obj),
-            'ref_id':       result['ref_id'],
-        })
+
+@login_required
+@require_POST
+def checkout(request):
+    """
+    POST /purchase/checkout/
+    items=book:12&items=podcast:7&...
+    """
+    items = []
+    for raw in request.POST.getlist('items'):
+        content_type, _, object_id = raw.partition(':')
+        if content_type in ('book', 'podcast', 'course') and object_id.isdigit():
+            items.append((content_type, int(object_id)))
+
+    fallback = _safe_next(request)
+    if not items:
+        messages.error(request, 'سبد خرید خالی است.')
+        return redirect(fallback)
+
+    return _start_order(request, items, f'خرید {len(items)} محتوا', fallback)
+
+
+@login_required
+@require_POST
+def series_checkout(request, series_id):
+    """
+    POST /purchase/series/<series_id>/
+    خرید همه قسمت‌های پولی یک مجموعه پادکست با تخفیف مجموعه
+    """
+    from podcast.models import PodcastSeries
+    series = get_object_or_404(PodcastSeries, pk=series_id, is_active=True)
+    episode_ids = series.episodes.filter(is_active=True).values_list('pk', flat=True)
+    fallback = _safe_next(request)
+    return _start_order(
+        request,
+        [('podcast', pk) for pk in episode_ids],
+        f'خرید مجموعه پادکست: {series.title}',
+        fallback,
+    )
+
+
+def order_callback(request, ref_id):
+    """
+    GET /purchase/order-callback/<ref_id>/
+    بازگشت از درگاه برای سفارش چندقلمی
+    """
+    order    = get_object_or_404(Order, ref_id=ref_id)
+    status   = request.GET.get('Status', '')
+    authority= request.GET.get('Authority', '')
+
+    order = verify_order(order.pk, authority=authority, cancelled=(status != 'OK'))
+
+    def content_url():
+        first = order.items.order_by('pk').first()
+        if not first:
+            return '/'
+        return _content_redirect(first.content_type, _get_content_object(first.content_type, first.object_id))
+
+    return _render_result(
+        request, order,
+        f'پرداخت موفق بود! دسترسی {order.items.count()} محتوا فعال شد.',
+        content_url,
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# اشتراک ویژه
+# ─────────────────────────────────────────────────────────────────────────
+
+def subscription_plans(request):
+    """
+    GET /purchase/subscribe/
+    لیست طرح‌های اشتراک
+    """
+    return render(request, 'purchase/plans.html', {
+        'plans': SubscriptionPlan.objects.filter(is_active=True),
+    })
+
+
+@login_required
+@require_POST
+def start_subscription(request, plan_id):
+    """
+    POST /purchase/subscribe/<plan_id>/
+    ایجاد رکورد Subscription و redirect به درگاه
+    """
+    plan = get_object_or_404(SubscriptionPlan, pk=plan_id, is_active=True)
+    subscription = Subscription.objects.create(
+        user   = request.user,
+        plan   = plan,
+        amount = plan.price,
+    )
+
+    callback_url = request.build_absolute_uri(
+        reverse('purchase:subscription_callback', kwargs={'ref_id': subscription.ref_id})
+    )
+
+    result = request_payment(
+        amount_toman = plan.price,
+        description  = f'اشتراک ویژه: {plan.title}',
+        callback_url = callback_url,
+        mobile       = request.user.phone_number,
+    )
+
+    if result['ok']:
+        subscription.authority = result['authority']
+        subscription.save(update_fields=['authority', 'updated_at'])
+        return redirect(result['gateway_url'])
     else:
-        purchase.status = Purchase.Status.FAILED
-        purchase.save(update_fields=['status'])
-        return render(request, 'purchase/result.html', {
-            'success': False,
-            'message': f'تأیید پرداخت ناموفق: {result["error"]}',
-            'purchase': purchase,
-        })
\ No newline at end of file
+        subscription.transition(Subscription.Status.FAILED, status_message=result['error'][:255])
+        messages.error(request, f'خطا در اتصال به درگاه: {result["error"]}')
+        return redirect('purchase:plans')
+
+
+def subscription_callback(request, ref_id):
+    """
+    GET /purchase/subscription-callback/<ref_id>/
+    بازگشت از درگاه برای خرید اشتراک
+    """
+    subscription = get_object_or_404(Subscription, ref_id=ref_id)
+    status   = request.GET.get('Status', '')
+    authority= request.GET.get('Authority', '')
+
+    subscription = verify_subscription(subscription.pk, authority=authority, cancelled=(status != 'OK'))
+
+    return _render_result(
+        request, subscription,
+        'اشتراک ویژه شما فعال شد!',
+        lambda: reverse('account:profile'),
+    )
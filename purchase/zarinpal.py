@@ -1,10 +1,20 @@
 """
 purchase/zarinpal.py
 یکپارچه‌سازی با درگاه پرداخت زرین‌پال (REST v4)
+
+request_payment / verify_payment برای viewهای sync و reconciler؛ arequest_payment / averify_payment
+همان قرارداد را با main/httpclient.py دارند و در viewهای async هنگام انتظار thread اشغال نمی‌کنند.
+
+پاسخ خطای v4 بدنه‌ای مثل {"data": [], "errors": {"code": -51, "message": "..."}} دارد؛ چنین پاسخی
+نتیجه قطعی درگاه است. فقط خطای شبکه، timeout، HTTP 5xx و بدنه غیر JSON موقت (transient) حساب می‌شوند.
 """
+import httpx
 import requests
 from django.conf import settings
 
+from main import metrics
+from main.httpclient import http_client
+
 SANDBOX = getattr(settings, 'ZARINPAL_SANDBOX', True)
 
 if SANDBOX:
@@ -19,12 +29,7 @@ else:
 MERCHANT_ID  = getattr(settings, 'ZARINPAL_MERCHANT_ID', 'XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX')
 
 
-def request_payment(amount_toman: int, description: str, callback_url: str, mobile: str = '') -> dict:
-    """
-    درخواست پرداخت
-    Returns: {'ok': True, 'authority': '...', 'gateway_url': '...'}
-          or {'ok': False, 'error': '...'}
-    """
+def _request_payload(amount_toman: int, description: str, callback_url: str, mobile: str) -> dict:
     payload = {
         'merchant_id':   MERCHANT_ID,
         'amount':        amount_toman * 10,   # تبدیل به ریال
@@ -33,18 +38,88 @@ def request_payment(amount_toman: int, description: str, callback_url: str, mobi
     }
     if mobile:
         payload['metadata'] = {'mobile': mobile}
+    return payload
+
+
+def _section(data, key: str) -> dict:
+    """data['data'] یا data['errors'] — در پاسخ‌های خطا آرایه خالی است"""
+    value = data.get(key) if isinstance(data, dict) else None
+    return value if isinstance(value, dict) else {}
+
+
+def _error(data, default: str) -> str:
+    errors  = _section(data, 'errors')
+    message = errors.get('message') or default
+    return f'{message} ({errors["code"]})' if 'code' in errors else message
+
+
+def _request_result(data: dict, call: dict) -> dict:
+    body = _section(data, 'data')
+    if body.get('code') == 100 and body.get('authority'):
+        call['outcome'] = 'ok'
+        authority = body['authority']
+        return {
+            'ok': True,
+            'authority': authority,
+            'gateway_url': GATEWAY_URL.format(authority=authority)
+        }
+    call['outcome'] = 'rejected'
+    return {'ok': False, 'error': _error(data, 'خطای نامشخص')}
+
+
+def _verify_payload(authority: str, amount_toman: int) -> dict:
+    return {
+        'merchant_id': MERCHANT_ID,
+        'amount':      amount_toman * 10,
+        'authority':   authority,
+    }
+
+
+def _verify_result(data: dict, call: dict) -> dict:
+    body = _section(data, 'data')
+    if body.get('code') in (100, 101) and body.get('ref_id'):      # 101 = قبلاً تأیید شده
+        call['outcome'] = 'ok'
+        return {'ok': True, 'ref_id': str(body['ref_id'])}
+    call['outcome'] = 'rejected'
+    return {'ok': False, 'error': _error(data, 'پرداخت تأیید نشد'), 'transient': False}
+
 
+def _verify_response(status: int, read_json, call: dict) -> dict:
+    """پاسخ HTTP تأیید؛ read_json: متد json() پاسخ requests یا httpx"""
+    if status >= 500:
+        call['outcome'] = 'unavailable'
+        return {'ok': False, 'error': f'درگاه در دسترس نیست (HTTP {status})', 'transient': True}
     try:
-        resp = requests.post(REQUEST_URL, json=payload, timeout=10)
-        data = resp.json()
-        if data.get('data', {}).get('code') == 100:
-            authority = data['data']['authority']
-            return {
-                'ok': True,
-                'authority': authority,
-                'gateway_url': GATEWAY_URL.format(authority=authority)
-            }
-        return {'ok': False, 'error': data.get('errors', {}).get('message', 'خطای نامشخص')}
+        data = read_json()
+    except ValueError:
+        call['outcome'] = 'unavailable'
+        return {'ok': False, 'error': f'پاسخ نامعتبر درگاه (HTTP {status})', 'transient': True}
+    return _verify_result(data, call)
+
+
+def request_payment(amount_toman: int, description: str, callback_url: str, mobile: str = '') -> dict:
+    """
+    درخواست پرداخت
+    Returns: {'ok': True, 'authority': '...', 'gateway_url': '...'}
+          or {'ok': False, 'error': '...'}
+    """
+    payload = _request_payload(amount_toman, description, callback_url, mobile)
+    try:
+        with metrics.observe(metrics.ZARINPAL_LATENCY, operation='request') as call:
+            resp = requests.post(REQUEST_URL, json=payload, timeout=10)
+            return _request_result(resp.json(), call)
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+
+
+async def arequest_payment(amount_toman: int, description: str, callback_url: str, mobile: str = '') -> dict:
+    """نسخه async درخواست پرداخت — همان خروجی request_payment"""
+    payload = _request_payload(amount_toman, description, callback_url, mobile)
+    try:
+        with metrics.observe(metrics.ZARINPAL_LATENCY, operation='request') as call:
+            async with http_client() as http:
+                resp = await http.post(REQUEST_URL, json=payload)
+            return _request_result(resp.json(), call)
     except Exception as e:
         return {'ok': False, 'error': str(e)}
 
@@ -53,19 +128,25 @@ def verify_payment(authority: str, amount_toman: int) -> dict:
     """
     تأیید پرداخت
     Returns: {'ok': True, 'ref_id': '...'}
-          or {'ok': False, 'error': '...'}
+          or {'ok': False, 'error': '...', 'transient': bool}
+    transient=True یعنی پاسخ قطعی از درگاه دریافت نشد (شبکه، timeout، 5xx) و باید بعداً دوباره تلاش کرد
     """
-    payload = {
-        'merchant_id': MERCHANT_ID,
-        'amount':      amount_toman * 10,
-        'authority':   authority,
-    }
+    payload = _verify_payload(authority, amount_toman)
     try:
-        resp = requests.post(VERIFY_URL, json=payload, timeout=10)
-        data = resp.json()
-        code = data.get('data', {}).get('code')
-        if code in (100, 101):      # 101 = قبلاً تأیید شده
-            return {'ok': True, 'ref_id': str(data['data']['ref_id'])}
-        return {'ok': False, 'error': data.get('errors', {}).get('message', 'پرداخت تأیید نشد')}
-    except Exception as e:
-        return {'ok': False, 'error': str(e)}
\ No newline at end of file
+        with metrics.observe(metrics.ZARINPAL_LATENCY, operation='verify') as call:
+            resp = requests.post(VERIFY_URL, json=payload, timeout=10)
+            return _verify_response(resp.status_code, resp.json, call)
+    except requests.RequestException as e:
+        return {'ok': False, 'error': str(e), 'transient': True}
+
+
+async def averify_payment(authority: str, amount_toman: int) -> dict:
+    """نسخه async تأیید پرداخت — همان خروجی verify_payment"""
+    payload = _verify_payload(authority, amount_toman)
+    try:
+        with metrics.observe(metrics.ZARINPAL_LATENCY, operation='verify') as call:
+            async with http_client() as http:
+                resp = await http.post(VERIFY_URL, json=payload)
+            return _verify_response(resp.status_code, resp.json, call)
+    except httpx.HTTPError as e:
+        return {'ok': False, 'error': str(e), 'transient': True}
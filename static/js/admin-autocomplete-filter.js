@@ -0,0 +1,16 @@
+// فیلترهای autocomplete نوار کناری changelist (main/adminfilters.py)
+// با انتخاب گزینه، همان صفحه با پارامتر فیلتر جدید (و از صفحه اول) باز می‌شود
+'use strict';
+{
+    const $ = django.jQuery;
+
+    $(document).on('change', 'select.autocomplete-filter', function() {
+        const params = new URLSearchParams(window.location.search);
+        params.delete(this.dataset.lookup);
+        params.delete('p');
+        if (this.value) {
+            params.set(this.dataset.lookup, this.value);
+        }
+        window.location.search = params.toString();
+    });
+}
@@ -339,6 +339,47 @@ class BookReader {
     }
 }
 
+// پیشرفت مطالعه سمت سرور — ورق زدن‌های پشت‌سرهم یک درخواست می‌شوند
+// (سرور هم beaconها را در بافر جمع و دسته‌ای می‌نویسد: book/progress.py)
+class ReadingProgressBeacon {
+    constructor(el, delay = 3000) {
+        this.url = el.dataset.progressUrl;
+        this.csrf = el.dataset.csrf;
+        this.total = parseInt(el.dataset.total);
+        this.delay = delay;
+        this.timer = null;
+        this.pending = null;
+
+        // بستن تب / رفتن به پس‌زمینه: ارسال فوری، بدون انتظار debounce
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') this.send();
+        });
+        window.addEventListener('pagehide', () => this.send());
+
+        this.update(parseInt(el.dataset.page));
+    }
+
+    update(page) {
+        this.pending = page;
+        clearTimeout(this.timer);
+        this.timer = setTimeout(() => this.send(), this.delay);
+    }
+
+    send() {
+        clearTimeout(this.timer);
+        if (!this.pending) return;
+        const body = new FormData();
+        body.append('order', this.pending);
+        body.append('total', this.total);
+        body.append('csrfmiddlewaretoken', this.csrf);
+        this.pending = null;
+        // sendBeacon هنگام بستن صفحه هم ارسال می‌شود؛ fetch keepalive برای مرورگرهای بدون آن
+        if (!(navigator.sendBeacon && navigator.sendBeacon(this.url, body))) {
+            fetch(this.url, { method: 'POST', body, keepalive: true, credentials: 'same-origin' }).catch(() => {});
+        }
+    }
+}
+
 // انیمیشن‌های CSS
 const style = document.createElement('style');
 style.textContent = `
@@ -368,4 +409,9 @@ document.head.appendChild(style);
 
 document.addEventListener('DOMContentLoaded', () => {
     window.bookReader = new BookReader();
+
+    const readerContent = document.getElementById('readerContent');
+    if (readerContent?.dataset.progressUrl) {
+        window.readingProgress = new ReadingProgressBeacon(readerContent);
+    }
 });